@@ -28,6 +28,7 @@ from app.utils.config import (
     OUTPUT_DIR,
     Config
 )
+from app.core.search_executor import SearchExecutor, SearchTask, TaskOutcome
 from app.utils.interface import UserInterface
 from app.utils.prompt_manager import get_prompt_manager, get_system_prompt
 
@@ -44,6 +45,17 @@ except ImportError as e:
     BioMCPIntegration = None
     MCP_AVAILABLE = False
 
+# Deep Search 소스 표시 이름
+DEEP_SEARCH_LABELS = {
+    "thinking": "🧠 Sequential Thinking",
+    "drugbank": "💊 DrugBank",
+    "opentargets": "🎯 OpenTargets",
+    "chembl": "🧪 ChEMBL",
+    "articles": "📄 BioMCP 논문",
+    "trials": "🏥 BioMCP 임상시험",
+    "biorxiv": "📑 BioRxiv"
+}
+
 
 class DrugDevelopmentChatbot:
     """
@@ -253,8 +265,167 @@ class DrugDevelopmentChatbot:
 
         print("프로그램이 종료되었습니다.")
 
+    async def _known_entity(self, name: str, kind: str) -> Optional[Dict[str, Any]]:
+        """엔티티 크로스워크에 이미 있는 ID 조회 (있으면 검색 호출 생략)"""
+        if not self.mcp_manager or not hasattr(self.mcp_manager, 'resolve_entity'):
+            return None
+        try:
+            return await self.mcp_manager.resolve_entity(name, kind, allow_search=False)
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _first_id(entity: Optional[Dict[str, Any]], source: str) -> Optional[str]:
+        value = (entity or {}).get('ids', {}).get(source)
+        return value[0] if isinstance(value, list) else value
+    
+    @staticmethod
+    def _format_known_entity(entity: Dict[str, Any]) -> str:
+        ids = ", ".join(f"{source}: {', '.join(value) if isinstance(value, list) else value}"
+                        for source, value in entity['ids'].items())
+        synonyms = ", ".join(entity['names'][1:6])
+        text = f"• {entity['name']} ({entity['kind']})\n  IDs: {ids}"
+        if synonyms:
+            text += f"\n  동의어: {synonyms}"
+        return text
+    
+    @staticmethod
+    def _result_text(result: Any, min_length: int = 50) -> Optional[str]:
+        """툴 결과의 첫 텍스트 블록 (min_length자 이하면 의미 없는 결과로 보고 None)"""
+        if result and 'content' in result and result['content']:
+            text = result['content'][0].get('text', '').strip()
+            if text and len(text) > min_length:
+                return text
+        return None
+    
+    def _deep_search_tasks(self, user_input: str, input_lower: str, topics: Dict[str, bool]) -> List[SearchTask]:
+        """Deep Search 작업 그래프 구성 (소스/검색어별 작업, 서로 독립이므로 모두 동시에 실행)"""
+        debug = self.settings.get("debug_mode", False)
+        tasks: List[SearchTask] = []
+        
+        async def call(label: str, client_id: str, tool_name: str, arguments: Dict[str, Any]) -> Any:
+            result = await self.mcp_commands.call_tool(client_id=client_id, tool_name=tool_name, arguments=arguments)
+            if debug:
+                self.interface.print_thinking(f"🐛 {label} 결과: {result}")
+            return result
+        
+        # 1. Sequential Thinking으로 연구 계획 수립
+        async def thinking(_):
+            result = await call('Sequential Thinking', 'default', 'start_thinking', {
+                'problem': f'신약개발 연구 질문 분석: {user_input}',
+                'maxSteps': 5
+            })
+            text = self._result_text(result, min_length=30)
+            return f"🧠 AI 연구 계획:\n{text}" if text else None
+        tasks.append(SearchTask('thinking', 'thinking', thinking))
+        
+        # 2. DrugBank 약물 데이터베이스 검색 (검색어별 작업)
+        if topics['drug']:
+            common_drugs = ['aspirin', 'ibuprofen', 'metformin', 'insulin', 'acetaminophen', '아스피린', '메트포민']
+            search_terms = [drug for drug in common_drugs if drug in input_lower]
+            # 특정 약물이 없으면 일반적 검색어 사용
+            if not search_terms:
+                if 'pain' in input_lower or '통증' in input_lower:
+                    search_terms = ['aspirin']
+                elif 'diabetes' in input_lower or '당뇨' in input_lower:
+                    search_terms = ['metformin']
+                else:
+                    search_terms = ['cancer']  # 일반적인 암 치료제 검색
+            
+            for term in search_terms[:2]:  # 최대 2개 검색
+                async def drugbank(_, term=term):
+                    # 크로스워크에 DrugBank ID가 있으면 검색 없이 상세 조회
+                    drugbank_id = self._first_id(await self._known_entity(term, 'drug'), 'drugbank')
+                    result = await call(f'DrugBank {term}', 'drugbank-mcp',
+                                        'get_drug_details' if drugbank_id else 'search_drugs',
+                                        {'drugbank_id': drugbank_id} if drugbank_id else {'query': term, 'limit': 3})
+                    text = self._result_text(result)
+                    return f"💊 DrugBank - {term}:\n{text}" if text else None
+                tasks.append(SearchTask(f'drugbank:{term}', 'drugbank', drugbank))
+        
+        # 3. OpenTargets 타겟-질병 연관성 검색
+        if topics['target'] or topics['disease']:
+            common_targets = ['BRCA1', 'TP53', 'EGFR', 'KRAS', 'PIK3CA']
+            target_terms = [target for target in common_targets if target.lower() in input_lower] or ['cancer']
+            kind = 'target' if topics['target'] else 'disease'
+            
+            for term in target_terms[:2]:
+                async def opentargets(_, term=term):
+                    # 크로스워크에 OpenTargets ID가 있으면 검색 없이 ID로 조회
+                    entity_id = self._first_id(await self._known_entity(term, kind), 'opentargets')
+                    if entity_id and kind == 'target':
+                        tool_name, arguments = 'get_target_details', {'target_id': entity_id}
+                    elif entity_id:
+                        tool_name, arguments = 'get_disease_associated_targets', {'disease_id': entity_id, 'limit': 3}
+                    else:
+                        tool_name = 'search_targets' if kind == 'target' else 'search_diseases'
+                        arguments = {'query': term, 'limit': 3}
+                    text = self._result_text(await call(f'OpenTargets {term}', 'opentargets-mcp', tool_name, arguments))
+                    return f"🎯 OpenTargets - {term}:\n{text}" if text else None
+                tasks.append(SearchTask(f'opentargets:{term}', 'opentargets', opentargets))
+        
+        # 4. ChEMBL 화학 구조 및 분자 정보 검색
+        if topics['chemical'] or topics['drug']:
+            if 'aspirin' in input_lower or '아스피린' in input_lower:
+                chemical_terms = ['aspirin']
+            elif 'fluorouracil' in input_lower or '5-FU' in input_lower:
+                chemical_terms = ['fluorouracil']
+            else:
+                chemical_terms = ['cancer']  # 일반적인 항암제 검색
+            
+            for term in chemical_terms[:2]:
+                async def chembl(_, term=term):
+                    # 크로스워크에 ChEMBL ID가 있으면 분자 검색 생략
+                    known = await self._known_entity(term, 'drug')
+                    if self._first_id(known, 'chembl'):
+                        return f"🧪 ChEMBL - {term}:\n{self._format_known_entity(known)}"
+                    text = self._result_text(await call(f'ChEMBL {term}', 'default', 'search_molecule',
+                                                        {'query': term, 'limit': 3}))
+                    return f"🧪 ChEMBL - {term}:\n{text}" if text else None
+                tasks.append(SearchTask(f'chembl:{term}', 'chembl', chembl))
+        
+        # 5. BioMCP 생의학 논문 / 임상시험 검색
+        async def articles(_):
+            result = await call('BioMCP 논문 검색', 'default', 'article_searcher', {
+                'call_benefit': f'신약개발 연구를 위한 "{user_input}" 관련 논문 검색',
+                'keywords': user_input,
+                'diseases': user_input if topics['disease'] else None,
+                'genes': user_input if topics['target'] else None,
+                'chemicals': user_input if topics['chemical'] or topics['drug'] else None
+            })
+            text = self._result_text(result)
+            return f"📄 BioMCP 논문:\n{text}" if text else None
+        tasks.append(SearchTask('articles', 'articles', articles))
+        
+        if topics['disease']:
+            async def trials(_):
+                result = await call('BioMCP 임상시험 검색', 'default', 'trial_searcher', {
+                    'call_benefit': f'"{user_input}" 관련 임상시험 데이터 검색',
+                    'conditions': user_input,
+                    'recruiting_status': 'ANY',
+                    'study_type': 'INTERVENTIONAL'
+                })
+                text = self._result_text(result)
+                return f"🏥 BioMCP 임상시험:\n{text}" if text else None
+            tasks.append(SearchTask('trials', 'trials', trials))
+        
+        # 6. BioRxiv 최근 프리프린트 (최근 7일, 최대 10개)
+        async def biorxiv(_):
+            result = await call('BioRxiv 검색', 'biorxiv-mcp', 'get_recent_preprints',
+                                {'server': 'biorxiv', 'interval': 7, 'limit': 10})
+            text = self._result_text(result)
+            return f"📑 BioRxiv 프리프린트:\n{text}" if text else None
+        tasks.append(SearchTask('biorxiv', 'biorxiv', biorxiv))
+        
+        return tasks
+    
     async def deep_search_with_mcp(self, user_input):
-        """MCP를 활용한 통합 Deep Search 수행 - DrugBank, OpenTargets, ChEMBL, BioMCP 모두 활용"""
+        """MCP를 활용한 통합 Deep Search 수행 - DrugBank, OpenTargets, ChEMBL, BioMCP 모두 활용
+        
+        소스/검색어별 작업을 SearchExecutor로 동시에 실행하므로 전체 지연 시간은 가장 느린
+        소스에 가까움. 소스별 타임아웃과 전체 마감 시간(DEEP_SEARCH_DEADLINE)을 넘긴 소스는
+        결과에서 누락으로 표시됨.
+        """
         # 일반 모드에서는 MCP Deep Search를 수행하지 않음
         if hasattr(self, 'current_mode') and self.current_mode == "normal":
             if self.settings.get("debug_mode", False):
@@ -269,453 +440,73 @@ class DrugDevelopmentChatbot:
         try:
             if self.config.show_mcp_output:
                 self.interface.print_thinking("🔬 통합 MCP Deep Search 수행 중...")
-            search_results = []
             
             # 키워드 분석으로 최적 검색 전략 결정
             input_lower = user_input.lower()
-            is_drug_related = any(kw in input_lower for kw in ['약물', '치료제', '복용', '부작용', '상호작용', 'drug', 'medication', 'aspirin', '아스피린', 'metformin', '메트포민'])
-            is_target_related = any(kw in input_lower for kw in ['타겟', '유전자', '단백질', 'target', 'protein', 'gene', 'brca1', 'tp53', 'egfr'])
-            is_disease_related = any(kw in input_lower for kw in ['질병', '암', '당뇨', 'cancer', 'disease', 'diabetes', '유방암', 'breast', '알츠하이머', 'alzheimer'])
-            is_chemical_related = any(kw in input_lower for kw in ['화학', '분자', '구조', 'chemical', 'molecule', 'structure', 'smiles'])
+            topics = {
+                'drug': any(kw in input_lower for kw in ['약물', '치료제', '복용', '부작용', '상호작용', 'drug', 'medication', 'aspirin', '아스피린', 'metformin', '메트포민']),
+                'target': any(kw in input_lower for kw in ['타겟', '유전자', '단백질', 'target', 'protein', 'gene', 'brca1', 'tp53', 'egfr']),
+                'disease': any(kw in input_lower for kw in ['질병', '암', '당뇨', 'cancer', 'disease', 'diabetes', '유방암', 'breast', '알츠하이머', 'alzheimer']),
+                'chemical': any(kw in input_lower for kw in ['화학', '분자', '구조', 'chemical', 'molecule', 'structure', 'smiles'])
+            }
             
             # 디버그 정보 출력
             if self.settings.get("debug_mode", False) and self.config.show_mcp_output:
-                self.interface.print_thinking(f"🔍 키워드 분석: 약물={is_drug_related}, 타겟={is_target_related}, 질병={is_disease_related}, 화학={is_chemical_related}")
+                self.interface.print_thinking(f"🔍 키워드 분석: 약물={topics['drug']}, 타겟={topics['target']}, 질병={topics['disease']}, 화학={topics['chemical']}")
             
-            # 1. Sequential Thinking으로 연구 계획 수립
-            thinking_success = False
-            try:
-                if self.config.show_mcp_output:
-                    self.interface.print_thinking("🧠 AI 분석 및 연구 계획 수립...")
-                
-                # 수정된 매개변수 사용 (enableBranching 제거)
-                thinking_result = await self.mcp_commands.call_tool(
-                    client_id='default',
-                    tool_name='start_thinking',
-                    arguments={
-                        'problem': f'신약개발 연구 질문 분석: {user_input}',
-                        'maxSteps': 5
-                    }
-                )
-                
-                if self.settings.get("debug_mode", False):
-                    self.interface.print_thinking(f"🐛 Sequential Thinking 결과: {thinking_result}")
-                
-                # 결과 검증 및 유의미한 데이터 확인
-                if (thinking_result and 
-                    'content' in thinking_result and 
-                    thinking_result['content'] and 
-                    len(thinking_result['content']) > 0):
-                    
-                    thinking_text = thinking_result['content'][0].get('text', '').strip()
-                    # 비어있지 않은 의미있는 결과만 포함
-                    if thinking_text and len(thinking_text) > 30:  # 최소 30자 이상의 의미있는 내용
-                        search_results.append(f"🧠 AI 연구 계획:\n{thinking_text}")
-                        thinking_success = True
-                        if self.config.show_mcp_output:
-                            self.interface.print_thinking("✓ AI 분석 완료")
-                
-                if not thinking_success and self.config.show_mcp_output:
-                    self.interface.print_thinking("⚠️ AI 분석 결과 없음")
-                    
-            except Exception as e:
-                if self.config.show_mcp_output:
-                    self.interface.print_thinking(f"🙅 AI 분석 실패: {e}")
-                if self.settings.get("debug_mode", False):
-                    import traceback
-                    self.interface.print_thinking(f"🐛 상세 오류: {traceback.format_exc()}")
-                    if "Method not implemented" in str(e):
-                        self.interface.print_thinking("🐛 Sequential Thinking 서버가 실행되지 않았거나 툴이 구현되지 않음")
-            
-            # 2. DrugBank 약물 데이터베이스 검색
-            if is_drug_related:
-                try:
-                    if self.config.show_mcp_output:
-                        self.interface.print_thinking("💊 DrugBank 약물 데이터 검색...")
-                    
-                    # 질문에서 약물명 추출
-                    common_drugs = ['aspirin', 'ibuprofen', 'metformin', 'insulin', 'acetaminophen', '아스피린', '메트포민']
-                    search_terms = []
-                    
-                    for drug in common_drugs:
-                        if drug in input_lower:
-                            search_terms.append(drug)
-                    
-                    # 특정 약물이 없으면 일반적 검색어 사용
-                    if not search_terms:
-                        if 'pain' in input_lower or '통증' in input_lower:
-                            search_terms = ['aspirin']
-                        elif 'diabetes' in input_lower or '당뇨' in input_lower:
-                            search_terms = ['metformin']
-                        else:
-                            search_terms = ['cancer']  # 일반적인 암 치료제 검색
-                    
-                    if self.settings.get("debug_mode", False):
-                        self.interface.print_thinking(f"🐛 DrugBank 검색어: {search_terms}")
-                    
-                    drugbank_success = False
-                    for term in search_terms[:2]:  # 최대 2개 검색
-                        try:
-                            # 올바른 클라이언트 ID 사용
-                            drugbank_result = await self.mcp_commands.call_tool(
-                                client_id='drugbank-mcp',  # 정확한 클라이언트 ID
-                                tool_name='search_drugs',
-                                arguments={'query': term, 'limit': 3}
-                            )
-                            
-                            if self.settings.get("debug_mode", False):
-                                self.interface.print_thinking(f"🐛 DrugBank {term} 결과: {drugbank_result}")
-                            
-                            # 결과 검증 및 유의미한 데이터 확인
-                            if (drugbank_result and 
-                                'content' in drugbank_result and 
-                                drugbank_result['content'] and 
-                                len(drugbank_result['content']) > 0):
-                                
-                                drug_text = drugbank_result['content'][0].get('text', '').strip()
-                                # 비어있지 않은 의미있는 결과만 포함
-                                if drug_text and len(drug_text) > 50:  # 최소 50자 이상의 의미있는 내용
-                                    search_results.append(f"💊 DrugBank - {term}:\n{drug_text}")
-                                    drugbank_success = True
-                                    if self.settings.get("debug_mode", False):
-                                        self.interface.print_thinking(f"🐛 DrugBank {term} 검색 성공: {len(drug_text)}자")
-                                
-                        except Exception as tool_error:
-                            if self.settings.get("debug_mode", False):
-                                self.interface.print_thinking(f"🐛 DrugBank {term} 툴 호출 실패: {tool_error}")
-                            continue
-                    
-                    if drugbank_success:
-                        self.interface.print_thinking("✓ DrugBank 검색 완료")
-                    else:
-                        self.interface.print_thinking("⚠️ DrugBank 검색 결과 없음")
-                        
-                except Exception as e:
-                    self.interface.print_thinking(f"🙅 DrugBank 검색 실패: {e}")
-                    if self.settings.get("debug_mode", False):
-                        import traceback
-                        self.interface.print_thinking(f"🐛 DrugBank 상세 오류: {traceback.format_exc()}")
+            tasks = self._deep_search_tasks(user_input, input_lower, topics)
+            if self.config.show_mcp_output:
+                sources = dict.fromkeys(DEEP_SEARCH_LABELS[task.source] for task in tasks)
+                self.interface.print_thinking(f"⚡ {len(tasks)}개 검색 동시 실행: {', '.join(sources)}")
             
-            # 3. OpenTargets 타겟-질병 연관성 검색
-            if is_target_related or is_disease_related:
-                try:
-                    self.interface.print_thinking("🎯 OpenTargets 타겟-질병 연관성 검색...")
-                    
-                    # 유전자/타겟 검색
-                    common_targets = ['BRCA1', 'TP53', 'EGFR', 'KRAS', 'PIK3CA']
-                    target_terms = []
-                    
-                    for target in common_targets:
-                        if target.lower() in input_lower:
-                            target_terms.append(target)
-                    
-                    if not target_terms and (is_target_related or is_disease_related):
-                        target_terms = ['cancer']  # 기본 검색어
-                    
-                    if self.settings.get("debug_mode", False):
-                        self.interface.print_thinking(f"🐛 OpenTargets 검색어: {target_terms}")
-                    
-                    opentargets_success = False
-                    for term in target_terms[:2]:
-                        try:
-                            # 올바른 클라이언트 ID 사용
-                            targets_result = await self.mcp_commands.call_tool(
-                                client_id='opentargets-mcp',  # 정확한 클라이언트 ID
-                                tool_name='search_targets' if is_target_related else 'search_diseases',
-                                arguments={'query': term, 'limit': 3}
-                            )
-                            
-                            if self.settings.get("debug_mode", False):
-                                self.interface.print_thinking(f"🐛 OpenTargets {term} 결과: {targets_result}")
-                            
-                            # 결과 검증 및 유의미한 데이터 확인
-                            if (targets_result and 
-                                'content' in targets_result and 
-                                targets_result['content'] and 
-                                len(targets_result['content']) > 0):
-                                
-                                targets_text = targets_result['content'][0].get('text', '').strip()
-                                # 비어있지 않은 의미있는 결과만 포함
-                                if targets_text and len(targets_text) > 50:  # 최소 50자 이상의 의미있는 내용
-                                    search_results.append(f"🎯 OpenTargets - {term}:\n{targets_text}")
-                                    opentargets_success = True
-                                    if self.settings.get("debug_mode", False):
-                                        self.interface.print_thinking(f"🐛 OpenTargets {term} 검색 성공: {len(targets_text)}자")
-                                
-                        except Exception as tool_error:
-                            if self.settings.get("debug_mode", False):
-                                self.interface.print_thinking(f"🐛 OpenTargets {term} 툴 호출 실패: {tool_error}")
-                            continue
-                    
-                    if opentargets_success:
-                        self.interface.print_thinking("✓ OpenTargets 검색 완료")
-                    else:
-                        self.interface.print_thinking("⚠️ OpenTargets 검색 결과 없음")
-                        
-                except Exception as e:
-                    self.interface.print_thinking(f"🙅 OpenTargets 검색 실패: {e}")
-                    if self.settings.get("debug_mode", False):
-                        import traceback
-                        self.interface.print_thinking(f"🐛 OpenTargets 상세 오류: {traceback.format_exc()}")
+            def on_done(outcome: TaskOutcome):
+                if self.settings.get("debug_mode", False):
+                    detail = f" ({outcome.error})" if outcome.error else ""
+                    self.interface.print_thinking(f"🐛 {outcome.name}: {outcome.status}, {outcome.elapsed:.1f}초{detail}")
             
-            # 4. ChEMBL 화학 구조 및 분자 정보 검색
-            if is_chemical_related or is_drug_related:
-                try:
-                    self.interface.print_thinking("🧪 ChEMBL 화학 데이터 검색...")
-                    
-                    # 화학물질/약물 검색
-                    chemical_terms = []
-                    if 'aspirin' in input_lower or '아스피린' in input_lower:
-                        chemical_terms.append('aspirin')
-                    elif 'fluorouracil' in input_lower or '5-FU' in input_lower:
-                        chemical_terms.append('fluorouracil')
-                    else:
-                        chemical_terms.append('cancer')  # 일반적인 항암제 검색
-                    
-                    if self.settings.get("debug_mode", False):
-                        self.interface.print_thinking(f"🐛 ChEMBL 검색어: {chemical_terms}")
-                    
-                    chembl_success = False
-                    for term in chemical_terms[:2]:
-                        try:
-                            # ChEMBL은 default 클라이언트 사용
-                            chembl_result = await self.mcp_commands.call_tool(
-                                client_id='default',  # ChEMBL은 기본 클라이언트
-                                tool_name='search_molecule',
-                                arguments={'query': term, 'limit': 3}
-                            )
-                            
-                            if self.settings.get("debug_mode", False):
-                                self.interface.print_thinking(f"🐛 ChEMBL {term} 결과: {chembl_result}")
-                            
-                            # 결과 검증 및 유의미한 데이터 확인
-                            if (chembl_result and 
-                                'content' in chembl_result and 
-                                chembl_result['content'] and 
-                                len(chembl_result['content']) > 0):
-                                
-                                chembl_text = chembl_result['content'][0].get('text', '').strip()
-                                # 비어있지 않은 의미있는 결과만 포함
-                                if chembl_text and len(chembl_text) > 50:  # 최소 50자 이상의 의미있는 내용
-                                    search_results.append(f"🧪 ChEMBL - {term}:\n{chembl_text}")
-                                    chembl_success = True
-                                    if self.settings.get("debug_mode", False):
-                                        self.interface.print_thinking(f"🐛 ChEMBL {term} 검색 성공: {len(chembl_text)}자")
-                                
-                        except Exception as tool_error:
-                            if self.settings.get("debug_mode", False):
-                                self.interface.print_thinking(f"🐛 ChEMBL {term} 툴 호출 실패: {tool_error}")
-                            continue
-                    
-                    if chembl_success:
-                        self.interface.print_thinking("✓ ChEMBL 검색 완료")
-                    else:
-                        self.interface.print_thinking("⚠️ ChEMBL 검색 결과 없음")
-                        
-                except Exception as e:
-                    self.interface.print_thinking(f"🙅 ChEMBL 검색 실패: {e}")
-                    if self.settings.get("debug_mode", False):
-                        import traceback
-                        self.interface.print_thinking(f"🐛 ChEMBL 상세 오류: {traceback.format_exc()}")
+            report = await SearchExecutor().run(tasks, on_done=on_done)
             
-            # 5. BioMCP 생의학 연구 데이터 검색
-            biomcp_success = False
-            try:
-                self.interface.print_thinking("📄 BioMCP 생의학 논문 검색...")
-                
-                # 논문 검색 - 올바른 툴 이름 사용 (article_searcher)
-                try:
-                    articles_result = await self.mcp_commands.call_tool(
-                        client_id='default',  # BioMCP는 기본 클라이언트
-                        tool_name='article_searcher',  # 실제 BioMCP 툴 이름
-                        arguments={
-                            'call_benefit': f'신약개발 연구를 위한 "{user_input}" 관련 논문 검색',
-                            'keywords': user_input,
-                            'diseases': user_input if is_disease_related else None,
-                            'genes': user_input if is_target_related else None,
-                            'chemicals': user_input if is_chemical_related or is_drug_related else None
-                        }
-                    )
-                    
-                    if self.settings.get("debug_mode", False):
-                        self.interface.print_thinking(f"🐛 BioMCP 논문 검색 결과: {articles_result}")
-                    
-                    # 결과 검증 및 유의미한 데이터 확인
-                    if (articles_result and 
-                        'content' in articles_result and 
-                        articles_result['content'] and 
-                        len(articles_result['content']) > 0):
-                        
-                        articles_text = articles_result['content'][0].get('text', '').strip()
-                        # 비어있지 않은 의미있는 결과만 포함
-                        if articles_text and len(articles_text) > 50:  # 최소 50자 이상의 의미있는 내용
-                            search_results.append(f"📄 BioMCP 논문:\n{articles_text}")
-                            biomcp_success = True
-                            if self.settings.get("debug_mode", False):
-                                self.interface.print_thinking(f"🐛 BioMCP 논문 검색 성공: {len(articles_text)}자")
-                
-                except Exception as article_error:
-                    if self.settings.get("debug_mode", False):
-                        self.interface.print_thinking(f"🐛 BioMCP 논문 검색 실패: {article_error}")
-                    if "Method not implemented" in str(article_error):
-                        self.interface.print_thinking("🐛 BioMCP 서버가 실행되지 않았거나 툴이 구현되지 않음")
-                
-                # 임상시험 검색 (질병 관련인 경우) - 올바른 툴 이름 사용 (trial_searcher)
-                if is_disease_related:
-                    try:
-                        trials_result = await self.mcp_commands.call_tool(
-                            client_id='default',
-                            tool_name='trial_searcher',  # 실제 BioMCP 툴 이름
-                            arguments={
-                                'call_benefit': f'"{user_input}" 관련 임상시험 데이터 검색',
-                                'conditions': user_input,
-                                'recruiting_status': 'ANY',
-                                'study_type': 'INTERVENTIONAL'
-                            }
-                        )
-                        
-                        if self.settings.get("debug_mode", False):
-                            self.interface.print_thinking(f"🐛 BioMCP 임상시험 검색 결과: {trials_result}")
-                        
-                        # 결과 검증 및 유의미한 데이터 확인
-                        if (trials_result and 
-                            'content' in trials_result and 
-                            trials_result['content'] and 
-                            len(trials_result['content']) > 0):
-                            
-                            trials_text = trials_result['content'][0].get('text', '').strip()
-                            # 비어있지 않은 의미있는 결과만 포함
-                            if trials_text and len(trials_text) > 50:  # 최소 50자 이상의 의미있는 내용
-                                search_results.append(f"🏥 BioMCP 임상시험:\n{trials_text}")
-                                biomcp_success = True
-                                if self.settings.get("debug_mode", False):
-                                    self.interface.print_thinking(f"🐛 BioMCP 임상시험 검색 성공: {len(trials_text)}자")
-                    
-                    except Exception as trial_error:
-                        if self.settings.get("debug_mode", False):
-                            self.interface.print_thinking(f"🐛 BioMCP 임상시험 검색 실패: {trial_error}")
-                            if "Method not implemented" in str(trial_error):
-                                self.interface.print_thinking("🐛 BioMCP 서버가 실행되지 않았거나 툴이 구현되지 않음")
-                
-                if biomcp_success:
-                    self.interface.print_thinking("✓ BioMCP 검색 완료")
+            # 소스별 상태 표시
+            successful_dbs, missing_sources = [], []
+            for source, outcomes in report.by_source().items():
+                label = DEEP_SEARCH_LABELS[source]
+                late = [o for o in outcomes if o.status in ("timeout", "deadline")]
+                if any(o.ok and o.value for o in outcomes):
+                    successful_dbs.append(label)
+                    self.interface.print_thinking(f"✓ {label} 검색 완료")
+                elif late:
+                    self.interface.print_thinking(f"⏱️ {label} 응답 시간 초과")
                 else:
-                    self.interface.print_thinking("⚠️ BioMCP 검색 결과 없음")
-                    
-            except Exception as e:
-                self.interface.print_thinking(f"🙅 BioMCP 검색 실패: {e}")
-                if self.settings.get("debug_mode", False):
-                    import traceback
-                    self.interface.print_thinking(f"🐛 BioMCP 상세 오류: {traceback.format_exc()}")
-                    if "Method not implemented" in str(e):
-                        self.interface.print_thinking("🐛 BioMCP 서버가 실행되지 않았거나 MCP 툴이 구현되지 않음")
+                    self.interface.print_thinking(f"⚠️ {label} 검색 결과 없음")
+                missing_sources.extend(f"{label}({o.name.partition(':')[2] or source}): {o.error}" for o in late)
             
-            # 6. BioRxiv 프리프린트 논문 검색
-            biorxiv_success = False
-            try:
-                self.interface.print_thinking("📑 BioRxiv 프리프린트 논문 검색...")
-                
-                # 최근 프리프린트 검색 (기본 7일)
-                try:
-                    # 연구 관련 키워드가 있으면 검색
-                    search_terms = []
-                    if is_drug_related:
-                        search_terms.extend(['drug', 'therapy', 'treatment'])
-                    if is_target_related:
-                        search_terms.extend(['target', 'protein', 'gene'])
-                    if is_disease_related:
-                        search_terms.extend(['cancer', 'disease', 'therapy'])
-                    if is_chemical_related:
-                        search_terms.extend(['compound', 'molecule', 'chemical'])
-                    
-                    # 키워드가 없으면 일반적인 생물의학 검색
-                    if not search_terms:
-                        search_terms = ['biomedical', 'research']
-                    
-                    if self.settings.get("debug_mode", False):
-                        self.interface.print_thinking(f"🐛 BioRxiv 검색 전략: 최근 7일 프리프린트")
-                    
-                    # BioRxiv 최근 프리프린트 검색
-                    biorxiv_result = await self.mcp_commands.call_tool(
-                        client_id='biorxiv-mcp',  # BioRxiv MCP 클라이언트
-                        tool_name='get_recent_preprints',
-                        arguments={
-                            'server': 'biorxiv',
-                            'interval': 7,  # 최근 7일
-                            'limit': 10     # 최대 10개
-                        }
-                    )
-                    
-                    if self.settings.get("debug_mode", False):
-                        self.interface.print_thinking(f"🐛 BioRxiv 검색 결과: {biorxiv_result}")
-                    
-                    # 결과 검증 및 유의미한 데이터 확인
-                    if (biorxiv_result and 
-                        'content' in biorxiv_result and 
-                        biorxiv_result['content'] and 
-                        len(biorxiv_result['content']) > 0):
-                        
-                        biorxiv_text = biorxiv_result['content'][0].get('text', '').strip()
-                        # 비어있지 않은 의미있는 결과만 포함
-                        if biorxiv_text and len(biorxiv_text) > 50:  # 최소 50자 이상의 의미있는 내용
-                            search_results.append(f"📑 BioRxiv 프리프린트:\n{biorxiv_text}")
-                            biorxiv_success = True
-                            if self.settings.get("debug_mode", False):
-                                self.interface.print_thinking(f"🐛 BioRxiv 검색 성공: {len(biorxiv_text)}자")
-                    
-                except Exception as biorxiv_error:
-                    if self.settings.get("debug_mode", False):
-                        self.interface.print_thinking(f"🐛 BioRxiv 검색 실패: {biorxiv_error}")
-                        if "Method not implemented" in str(biorxiv_error):
-                            self.interface.print_thinking("🐛 BioRxiv 서버가 실행되지 않았거나 툴이 구현되지 않음")
-                
-                if biorxiv_success:
-                    self.interface.print_thinking("✓ BioRxiv 검색 완료")
-                else:
-                    self.interface.print_thinking("⚠️ BioRxiv 검색 결과 없음")
-                    
-            except Exception as e:
-                self.interface.print_thinking(f"🙅 BioRxiv 검색 실패: {e}")
-                if self.settings.get("debug_mode", False):
-                    import traceback
-                    self.interface.print_thinking(f"🐛 BioRxiv 상세 오류: {traceback.format_exc()}")
-                    if "Method not implemented" in str(e):
-                        self.interface.print_thinking("🐛 BioRxiv 서버가 실행되지 않았거나 MCP 툴이 구현되지 않음")
+            # 작업 등록 순서대로 결과 통합 (완료 순서와 무관)
+            search_results = [outcome.value for outcome in report.outcomes.values() if outcome.ok and outcome.value]
+            missing_note = ""
+            if missing_sources:
+                missing_note = "\n⏱️ **시간 내 응답하지 않은 소스 (결과에서 누락):**\n" + "\n".join(f"- {m}" for m in missing_sources) + "\n"
+            
+            if self.settings.get("debug_mode", False):
+                self.interface.print_thinking(f"🐛 Deep Search 소요 시간: {report.elapsed:.1f}초 (마감 초과: {report.deadline_hit})")
             
-            # 7. 결과 통합 및 요약
+            # 결과 통합 및 요약
             if search_results:
                 self.interface.print_thinking("📊 통합 Deep Search 완료 - 데이터 분석 중...")
                 
-                # 검색 결과 통계 및 성공적인 데이터베이스 확인
-                successful_dbs = []
-                for result in search_results:
-                    if "💊 DrugBank" in result:
-                        successful_dbs.append("💊 DrugBank")
-                    elif "🎯 OpenTargets" in result:
-                        successful_dbs.append("🎯 OpenTargets")
-                    elif "🧪 ChEMBL" in result:
-                        successful_dbs.append("🧪 ChEMBL")
-                    elif "📄 BioMCP" in result:
-                        successful_dbs.append("📄 BioMCP")
-                    elif "📑 BioRxiv" in result:
-                        successful_dbs.append("📑 BioRxiv")
-                    elif "🧠 AI" in result:
-                        successful_dbs.append("🧠 Sequential Thinking")
-                
                 result_stats = f"""
 🔬 **GAIA-BT v2.0 Alpha 통합 Deep Search 수행 완루**
 
 📊 **성공적으로 검색된 MCP 데이터베이스:**
-{' + '.join(set(successful_dbs)) if successful_dbs else '검색 결과 없음'}
-
+{' + '.join(successful_dbs) if successful_dbs else '검색 결과 없음'}
+{missing_note}
 📋 **스마트 키워드 분석 결과:**
 - 원본 질문: "{user_input}"
-- 약물 관련 키워드: {'✓ 감지' if is_drug_related else '✗ 미감지'}
-- 타겟/유전자 키워드: {'✓ 감지' if is_target_related else '✗ 미감지'}
-- 질병 관련 키워드: {'✓ 감지' if is_disease_related else '✗ 미감지'}
-- 화학 구조 키워드: {'✓ 감지' if is_chemical_related else '✗ 미감지'}
+- 약물 관련 키워드: {'✓ 감지' if topics['drug'] else '✗ 미감지'}
+- 타겟/유전자 키워드: {'✓ 감지' if topics['target'] else '✗ 미감지'}
+- 질병 관련 키워드: {'✓ 감지' if topics['disease'] else '✗ 미감지'}
+- 화학 구조 키워드: {'✓ 감지' if topics['chemical'] else '✗ 미감지'}
 
-🎯 **검색 결과:** {len(search_results)}개 데이터소스에서 유의미한 데이터 획득
+🎯 **검색 결과:** {len(search_results)}개 데이터소스에서 유의미한 데이터 획득 ({report.elapsed:.1f}초)
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
@@ -734,7 +525,7 @@ class DrugDevelopmentChatbot:
 🔍 **MCP Deep Search 결과 없음**
 
 📝 **분석된 질문:** "{user_input}"
-
+{missing_note}
 ⚠️ **가능한 원인:**
 - MCP 서버가 시작되지 않음 ('/mcp start' 명령어 필요)
 - 네트워크 연결 문제로 외부 데이터베이스 접근 불가
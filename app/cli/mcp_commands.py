@@ -317,6 +317,10 @@ MCP가 활성화되면 일반 질문도 자동으로 MCP 툴을 사용하여 처
                                 print_fn("[green]🧪 ChEMBL 서버 연결됨[/green]")
                             if 'sequential-thinking' in client_ids:
                                 print_fn("[green]🧠 Sequential Thinking 서버 연결됨[/green]")
+                        
+                        lazy_servers = status.get('lazy_servers', [])
+                        if lazy_servers:
+                            print_fn(f"[dim]첫 호출 시 시작: {', '.join(lazy_servers)}[/dim]")
                 else:
                     print_fn("[yellow]⚠️ 일부 외부 서버 시작에 실패했습니다.[/yellow]")
                 
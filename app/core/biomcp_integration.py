@@ -9,6 +9,8 @@ import logging
 from typing import Dict, List, Optional, Any
 import json
 
+from mcp.common.structured import structured_content, structured_records
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,8 +30,8 @@ class BioMCPIntegration:
         # Map of server names to their capabilities
         self.server_capabilities = {
             "biomcp": ["search_articles", "search_trials", "search_variants", "get_article", "get_trial"],
-            "pubmed-mcp": ["search_pubmed", "get_article_details", "find_related_articles", "search_by_author", "get_citations"],
-            "clinicaltrials-mcp": ["search_clinical_trials", "get_trial_details", "search_trials_by_sponsor", "search_trials_by_condition", "get_trial_results"]
+            "pubmed-mcp": ["search_pubmed", "get_article_details", "get_articles_details", "find_related_articles", "search_by_author", "get_citations"],
+            "clinicaltrials-mcp": ["search_clinical_trials", "get_trial_details", "get_trials_details", "search_trials_by_sponsor", "search_trials_by_condition", "get_trial_results"]
         }
     
     async def search_biomedical_articles(
@@ -59,7 +61,8 @@ class BioMCPIntegration:
                 tool_name="search_pubmed",
                 arguments={
                     "query": query,
-                    "max_results": limit
+                    "max_results": limit,
+                    "output_format": "json"
                 }
             )
             
@@ -127,7 +130,8 @@ class BioMCPIntegration:
                     "query": condition,
                     "condition": condition,
                     "status": status,
-                    "max_results": limit
+                    "max_results": limit,
+                    "output_format": "json"
                 }
             )
             
@@ -222,7 +226,8 @@ class BioMCPIntegration:
                 client_id="pubmed-mcp",
                 tool_name="get_article_details",
                 arguments={
-                    "pmid": article_id
+                    "pmid": article_id,
+                    "output_format": "json"
                 }
             )
             
@@ -269,7 +274,8 @@ class BioMCPIntegration:
                 client_id="clinicaltrials-mcp",
                 tool_name="get_trial_details",
                 arguments={
-                    "nct_id": trial_id
+                    "nct_id": trial_id,
+                    "output_format": "json"
                 }
             )
             
@@ -380,7 +386,27 @@ class BioMCPIntegration:
         return results
     
     def _process_biomcp_result(self, result: Dict[str, Any], search_type: str) -> Dict[str, Any]:
-        """Process BioMCP result into standardized format"""
+        """Process BioMCP result into standardized format
+        
+        Typed records in ``structuredContent`` are used as-is; text content is
+        parsed only for servers that return text.
+        """
+        structured = structured_content(result)
+        if structured is not None:
+            if result.get("isError") or ("error" in structured and len(structured) == 1):
+                return {
+                    "success": False,
+                    "error": structured.get("error", "Tool returned an error"),
+                    "search_type": search_type,
+                    "results": []
+                }
+            return {
+                "success": True,
+                "search_type": search_type,
+                "results": structured_records(structured),
+                "total": structured.get("total", structured.get("total_found"))
+            }
+        
         if not result or "content" not in result:
             return {
                 "success": False,
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Deep Search 실행기
+의존성 그래프(DAG)에 따라 검색 작업을 동시에 실행
+
+- 의존 작업이 모두 끝난 작업부터 바로 시작 (독립 작업은 동시에 실행)
+- 소스별 타임아웃과 동시 실행 제한(bulkhead)으로 느린 소스가 다른 소스를 막지 않음
+- 전체 마감 시간(deadline)이 지나면 끝난 결과만 반환하고 나머지는 누락으로 표시
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class SourcePolicy:
+    """검색 소스 하나의 실행 제한"""
+    timeout: float = 20.0       # 작업 하나의 최대 실행 시간 (bulkhead 대기 제외)
+    max_concurrency: int = 2    # 이 소스에서 동시에 실행되는 작업 수
+
+
+# Deep Search 소스별 기본 정책 (외부 API 응답 속도와 rate limit 기준)
+DEEP_SEARCH_POLICIES: Dict[str, SourcePolicy] = {
+    "thinking": SourcePolicy(timeout=30.0, max_concurrency=1),
+    "drugbank": SourcePolicy(timeout=15.0, max_concurrency=2),
+    "opentargets": SourcePolicy(timeout=15.0, max_concurrency=2),
+    "chembl": SourcePolicy(timeout=15.0, max_concurrency=2),
+    "articles": SourcePolicy(timeout=25.0, max_concurrency=1),
+    "trials": SourcePolicy(timeout=25.0, max_concurrency=1),
+    "biorxiv": SourcePolicy(timeout=20.0, max_concurrency=1),
+}
+
+DEFAULT_DEADLINE = float(os.getenv("DEEP_SEARCH_DEADLINE", "45"))
+
+
+@dataclass
+class SearchTask:
+    """실행할 검색 작업
+
+    ``run``은 의존 작업의 결과(작업 이름 -> 값, 실패한 작업은 None)를 받는 코루틴 함수
+    """
+    name: str
+    source: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class TaskOutcome:
+    """작업 실행 결과 (status: ok, error, timeout, deadline)"""
+    name: str
+    source: str
+    status: str
+    value: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+@dataclass
+class SearchReport:
+    """전체 실행 결과 (outcomes는 작업 등록 순서 유지)"""
+    outcomes: Dict[str, TaskOutcome] = field(default_factory=dict)
+    elapsed: float = 0.0
+    deadline_hit: bool = False
+
+    def value(self, name: str) -> Any:
+        outcome = self.outcomes.get(name)
+        return outcome.value if outcome is not None and outcome.ok else None
+
+    @property
+    def missing(self) -> List[TaskOutcome]:
+        """끝나지 못한 작업 (타임아웃 / 마감 / 오류)"""
+        return [outcome for outcome in self.outcomes.values() if not outcome.ok]
+
+    def by_source(self) -> Dict[str, List[TaskOutcome]]:
+        grouped: Dict[str, List[TaskOutcome]] = {}
+        for outcome in self.outcomes.values():
+            grouped.setdefault(outcome.source, []).append(outcome)
+        return grouped
+
+
+class SearchExecutor:
+    """
+    의존성 인식 동시 실행기
+    작업 간 의존성만 지키면서 모든 작업을 동시에 진행하므로, 전체 지연 시간이
+    소스별 지연 시간의 합이 아니라 가장 긴 의존 경로에 가까워짐
+    """
+
+    def __init__(self,
+                 policies: Optional[Dict[str, SourcePolicy]] = None,
+                 default_policy: SourcePolicy = SourcePolicy(),
+                 deadline: Optional[float] = None):
+        """
+        실행기 초기화
+
+        Args:
+            policies: 소스별 정책 (없으면 DEEP_SEARCH_POLICIES)
+            default_policy: 정책이 없는 소스에 적용할 정책
+            deadline: 전체 마감 시간(초) (없으면 DEEP_SEARCH_DEADLINE 환경 변수, 기본 45초)
+        """
+        self.policies = policies if policies is not None else DEEP_SEARCH_POLICIES
+        self.default_policy = default_policy
+        self.deadline = deadline if deadline is not None else DEFAULT_DEADLINE
+
+    def policy(self, source: str) -> SourcePolicy:
+        return self.policies.get(source, self.default_policy)
+
+    @staticmethod
+    def _check_graph(tasks: Sequence[SearchTask]):
+        """중복 이름, 없는 의존 작업, 순환 의존성 검사"""
+        names = [task.name for task in tasks]
+        if len(set(names)) != len(names):
+            raise ValueError("Search task names must be unique")
+        graph = {task.name: task.depends_on for task in tasks}
+        for task in tasks:
+            unknown = [dep for dep in task.depends_on if dep not in graph]
+            if unknown:
+                raise ValueError(f"Task '{task.name}' depends on unknown task(s): {', '.join(unknown)}")
+
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through task '{name}'")
+            visiting.add(name)
+            for dep in graph[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in names:
+            visit(name)
+
+    async def run(self,
+                  tasks: Sequence[SearchTask],
+                  on_done: Optional[Callable[[TaskOutcome], None]] = None) -> SearchReport:
+        """
+        작업 그래프 실행
+
+        Args:
+            tasks: 실행할 작업 목록
+            on_done: 작업이 끝날 때마다 호출되는 콜백 (진행 상황 표시용)
+
+        Returns:
+            SearchReport: 작업별 결과 (마감 시간까지 끝나지 못한 작업은 status="deadline")
+        """
+        self._check_graph(tasks)
+        started = time.monotonic()
+        semaphores = {source: asyncio.Semaphore(max(1, self.policy(source).max_concurrency))
+                      for source in {task.source for task in tasks}}
+        outcomes: Dict[str, TaskOutcome] = {}
+        running: Dict[str, asyncio.Task] = {}
+
+        async def execute(task: SearchTask) -> TaskOutcome:
+            # 의존 작업 완료 대기 (실패한 의존 작업의 결과는 None으로 전달)
+            if task.depends_on:
+                await asyncio.wait([running[dep] for dep in task.depends_on])
+            inputs = {dep: outcomes[dep].value if outcomes[dep].ok else None for dep in task.depends_on}
+
+            policy = self.policy(task.source)
+            async with semaphores[task.source]:
+                task_started = time.monotonic()
+                try:
+                    value = await asyncio.wait_for(task.run(inputs), timeout=policy.timeout)
+                    outcome = TaskOutcome(task.name, task.source, "ok", value=value)
+                except asyncio.TimeoutError:
+                    outcome = TaskOutcome(task.name, task.source, "timeout",
+                                          error=f"{policy.timeout:g}초 타임아웃")
+                except Exception as e:
+                    outcome = TaskOutcome(task.name, task.source, "error", error=str(e))
+                outcome.elapsed = time.monotonic() - task_started
+
+            outcomes[task.name] = outcome
+            if on_done is not None:
+                on_done(outcome)
+            return outcome
+
+        for task in tasks:
+            running[task.name] = asyncio.ensure_future(execute(task))
+
+        pending = set()
+        if running:
+            _, pending = await asyncio.wait(running.values(), timeout=self.deadline)
+        for future in pending:
+            future.cancel()
+        if pending:
+            # 취소가 진행 중인 툴 호출(서버 측 취소 알림 포함)까지 정리되도록 대기
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        report = SearchReport(elapsed=time.monotonic() - started, deadline_hit=bool(pending))
+        for task in tasks:
+            report.outcomes[task.name] = outcomes.get(task.name) or TaskOutcome(
+                task.name, task.source, "deadline",
+                error=f"전체 마감 시간 {self.deadline:g}초 초과", elapsed=report.elapsed)
+        return report
@@ -8,14 +8,20 @@ Supports searching recent preprints, finding published versions, and accessing d
 """
 
 import asyncio
+import gzip
 import json
 import os
 import logging
 import argparse
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Union
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple, Union
 import httpx
 
+from mcp.common.http_client import get_http_client
+from mcp.common.structured import wants_structured
+
 # FastMCP imports
 try:
     from mcp.server.fastmcp import FastMCP
@@ -27,9 +33,123 @@ except ImportError:
     stdio_server = None
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PAGE_SIZE = 100              # details 엔드포인트의 페이지 크기 (cursor 단위)
+MAX_CONCURRENT_PAGES = 4     # total을 안 뒤 동시에 가져오는 페이지 수
+RECENT_WINDOW_DAYS = 3       # 이 기간 안의 날짜 창은 아직 바뀔 수 있으므로 캐시하지 않음
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gaia", "biorxiv")
+REQUEST_TIMEOUT = 30.0         # 요청별 타임아웃 (공유 클라이언트 도입 전 클라이언트 한도)
+
+
+def date_windows(start: date, end: date) -> List[Tuple[date, date]]:
+    """Split [start, end] into calendar-month windows (clipped to the range)"""
+    windows = []
+    current = start
+    while current <= end:
+        next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+        window_end = min(next_month - timedelta(days=1), end)
+        windows.append((current, window_end))
+        current = window_end + timedelta(days=1)
+    return windows
+
+
+def normalize_category(category: str) -> str:
+    """API category parameter form ("Cell Biology" -> "cell_biology")"""
+    return category.strip().lower().replace(" ", "_")
+
+
+def category_matches(preprint: Dict[str, Any], category: str) -> bool:
+    return normalize_category(category) in normalize_category(preprint.get("category") or "")
+
+
+def format_preprint(preprint: Dict[str, Any]) -> Dict[str, Any]:
+    """Preprint summary returned by the listing tools"""
+    abstract = preprint.get("abstract", "")
+    return {
+        "doi": preprint.get("doi"),
+        "title": preprint.get("title"),
+        "authors": preprint.get("authors"),
+        "abstract": abstract[:300] + "..." if abstract and len(abstract) > 300 else abstract,
+        "published_date": preprint.get("date"),
+        "version": preprint.get("version"),
+        "category": preprint.get("category"),
+        "server": preprint.get("server"),
+        "url": f"https://doi.org/{preprint.get('doi')}"
+    }
+
+
+def preprint_details(preprint: Dict[str, Any]) -> Dict[str, Any]:
+    """Full preprint record returned by the DOI lookup tools"""
+    return {
+        "doi": preprint.get("doi"),
+        "title": preprint.get("title"),
+        "authors": preprint.get("authors"),
+        "abstract": preprint.get("abstract"),
+        "published_date": preprint.get("date"),
+        "version": preprint.get("version"),
+        "category": preprint.get("category"),
+        "server": preprint.get("server"),
+        "url": f"https://doi.org/{preprint.get('doi')}"
+    }
+
+
+def strip_doi(doi: str) -> str:
+    """Bare DOI without a https://doi.org/ or doi: prefix"""
+    doi = doi.strip()
+    if doi.startswith("https://doi.org/"):
+        return doi.replace("https://doi.org/", "")
+    if doi.startswith("doi:"):
+        return doi.replace("doi:", "")
+    return doi
+
+
+def _output(output_format: str, value: Dict[str, Any], indent: Optional[int] = None) -> Union[str, Dict[str, Any]]:
+    """Structured record for output_format="json", otherwise the JSON string the tools always returned"""
+    if wants_structured(output_format):
+        return value
+    return json.dumps(value, indent=indent)
+
+
+def get_preprint_index():
+    """Local preprint index (BIORXIV_LOCAL_DB), or None when not set up"""
+    # 지연 import: preprint_index를 CLI(python -m)로 실행할 때 중복 로드를 피함
+    from mcp.biorxiv.preprint_index import get_preprint_index as load_index
+    return load_index()
+
+
+class PreprintWindowCache:
+    """Gzipped JSON files holding every record of a closed (immutable) date window"""
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or os.getenv("BIORXIV_CACHE_DIR", DEFAULT_CACHE_DIR))
+    
+    def _path(self, server: str, start: date, end: date, category: Optional[str]) -> Path:
+        suffix = f"_{normalize_category(category)}" if category else ""
+        return self.cache_dir / server / f"{start.isoformat()}_{end.isoformat()}{suffix}.json.gz"
+    
+    def load(self, server: str, start: date, end: date, category: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        path = self._path(server, start, end, category)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable preprint cache {path}: {e}")
+            return None
+    
+    def store(self, server: str, start: date, end: date, category: Optional[str], records: List[Dict[str, Any]]):
+        path = self._path(server, start, end, category)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(records, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache preprint window {path}: {e}")
+
 
 class BioRxivMCPServer:
     """BioRxiv MCP Server implementation for accessing preprint repositories"""
@@ -38,6 +158,8 @@ class BioRxivMCPServer:
         self.server_name = server_name
         self.base_url = "https://api.biorxiv.org"
         self.client = None
+        self.window_cache = PreprintWindowCache()
+        self.stats = {"pages_fetched": 0, "window_cache_hits": 0}
         
         # Initialize FastMCP if available
         if FastMCP:
@@ -49,13 +171,13 @@ class BioRxivMCPServer:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = get_http_client(self.base_url)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.client:
-            await self.client.aclose()
+        # 공유 HTTP 클라이언트는 닫지 않음 (close_http_clients()로 일괄 종료)
+        self.client = None
     
     def _register_tools(self):
         """Register tools with FastMCP if available"""
@@ -63,37 +185,54 @@ class BioRxivMCPServer:
             return
         
         @self.app.tool()
-        async def get_preprint_by_doi(doi: str) -> str:
+        async def get_preprint_by_doi(doi: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
             """
             Get detailed preprint information by DOI.
             
             Args:
                 doi: Digital Object Identifier of the preprint
+                output_format: "text" (JSON string) or "json" (structured record)
                 
             Returns:
                 JSON string with preprint details
             """
-            return await self.get_preprint_by_doi(doi)
+            return await self.get_preprint_by_doi(doi, output_format)
+        
+        @self.app.tool()
+        async def get_preprints_by_doi(dois: List[str], output_format: str = "text") -> Union[str, Dict[str, Any]]:
+            """
+            Get detailed information for many preprints at once (batch variant of get_preprint_by_doi).
+            
+            Args:
+                dois: List of preprint DOIs
+                output_format: "text" (JSON string) or "json" (structured records)
+                
+            Returns:
+                Preprint details keyed by DOI (missing DOIs map to {"error": ...})
+            """
+            return await self.get_preprints_by_doi(dois, output_format)
         
         @self.app.tool()
-        async def find_published_version(doi: str) -> str:
+        async def find_published_version(doi: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
             """
             Find published journal version of a preprint.
             
             Args:
                 doi: DOI of the preprint to find published version for
+                output_format: "text" (JSON string) or "json" (structured record)
                 
             Returns:
                 JSON string with published version information if found
             """
-            return await self.find_published_version(doi)
+            return await self.find_published_version(doi, output_format)
         
         @self.app.tool()
         async def get_recent_preprints(
             server: str = "biorxiv",
             interval: int = 7,
-            limit: int = 30
-        ) -> str:
+            limit: int = 30,
+            output_format: str = "text"
+        ) -> Union[str, Dict[str, Any]]:
             """
             Get recent preprints from bioRxiv or medRxiv.
             
@@ -101,11 +240,12 @@ class BioRxivMCPServer:
                 server: Server to query ('biorxiv' or 'medrxiv')
                 interval: Number of days back to search (default: 7)
                 limit: Maximum number of results (default: 30)
+                output_format: "text" (JSON string) or "json" (structured records)
                 
             Returns:
                 JSON string with recent preprints
             """
-            return await self.get_recent_preprints(server, interval, limit)
+            return await self.get_recent_preprints(server, interval, limit, output_format)
         
         @self.app.tool()
         async def search_preprints(
@@ -113,8 +253,9 @@ class BioRxivMCPServer:
             end_date: str,
             server: str = "biorxiv",
             category: Optional[str] = None,
-            limit: int = 50
-        ) -> str:
+            limit: int = 50,
+            output_format: str = "text"
+        ) -> Union[str, Dict[str, Any]]:
             """
             Search preprints by date range and optional category.
             
@@ -124,11 +265,37 @@ class BioRxivMCPServer:
                 server: Server to query ('biorxiv' or 'medrxiv')
                 category: Optional category filter
                 limit: Maximum number of results (default: 50)
+                output_format: "text" (JSON string) or "json" (structured records)
                 
             Returns:
                 JSON string with search results
             """
-            return await self.search_preprints(start_date, end_date, server, category, limit)
+            return await self.search_preprints(start_date, end_date, server, category, limit, output_format)
+        
+        @self.app.tool()
+        async def search_preprints_text(
+            query: str,
+            since: Optional[str] = None,
+            server: Optional[str] = None,
+            category: Optional[str] = None,
+            limit: int = 20,
+            output_format: str = "text"
+        ) -> Union[str, Dict[str, Any]]:
+            """
+            Keyword search over titles and abstracts of locally harvested preprints.
+            
+            Args:
+                query: Search keywords (all words preferred, any word as fallback)
+                since: Only preprints posted on or after this date (YYYY-MM-DD)
+                server: Optional server filter ('biorxiv' or 'medrxiv')
+                category: Optional category filter
+                limit: Maximum number of results (default: 20)
+                output_format: "text" (JSON string) or "json" (structured records)
+                
+            Returns:
+                JSON string with relevance-ranked preprints
+            """
+            return await self.search_preprints_text(query, since, server, category, limit, output_format)
     
     async def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Make HTTP request to BioRxiv API"""
@@ -138,7 +305,7 @@ class BioRxivMCPServer:
         url = f"{self.base_url}/{endpoint}"
         
         try:
-            response = await self.client.get(url, params=params or {})
+            response = await self.client.get(url, params=params or {}, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             return response.json()
         
@@ -152,14 +319,97 @@ class BioRxivMCPServer:
             logger.error(f"JSON decode error: {e}")
             raise
     
-    async def get_preprint_by_doi(self, doi: str) -> str:
+    async def _fetch_page(self, server: str, start: date, end: date, cursor: int,
+                          category: Optional[str]) -> Dict[str, Any]:
+        endpoint = f"details/{server}/{start.isoformat()}/{end.isoformat()}/{cursor}"
+        params = {"category": normalize_category(category)} if category else None
+        self.stats["pages_fetched"] += 1
+        return await self._make_request(endpoint, params)
+    
+    async def _iter_window(self, server: str, start: date, end: date,
+                           category: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Records of one date window, from the disk cache or by cursor pagination.
+        
+        The first page gives the total; the remaining cursors are then fetched
+        concurrently (at most MAX_CONCURRENT_PAGES in flight) and yielded in order.
+        A fully read window that ended before the recent period is cached.
+        """
+        immutable = end < date.today() - timedelta(days=RECENT_WINDOW_DAYS)
+        if immutable:
+            cached = self.window_cache.load(server, start, end, category)
+            if cached is not None:
+                self.stats["window_cache_hits"] += 1
+                for record in cached:
+                    yield record
+                return
+        
+        first = await self._fetch_page(server, start, end, 0, category)
+        records = list(first.get("collection") or [])
+        message = (first.get("messages") or [{}])[0]
+        try:
+            total = int(message.get("total", len(records)))
+        except (TypeError, ValueError):
+            total = len(records)
+        for record in records:
+            yield record
+        
+        step = len(records) or PAGE_SIZE
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+        
+        async def fetch(cursor: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._fetch_page(server, start, end, cursor, category)
+        
+        pages = [asyncio.ensure_future(fetch(cursor)) for cursor in range(step, total, step)] if records else []
+        try:
+            for page in pages:
+                page_records = (await page).get("collection") or []
+                records.extend(page_records)
+                for record in page_records:
+                    yield record
+        finally:
+            # 소비자가 중간에 멈추면 남은 페이지 요청 취소
+            for page in pages:
+                if not page.cancel() and not page.cancelled():
+                    page.exception()
+        
+        if immutable:
+            self.window_cache.store(server, start, end, category, records)
+    
+    async def iter_preprints(self, server: str, start: date, end: date,
+                             category: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream preprints of a date range window by window (oldest first)"""
+        for window_start, window_end in date_windows(start, end):
+            window = self._iter_window(server, window_start, window_end, category)
+            try:
+                async for record in window:
+                    if category and not category_matches(record, category):
+                        continue
+                    yield record
+            finally:
+                await window.aclose()
+    
+    async def collect_preprints(self, server: str, start: date, end: date,
+                                category: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """First ``limit`` matching preprints; stops paging as soon as enough are collected"""
+        preprints: List[Dict[str, Any]] = []
+        if limit <= 0:
+            return preprints
+        stream = self.iter_preprints(server, start, end, category)
+        try:
+            async for record in stream:
+                preprints.append(format_preprint(record))
+                if len(preprints) >= limit:
+                    break
+        finally:
+            await stream.aclose()
+        return preprints
+    
+    async def get_preprint_by_doi(self, doi: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
         """Get detailed preprint information by DOI"""
         try:
             # Remove URL prefix if present
-            if doi.startswith("https://doi.org/"):
-                doi = doi.replace("https://doi.org/", "")
-            elif doi.startswith("doi:"):
-                doi = doi.replace("doi:", "")
+            doi = strip_doi(doi)
             
             # BioRxiv API endpoint for DOI lookup
             endpoint = f"details/{doi}"
@@ -167,34 +417,49 @@ class BioRxivMCPServer:
             
             # Format the response
             if "collection" in result and result["collection"]:
-                preprint = result["collection"][0]
-                formatted_result = {
-                    "doi": preprint.get("doi"),
-                    "title": preprint.get("title"),
-                    "authors": preprint.get("authors"),
-                    "abstract": preprint.get("abstract"),
-                    "published_date": preprint.get("date"),
-                    "version": preprint.get("version"),
-                    "category": preprint.get("category"),
-                    "server": preprint.get("server"),
-                    "url": f"https://doi.org/{preprint.get('doi')}"
-                }
-                return json.dumps(formatted_result, indent=2)
+                return _output(output_format, preprint_details(result["collection"][0]), indent=2)
             else:
-                return json.dumps({"error": "Preprint not found"})
+                return _output(output_format, {"error": "Preprint not found"})
         
         except Exception as e:
             logger.error(f"Error getting preprint by DOI: {e}")
-            return json.dumps({"error": f"Failed to fetch preprint: {str(e)}"})
+            return _output(output_format, {"error": f"Failed to fetch preprint: {str(e)}"})
     
-    async def find_published_version(self, doi: str) -> str:
+    async def get_preprints_by_doi(self, dois: List[str], output_format: str = "text") -> Union[str, Dict[str, Any]]:
+        """Get many preprints by DOI: one local index query, remaining DOIs fetched concurrently"""
+        dois = list(dict.fromkeys(strip_doi(doi) for doi in dois if doi and doi.strip()))
+        results: Dict[str, Any] = {}
+        
+        index = get_preprint_index()
+        if index is not None:
+            for doi, record in index.get_many(dois).items():
+                results[doi] = {**preprint_details(record), "source": "local"}
+        
+        # details/{doi}는 DOI 하나씩만 받으므로 남은 DOI는 동시성을 제한해 조회
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+        
+        async def fetch(doi: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    result = await self._make_request(f"details/{doi}")
+                except Exception as e:
+                    logger.error(f"Error getting preprint by DOI {doi}: {e}")
+                    return {"error": f"Failed to fetch preprint: {str(e)}"}
+            if result.get("collection"):
+                # 같은 DOI의 여러 버전 중 최신 버전
+                return preprint_details(result["collection"][-1])
+            return {"error": "Preprint not found"}
+        
+        missing = [doi for doi in dois if doi not in results]
+        for doi, details in zip(missing, await asyncio.gather(*(fetch(doi) for doi in missing))):
+            results[doi] = details
+        return _output(output_format, {doi: results[doi] for doi in dois}, indent=2)
+    
+    async def find_published_version(self, doi: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
         """Find published journal version of a preprint"""
         try:
             # Remove URL prefix if present
-            if doi.startswith("https://doi.org/"):
-                doi = doi.replace("https://doi.org/", "")
-            elif doi.startswith("doi:"):
-                doi = doi.replace("doi:", "")
+            doi = strip_doi(doi)
             
             # BioRxiv API endpoint for published version lookup
             endpoint = f"pub/{doi}"
@@ -211,74 +476,43 @@ class BioRxivMCPServer:
                     "crossref_status": published_info.get("status"),
                     "url": f"https://doi.org/{published_info.get('published_doi')}" if published_info.get('published_doi') else None
                 }
-                return json.dumps(formatted_result, indent=2)
+                return _output(output_format, formatted_result, indent=2)
             else:
-                return json.dumps({"message": "No published version found", "preprint_doi": doi})
+                return _output(output_format, {"message": "No published version found", "preprint_doi": doi})
         
         except Exception as e:
             logger.error(f"Error finding published version: {e}")
-            return json.dumps({"error": f"Failed to find published version: {str(e)}"})
+            return _output(output_format, {"error": f"Failed to find published version: {str(e)}"})
     
-    async def get_recent_preprints(self, server: str = "biorxiv", interval: int = 7, limit: int = 30) -> str:
+    async def get_recent_preprints(self, server: str = "biorxiv", interval: int = 7, limit: int = 30,
+                                  output_format: str = "text") -> Union[str, Dict[str, Any]]:
         """Get recent preprints from bioRxiv or medRxiv"""
         try:
             # Calculate date range
-            end_date = datetime.now()
+            end_date = datetime.now().date()
             start_date = end_date - timedelta(days=interval)
             
             # Format dates for API
             start_date_str = start_date.strftime("%Y-%m-%d")
             end_date_str = end_date.strftime("%Y-%m-%d")
             
-            # BioRxiv API endpoint for recent preprints
-            endpoint = f"details/{server}/{start_date_str}/{end_date_str}"
-            result = await self._make_request(endpoint)
+            formatted_results = await self.collect_preprints(server, start_date, end_date, None, limit)
             
-            # Format the response
-            if "collection" in result and result["collection"]:
-                preprints = result["collection"][:limit]  # Limit results
-                
-                formatted_results = []
-                for preprint in preprints:
-                    formatted_preprint = {
-                        "doi": preprint.get("doi"),
-                        "title": preprint.get("title"),
-                        "authors": preprint.get("authors"),
-                        "abstract": preprint.get("abstract", "")[:300] + "..." if preprint.get("abstract", "") and len(preprint.get("abstract", "")) > 300 else preprint.get("abstract", ""),
-                        "published_date": preprint.get("date"),
-                        "version": preprint.get("version"),
-                        "category": preprint.get("category"),
-                        "server": preprint.get("server"),
-                        "url": f"https://doi.org/{preprint.get('doi')}"
-                    }
-                    formatted_results.append(formatted_preprint)
-                
-                return json.dumps({
-                    "search_parameters": {
-                        "server": server,
-                        "start_date": start_date_str,
-                        "end_date": end_date_str,
-                        "interval_days": interval,
-                        "limit": limit
-                    },
-                    "total_found": len(formatted_results),
-                    "preprints": formatted_results
-                }, indent=2)
-            else:
-                return json.dumps({
-                    "search_parameters": {
-                        "server": server,
-                        "start_date": start_date_str,
-                        "end_date": end_date_str,
-                        "interval_days": interval
-                    },
-                    "total_found": 0,
-                    "preprints": []
-                })
+            return _output(output_format, {
+                "search_parameters": {
+                    "server": server,
+                    "start_date": start_date_str,
+                    "end_date": end_date_str,
+                    "interval_days": interval,
+                    "limit": limit
+                },
+                "total_found": len(formatted_results),
+                "preprints": formatted_results
+            }, indent=2)
         
         except Exception as e:
             logger.error(f"Error getting recent preprints: {e}")
-            return json.dumps({"error": f"Failed to fetch recent preprints: {str(e)}"})
+            return _output(output_format, {"error": f"Failed to fetch recent preprints: {str(e)}"})
     
     async def search_preprints(
         self,
@@ -286,80 +520,95 @@ class BioRxivMCPServer:
         end_date: str,
         server: str = "biorxiv",
         category: Optional[str] = None,
-        limit: int = 50
-    ) -> str:
-        """Search preprints by date range and optional category"""
+        limit: int = 50,
+        output_format: str = "text"
+    ) -> Union[str, Dict[str, Any]]:
+        """Search preprints by date range and optional category
+        
+        Pages through the whole range (cursor pagination, concurrent page fetches)
+        until ``limit`` preprints matching the category have been collected.
+        """
         try:
             # Validate date format
             try:
-                datetime.strptime(start_date, "%Y-%m-%d")
-                datetime.strptime(end_date, "%Y-%m-%d")
+                start = datetime.strptime(start_date, "%Y-%m-%d").date()
+                end = datetime.strptime(end_date, "%Y-%m-%d").date()
             except ValueError:
-                return json.dumps({"error": "Date format must be YYYY-MM-DD"})
-            
-            # BioRxiv API endpoint for date range search
-            endpoint = f"details/{server}/{start_date}/{end_date}"
+                return _output(output_format, {"error": "Date format must be YYYY-MM-DD"})
             
-            # Add category filter if specified
-            params = {}
-            if category:
-                params["category"] = category
+            formatted_results = await self.collect_preprints(server, start, end, category, limit)
             
-            result = await self._make_request(endpoint, params)
-            
-            # Format the response
-            if "collection" in result and result["collection"]:
-                preprints = result["collection"][:limit]  # Limit results
-                
-                formatted_results = []
-                for preprint in preprints:
-                    # Filter by category if specified (client-side filtering)
-                    if category and category.lower() not in preprint.get("category", "").lower():
-                        continue
-                    
-                    formatted_preprint = {
-                        "doi": preprint.get("doi"),
-                        "title": preprint.get("title"),
-                        "authors": preprint.get("authors"),
-                        "abstract": preprint.get("abstract", "")[:300] + "..." if preprint.get("abstract", "") and len(preprint.get("abstract", "")) > 300 else preprint.get("abstract", ""),
-                        "published_date": preprint.get("date"),
-                        "version": preprint.get("version"),
-                        "category": preprint.get("category"),
-                        "server": preprint.get("server"),
-                        "url": f"https://doi.org/{preprint.get('doi')}"
-                    }
-                    formatted_results.append(formatted_preprint)
-                
-                return json.dumps({
-                    "search_parameters": {
-                        "server": server,
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "category": category,
-                        "limit": limit
-                    },
-                    "total_found": len(formatted_results),
-                    "preprints": formatted_results
-                }, indent=2)
-            else:
-                return json.dumps({
-                    "search_parameters": {
-                        "server": server,
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "category": category
-                    },
-                    "total_found": 0,
-                    "preprints": []
-                })
+            return _output(output_format, {
+                "search_parameters": {
+                    "server": server,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "category": category,
+                    "limit": limit
+                },
+                "total_found": len(formatted_results),
+                "preprints": formatted_results
+            }, indent=2)
         
         except Exception as e:
             logger.error(f"Error searching preprints: {e}")
-            return json.dumps({"error": f"Failed to search preprints: {str(e)}"})
+            return _output(output_format, {"error": f"Failed to search preprints: {str(e)}"})
+    
+    async def search_preprints_text(
+        self,
+        query: str,
+        since: Optional[str] = None,
+        server: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+        output_format: str = "text"
+    ) -> Union[str, Dict[str, Any]]:
+        """Keyword search over the local preprint index (BIORXIV_LOCAL_DB)"""
+        index = get_preprint_index()
+        if index is None:
+            return _output(output_format, {"error": "Local preprint index not available (set BIORXIV_LOCAL_DB "
+                                                     "and run python -m mcp.biorxiv.preprint_index sync)"})
+        if since:
+            try:
+                datetime.strptime(since, "%Y-%m-%d")
+            except ValueError:
+                return _output(output_format, {"error": "Date format must be YYYY-MM-DD"})
+        
+        try:
+            started = time.perf_counter()
+            records = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: index.search(query, since, server=server, category=category, limit=limit)
+            )
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        except Exception as e:
+            logger.error(f"Error searching local preprint index: {e}")
+            return _output(output_format, {"error": f"Failed to search preprints: {str(e)}"})
+        
+        preprints = []
+        for record in records:
+            preprint = format_preprint(record)
+            preprint["published_doi"] = record.get("published")
+            preprint["relevance"] = record.get("relevance")
+            preprints.append(preprint)
+        
+        return _output(output_format, {
+            "search_parameters": {
+                "query": query,
+                "since": since,
+                "server": server,
+                "category": category,
+                "limit": limit,
+                "source": "local index",
+                "elapsed_ms": elapsed_ms
+            },
+            "total_found": len(preprints),
+            "preprints": preprints
+        }, indent=2)
 
 
 async def main():
     """Main function to run the BioRxiv MCP server"""
+    logging.basicConfig(level=logging.INFO)
     parser = argparse.ArgumentParser(description="BioRxiv MCP Server")
     parser.add_argument("--name", default="biorxiv-mcp", help="Server name")
     parser.add_argument("--working-directory", help="Working directory")
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Local full-text index of bioRxiv / medRxiv preprints backed by SQLite
+
+The bioRxiv API only lists preprints by date range, so topic questions cannot be
+answered from it directly. This module harvests preprint metadata and abstracts
+day range by day range into a SQLite database with an FTS5 inverted index
+(porter stemming, BM25 ranking with title > abstract > authors > category
+weights), so keyword searches over all harvested preprints run locally in
+milliseconds.
+
+Syncs are incremental: each server remembers the last harvested date and the
+next sync only pulls the days after it (plus a short overlap for late postings).
+Re-harvested preprints replace older versions of the same DOI.
+
+Usage:
+    python -m mcp.biorxiv.preprint_index sync --db preprints.db --since 2024-01-01
+    python -m mcp.biorxiv.preprint_index sync --db preprints.db            # only new days
+    python -m mcp.biorxiv.preprint_index search --db preprints.db "single cell atlas" --since 2024-06-01
+    python -m mcp.biorxiv.preprint_index stats --db preprints.db
+
+Set BIORXIV_LOCAL_DB to the database path to enable the search_preprints_text tool.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+logger = logging.getLogger(__name__)
+
+SERVERS = ("biorxiv", "medrxiv")
+DEFAULT_SYNC_DAYS = 30   # 첫 동기화 시 기본 수집 기간
+SYNC_OVERLAP_DAYS = 3    # 늦게 올라온 preprint를 위해 마지막 수집일 이전 며칠을 다시 수집
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS preprints (
+    id INTEGER PRIMARY KEY,
+    doi TEXT UNIQUE NOT NULL,
+    version INTEGER,
+    server TEXT,
+    title TEXT,
+    authors TEXT,
+    corresponding_author TEXT,
+    institution TEXT,
+    category TEXT,
+    date TEXT,
+    abstract TEXT,
+    published TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_preprints_date ON preprints(date);
+CREATE INDEX IF NOT EXISTS idx_preprints_server_date ON preprints(server, date);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS preprints_fts USING fts5(
+    title, abstract, authors, category, tokenize = 'porter unicode61'
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    server TEXT PRIMARY KEY,
+    last_date TEXT,
+    synced_at TEXT
+);
+"""
+
+UPSERT_PREPRINT = """
+INSERT INTO preprints (doi, version, server, title, authors, corresponding_author, institution,
+                       category, date, abstract, published)
+VALUES (:doi, :version, :server, :title, :authors, :corresponding_author, :institution,
+        :category, :date, :abstract, :published)
+ON CONFLICT(doi) DO UPDATE SET
+    version = excluded.version, server = excluded.server, title = excluded.title,
+    authors = excluded.authors, corresponding_author = excluded.corresponding_author,
+    institution = excluded.institution, category = excluded.category, date = excluded.date,
+    abstract = excluded.abstract, published = excluded.published
+WHERE excluded.version >= preprints.version
+"""
+
+# bm25 가중치: title, abstract, authors, category
+BM25_WEIGHTS = (10.0, 1.0, 0.5, 0.2)
+
+_WORD = re.compile(r"[\w\-']+", re.UNICODE)
+
+
+def _fts_query(text: str, operator: str = "AND") -> str:
+    """FTS5 expression over the words of ``text`` (quoted, so FTS syntax in input is inert)"""
+    words = [w.replace('"', '') for w in _WORD.findall(text)]
+    return f" {operator} ".join(f'"{w}"' for w in words if w)
+
+
+def _version(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 1
+
+
+def preprint_row(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Table row for a record of the bioRxiv ``details`` endpoint"""
+    doi = record.get("doi")
+    if not doi:
+        return None
+    published = record.get("published")
+    return {
+        "doi": doi,
+        "version": _version(record.get("version")),
+        "server": (record.get("server") or "").lower() or None,
+        "title": record.get("title"),
+        "authors": record.get("authors"),
+        "corresponding_author": record.get("author_corresponding"),
+        "institution": record.get("author_corresponding_institution"),
+        "category": record.get("category"),
+        "date": record.get("date"),
+        "abstract": record.get("abstract"),
+        "published": published if published and published != "NA" else None
+    }
+
+
+class PreprintIndex:
+    """SQLite FTS5 index of harvested preprints"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------ ingest
+
+    def _write_batch(self, rows: List[Dict[str, Any]]):
+        # 같은 DOI는 가장 높은 버전만 유지
+        latest: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            current = latest.get(row["doi"])
+            if current is None or row["version"] >= current["version"]:
+                latest[row["doi"]] = row
+        self.conn.executemany(UPSERT_PREPRINT, list(latest.values()))
+
+        dois = list(latest)
+        for start in range(0, len(dois), 500):
+            chunk = dois[start:start + 500]
+            stored = self.conn.execute(
+                f"SELECT id, title, abstract, authors, category FROM preprints "
+                f"WHERE doi IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            ids = [(row["id"],) for row in stored]
+            self.conn.executemany("DELETE FROM preprints_fts WHERE rowid = ?", ids)
+            self.conn.executemany(
+                "INSERT INTO preprints_fts (rowid, title, abstract, authors, category) VALUES (?, ?, ?, ?, ?)",
+                [(row["id"], row["title"] or "", row["abstract"] or "", row["authors"] or "", row["category"] or "")
+                 for row in stored]
+            )
+
+    def add_records(self, records: Sequence[Dict[str, Any]]) -> int:
+        """Insert or refresh preprints from API records; returns the number of records written"""
+        rows = [row for row in map(preprint_row, records) if row is not None]
+        if rows:
+            with self.conn:
+                self._write_batch(rows)
+        return len(rows)
+
+    def last_synced(self, server: str) -> Optional[date]:
+        row = self.conn.execute("SELECT last_date FROM sync_state WHERE server = ?", (server,)).fetchone()
+        return date.fromisoformat(row["last_date"]) if row and row["last_date"] else None
+
+    def _mark_synced(self, server: str, last_date: date):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sync_state (server, last_date, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(server) DO UPDATE SET last_date = excluded.last_date, synced_at = excluded.synced_at",
+                (server, last_date.isoformat(), datetime.now().isoformat(timespec="seconds"))
+            )
+
+    async def sync(self, servers: Sequence[str] = SERVERS, since: Optional[date] = None,
+                   until: Optional[date] = None, batch_size: int = 1000) -> Dict[str, Any]:
+        """Harvest new days from the bioRxiv API.
+
+        Starts at ``since`` when given, otherwise a few days before the last
+        synced date (or DEFAULT_SYNC_DAYS ago on the first run).
+        """
+        # 지연 import: biorxiv_mcp가 이 모듈을 지연 import하므로 순환을 피함
+        from mcp.biorxiv.biorxiv_mcp import BioRxivMCPServer
+
+        until = until or date.today()
+        summary: Dict[str, Any] = {}
+        async with BioRxivMCPServer() as api:
+            for server in servers:
+                last = self.last_synced(server)
+                start = since or (last - timedelta(days=SYNC_OVERLAP_DAYS - 1) if last
+                                  else until - timedelta(days=DEFAULT_SYNC_DAYS))
+                if start > until:
+                    summary[server] = {"from": start.isoformat(), "to": until.isoformat(), "records": 0}
+                    continue
+
+                written = 0
+                batch: List[Dict[str, Any]] = []
+                stream = api.iter_preprints(server, start, until)
+                try:
+                    async for record in stream:
+                        batch.append(record)
+                        if len(batch) >= batch_size:
+                            written += self.add_records(batch)
+                            batch = []
+                finally:
+                    await stream.aclose()
+                written += self.add_records(batch)
+
+                if last is None or until > last:
+                    self._mark_synced(server, until)
+                summary[server] = {"from": start.isoformat(), "to": until.isoformat(), "records": written}
+                logger.info(f"Synced {written} {server} preprints ({start} .. {until})")
+
+        self.conn.execute("INSERT INTO preprints_fts(preprints_fts) VALUES ('optimize')")
+        self.conn.commit()
+        summary["api_pages"] = api.stats["pages_fetched"]
+        return summary
+
+    # ------------------------------------------------------------------ query
+
+    def search(self, query: str, since: Optional[str] = None, until: Optional[str] = None,
+               server: Optional[str] = None, category: Optional[str] = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """BM25-ranked preprints matching every word of ``query`` (any word if none match all)"""
+        clauses, params = [], []
+        if since:
+            clauses.append("p.date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("p.date <= ?")
+            params.append(until)
+        if server:
+            clauses.append("p.server = ?")
+            params.append(server.lower())
+        if category:
+            clauses.append("lower(replace(p.category, '_', ' ')) = ?")
+            params.append(category.strip().lower().replace("_", " "))
+        extra = "".join(f" AND {clause}" for clause in clauses)
+
+        for operator in ("AND", "OR"):
+            expression = _fts_query(query, operator)
+            if not expression:
+                return []
+            try:
+                rows = self.conn.execute(
+                    f"""SELECT p.*, bm25(preprints_fts, {', '.join(map(str, BM25_WEIGHTS))}) AS rank
+                        FROM preprints_fts JOIN preprints p ON p.id = preprints_fts.rowid
+                        WHERE preprints_fts MATCH ?{extra}
+                        ORDER BY rank LIMIT ?""",
+                    [expression] + params + [limit]
+                ).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Local preprint query failed ({query}): {e}")
+                return []
+            if rows:
+                return [self._row_to_record(row) for row in rows]
+        return []
+
+    def get_many(self, dois: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Latest indexed version of each DOI, keyed by DOI (unknown DOIs omitted)"""
+        dois = list(dict.fromkeys(dois))
+        records: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(dois), 500):
+            chunk = dois[start:start + 500]
+            for row in self.conn.execute(
+                    f"SELECT * FROM preprints WHERE doi IN ({','.join('?' * len(chunk))})", chunk):
+                records[row["doi"]] = self._row_to_record(row)
+        return records
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "preprints": self.conn.execute("SELECT count(*) FROM preprints").fetchone()[0],
+            "by_server": {row["server"]: row["n"] for row in self.conn.execute(
+                "SELECT server, count(*) AS n FROM preprints GROUP BY server")},
+            "date_range": list(self.conn.execute("SELECT min(date), max(date) FROM preprints").fetchone()),
+            "synced": {row["server"]: row["last_date"] for row in self.conn.execute(
+                "SELECT server, last_date FROM sync_state")},
+            "db_size_mb": round(os.path.getsize(self.db_path) / (1024 * 1024), 1)
+        }
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> Dict[str, Any]:
+        """API-shaped record (plus relevance for search hits) so the MCP formatter can reuse it"""
+        record = {
+            "doi": row["doi"],
+            "title": row["title"],
+            "authors": row["authors"],
+            "abstract": row["abstract"],
+            "date": row["date"],
+            "version": str(row["version"]),
+            "category": row["category"],
+            "server": row["server"],
+            "published": row["published"]
+        }
+        if "rank" in row.keys():
+            record["relevance"] = round(-row["rank"], 3)
+        return record
+
+
+_index: Optional[PreprintIndex] = None
+
+
+def get_preprint_index() -> Optional[PreprintIndex]:
+    """Index configured through BIORXIV_LOCAL_DB, or None when no local copy is set up"""
+    global _index
+    db_path = os.getenv("BIORXIV_LOCAL_DB")
+    if not db_path or not os.path.exists(db_path):
+        return None
+    if _index is None or _index.db_path != db_path:
+        _index = PreprintIndex(db_path)
+    return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local bioRxiv / medRxiv full-text index (SQLite FTS5)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Harvest new days from the bioRxiv API")
+    sync_parser.add_argument("--server", action="append", choices=SERVERS,
+                             help="Server to sync (repeatable, default: both)")
+    sync_parser.add_argument("--since", help="YYYY-MM-DD (default: continue after the last sync)")
+    sync_parser.add_argument("--until", help="YYYY-MM-DD (default: today)")
+
+    search_parser = subparsers.add_parser("search", help="Keyword search")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--since", help="YYYY-MM-DD")
+    search_parser.add_argument("--server", choices=SERVERS)
+    search_parser.add_argument("--category")
+    search_parser.add_argument("--limit", type=int, default=10)
+
+    stats_parser = subparsers.add_parser("stats", help="Show index statistics")
+    for sub in (sync_parser, search_parser, stats_parser):
+        sub.add_argument("--db", required=True)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    index = PreprintIndex(args.db)
+    try:
+        if args.command == "sync":
+            result: Any = asyncio.run(index.sync(
+                args.server or SERVERS,
+                date.fromisoformat(args.since) if args.since else None,
+                date.fromisoformat(args.until) if args.until else None
+            ))
+        elif args.command == "stats":
+            result = index.stats()
+        else:
+            start = time.perf_counter()
+            records = index.search(args.query, args.since, server=args.server,
+                                   category=args.category, limit=args.limit)
+            result = {
+                "preprints": [{"doi": r["doi"], "date": r["date"], "title": r["title"],
+                               "relevance": r["relevance"]} for r in records],
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+            }
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,19 @@ MCP Client Implementation
 import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, AsyncIterator, List, Optional, Union
 import uuid
 
 from ..protocol.messages import (
     MCPRequest, MCPResponse, MCPError, MCPErrorCode,
     MCPTool, MCPMethod
 )
+from ..server.progress import iterate_events, notification_to_event
 
 
 class MCPClient:
-    def __init__(self, client_name: str = "GAIA-MCP-Client", client_version: str = "0.1.0"):
+    def __init__(self, client_name: str = "GAIA-MCP-Client", client_version: str = "0.1.0",
+                 transport: Optional[Any] = None):
         self.client_name = client_name
         self.client_version = client_version
         self.logger = logging.getLogger(__name__)
@@ -23,9 +25,17 @@ class MCPClient:
         self.available_tools: List[MCPTool] = []
         self.server_info: Optional[Dict[str, Any]] = None
         
-        # Connection handling (placeholder for actual transport)
+        # Connection handling; without a transport requests are simulated
+        self.transport = transport
+        if transport is not None:
+            transport.notification_handler = self.handle_notification
         self.connected = False
         self._request_id_counter = 0
+        
+        # progressToken -> queue of progress/partial events for call_tool_stream
+        self._progress_streams: Dict[str, asyncio.Queue] = {}
+        # 전송 중인 notifications/cancelled 태스크 (GC 방지용 참조)
+        self._pending_cancels: set = set()
     
     def _generate_request_id(self) -> str:
         """Generate unique request ID"""
@@ -35,8 +45,8 @@ class MCPClient:
     async def connect(self) -> bool:
         """Connect to MCP server"""
         try:
-            # Placeholder for actual connection logic
-            # In real implementation, this would establish transport connection
+            if self.transport is not None and not self.transport.alive:
+                await self.transport.start()
             self.connected = True
             self.logger.info("Connected to MCP server")
             return True
@@ -46,6 +56,8 @@ class MCPClient:
     
     async def disconnect(self):
         """Disconnect from MCP server"""
+        if self.transport is not None:
+            await self.transport.stop()
         self.connected = False
         self.initialized = False
         self.available_tools = []
@@ -81,6 +93,8 @@ class MCPClient:
             
             self.server_info = response.result
             self.initialized = True
+            if self.transport is not None:
+                await self.transport.notify(MCPMethod.NOTIFICATION_INITIALIZED.value)
             self.logger.info("Successfully initialized MCP client")
             
             # Load available tools
@@ -111,8 +125,8 @@ class MCPClient:
             self.available_tools = [
                 MCPTool(
                     name=tool["name"],
-                    description=tool["description"],
-                    inputSchema=tool["inputSchema"]
+                    description=tool.get("description", ""),
+                    inputSchema=tool.get("inputSchema", {"type": "object"})
                 )
                 for tool in tools_data
             ]
@@ -124,22 +138,28 @@ class MCPClient:
             self.logger.error(f"List tools error: {e}")
             raise
     
+    def _build_tool_call(self, tool_name: str, arguments: Dict[str, Any] = None,
+                         progress_token: Optional[str] = None) -> MCPRequest:
+        """Build a tools/call request, optionally carrying a progress token"""
+        params = {
+            "name": tool_name,
+            "arguments": arguments or {}
+        }
+        if progress_token is not None:
+            params["_meta"] = {"progressToken": progress_token}
+        
+        return MCPRequest(
+            method=MCPMethod.TOOLS_CALL.value,
+            id=self._generate_request_id(),
+            params=params
+        )
+    
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
         """Call a tool on the MCP server"""
         if not self.initialized:
             raise RuntimeError("Client not initialized")
         
-        if arguments is None:
-            arguments = {}
-        
-        request = MCPRequest(
-            method=MCPMethod.TOOLS_CALL.value,
-            id=self._generate_request_id(),
-            params={
-                "name": tool_name,
-                "arguments": arguments
-            }
-        )
+        request = self._build_tool_call(tool_name, arguments)
         
         try:
             response = await self._send_request(request)
@@ -152,6 +172,90 @@ class MCPClient:
             self.logger.error(f"Tool call error: {e}")
             raise
     
+    async def call_tool_stream(self, tool_name: str,
+                               arguments: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Call a tool and iterate over its progress/partial events as they arrive.
+        
+        Yields ``{"type": "progress", ...}`` and ``{"type": "partial", "content": [...]}``
+        events, then a final ``{"type": "result", "result": ...}``.
+        """
+        if not self.initialized:
+            raise RuntimeError("Client not initialized")
+        
+        progress_token = f"progress_{uuid.uuid4().hex[:12]}"
+        queue: asyncio.Queue = asyncio.Queue()
+        self._progress_streams[progress_token] = queue
+        request = self._build_tool_call(tool_name, arguments, progress_token)
+        
+        async def _call() -> Dict[str, Any]:
+            response = await self._send_request(request)
+            if response.error:
+                raise RuntimeError(f"Tool call failed: {response.error}")
+            return response.result
+        
+        try:
+            async for event in iterate_events(queue, asyncio.ensure_future(_call())):
+                yield event
+        finally:
+            self._progress_streams.pop(progress_token, None)
+    
+    async def read_resource(self, uri: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Read a resource (e.g. a result-set page or ``<result-set uri>/records/<n>``)"""
+        if not self.initialized:
+            raise RuntimeError("Client not initialized")
+
+        params: Dict[str, Any] = {"uri": uri}
+        if cursor:
+            params["cursor"] = cursor
+        request = MCPRequest(
+            method=MCPMethod.RESOURCES_READ.value,
+            id=self._generate_request_id(),
+            params=params
+        )
+
+        response = await self._send_request(request)
+        if response.error:
+            raise RuntimeError(f"Resource read failed: {response.error}")
+        return response.result
+
+    async def iter_result_pages(self, result: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a tools/call result, then every further page of its result set (following nextCursor).
+
+        Stop iterating as soon as enough has been read; unread pages are never fetched.
+        """
+        yield result
+        result_set = (result.get("_meta") or {}).get("resultSet")
+        cursor = result.get("nextCursor")
+        while result_set and cursor:
+            page = await self.read_resource(result_set["uri"], cursor)
+            yield page
+            cursor = page.get("nextCursor")
+
+    async def handle_notification(self, message: Dict[str, Any]):
+        """Route a server notification (progress/partial result) to its stream"""
+        params = message.get("params") or {}
+        queue = self._progress_streams.get(params.get("progressToken"))
+        if queue is None:
+            self.logger.debug(f"Unrouted notification: {message.get('method')}")
+            return
+        
+        event = notification_to_event(message.get("method", ""), params)
+        if event is not None:
+            queue.put_nowait(event)
+    
+    async def cancel_request(self, request_id: Union[str, int], reason: Optional[str] = None):
+        """Send notifications/cancelled for an in-flight request"""
+        if self.transport is None or not self.transport.alive:
+            return
+        
+        params = {"requestId": request_id}
+        if reason:
+            params["reason"] = reason
+        try:
+            await self.transport.notify(MCPMethod.NOTIFICATION_CANCELLED.value, params)
+        except Exception as e:
+            self.logger.debug(f"Failed to send cancel notification: {e}")
+    
     async def ping(self) -> bool:
         """Ping the MCP server"""
         if not self.connected:
@@ -171,8 +275,20 @@ class MCPClient:
             return False
     
     async def _send_request(self, request: MCPRequest) -> MCPResponse:
-        """Send request to MCP server (placeholder implementation)"""
-        # This is a placeholder implementation
+        """Send request to MCP server"""
+        if self.transport is not None:
+            try:
+                return await self.transport.request(request)
+            except asyncio.CancelledError:
+                # 호출자가 취소/타임아웃된 경우 서버에도 알려 핸들러(및 외부 HTTP 요청)를 중단
+                task = asyncio.ensure_future(
+                    self.cancel_request(request.id, "Request cancelled by client")
+                )
+                self._pending_cancels.add(task)
+                task.add_done_callback(self._pending_cancels.discard)
+                raise
+        
+        # Without a transport, fall back to the simulated server
         # In real implementation, this would send the request through the transport layer
         
         # For now, we'll simulate a basic response
@@ -3,15 +3,21 @@
 from .clinicaltrials_mcp import (
     search_clinical_trials,
     get_trial_details,
+    get_trials_details,
     search_trials_by_sponsor,
     search_trials_by_condition,
-    get_trial_results
+    get_trial_results,
+    stream_clinical_trials,
+    aggregate_trials
 )
 
 __all__ = [
     'search_clinical_trials',
     'get_trial_details',
+    'get_trials_details',
     'search_trials_by_sponsor',
     'search_trials_by_condition',
-    'get_trial_results'
+    'get_trial_results',
+    'stream_clinical_trials',
+    'aggregate_trials'
 ]
\ No newline at end of file
@@ -7,9 +7,10 @@ Provides access to ClinicalTrials.gov database for clinical trial information.
 Supports trial search, trial details, and sponsor/condition searches.
 """
 
-import os
+import asyncio
 import sys
-from typing import Any, List, Optional, Dict
+from functools import partial
+from typing import Any, AsyncIterator, List, Optional, Dict, Union
 import httpx
 from pathlib import Path
 import json
@@ -17,6 +18,11 @@ import json
 # Add the parent directory to sys.path to import from mcp package
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from mcp.common.http_client import pooled_client
+from mcp.common.exports import resolve_export_path
+from mcp.common.structured import wants_structured
+from mcp.common.local_mode import get_local_mode as resolve_local_mode
+
 try:
     from mcp.server.fastmcp import FastMCP
 except ImportError:
@@ -52,12 +58,24 @@ except ImportError:
                 
             async def run(self):
                 # Run the server
-                from mcp.server.stdio import stdio_server
                 async with stdio_server() as (read_stream, write_stream):
                     await self.server.run(read_stream, write_stream)
     except ImportError:
-        print("Error: Could not import MCP server components")
-        sys.exit(1)
+        # MCP 서버 구성요소가 없으면 툴 등록만 하는 기본 클래스 제공 (in-process 호스트용)
+        class FastMCP:
+            def __init__(self, name: str, working_dir: str = None):
+                self.name = name
+                self.working_dir = working_dir
+                self.tools = []
+                
+            def tool(self):
+                def decorator(func):
+                    self.tools.append((None, func))
+                    return func
+                return decorator
+                
+            async def run(self):
+                raise RuntimeError("Could not import MCP server components")
 
 # Initialize FastMCP server
 mcp = FastMCP("clinicaltrials-mcp", working_dir=str(Path(__file__).parent))
@@ -65,6 +83,35 @@ mcp = FastMCP("clinicaltrials-mcp", working_dir=str(Path(__file__).parent))
 # Constants
 API_BASE_URL = "https://clinicaltrials.gov/api/v2"
 TOOL_NAME = "GAIA-MCP-ClinicalTrials"
+MAX_PAGE_SIZE = 1000  # API v2 pageSize 상한
+
+# fields= projection presets: only the modules each formatter actually reads
+FIELD_PRESETS = {
+    "summary": [
+        "protocolSection.identificationModule.nctId",
+        "protocolSection.identificationModule.briefTitle",
+        "protocolSection.statusModule.overallStatus",
+        "protocolSection.designModule.studyType",
+        "protocolSection.designModule.phases",
+        "protocolSection.designModule.enrollmentInfo",
+        "protocolSection.conditionsModule.conditions",
+        "protocolSection.sponsorCollaboratorsModule.leadSponsor",
+    ],
+    "details": ["protocolSection"],
+    "eligibility": [
+        "protocolSection.identificationModule",
+        "protocolSection.eligibilityModule",
+    ],
+    "outcomes": [
+        "protocolSection.identificationModule",
+        "protocolSection.outcomesModule",
+    ],
+    "results": [
+        "protocolSection.identificationModule",
+        "hasResults",
+        "resultsSection",
+    ],
+}
 
 async def make_api_request(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Make a request to the ClinicalTrials.gov API."""
@@ -74,7 +121,7 @@ async def make_api_request(endpoint: str, params: Optional[Dict[str, Any]] = Non
         "User-Agent": f"{TOOL_NAME}/1.0"
     }
     
-    async with httpx.AsyncClient() as client:
+    async with pooled_client(API_BASE_URL) as client:
         try:
             response = await client.get(url, params=params, headers=headers, timeout=30.0)
             response.raise_for_status()
@@ -84,6 +131,222 @@ async def make_api_request(endpoint: str, params: Optional[Dict[str, Any]] = Non
         except Exception as e:
             return {"error": f"Request failed: {str(e)}"}
 
+def preset_fields(preset: Optional[str]) -> Optional[str]:
+    """Comma-joined fields= value for a projection preset (None = full documents)"""
+    if not preset or preset == "full":
+        return None
+    if preset not in FIELD_PRESETS:
+        raise ValueError(f"Unknown field preset '{preset}'. Use one of: {', '.join(FIELD_PRESETS)}, full")
+    return ",".join(FIELD_PRESETS[preset])
+
+def single_study(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Study document from a studies/{nctId} response (returned directly, not under "studies")"""
+    if "protocolSection" in result:
+        return result
+    studies = result.get("studies") or []
+    return studies[0] if studies else None
+
+def build_search_params(query: Optional[str] = None,
+                        condition: Optional[str] = None,
+                        intervention: Optional[str] = None,
+                        sponsor: Optional[str] = None,
+                        status: Optional[str] = None,
+                        phase: Optional[str] = None) -> Dict[str, Any]:
+    """Query parameters shared by the search tools."""
+    params: Dict[str, Any] = {"format": "json"}
+    if query:
+        params["query.term"] = query
+    
+    # Add specific filters if provided
+    filters = []
+    if condition:
+        filters.append(f"AREA[Condition]{condition}")
+    if intervention:
+        filters.append(f"AREA[Intervention]{intervention}")
+    if sponsor:
+        filters.append(f"AREA[Sponsor]{sponsor}")
+    if status:
+        filters.append(f"AREA[OverallStatus]{status}")
+    if phase:
+        filters.append(f"AREA[Phase]{phase}")
+    
+    if filters:
+        params["filter.advanced"] = " AND ".join(filters)
+    return params
+
+async def iter_study_pages(params: Dict[str, Any],
+                           preset: Optional[str] = "summary",
+                           max_studies: Optional[int] = None,
+                           page_size: int = 100,
+                           prefetch: int = 2) -> AsyncIterator[Dict[str, Any]]:
+    """Follow nextPageToken and yield result pages.
+    
+    A background task fetches up to ``prefetch`` pages ahead of the consumer, so
+    network time overlaps processing while memory stays bounded.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch))
+    fields = preset_fields(preset)
+    
+    async def produce():
+        try:
+            token = None
+            fetched = 0
+            while True:
+                remaining = None if max_studies is None else max_studies - fetched
+                page_params = dict(params)
+                page_params["pageSize"] = min(page_size if remaining is None else min(page_size, remaining), MAX_PAGE_SIZE)
+                if fields:
+                    page_params["fields"] = fields
+                if token:
+                    page_params["pageToken"] = token
+                else:
+                    page_params["countTotal"] = "true"
+                
+                page = await make_api_request("studies", page_params)
+                await queue.put(page)
+                if "error" in page:
+                    break
+                
+                token = page.get("nextPageToken")
+                fetched += len(page.get("studies", []))
+                if not token or (max_studies is not None and fetched >= max_studies):
+                    break
+        finally:
+            # 예외로 끝나도 소비자가 대기 상태로 남지 않도록 종료 표시 (소비자가 취소한 경우는 제외)
+            if not asyncio.current_task().cancelling():
+                await queue.put(None)
+    
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            page = await queue.get()
+            if page is None:
+                # producer에서 발생한 예외를 소비자에게 전달
+                await producer
+                break
+            yield page
+            if "error" in page:
+                break
+    finally:
+        if not producer.done():
+            producer.cancel()
+        # 취소된 producer(진행 중인 API 요청 포함)가 정리될 때까지 대기
+        await asyncio.gather(producer, return_exceptions=True)
+
+async def iter_studies(params: Dict[str, Any],
+                       preset: Optional[str] = "summary",
+                       max_studies: Optional[int] = None,
+                       page_size: int = 100,
+                       prefetch: int = 2) -> AsyncIterator[Dict[str, Any]]:
+    """Yield individual (projected) study documents across pages."""
+    yielded = 0
+    pages = iter_study_pages(params, preset, max_studies, page_size, prefetch)
+    try:
+        async for page in pages:
+            if "error" in page:
+                raise RuntimeError(page["error"])
+            for study in page.get("studies", []):
+                yield study
+                yielded += 1
+                if max_studies is not None and yielded >= max_studies:
+                    return
+    finally:
+        await pages.aclose()
+
+def compact_trial(trial: Dict[str, Any]) -> Dict[str, Any]:
+    """One-line-friendly trial record built from the summary preset fields."""
+    protocol = trial.get("protocolSection", {})
+    design_module = protocol.get("designModule", {})
+    return {
+        "nct_id": protocol.get("identificationModule", {}).get("nctId"),
+        "title": protocol.get("identificationModule", {}).get("briefTitle"),
+        "status": protocol.get("statusModule", {}).get("overallStatus"),
+        "study_type": design_module.get("studyType"),
+        "phases": design_module.get("phases", []),
+        "enrollment": design_module.get("enrollmentInfo", {}).get("count"),
+        "conditions": protocol.get("conditionsModule", {}).get("conditions", []),
+        "sponsor": protocol.get("sponsorCollaboratorsModule", {}).get("leadSponsor", {}).get("name")
+    }
+
+def detail_record(study: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed trial record from the details preset (output_format="json")."""
+    protocol = study.get("protocolSection", {})
+    id_module = protocol.get("identificationModule", {})
+    status_module = protocol.get("statusModule", {})
+    design_module = protocol.get("designModule", {})
+    design_info = design_module.get("designInfo", {})
+    eligibility = protocol.get("eligibilityModule", {})
+    sponsor_module = protocol.get("sponsorCollaboratorsModule", {})
+    locations = protocol.get("contactsLocationsModule", {}).get("locations", [])
+    record = compact_trial(study)
+    record.update({
+        "official_title": id_module.get("officialTitle"),
+        "brief_summary": protocol.get("descriptionModule", {}).get("briefSummary"),
+        "start_date": status_module.get("startDateStruct", {}).get("date"),
+        "primary_completion_date": status_module.get("primaryCompletionDateStruct", {}).get("date"),
+        "primary_purpose": design_info.get("primaryPurpose"),
+        "allocation": design_info.get("allocation"),
+        "masking": design_info.get("maskingInfo", {}).get("masking"),
+        "interventions": [{"type": i.get("type"), "name": i.get("name"), "description": i.get("description")}
+                          for i in protocol.get("armsInterventionsModule", {}).get("interventions", [])],
+        "primary_outcomes": [{"measure": o.get("measure"), "time_frame": o.get("timeFrame")}
+                             for o in protocol.get("outcomesModule", {}).get("primaryOutcomes", [])],
+        "eligibility": {
+            "minimum_age": eligibility.get("minimumAge"),
+            "maximum_age": eligibility.get("maximumAge"),
+            "sex": eligibility.get("sex"),
+            "healthy_volunteers": eligibility.get("healthyVolunteers")
+        } if eligibility else None,
+        "sponsor_class": sponsor_module.get("leadSponsor", {}).get("class"),
+        "collaborators": [c.get("name") for c in sponsor_module.get("collaborators", [])],
+        "location_count": len(locations),
+        "locations": [{"facility": loc.get("facility"), "city": loc.get("city"), "country": loc.get("country")}
+                      for loc in locations[:10]],
+        "reference_count": len(protocol.get("referencesModule", {}).get("references", []))
+    })
+    return record
+
+# 로컬 미러 선택 (CLINICALTRIALS_MODE: remote | local | hybrid)
+get_local_mode = partial(resolve_local_mode, "CLINICALTRIALS_MODE", "mcp.clinicaltrials.local_index:get_local_index")
+
+def format_local_results(total: int, studies: List[Dict[str, Any]],
+                         groups: Optional[List[Any]] = None) -> str:
+    """Format local index hits like the API search output, plus a lead-sponsor breakdown."""
+    if not studies:
+        return "No clinical trials found matching your criteria. [local index]"
+    
+    output = [f"Found {total} trials (showing top {len(studies)}) [local index]:"]
+    if groups:
+        output.append("Lead sponsors: " + ", ".join(f"{name} ({count})" for name, count in groups))
+    
+    for i, study in enumerate(studies, 1):
+        output.append(f"\n{'='*60}")
+        output.append(f"Result {i}:")
+        output.append(format_trial_summary(study))
+    
+    return "\n".join(output)
+
+async def search_local_trials(max_results: int, structured: bool = False,
+                              **filters) -> Optional[Union[str, Dict[str, Any]]]:
+    """Answer a search from the local index, or None to fall through to the API."""
+    index, mode = get_local_mode()
+    if index is None:
+        return None
+    
+    def run():
+        total, studies = index.search(max_results, **filters)
+        groups = index.aggregate("sponsor", 5, **filters) if total > len(studies) else None
+        return total, studies, groups
+    
+    # SQLite 조회는 이벤트 루프 밖에서 실행
+    total, studies, groups = await asyncio.get_running_loop().run_in_executor(None, run)
+    if studies or mode == "local":
+        if structured:
+            return {"total": total, "source": "local", "trials": [compact_trial(study) for study in studies],
+                    "sponsor_groups": [{"value": name, "count": count} for name, count in groups or []]}
+        return format_local_results(total, studies, groups)
+    return None
+
 def format_trial_summary(trial: Dict[str, Any]) -> str:
     """Format a trial summary for display."""
     protocol = trial.get("protocolSection", {})
@@ -133,8 +396,9 @@ async def search_clinical_trials(
     sponsor: Optional[str] = None,
     status: Optional[str] = None,
     phase: Optional[str] = None,
-    max_results: int = 10
-) -> str:
+    max_results: int = 10,
+    output_format: str = "text"
+) -> Union[str, Dict[str, Any]]:
     """Search ClinicalTrials.gov for clinical trials.
     
     Args:
@@ -145,36 +409,26 @@ async def search_clinical_trials(
         status: Trial status (e.g., "RECRUITING", "COMPLETED")
         phase: Trial phase (e.g., "PHASE1", "PHASE2", "PHASE3")
         max_results: Maximum number of results to return
+        output_format: "text" (formatted listing) or "json" (trial records)
     """
-    params = {
-        "format": "json",
-        "pageSize": max_results,
-        "query.term": query
-    }
-    
-    # Add specific filters if provided
-    filters = []
-    if condition:
-        filters.append(f"AREA[Condition]{condition}")
-    if intervention:
-        filters.append(f"AREA[Intervention]{intervention}")
-    if sponsor:
-        filters.append(f"AREA[Sponsor]{sponsor}")
-    if status:
-        filters.append(f"AREA[OverallStatus]{status}")
-    if phase:
-        filters.append(f"AREA[Phase]{phase}")
-    
-    if filters:
-        params["filter.advanced"] = " AND ".join(filters)
-    
-    result = await make_api_request("studies", params)
-    
-    if "error" in result:
-        return f"Error searching trials: {result['error']}"
-    
-    studies = result.get("studies", [])
-    total_count = result.get("totalCount", 0)
+    structured = wants_structured(output_format)
+    params = build_search_params(query, condition, intervention, sponsor, status, phase)
+    
+    # summary 프리셋으로 필요한 필드만 받고, 페이지 상한을 넘는 요청은 nextPageToken으로 이어받음
+    studies = []
+    total_count = 0
+    async for page in iter_study_pages(params, "summary", max_studies=max_results,
+                                       page_size=min(max_results, MAX_PAGE_SIZE)):
+        if "error" in page:
+            if structured:
+                return {"error": f"Error searching trials: {page['error']}"}
+            return f"Error searching trials: {page['error']}"
+        total_count = page.get("totalCount", total_count)
+        studies.extend(page.get("studies", []))
+    studies = studies[:max_results]
+    
+    if structured:
+        return {"total": total_count, "source": "api", "trials": [compact_trial(study) for study in studies]}
     
     if not studies:
         return "No clinical trials found matching your criteria."
@@ -189,25 +443,32 @@ async def search_clinical_trials(
     return "\n".join(output)
 
 @mcp.tool()
-async def get_trial_details(nct_id: str) -> str:
+async def get_trial_details(nct_id: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Get detailed information about a specific clinical trial.
     
     Args:
         nct_id: NCT identifier (e.g., "NCT12345678")
+        output_format: "text" (formatted details) or "json" (trial record)
     """
+    structured = wants_structured(output_format)
     # Ensure NCT ID is properly formatted
     if not nct_id.upper().startswith("NCT"):
         nct_id = f"NCT{nct_id}"
     
-    result = await make_api_request(f"studies/{nct_id}")
+    result = await make_api_request(f"studies/{nct_id}", {"fields": preset_fields("details")})
     
     if "error" in result:
+        if structured:
+            return {"error": f"Error fetching trial details: {result['error']}"}
         return f"Error fetching trial details: {result['error']}"
     
-    if "studies" not in result or not result["studies"]:
-        return f"No trial found with NCT ID: {nct_id}"
+    study = single_study(result)
+    if not study:
+        return {"error": f"No trial found with NCT ID: {nct_id}"} if structured else f"No trial found with NCT ID: {nct_id}"
+    
+    if structured:
+        return detail_record(study)
     
-    study = result["studies"][0]
     protocol = study.get("protocolSection", {})
     
     output = [f"Clinical Trial Details: {nct_id}", "="*80]
@@ -327,62 +588,175 @@ async def get_trial_details(nct_id: str) -> str:
     return "\n".join(output)
 
 @mcp.tool()
-async def search_trials_by_sponsor(sponsor_name: str, max_results: int = 10) -> str:
+async def get_trials_details(nct_ids: List[str]) -> Dict[str, Any]:
+    """Get details for many clinical trials at once (batch variant of get_trial_details).
+    
+    All trials are fetched with one studies request filtered by ``filter.ids``
+    (paged only beyond the API page size).
+    
+    Args:
+        nct_ids: List of NCT identifiers (e.g., ["NCT12345678", "NCT87654321"])
+    
+    Returns:
+        Trial records (same fields as get_trial_details output_format="json") keyed by NCT ID;
+        IDs that could not be fetched map to {"error": ...}
+    """
+    ids = []
+    for nct_id in nct_ids:
+        nct_id = str(nct_id).strip().upper()
+        if nct_id:
+            ids.append(nct_id if nct_id.startswith("NCT") else f"NCT{nct_id}")
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return {}
+    
+    records: Dict[str, Any] = {}
+    params = {"format": "json", "filter.ids": ",".join(ids)}
+    try:
+        async for study in iter_studies(params, preset="details", max_studies=len(ids), page_size=len(ids)):
+            record = detail_record(study)
+            records[record["nct_id"]] = record
+    except RuntimeError as e:
+        return {nct_id: {"error": f"Error fetching trial details: {e}"} for nct_id in ids}
+    
+    return {nct_id: records.get(nct_id, {"error": f"No trial found with NCT ID: {nct_id}"}) for nct_id in ids}
+
+@mcp.tool()
+async def search_trials_by_sponsor(sponsor_name: str, max_results: int = 10,
+                                   output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Search for clinical trials by sponsor organization.
     
     Args:
         sponsor_name: Name of the sponsoring organization
         max_results: Maximum number of results to return
+        output_format: "text" (formatted listing) or "json" (trial records)
     """
+    local = await search_local_trials(max_results, wants_structured(output_format), sponsor=sponsor_name)
+    if local is not None:
+        return local
+    
     return await search_clinical_trials(
         query=sponsor_name,
         sponsor=sponsor_name,
-        max_results=max_results
+        max_results=max_results,
+        output_format=output_format
     )
 
 @mcp.tool()
-async def search_trials_by_condition(condition: str, status: Optional[str] = None, max_results: int = 10) -> str:
+async def search_trials_by_condition(condition: str, status: Optional[str] = None, max_results: int = 10,
+                                     phase: Optional[str] = None,
+                                     output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Search for clinical trials by medical condition.
     
     Args:
         condition: Medical condition or disease name
         status: Optional trial status filter (e.g., "RECRUITING")
         max_results: Maximum number of results to return
+        phase: Optional phase filter (e.g., "PHASE2" or "PHASE2,PHASE3")
+        output_format: "text" (formatted listing) or "json" (trial records)
     """
+    local = await search_local_trials(max_results, wants_structured(output_format),
+                                      condition=condition, status=status, phase=phase)
+    if local is not None:
+        return local
+    
     return await search_clinical_trials(
         query=condition,
         condition=condition,
         status=status,
-        max_results=max_results
+        phase=phase,
+        max_results=max_results,
+        output_format=output_format
     )
 
 @mcp.tool()
-async def get_trial_results(nct_id: str) -> str:
+async def aggregate_trials(
+    group_by: str,
+    condition: Optional[str] = None,
+    intervention: Optional[str] = None,
+    sponsor: Optional[str] = None,
+    status: Optional[str] = None,
+    phase: Optional[str] = None,
+    start_from: Optional[str] = None,
+    start_to: Optional[str] = None,
+    limit: int = 20,
+    output_format: str = "text"
+) -> Union[str, Dict[str, Any]]:
+    """Count trials per group using the local ClinicalTrials.gov index.
+    
+    Args:
+        group_by: One of phase, status, sponsor, sponsor_class, condition, intervention, study_type, start_year
+        condition: Medical condition or disease
+        intervention: Treatment or intervention
+        sponsor: Sponsor or collaborator name
+        status: Trial status, comma-separated for several (e.g., "RECRUITING,NOT_YET_RECRUITING")
+        phase: Trial phase, comma-separated for several (e.g., "PHASE2,PHASE3")
+        start_from: Earliest start date (YYYY[-MM[-DD]])
+        start_to: Latest start date (YYYY[-MM[-DD]])
+        limit: Maximum number of groups to return
+        output_format: "text" (formatted counts) or "json" ({"groups": [{"value", "count"}]})
+    """
+    structured = wants_structured(output_format)
+    index, _ = get_local_mode()
+    if index is None:
+        message = "Local ClinicalTrials.gov index not available (set CLINICALTRIALS_LOCAL_DB)."
+        return {"error": message} if structured else message
+    
+    filters = {"condition": condition, "intervention": intervention, "sponsor": sponsor,
+               "status": status, "phase": phase, "start_from": start_from, "start_to": start_to}
+    try:
+        groups = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: index.aggregate(group_by, limit, **filters)
+        )
+    except Exception as e:
+        return {"error": f"Error aggregating trials: {str(e)}"} if structured else f"Error aggregating trials: {str(e)}"
+    
+    if structured:
+        return {"group_by": group_by, "filters": {k: v for k, v in filters.items() if v}, "source": "local",
+                "groups": [{"value": value, "count": count} for value, count in groups]}
+    
+    if not groups:
+        return "No clinical trials found matching your criteria. [local index]"
+    
+    active = ", ".join(f"{k}={v}" for k, v in filters.items() if v)
+    output = [f"Trials by {group_by}" + (f" ({active})" if active else "") + " [local index]:"]
+    for value, count in groups:
+        output.append(f"  {value or 'N/A'}: {count}")
+    return "\n".join(output)
+
+@mcp.tool()
+async def get_trial_results(nct_id: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Get reported results for a clinical trial if available.
     
     Args:
         nct_id: NCT identifier (e.g., "NCT12345678")
+        output_format: "text" (formatted summary) or "json" (results section as reported)
     """
+    structured = wants_structured(output_format)
     # Ensure NCT ID is properly formatted
     if not nct_id.upper().startswith("NCT"):
         nct_id = f"NCT{nct_id}"
     
-    result = await make_api_request(f"studies/{nct_id}")
+    result = await make_api_request(f"studies/{nct_id}", {"fields": preset_fields("results")})
     
     if "error" in result:
+        if structured:
+            return {"error": f"Error fetching trial results: {result['error']}"}
         return f"Error fetching trial results: {result['error']}"
     
-    if "studies" not in result or not result["studies"]:
-        return f"No trial found with NCT ID: {nct_id}"
-    
-    study = result["studies"][0]
+    study = single_study(result)
+    if not study:
+        return {"error": f"No trial found with NCT ID: {nct_id}"} if structured else f"No trial found with NCT ID: {nct_id}"
     
     # Check if results are available
     has_results = study.get("hasResults", False)
+    results_section = study.get("resultsSection", {})
+    if structured:
+        return {"nct_id": nct_id, "has_results": bool(has_results and results_section),
+                "results_section": results_section or None}
     if not has_results:
         return f"No results have been posted for trial {nct_id} yet."
     
-    results_section = study.get("resultsSection", {})
     if not results_section:
         return f"Results section not available for trial {nct_id}."
     
@@ -444,9 +818,84 @@ async def get_trial_results(nct_id: str) -> str:
     
     return "\n".join(output)
 
-if __name__ == "__main__":
-    import asyncio
+@mcp.tool()
+async def stream_clinical_trials(
+    query: Optional[str] = None,
+    condition: Optional[str] = None,
+    intervention: Optional[str] = None,
+    sponsor: Optional[str] = None,
+    status: Optional[str] = None,
+    phase: Optional[str] = None,
+    fields: str = "summary",
+    max_results: int = 1000,
+    output_path: Optional[str] = None,
+    output_format: str = "text"
+) -> Union[str, Dict[str, Any]]:
+    """Sweep a large set of trials page by page with a field projection.
+    
+    Follows nextPageToken with bounded prefetch and emits one JSON record per trial
+    (JSON Lines). With the "summary" preset each record is a compact summary;
+    other presets emit the projected study document.
     
+    Args:
+        query: General search query
+        condition: Medical condition or disease
+        intervention: Treatment or intervention type
+        sponsor: Trial sponsor name
+        status: Trial status (e.g., "RECRUITING", "COMPLETED")
+        phase: Trial phase (e.g., "PHASE2")
+        fields: Projection preset: summary, details, eligibility, outcomes, results, full
+        max_results: Maximum number of trials to retrieve (default: 1000)
+        output_path: Optional .jsonl file inside MCP_EXPORT_DIR to write records to instead of returning them
+        output_format: "text" (JSON Lines) or "json" ({"trials": [...]}); ignored with output_path
+    """
+    structured = wants_structured(output_format) and not output_path
+    if not any([query, condition, intervention, sponsor, status, phase]):
+        return "Provide at least one search criterion."
+    
+    if output_path:
+        try:
+            output_path = resolve_export_path(output_path)
+        except ValueError as e:
+            return str(e)
+    
+    try:
+        preset_fields(fields)
+    except ValueError as e:
+        return str(e)
+    
+    params = build_search_params(query, condition, intervention, sponsor, status, phase)
+    count = 0
+    lines = []
+    records = []
+    try:
+        if output_path:
+            with open(output_path, "w", encoding="utf-8") as f:
+                async for study in iter_studies(params, fields, max_studies=max_results, page_size=MAX_PAGE_SIZE):
+                    record = compact_trial(study) if fields == "summary" else study
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    count += 1
+            return f"Wrote {count} trials to {output_path}"
+        
+        async for study in iter_studies(params, fields, max_studies=max_results, page_size=MAX_PAGE_SIZE):
+            record = compact_trial(study) if fields == "summary" else study
+            if structured:
+                records.append(record)
+            else:
+                lines.append(json.dumps(record, ensure_ascii=False))
+            count += 1
+    except Exception as e:
+        if structured:
+            return {"error": f"Error streaming trials after {count} records: {str(e)}"}
+        return f"Error streaming trials after {count} records: {str(e)}"
+    
+    if structured:
+        return {"total": count, "fields": fields, "trials": records}
+    if not lines:
+        return "No clinical trials found matching your criteria."
+    return "\n".join(lines)
+
+if __name__ == "__main__":
     print(f"Starting ClinicalTrials.gov MCP Server...")
     print(f"Server name: {mcp.name}")
     print(f"Working directory: {mcp.working_dir}")
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Offline ClinicalTrials.gov index backed by SQLite
+
+Loads the ClinicalTrials.gov JSON bulk export (ctg-studies.json.zip, one API v2
+study document per file) into a SQLite database with one row per trial plus
+indexed side tables for phases, conditions, interventions and sponsors. Status,
+phase and date filters use B-tree indexes; condition / intervention / sponsor
+text matching goes through an FTS5 index, so filtered searches and GROUP BY
+aggregations over the full registry run locally in milliseconds.
+
+Usage:
+    python -m mcp.clinicaltrials.local_index ingest --db ctgov.db /data/ctg-studies.json.zip
+    python -m mcp.clinicaltrials.local_index search --db ctgov.db --condition HNSCC --status RECRUITING --phase PHASE2,PHASE3
+    python -m mcp.clinicaltrials.local_index aggregate --db ctgov.db sponsor --condition HNSCC --status RECRUITING
+    python -m mcp.clinicaltrials.local_index stats --db ctgov.db
+
+Set CLINICALTRIALS_LOCAL_DB to the database path to let the ClinicalTrials MCP tools answer from it.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY,
+    nct_id TEXT UNIQUE NOT NULL,
+    title TEXT,
+    overall_status TEXT,
+    study_type TEXT,
+    phases TEXT,
+    enrollment INTEGER,
+    enrollment_type TEXT,
+    lead_sponsor TEXT,
+    sponsor_class TEXT,
+    conditions TEXT,
+    start_date TEXT,
+    primary_completion_date TEXT,
+    completion_date TEXT,
+    last_update TEXT,
+    has_results INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_trials_status ON trials(overall_status);
+CREATE INDEX IF NOT EXISTS idx_trials_study_type ON trials(study_type);
+CREATE INDEX IF NOT EXISTS idx_trials_lead_sponsor ON trials(lead_sponsor COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_trials_start_date ON trials(start_date);
+CREATE INDEX IF NOT EXISTS idx_trials_completion_date ON trials(completion_date);
+CREATE INDEX IF NOT EXISTS idx_trials_last_update ON trials(last_update);
+
+CREATE TABLE IF NOT EXISTS trial_phases (
+    id INTEGER NOT NULL,
+    phase TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_phases_phase ON trial_phases(phase, id);
+CREATE INDEX IF NOT EXISTS idx_phases_id ON trial_phases(id);
+
+CREATE TABLE IF NOT EXISTS trial_conditions (
+    id INTEGER NOT NULL,
+    condition TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_conditions_condition ON trial_conditions(condition COLLATE NOCASE, id);
+CREATE INDEX IF NOT EXISTS idx_conditions_id ON trial_conditions(id);
+
+CREATE TABLE IF NOT EXISTS trial_interventions (
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_interventions_name ON trial_interventions(name COLLATE NOCASE, id);
+CREATE INDEX IF NOT EXISTS idx_interventions_id ON trial_interventions(id);
+
+CREATE TABLE IF NOT EXISTS trial_sponsors (
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    role TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sponsors_name ON trial_sponsors(name COLLATE NOCASE, id);
+CREATE INDEX IF NOT EXISTS idx_sponsors_id ON trial_sponsors(id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS trials_fts USING fts5(
+    title, conditions, interventions, sponsors
+);
+"""
+
+INSERT_TRIAL = """
+INSERT INTO trials (id, nct_id, title, overall_status, study_type, phases, enrollment, enrollment_type,
+                    lead_sponsor, sponsor_class, conditions, start_date, primary_completion_date,
+                    completion_date, last_update, has_results)
+VALUES (:id, :nct_id, :title, :overall_status, :study_type, :phases, :enrollment, :enrollment_type,
+        :lead_sponsor, :sponsor_class, :conditions, :start_date, :primary_completion_date,
+        :completion_date, :last_update, :has_results)
+"""
+
+CHILD_TABLES = ("trial_phases", "trial_conditions", "trial_interventions", "trial_sponsors")
+
+# aggregate() group_by -> (SELECT 식, 필요한 JOIN)
+GROUP_COLUMNS = {
+    "status": ("t.overall_status", ""),
+    "study_type": ("t.study_type", ""),
+    "sponsor": ("t.lead_sponsor", ""),
+    "sponsor_class": ("t.sponsor_class", ""),
+    "start_year": ("substr(t.start_date, 1, 4)", ""),
+    "phase": ("p.phase", "JOIN trial_phases p ON p.id = t.id"),
+    "condition": ("c.condition", "JOIN trial_conditions c ON c.id = t.id"),
+    "intervention": ("i.name", "JOIN trial_interventions i ON i.id = t.id"),
+}
+
+_WORD = re.compile(r"[\w\-']+", re.UNICODE)
+
+
+def _terms_query(column: str, text: str) -> str:
+    """FTS5 expression requiring every word of ``text`` in ``column``"""
+    words = [w.replace('"', '') for w in _WORD.findall(text)]
+    return " AND ".join(f'{column}: "{w}"' for w in words if w)
+
+
+def _split_values(value: Optional[str]) -> List[str]:
+    """'PHASE2,PHASE3' / 'PHASE2|PHASE3' / 'phase 2' -> normalized API enum values"""
+    if not value:
+        return []
+    values = []
+    for item in re.split(r"[,|]", value):
+        item = item.strip().upper().replace(" ", "_")
+        if not item:
+            continue
+        if item.startswith("PHASE_"):
+            item = "PHASE" + item[len("PHASE_"):]
+        values.append(item)
+    return values
+
+
+def _date(module: Dict[str, Any], key: str) -> Optional[str]:
+    return (module.get(key) or {}).get("date")
+
+
+def flatten_study(study: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Columns and side-table rows for one API v2 study document"""
+    protocol = study.get("protocolSection", {})
+    ident = protocol.get("identificationModule", {})
+    nct_id = ident.get("nctId")
+    if not nct_id or not nct_id[3:].isdigit():
+        return None
+
+    status = protocol.get("statusModule", {})
+    design = protocol.get("designModule", {})
+    conditions_module = protocol.get("conditionsModule", {})
+    sponsors_module = protocol.get("sponsorCollaboratorsModule", {})
+    interventions = protocol.get("armsInterventionsModule", {}).get("interventions", [])
+
+    lead = sponsors_module.get("leadSponsor", {})
+    sponsors = [(lead["name"], "lead")] if lead.get("name") else []
+    sponsors += [(c["name"], "collaborator") for c in sponsors_module.get("collaborators", []) if c.get("name")]
+
+    conditions = conditions_module.get("conditions", [])
+    keywords = conditions_module.get("keywords", [])
+    phases = design.get("phases", [])
+    enrollment = design.get("enrollmentInfo", {})
+
+    intervention_names = []
+    for intervention in interventions:
+        if intervention.get("name"):
+            intervention_names.append((intervention["name"], intervention.get("type")))
+        for other in intervention.get("otherNames", []):
+            intervention_names.append((other, intervention.get("type")))
+
+    row_id = int(nct_id[3:])
+    return {
+        "trial": {
+            "id": row_id,
+            "nct_id": nct_id,
+            "title": ident.get("briefTitle"),
+            "overall_status": status.get("overallStatus"),
+            "study_type": design.get("studyType"),
+            "phases": ",".join(phases),
+            "enrollment": enrollment.get("count"),
+            "enrollment_type": enrollment.get("type"),
+            "lead_sponsor": lead.get("name"),
+            "sponsor_class": lead.get("class"),
+            "conditions": json.dumps(conditions, ensure_ascii=False),
+            "start_date": _date(status, "startDateStruct"),
+            "primary_completion_date": _date(status, "primaryCompletionDateStruct"),
+            "completion_date": _date(status, "completionDateStruct"),
+            "last_update": _date(status, "lastUpdatePostDateStruct"),
+            "has_results": 1 if study.get("hasResults") else 0
+        },
+        "phases": [(row_id, phase) for phase in phases],
+        "conditions": [(row_id, condition) for condition in conditions],
+        "interventions": [(row_id, name, kind) for name, kind in intervention_names],
+        "sponsors": [(row_id, name, role) for name, role in sponsors],
+        "fts": (row_id, ident.get("briefTitle") or "",
+                " ; ".join(conditions + keywords),
+                " ; ".join(name for name, _ in intervention_names),
+                " ; ".join(name for name, _ in sponsors))
+    }
+
+
+def _studies_from_json(data: Any) -> Iterator[Dict[str, Any]]:
+    """A study document, a list of them, or an API page ({"studies": [...]})"""
+    if isinstance(data, list):
+        yield from data
+    elif isinstance(data, dict) and "studies" in data:
+        yield from data["studies"]
+    elif isinstance(data, dict):
+        yield data
+
+
+def iter_export(paths: List[str]) -> Iterator[Dict[str, Any]]:
+    """Study documents from bulk export zips, directories, .json and .jsonl files"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            files = sorted(p for p in path.rglob("*") if p.suffix in (".json", ".jsonl", ".ndjson", ".zip"))
+            yield from iter_export([str(p) for p in files])
+        elif path.suffix == ".zip":
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    if name.endswith(".json"):
+                        with archive.open(name) as f:
+                            yield from _studies_from_json(json.load(f))
+        elif path.suffix in (".jsonl", ".ndjson"):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield from _studies_from_json(json.loads(line))
+        else:
+            with open(path, encoding="utf-8") as f:
+                yield from _studies_from_json(json.load(f))
+
+
+class ClinicalTrialsLocalIndex:
+    """SQLite index of the ClinicalTrials.gov registry"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------ ingest
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        ids = [(item["trial"]["id"],) for item in batch]
+        # 갱신된 trial은 기존 행을 지우고 다시 넣음 (side table / FTS 포함)
+        self.conn.executemany("DELETE FROM trials WHERE id = ?", ids)
+        self.conn.executemany("DELETE FROM trials_fts WHERE rowid = ?", ids)
+        for table in CHILD_TABLES:
+            self.conn.executemany(f"DELETE FROM {table} WHERE id = ?", ids)
+
+        self.conn.executemany(INSERT_TRIAL, [item["trial"] for item in batch])
+        self.conn.executemany("INSERT INTO trial_phases VALUES (?, ?)",
+                              [row for item in batch for row in item["phases"]])
+        self.conn.executemany("INSERT INTO trial_conditions VALUES (?, ?)",
+                              [row for item in batch for row in item["conditions"]])
+        self.conn.executemany("INSERT INTO trial_interventions VALUES (?, ?, ?)",
+                              [row for item in batch for row in item["interventions"]])
+        self.conn.executemany("INSERT INTO trial_sponsors VALUES (?, ?, ?)",
+                              [row for item in batch for row in item["sponsors"]])
+        self.conn.executemany(
+            "INSERT INTO trials_fts (rowid, title, conditions, interventions, sponsors) VALUES (?, ?, ?, ?, ?)",
+            [item["fts"] for item in batch]
+        )
+
+    def ingest(self, paths: List[str], batch_size: int = 2000) -> Dict[str, int]:
+        """Load (or refresh) trials from bulk export files; existing trials are replaced"""
+        loaded = skipped = 0
+        batch: List[Dict[str, Any]] = []
+        with self.conn:
+            for study in iter_export(paths):
+                item = flatten_study(study)
+                if item is None:
+                    skipped += 1
+                    continue
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    self._write_batch(batch)
+                    loaded += len(batch)
+                    batch = []
+                    if loaded % 50000 == 0:
+                        logger.info(f"Ingested {loaded} trials")
+            if batch:
+                self._write_batch(batch)
+                loaded += len(batch)
+
+        self.conn.execute("INSERT INTO trials_fts(trials_fts) VALUES ('optimize')")
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+        logger.info(f"Ingested {loaded} trials ({skipped} skipped)")
+        return {"trials": loaded, "skipped": skipped}
+
+    # ------------------------------------------------------------------ query
+
+    def _where(self,
+               condition: Optional[str] = None,
+               intervention: Optional[str] = None,
+               sponsor: Optional[str] = None,
+               status: Optional[str] = None,
+               phase: Optional[str] = None,
+               study_type: Optional[str] = None,
+               start_from: Optional[str] = None,
+               start_to: Optional[str] = None) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        text_filters = [_terms_query("conditions", condition or ""),
+                        _terms_query("interventions", intervention or ""),
+                        _terms_query("sponsors", sponsor or "")]
+        fts_query = " AND ".join(f"({q})" for q in text_filters if q)
+        if fts_query:
+            clauses.append("t.id IN (SELECT rowid FROM trials_fts WHERE trials_fts MATCH ?)")
+            params.append(fts_query)
+
+        statuses = _split_values(status)
+        if statuses:
+            clauses.append(f"t.overall_status IN ({','.join('?' * len(statuses))})")
+            params.extend(statuses)
+
+        phases = _split_values(phase)
+        if phases:
+            clauses.append(f"t.id IN (SELECT id FROM trial_phases WHERE phase IN ({','.join('?' * len(phases))}))")
+            params.extend(phases)
+
+        if study_type:
+            clauses.append("t.study_type = ?")
+            params.append(study_type.strip().upper())
+        if start_from:
+            clauses.append("t.start_date >= ?")
+            params.append(start_from)
+        if start_to:
+            clauses.append("t.start_date <= ?")
+            params.append(start_to)
+
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def search(self, limit: int = 10, **filters) -> Tuple[int, List[Dict[str, Any]]]:
+        """Filtered trial search, most recently updated first; returns (total, top trials)"""
+        where, params = self._where(**filters)
+        try:
+            total = self.conn.execute(f"SELECT count(*) FROM trials t{where}", params).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT t.* FROM trials t{where} ORDER BY t.last_update DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Local trial query failed ({filters}): {e}")
+            return 0, []
+        return total, [self._row_to_study(row) for row in rows]
+
+    def aggregate(self, group_by: str, limit: int = 20, **filters) -> List[Tuple[Any, int]]:
+        """Trial counts per phase / status / sponsor / condition / intervention / start_year ..."""
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"Unknown group_by '{group_by}'. Use one of: {', '.join(GROUP_COLUMNS)}")
+        column, join = GROUP_COLUMNS[group_by]
+        where, params = self._where(**filters)
+        rows = self.conn.execute(
+            f"""SELECT {column} AS value, count(DISTINCT t.id) AS n FROM trials t {join}{where}
+                GROUP BY value ORDER BY n DESC LIMIT ?""",
+            params + [limit]
+        ).fetchall()
+        return [(row["value"], row["n"]) for row in rows]
+
+    def get(self, nct_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT * FROM trials WHERE nct_id = ?", (nct_id.upper(),)).fetchone()
+        return self._row_to_study(row) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "trials": self.conn.execute("SELECT count(*) FROM trials").fetchone()[0],
+            "last_update": self.conn.execute("SELECT max(last_update) FROM trials").fetchone()[0],
+            "db_size_mb": round(os.path.getsize(self.db_path) / (1024 * 1024), 1)
+        }
+
+    @staticmethod
+    def _row_to_study(row: sqlite3.Row) -> Dict[str, Any]:
+        """Rebuild the summary-projected API v2 document so the MCP formatters can reuse it"""
+        return {
+            "protocolSection": {
+                "identificationModule": {"nctId": row["nct_id"], "briefTitle": row["title"]},
+                "statusModule": {
+                    "overallStatus": row["overall_status"],
+                    "startDateStruct": {"date": row["start_date"]},
+                    "completionDateStruct": {"date": row["completion_date"]}
+                },
+                "designModule": {
+                    "studyType": row["study_type"],
+                    "phases": [p for p in (row["phases"] or "").split(",") if p],
+                    "enrollmentInfo": {"count": row["enrollment"], "type": row["enrollment_type"]}
+                },
+                "conditionsModule": {"conditions": json.loads(row["conditions"] or "[]")},
+                "sponsorCollaboratorsModule": {
+                    "leadSponsor": {"name": row["lead_sponsor"], "class": row["sponsor_class"]}
+                }
+            },
+            "hasResults": bool(row["has_results"])
+        }
+
+
+_index: Optional[ClinicalTrialsLocalIndex] = None
+
+
+def get_local_index() -> Optional[ClinicalTrialsLocalIndex]:
+    """Index configured through CLINICALTRIALS_LOCAL_DB, or None when no local copy is set up"""
+    global _index
+    db_path = os.getenv("CLINICALTRIALS_LOCAL_DB")
+    if not db_path or not os.path.exists(db_path):
+        return None
+    if _index is None or _index.db_path != db_path:
+        _index = ClinicalTrialsLocalIndex(db_path)
+    return _index
+
+
+def _add_filter_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--condition")
+    parser.add_argument("--intervention")
+    parser.add_argument("--sponsor")
+    parser.add_argument("--status", help="e.g. RECRUITING or RECRUITING,NOT_YET_RECRUITING")
+    parser.add_argument("--phase", help="e.g. PHASE2,PHASE3")
+    parser.add_argument("--study-type")
+    parser.add_argument("--start-from", help="YYYY[-MM[-DD]]")
+    parser.add_argument("--start-to", help="YYYY[-MM[-DD]]")
+    parser.add_argument("--limit", type=int, default=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ClinicalTrials.gov index (SQLite)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Load bulk export zips, directories or JSON files")
+    ingest_parser.add_argument("paths", nargs="+")
+    ingest_parser.add_argument("--db", required=True)
+
+    _add_filter_args(subparsers.add_parser("search", help="Filter trials"))
+    aggregate_parser = subparsers.add_parser("aggregate", help="Count trials per group")
+    aggregate_parser.add_argument("group_by", choices=list(GROUP_COLUMNS))
+    _add_filter_args(aggregate_parser)
+
+    stats_parser = subparsers.add_parser("stats", help="Show index statistics")
+    stats_parser.add_argument("--db", required=True)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    index = ClinicalTrialsLocalIndex(args.db)
+    try:
+        if args.command == "ingest":
+            result = index.ingest(args.paths)
+        elif args.command == "stats":
+            result = index.stats()
+        else:
+            filters = {
+                "condition": args.condition, "intervention": args.intervention, "sponsor": args.sponsor,
+                "status": args.status, "phase": args.phase, "study_type": args.study_type,
+                "start_from": args.start_from, "start_to": args.start_to
+            }
+            start = time.perf_counter()
+            if args.command == "search":
+                total, studies = index.search(args.limit, **filters)
+                result = {
+                    "total": total,
+                    "trials": [{"nct_id": s["protocolSection"]["identificationModule"]["nctId"],
+                                "title": s["protocolSection"]["identificationModule"]["briefTitle"]}
+                               for s in studies]
+                }
+            else:
+                result = {"groups": index.aggregate(args.group_by, args.limit, **filters)}
+            result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Shared utilities for the data-source MCP servers
+"""
+
+from .http_client import close_http_clients, get_http_client, get_pool_stats, pooled_client
+from .structured import structured_content, structured_records, tool_result, wants_structured
+
+__all__ = ["close_http_clients", "get_http_client", "get_pool_stats", "pooled_client",
+           "structured_content", "structured_records", "tool_result", "wants_structured"]
@@ -0,0 +1,35 @@
+"""
+Export files for bulk tools
+
+Bulk tools can write their records to a file instead of returning them, but
+only inside the directory configured by MCP_EXPORT_DIR; without it, exports
+are disabled. A tool argument therefore names a file within that directory and
+can never point anywhere else on the server.
+"""
+
+import os
+from typing import Optional
+
+
+def export_dir() -> Optional[str]:
+    """Configured export directory (MCP_EXPORT_DIR), or None when exports are disabled"""
+    directory = os.getenv("MCP_EXPORT_DIR")
+    return os.path.realpath(directory) if directory else None
+
+
+def resolve_export_path(output_path: str) -> str:
+    """Absolute path for ``output_path`` inside the export directory
+
+    Relative paths are taken relative to the export directory. Raises ValueError
+    when exports are disabled or the path (after resolving symlinks and ``..``)
+    lies outside the directory.
+    """
+    directory = export_dir()
+    if directory is None:
+        raise ValueError("File export is disabled (set MCP_EXPORT_DIR to enable output_path)")
+    path = os.path.realpath(os.path.join(directory, output_path))
+    if os.path.commonpath([directory, path]) != directory or path == directory:
+        raise ValueError(f"output_path must name a file inside the export directory {directory}")
+    if not os.path.isdir(os.path.dirname(path)):
+        raise ValueError(f"Export subdirectory does not exist: {os.path.dirname(path)}")
+    return path
@@ -0,0 +1,277 @@
+"""
+Disk cache with conditional revalidation for the shared HTTP clients
+
+CachingTransport wraps the pooled transport of every data-source client
+(see http_client.py), so Entrez, ClinicalTrials.gov, bioRxiv, OpenTargets and
+DrugBank responses are cached without changes at the call sites.
+
+- Entries are keyed by method + canonical URL (sorted query parameters) + body
+  (JSON bodies with sorted keys) and stored gzip-compressed, one file per entry.
+- Each endpoint has its own TTL (CACHE_RULES). Fresh entries are served without
+  a request; stale entries carrying an ETag / Last-Modified are revalidated with
+  If-None-Match / If-Modified-Since and a 304 renews them.
+- Endpoints without a rule, requests matching CACHE_EXCLUDE, non-2xx responses
+  and ``Cache-Control: no-store`` responses are never cached. A request sent
+  with ``Cache-Control: no-cache`` skips the fresh copy, and
+  ``extensions={"http_cache": False}`` bypasses the cache.
+
+Environment: HTTP_CACHE_DIR (default ~/.cache/gaia/http), HTTP_CACHE_MAX_MB
+(default 512), HTTP_CACHE_DISABLED=1.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# (호스트, 경로 정규식, TTL 초, 캐시할 메서드) — 먼저 일치하는 규칙 적용
+CACHE_RULES: List[Tuple[str, "re.Pattern", float, Tuple[str, ...]]] = [
+    # PubMed: 출판된 논문 메타데이터/본문은 거의 바뀌지 않음, 검색/링크 결과는 자주 바뀜
+    ("eutils.ncbi.nlm.nih.gov", re.compile(r"/(efetch|esummary)\.fcgi$"), 14 * DAY, ("GET",)),
+    ("eutils.ncbi.nlm.nih.gov", re.compile(r"/elink\.fcgi$"), DAY, ("GET",)),
+    ("eutils.ncbi.nlm.nih.gov", re.compile(r"/esearch\.fcgi$"), HOUR, ("GET",)),
+    # ClinicalTrials.gov: 개별 trial은 수 시간, 검색 결과는 1시간
+    ("clinicaltrials.gov", re.compile(r"/api/v2/studies/NCT\d+$", re.IGNORECASE), 6 * HOUR, ("GET",)),
+    ("clinicaltrials.gov", re.compile(r"/api/v2/"), HOUR, ("GET",)),
+    # bioRxiv: DOI 상세/출판 정보는 길게, 날짜 범위 목록은 짧게 (닫힌 날짜 창은 별도 캐시)
+    ("api.biorxiv.org", re.compile(r"/details/(biorxiv|medrxiv)/\d{4}-"), HOUR, ("GET",)),
+    ("api.biorxiv.org", re.compile(r"/details/"), 7 * DAY, ("GET",)),
+    ("api.biorxiv.org", re.compile(r"/pub/"), DAY, ("GET",)),
+    # OpenTargets: 분기별 릴리스, GraphQL 읽기 쿼리는 POST
+    ("api.platform.opentargets.org", re.compile(r"/graphql$"), DAY, ("GET", "POST")),
+    ("api.drugbank.com", re.compile(r"."), 7 * DAY, ("GET",)),
+]
+
+# 규칙과 일치해도 캐시하지 않는 요청 (호스트, 경로, 쿼리 파라미터)
+# esearch usehistory=y(bulk_fetch.search_history)는 서버 측 history(WebEnv/query_key)를 새로 만드는 요청이라
+# 응답을 재사용할 수 없음. 일반 검색(search_pubmed)은 usehistory 없이 보내 1시간 캐시 규칙을 따름
+CACHE_EXCLUDE: List[Tuple[str, "re.Pattern", str]] = [
+    ("eutils.ncbi.nlm.nih.gov", re.compile(r"/esearch\.fcgi$"), "usehistory"),
+]
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gaia", "http")
+PRUNE_EVERY = 200  # 이 횟수만큼 저장할 때마다 용량 초과분 정리
+
+# 저장된 본문은 디코딩된 상태이므로 전송 관련 헤더는 버림
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+def ttl_for(method: str, url: httpx.URL) -> Optional[float]:
+    """TTL of the first matching rule, or None when the endpoint is not cached"""
+    host = url.host.lower()
+    for rule_host, path, param in CACHE_EXCLUDE:
+        if (host == rule_host or host.endswith("." + rule_host)) and path.search(url.path) and param in url.params:
+            return None
+    for rule_host, path, ttl, methods in CACHE_RULES:
+        if method in methods and (host == rule_host or host.endswith("." + rule_host)) and path.search(url.path):
+            return ttl
+    return None
+
+
+def cache_key(method: str, url: httpx.URL, body: bytes = b"") -> str:
+    """sha256 of method, canonical URL and canonical body"""
+    query = urlencode(sorted(parse_qsl(url.query.decode("ascii", "replace"), keep_blank_values=True)))
+    port = f":{url.port}" if url.port else ""
+    canonical_url = f"{url.scheme}://{url.host.lower()}{port}{url.path}?{query}"
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            pass
+    digest = hashlib.sha256(f"{method} {canonical_url}\n".encode("utf-8"))
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class HTTPDiskCache:
+    """gzip-compressed response files under ``cache_dir/<key[:2]>/<key>.gz``"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or os.getenv("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.max_bytes = max_bytes or int(float(os.getenv("HTTP_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "bypassed": 0}
+        self._stores_since_prune = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.gz"
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """(metadata, body) of a cached entry"""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                return meta, f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable HTTP cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def store(self, key: str, meta: Dict[str, Any], body: bytes):
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(json.dumps(meta).encode("utf-8") + b"\n")
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry {path.name}: {e}")
+            return
+        self.stats["stored"] += 1
+        self._stores_since_prune += 1
+        if self._stores_since_prune >= PRUNE_EVERY:
+            self._stores_since_prune = 0
+            self.prune()
+
+    def prune(self):
+        """Delete the least recently stored entries while the cache exceeds max_bytes"""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        logger.info(f"Pruned HTTP cache to {total / (1024 * 1024):.1f} MB")
+
+    def clear(self):
+        for path in self.cache_dir.glob("*/*.gz"):
+            path.unlink(missing_ok=True)
+
+
+def _response(meta: Dict[str, Any], body: bytes, request: httpx.Request, state: str) -> httpx.Response:
+    headers = [(name, value) for name, value in meta["headers"]]
+    headers.append(("X-GAIA-Cache", state))
+    return httpx.Response(meta["status"], headers=headers, content=body, request=request)
+
+
+def _no_store(headers: httpx.Headers) -> bool:
+    return "no-store" in headers.get("cache-control", "").lower()
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Serves fresh entries from the disk cache and revalidates stale ones"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: "HTTPDiskCache"):
+        self.transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        ttl = ttl_for(request.method, request.url)
+        if ttl is None:
+            return await self.transport.handle_async_request(request)
+        if request.extensions.get("http_cache") is False or _cache_disabled():
+            self.cache.stats["bypassed"] += 1
+            return await self.transport.handle_async_request(request)
+
+        body = await request.aread() if request.method != "GET" else b""
+        key = cache_key(request.method, request.url, body)
+        entry = await asyncio.to_thread(self.cache.load, key)
+        force_revalidate = "no-cache" in request.headers.get("cache-control", "").lower()
+
+        if entry is not None:
+            meta, cached_body = entry
+            if not force_revalidate and time.time() - meta["stored_at"] < ttl:
+                self.cache.stats["hits"] += 1
+                return _response(meta, cached_body, request, "hit")
+            # 만료된 항목: 검증자(ETag / Last-Modified)가 있으면 조건부 요청
+            if meta.get("etag"):
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request.headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = await self.transport.handle_async_request(request)
+
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            meta, cached_body = entry
+            meta = {**meta, "stored_at": time.time(),
+                    "etag": response.headers.get("etag", meta.get("etag")),
+                    "last_modified": response.headers.get("last-modified", meta.get("last_modified"))}
+            await asyncio.to_thread(self.cache.store, key, meta, cached_body)
+            self.cache.stats["revalidated"] += 1
+            return _response(meta, cached_body, request, "revalidated")
+
+        self.cache.stats["misses"] += 1
+        if not 200 <= response.status_code < 300 or _no_store(response.headers):
+            return response
+
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        meta = {
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": [(name, value) for name, value in response.headers.multi_items()
+                        if name.lower() not in _DROP_HEADERS],
+            "stored_at": time.time(),
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified")
+        }
+        await asyncio.to_thread(self.cache.store, key, meta, content)
+        return _response(meta, content, request, "miss")
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def _cache_disabled() -> bool:
+    return os.getenv("HTTP_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+async def fresh_response(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[httpx.Response]:
+    """Cached response that is still fresh, without touching the network.
+
+    Lets rate-limited callers (the Entrez scheduler) skip their request budget on a hit.
+    """
+    request = httpx.Request(method, url, params=params)
+    ttl = ttl_for(method, request.url)
+    if ttl is None or _cache_disabled():
+        return None
+    cache = get_http_cache()
+    entry = await asyncio.to_thread(cache.load, cache_key(method, request.url))
+    if entry is None or time.time() - entry[0]["stored_at"] >= ttl:
+        return None
+    cache.stats["hits"] += 1
+    return _response(entry[0], entry[1], request, "hit")
+
+
+_cache: Optional[HTTPDiskCache] = None
+
+
+def get_http_cache() -> HTTPDiskCache:
+    """Process-wide HTTP disk cache"""
+    global _cache
+    if _cache is None:
+        _cache = HTTPDiskCache()
+    return _cache
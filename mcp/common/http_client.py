@@ -0,0 +1,192 @@
+"""
+Shared pooled HTTP clients for the data-source MCP servers
+"""
+
+import asyncio
+import importlib.util
+import logging
+import socket
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from mcp.common.http_cache import CachingTransport, get_http_cache
+
+# HTTP/2는 h2 패키지(httpx[http2])가 있을 때만 사용
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+try:
+    from httpcore import AsyncNetworkBackend
+    from httpcore._backends.auto import AutoBackend
+except ImportError:  # 구버전 httpcore: DNS 캐시 없이 동작
+    AsyncNetworkBackend = object
+    AutoBackend = None
+
+
+logger = logging.getLogger(__name__)
+
+# 호스트별 연결 한도 / keep-alive 유지 시간
+DEFAULT_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=60.0)
+# 연결은 빠르게 실패, 응답 읽기는 느린 API를 고려해 여유 있게
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0, pool=10.0)
+DNS_CACHE_TTL = 300.0
+
+
+class CachingDNSBackend(AsyncNetworkBackend):
+    """httpcore network backend that caches host -> address lookups for DNS_CACHE_TTL seconds.
+
+    Only the TCP connect target is replaced; TLS still verifies against the original host name.
+    """
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL):
+        self.ttl = ttl
+        self._backend = AutoBackend()
+        self._cache: Dict[Tuple[str, int], Tuple[List[str], float]] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.connects = 0
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        cached = self._cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            self.hits += 1
+            return cached[0]
+
+        self.lookups += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[key] = (addresses, time.monotonic() + self.ttl)
+        return addresses
+
+    async def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                          local_address: Optional[str] = None, socket_options=None):
+        self.connects += 1
+        try:
+            addresses = await self._resolve(host, port)
+        except OSError:
+            addresses = [host]
+
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout,
+                    local_address=local_address, socket_options=socket_options
+                )
+            except Exception as e:
+                last_error = e
+        # 캐시된 주소가 모두 실패하면 다음 연결에서 다시 조회
+        self._cache.pop((host, port), None)
+        raise last_error
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _PooledClient:
+    """A shared AsyncClient plus the counters reported by get_pool_stats()"""
+
+    def __init__(self, origin: str, client: httpx.AsyncClient,
+                 transport: httpx.AsyncHTTPTransport, backend: Optional[CachingDNSBackend],
+                 loop: asyncio.AbstractEventLoop):
+        self.origin = origin
+        self.client = client
+        self.transport = transport
+        self.backend = backend
+        self.loop = loop
+        self.requests = 0
+
+
+_clients: Dict[str, _PooledClient] = {}
+
+
+def _origin(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _build_client(origin: str, loop: asyncio.AbstractEventLoop) -> _PooledClient:
+    transport = httpx.AsyncHTTPTransport(limits=DEFAULT_LIMITS, http2=HTTP2_AVAILABLE, retries=1)
+
+    backend = None
+    pool = getattr(transport, "_pool", None)
+    if AutoBackend is not None and hasattr(pool, "_network_backend"):
+        backend = CachingDNSBackend()
+        pool._network_backend = backend
+
+    pooled: Optional[_PooledClient] = None
+
+    async def _count_request(request: httpx.Request):
+        pooled.requests += 1
+
+    client = httpx.AsyncClient(
+        transport=CachingTransport(transport, get_http_cache()),
+        timeout=DEFAULT_TIMEOUT,
+        follow_redirects=True,
+        event_hooks={"request": [_count_request]}
+    )
+    pooled = _PooledClient(origin, client, transport, backend, loop)
+    logger.debug(f"Created pooled HTTP client for {origin} (http2={HTTP2_AVAILABLE})")
+    return pooled
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """Return the shared keep-alive client for the host of ``base_url``.
+
+    One client is kept per origin and event loop; callers must not close it.
+    """
+    origin = _origin(base_url)
+    loop = asyncio.get_event_loop()
+
+    pooled = _clients.get(origin)
+    if pooled is None or pooled.loop is not loop or pooled.client.is_closed:
+        pooled = _build_client(origin, loop)
+        _clients[origin] = pooled
+    return pooled.client
+
+
+@asynccontextmanager
+async def pooled_client(base_url: str) -> AsyncIterator[httpx.AsyncClient]:
+    """``async with`` drop-in for ``httpx.AsyncClient()`` that reuses the shared client"""
+    yield get_http_client(base_url)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-host request, connection and DNS cache counters"""
+    stats = {}
+    for origin, pooled in _clients.items():
+        connections = getattr(getattr(pooled.transport, "_pool", None), "connections", [])
+        entry = {
+            "requests": pooled.requests,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+            "http2": HTTP2_AVAILABLE,
+            "closed": pooled.client.is_closed
+        }
+        if pooled.backend is not None:
+            entry.update({
+                "new_connections": pooled.backend.connects,
+                "reused_connections": max(0, pooled.requests - pooled.backend.connects),
+                "dns_lookups": pooled.backend.lookups,
+                "dns_cache_hits": pooled.backend.hits
+            })
+        stats[origin] = entry
+    return stats
+
+
+async def close_http_clients():
+    """Close every shared client (call on shutdown)"""
+    for pooled in list(_clients.values()):
+        if not pooled.client.is_closed:
+            try:
+                await pooled.client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client for {pooled.origin}: {e}")
+    _clients.clear()
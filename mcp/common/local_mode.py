@@ -0,0 +1,33 @@
+"""
+Local mirror / remote API selection
+
+Each data-source server can answer from a local mirror (PubMed, ClinicalTrials.gov
+and DrugBank) according to its ``<SOURCE>_MODE`` environment variable:
+
+- remote: always call the remote API;
+- local: answer only from the local mirror;
+- hybrid (default): use the local mirror when it is available, otherwise the API.
+"""
+
+import importlib
+import os
+from typing import Any, Optional, Tuple
+
+
+LOCAL_MODES = ("remote", "local", "hybrid")
+
+
+def get_local_mode(env_var: str, loader: str, default: str = "hybrid") -> Tuple[Optional[Any], str]:
+    """(local mirror or None, mode) for a server
+
+    Args:
+        env_var: Mode environment variable (e.g. PUBMED_MODE)
+        loader: "module:function" returning the mirror or None when it is not configured
+        default: Mode when the variable is unset
+    """
+    mode = os.getenv(env_var, default).lower()
+    if mode == "remote":
+        return None, mode
+    # 지연 import: 로컬 미러 모듈을 CLI(python -m)로 실행할 때 중복 로드를 피함
+    module, _, function = loader.partition(":")
+    return getattr(importlib.import_module(module), function)(), mode
@@ -0,0 +1,61 @@
+"""
+Structured (typed record) tool results
+
+Data-source tools accept ``output_format="json"`` and then return their records
+as a dict instead of a pretty-printed string. The MCP result for such a value
+carries the object as ``structuredContent`` next to the usual text block (the
+JSON serialization, for clients that only read text), so consumers can rank,
+deduplicate and pack context on fields and render only what they need.
+
+DrugBank and OpenTargets tools already return dicts / lists and get
+``structuredContent`` without an option.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+
+OUTPUT_FORMATS = ("text", "json")
+
+# structuredContent 안에서 레코드 목록을 담는 키 (도구별 이름)
+RECORD_KEYS = ("results", "articles", "trials", "preprints", "records", "groups", "citations")
+
+
+def wants_structured(output_format: Optional[str]) -> bool:
+    """True when a tool was asked for typed records (``output_format="json"``)"""
+    return (output_format or "text").lower() == "json"
+
+
+def tool_result(value: Any) -> Dict[str, Any]:
+    """MCP tools/call result for a tool's return value.
+
+    Strings become a single text block; dicts and lists are also exposed as
+    ``structuredContent`` (lists wrapped as ``{"results": [...]}``, since
+    structured content must be a JSON object).
+    """
+    if isinstance(value, str):
+        return {"content": [{"type": "text", "text": value}]}
+    text = json.dumps(value, ensure_ascii=False, indent=2, default=str)
+    if not isinstance(value, (dict, list)):
+        return {"content": [{"type": "text", "text": text}]}
+
+    structured = value if isinstance(value, dict) else {"results": value}
+    result = {"content": [{"type": "text", "text": text}], "structuredContent": structured}
+    if isinstance(value, dict) and "error" in value and len(value) == 1:
+        result["isError"] = True
+    return result
+
+
+def structured_content(result: Any) -> Optional[Dict[str, Any]]:
+    """``structuredContent`` of an MCP result, or None for text-only results"""
+    if isinstance(result, dict) and isinstance(result.get("structuredContent"), dict):
+        return result["structuredContent"]
+    return None
+
+
+def structured_records(structured: Dict[str, Any]) -> List[Any]:
+    """Record list inside structured content (the object itself for single-record results)"""
+    for key in RECORD_KEYS:
+        if isinstance(structured.get(key), list):
+            return structured[key]
+    return [structured]
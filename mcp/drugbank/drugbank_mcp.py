@@ -8,10 +8,15 @@ import asyncio
 import json
 import logging
 import os
+import re
+from functools import partial
 from typing import Any, Dict, List, Optional
 
 import httpx
 
+from mcp.common.http_client import pooled_client
+from mcp.common.local_mode import get_local_mode as resolve_local_mode
+
 # MCP 임포트 (설치된 경우에만)
 try:
     from mcp.server import Server
@@ -39,9 +44,39 @@ except ImportError:
             return decorator
 
 # 로깅 설정
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 배치 도구가 원격 API에 동시에 보내는 최대 요청 수
+BATCH_CONCURRENCY = int(os.getenv("DRUGBANK_BATCH_CONCURRENCY", "4"))
+
+DRUGBANK_ID_PATTERN = re.compile(r"^DB\d{5}$", re.IGNORECASE)
+
+# 로컬 미러 선택 (DRUGBANK_MODE: remote | local | hybrid)
+get_local_mode = partial(resolve_local_mode, "DRUGBANK_MODE", "mcp.drugbank.local_store:get_local_store")
+
+def _short(text: Optional[str], length: int = 200) -> str:
+    text = text or ""
+    return text[:length] + "..." if len(text) > length else text
+
+def _groups(drug: Dict[str, Any]) -> List[str]:
+    return [g for g in (drug.get("groups") or "").split(",") if g]
+
+def _local_details(drug: Dict[str, Any]) -> Dict[str, Any]:
+    """get_drug_details 형식으로 변환한 로컬 저장소 레코드"""
+    details = {key: drug[key] for key in (
+        "drugbank_id", "name", "description", "cas_number", "indication",
+        "pharmacodynamics", "mechanism_of_action", "toxicity", "metabolism",
+        "absorption", "half_life", "protein_binding", "route_of_elimination",
+        "volume_of_distribution", "clearance")}
+    details.update({
+        "drug_type": drug["type"],
+        "groups": _groups(drug),
+        "synonyms": drug["synonyms"],
+        "categories": drug["categories"],
+        "targets": drug["targets"]
+    })
+    return details
+
 class DrugBankMCPServer:
     """DrugBank API MCP Server for drug development research"""
     
@@ -71,12 +106,25 @@ class DrugBankMCPServer:
             Returns:
                 검색된 약물 정보 리스트
             """
+            store, mode = get_local_mode()
+            if store is not None:
+                drugs = store.search(query, limit)
+                if drugs or mode == "local":
+                    return [{
+                        "drugbank_id": drug["drugbank_id"],
+                        "name": drug["name"],
+                        "description": _short(drug["description"]),
+                        "cas_number": drug["cas_number"],
+                        "drug_type": drug["type"],
+                        "groups": _groups(drug)
+                    } for drug in drugs]
+            
             try:
                 headers = {}
                 if self.api_key:
                     headers["Authorization"] = f"Bearer {self.api_key}"
                 
-                async with httpx.AsyncClient() as client:
+                async with pooled_client(self.base_url) as client:
                     response = await client.get(
                         f"{self.base_url}/drugs.json",
                         headers=headers,
@@ -118,12 +166,20 @@ class DrugBankMCPServer:
             Returns:
                 약물의 상세 정보
             """
+            store, mode = get_local_mode()
+            if store is not None:
+                drug = store.get(drugbank_id)
+                if drug is not None:
+                    return _local_details(drug)
+                if mode == "local":
+                    return {"error": f"약물 {drugbank_id}를 로컬 DrugBank에서 찾을 수 없습니다."}
+            
             try:
                 headers = {}
                 if self.api_key:
                     headers["Authorization"] = f"Bearer {self.api_key}"
                 
-                async with httpx.AsyncClient() as client:
+                async with pooled_client(self.base_url) as client:
                     response = await client.get(
                         f"{self.base_url}/drugs/{drugbank_id}.json",
                         headers=headers
@@ -160,6 +216,44 @@ class DrugBankMCPServer:
                 logger.error(f"예상치 못한 오류: {e}")
                 return {"error": f"예상치 못한 오류: {str(e)}"}
         
+        @self.server.call_tool()
+        async def get_drugs_details(drugbank_ids: List[str]) -> Dict[str, Any]:
+            """
+            여러 약물의 상세 정보를 한 번에 조회 (배치 모드)
+            
+            Args:
+                drugbank_ids: DrugBank ID 리스트 (예: ["DB00001", "DB00945"])
+            
+            Returns:
+                DrugBank ID별 상세 정보 (찾지 못한 ID는 error 항목)
+            """
+            ids = list(dict.fromkeys(d.strip() for d in drugbank_ids if d and d.strip()))
+            results: Dict[str, Any] = {}
+            
+            store, mode = get_local_mode()
+            if store is not None:
+                # 로컬 저장소: 테이블당 한 번의 IN 쿼리
+                found = store.get_many(ids)
+                for drugbank_id, drug in found.items():
+                    results[drugbank_id] = _local_details(drug)
+                if mode == "local":
+                    for drugbank_id in ids:
+                        results.setdefault(drugbank_id, {
+                            "error": f"약물 {drugbank_id}를 로컬 DrugBank에서 찾을 수 없습니다."})
+                    return results
+            
+            # DrugBank API에는 다중 ID 조회가 없으므로 남은 ID는 동시성을 제한해 개별 조회
+            missing = [d for d in ids if d not in results]
+            semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+            
+            async def fetch(drugbank_id: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await get_drug_details(drugbank_id)
+            
+            for drugbank_id, details in zip(missing, await asyncio.gather(*(fetch(d) for d in missing))):
+                results[drugbank_id] = details
+            return {drugbank_id: results[drugbank_id] for drugbank_id in ids}
+        
         @self.server.call_tool()
         async def find_drugs_by_indication(indication: str, limit: int = 10) -> List[Dict[str, Any]]:
             """
@@ -172,12 +266,25 @@ class DrugBankMCPServer:
             Returns:
                 해당 적응증의 약물 리스트
             """
+            store, mode = get_local_mode()
+            if store is not None:
+                drugs = store.find_by_indication(indication, limit)
+                if drugs or mode == "local":
+                    return [{
+                        "drugbank_id": drug["drugbank_id"],
+                        "name": drug["name"],
+                        "indication": drug["indication"],
+                        "mechanism_of_action": drug["mechanism_of_action"],
+                        "drug_type": drug["type"],
+                        "groups": _groups(drug)
+                    } for drug in drugs]
+            
             try:
                 headers = {}
                 if self.api_key:
                     headers["Authorization"] = f"Bearer {self.api_key}"
                 
-                async with httpx.AsyncClient() as client:
+                async with pooled_client(self.base_url) as client:
                     response = await client.get(
                         f"{self.base_url}/drugs.json",
                         headers=headers,
@@ -220,12 +327,28 @@ class DrugBankMCPServer:
             Returns:
                 약물 상호작용 정보 리스트
             """
+            store, mode = get_local_mode()
+            if store is not None:
+                rows = store.interactions(drugbank_id, limit)
+                if rows is not None:
+                    return [{
+                        "interacting_drug": {
+                            "drugbank_id": row["other_drugbank_id"],
+                            "name": row["other_name"]
+                        },
+                        "description": row["description"],
+                        "severity": None,  # XML 릴리스에는 심각도 정보가 없음
+                        "mechanism": None
+                    } for row in rows]
+                if mode == "local":
+                    return [{"error": f"약물 {drugbank_id}를 로컬 DrugBank에서 찾을 수 없습니다."}]
+            
             try:
                 headers = {}
                 if self.api_key:
                     headers["Authorization"] = f"Bearer {self.api_key}"
                 
-                async with httpx.AsyncClient() as client:
+                async with pooled_client(self.base_url) as client:
                     response = await client.get(
                         f"{self.base_url}/drugs/{drugbank_id}/interactions.json",
                         headers=headers,
@@ -269,12 +392,25 @@ class DrugBankMCPServer:
             Returns:
                 해당 타겟의 약물 리스트
             """
+            store, mode = get_local_mode()
+            if store is not None:
+                drugs = store.find_by_target(target, limit)
+                if drugs or mode == "local":
+                    return [{
+                        "drugbank_id": drug["drugbank_id"],
+                        "name": drug["name"],
+                        "target_info": drug["targets"],
+                        "mechanism_of_action": drug["mechanism_of_action"],
+                        "drug_type": drug["type"],
+                        "groups": _groups(drug)
+                    } for drug in drugs]
+            
             try:
                 headers = {}
                 if self.api_key:
                     headers["Authorization"] = f"Bearer {self.api_key}"
                 
-                async with httpx.AsyncClient() as client:
+                async with pooled_client(self.base_url) as client:
                     response = await client.get(
                         f"{self.base_url}/drugs.json",
                         headers=headers,
@@ -304,9 +440,131 @@ class DrugBankMCPServer:
             except Exception as e:
                 logger.error(f"예상치 못한 오류: {e}")
                 return [{"error": f"예상치 못한 오류: {str(e)}"}]
+        
+        async def remote_regimen_check(drug_ids: List[str], min_severity: str = "minor") -> Dict[str, Any]:
+            """상호작용 인덱스가 없을 때: 약물명을 ID로 변환한 뒤 약물별 상호작용을 동시에 조회해 regimen 내부 쌍만 남김"""
+            from mcp.drugbank.interaction_index import SEVERITY_LABELS
+            
+            store, _ = get_local_mode()
+            semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+            
+            async def resolve(drug: str):
+                """(DrugBank ID 또는 None, 오류 메시지 또는 None)"""
+                query = drug.strip()
+                if DRUGBANK_ID_PATTERN.match(query):
+                    return query.upper(), None
+                if store is not None:
+                    drugbank_id = store.resolve_drug(query)
+                    if drugbank_id:
+                        return drugbank_id, None
+                async with semaphore:
+                    matches = await search_drugs(query, 5)
+                errors = [match["error"] for match in matches if "error" in match]
+                if errors:
+                    return None, errors[0]
+                matches = [match for match in matches if match.get("drugbank_id")]
+                exact = [match for match in matches if (match.get("name") or "").lower() == query.lower()]
+                best = (exact or matches)[:1]
+                return (best[0]["drugbank_id"] if best else None), None
+            
+            async def fetch(drugbank_id: str) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await get_drug_interactions(drugbank_id, 1000)
+            
+            unresolved, errors = [], []
+            resolved = {}
+            for drug, (drugbank_id, error) in zip(drug_ids, await asyncio.gather(*(resolve(d) for d in drug_ids))):
+                if error:
+                    errors.append({"drug": drug, "error": error})
+                if drugbank_id:
+                    resolved.setdefault(drugbank_id, drug)
+                else:
+                    unresolved.append(drug)
+            
+            members = set(resolved)
+            ranks = {label: code for code, label in SEVERITY_LABELS.items()}
+            regimen, pairs = [], {}
+            lists = await asyncio.gather(*(fetch(d) for d in resolved))
+            for drug_id, interactions in zip(resolved, lists):
+                failed = [item["error"] for item in interactions if "error" in item]
+                if failed:
+                    # 조회 실패한 약물은 "상호작용 없음"이 아니라 미확인으로 보고
+                    errors.append({"drug": resolved[drug_id], "error": failed[0]})
+                    unresolved.append(resolved[drug_id])
+                    continue
+                regimen.append(drug_id)
+                for interaction in interactions:
+                    other = (interaction.get("interacting_drug") or {}).get("drugbank_id")
+                    severity = interaction.get("severity")
+                    if severity in ranks and ranks[severity] < ranks[min_severity]:
+                        continue
+                    if other in members and other != drug_id:
+                        key = tuple(sorted((drug_id, other)))
+                        pairs.setdefault(key, {
+                            "drug_a": key[0], "drug_b": key[1],
+                            "severity": severity,
+                            "description": interaction.get("description")
+                        })
+            
+            if errors and not regimen:
+                return {"error": "; ".join(f"{e['drug']}: {e['error']}" for e in errors),
+                        "regimen": [], "unresolved": unresolved}
+            report = {"regimen": regimen, "unresolved": unresolved, "interactions": list(pairs.values())}
+            if errors:
+                report["errors"] = errors
+            return report
+        
+        @self.server.call_tool()
+        async def check_regimen(drug_ids: List[str], min_severity: str = "minor") -> Dict[str, Any]:
+            """
+            처방 조합 내 모든 약물 쌍의 상호작용 검사 (희소 상호작용 인덱스 1회 조회)
+            
+            Args:
+                drug_ids: DrugBank ID 또는 약물명 리스트 (예: ["DB00619", "warfarin"])
+                min_severity: 보고할 최소 심각도 (minor, moderate, major)
+            
+            Returns:
+                상호작용 쌍 목록, 심각도별 개수, 최고 심각도
+            """
+            from mcp.drugbank.interaction_index import SEVERITY_LABELS, get_interaction_index
+            
+            codes = {label: code for code, label in SEVERITY_LABELS.items()}
+            if min_severity not in codes:
+                return {"error": f"지원하지 않는 min_severity: {min_severity} (minor, moderate, major)"}
+            
+            index = get_interaction_index()
+            if index is None:
+                return await remote_regimen_check(drug_ids, min_severity)
+            return index.check_regimen(drug_ids, codes[min_severity])
+        
+        @self.server.call_tool()
+        async def check_regimens(regimens: List[List[str]], min_severity: str = "moderate",
+                                 include_descriptions: bool = False) -> List[Dict[str, Any]]:
+            """
+            여러 후보 처방 조합의 상호작용을 한 번에 스크리닝 (배치 모드)
+            
+            Args:
+                regimens: 처방 조합 리스트 (각 조합은 DrugBank ID 또는 약물명 리스트)
+                min_severity: 보고할 최소 심각도 (minor, moderate, major)
+                include_descriptions: 상호작용 설명 포함 여부
+            
+            Returns:
+                조합별 상호작용 검사 결과 (입력 순서 유지)
+            """
+            from mcp.drugbank.interaction_index import SEVERITY_LABELS, get_interaction_index
+            
+            codes = {label: code for code, label in SEVERITY_LABELS.items()}
+            if min_severity not in codes:
+                return [{"error": f"지원하지 않는 min_severity: {min_severity} (minor, moderate, major)"}]
+            
+            index = get_interaction_index()
+            if index is None:
+                return [{"error": "배치 스크리닝에는 로컬 DrugBank 저장소가 필요합니다 (DRUGBANK_LOCAL_DB 설정)."}]
+            return index.check_regimens(regimens, codes[min_severity], include_descriptions)
 
 async def main():
     """DrugBank MCP 서버 실행"""
+    logging.basicConfig(level=logging.INFO)
     logger.info("DrugBank MCP Server 시작...")
     
     # 서버 인스턴스 생성
@@ -0,0 +1,234 @@
+"""
+Sparse drug-drug interaction index for regimen checks
+
+Builds a symmetric, severity-coded adjacency structure (CSR: indptr / indices /
+int8 severity) over every DrugBank drug from the local DrugBank store. Checking a
+regimen slices the rows of its drugs and keeps the columns inside the regimen in
+one vectorized pass; screening many regimens builds the dense severity block for
+the union of their drugs once and reads each regimen as a sub-block.
+
+The DrugBank XML release has no severity field, so severity is derived from the
+interaction description (see classify_severity). The index is cached next to the
+store as ``<db>.ddi.npz`` and rebuilt when the store changes.
+"""
+
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from mcp.drugbank.local_store import DrugBankLocalStore, get_local_store
+
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_LABELS = {0: "none", 1: "minor", 2: "moderate", 3: "major"}
+
+# 설명 문구 기반 심각도 규칙 (먼저 일치하는 규칙 적용)
+SEVERITY_RULES: List[Tuple[int, "re.Pattern"]] = [
+    (3, re.compile(r"QTc|torsade|serotonin syndrome|bleeding|hemorrhag|rhabdomyolysis|neuroleptic malignant"
+                   r"|myelosuppress|agranulocytosis|cardiotoxic|nephrotoxic|hepatotoxic|hyperkalemia"
+                   r"|respiratory depression|CNS depression|hypotensi|arrhythmi|contraindicated|lactic acidosis"
+                   r"|neutropenia|methemoglobinemia|seizure", re.IGNORECASE)),
+    (1, re.compile(r"absorption .* (decreased|reduced)|decrease in the absorption|bioavailability .* decreased"
+                   r"|excretion .* (increased|decreased)|protein binding", re.IGNORECASE)),
+    (2, re.compile(r".")),
+]
+
+
+def classify_severity(description: Optional[str]) -> int:
+    """Severity code (1 minor, 2 moderate, 3 major) for a DrugBank interaction description"""
+    text = description or ""
+    for severity, pattern in SEVERITY_RULES:
+        if pattern.search(text):
+            return severity
+    return 2
+
+
+class InteractionIndex:
+    """Symmetric CSR adjacency of drug-drug interactions with int8 severity codes"""
+
+    def __init__(self, drug_ids: List[str], indptr, indices, severity, store: Optional[DrugBankLocalStore] = None):
+        self.drug_ids = drug_ids
+        self.index = {drug_id: i for i, drug_id in enumerate(drug_ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.severity = severity
+        self.store = store
+
+    # ------------------------------------------------------------------ build
+
+    @classmethod
+    def build(cls, store: DrugBankLocalStore) -> "InteractionIndex":
+        """Build the adjacency from the store's interactions table"""
+        drug_ids = [row[0] for row in store.conn.execute("SELECT drugbank_id FROM drugs ORDER BY id")]
+        index = {drug_id: i for i, drug_id in enumerate(drug_ids)}
+
+        rows, cols, codes = [], [], []
+        for drug_id, other_id, description in store.conn.execute(
+                "SELECT d.drugbank_id, i.other_drugbank_id, i.description FROM interactions i "
+                "JOIN drugs d ON d.id = i.drug_id"):
+            other = index.get(other_id)
+            if other is None:
+                continue
+            rows.append(index[drug_id])
+            cols.append(other)
+            codes.append(classify_severity(description))
+
+        n = len(drug_ids)
+        r = np.array(rows + cols, dtype=np.int32)
+        c = np.array(cols + rows, dtype=np.int32)
+        s = np.array(codes + codes, dtype=np.int8)
+
+        # 양방향 중복 쌍은 더 높은 심각도만 유지
+        pair = r.astype(np.int64) * max(n, 1) + c
+        order = np.lexsort((-s, pair))
+        if len(order):
+            keep = order[np.concatenate(([True], pair[order][1:] != pair[order][:-1]))]
+            r, c, s = r[keep], c[keep], s[keep]
+
+        order = np.lexsort((c, r))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(r, minlength=n), out=indptr[1:])
+        return cls(drug_ids, indptr, c[order], s[order], store)
+
+    def save(self, path: str):
+        np.savez(path, drug_ids=np.array(self.drug_ids), indptr=self.indptr,
+                 indices=self.indices, severity=self.severity)
+
+    @classmethod
+    def load(cls, path: str, store: Optional[DrugBankLocalStore] = None) -> "InteractionIndex":
+        with np.load(path) as data:
+            return cls([str(d) for d in data["drug_ids"]], data["indptr"], data["indices"],
+                       data["severity"], store)
+
+    # ------------------------------------------------------------------ query
+
+    def _severity_block(self, members) -> "np.ndarray":
+        """Dense severity matrix among ``members`` (row indices into the adjacency)"""
+        k = len(members)
+        block = np.zeros((k, k), dtype=np.int8)
+        if k == 0:
+            return block
+        starts, ends = self.indptr[members], self.indptr[members + 1]
+        lengths = ends - starts
+        # 모든 멤버 행을 한 번에 모아 멤버 열만 남김
+        positions = np.repeat(starts - np.cumsum(np.concatenate(([0], lengths[:-1]))), lengths) + np.arange(lengths.sum())
+        owners = np.repeat(np.arange(k), lengths)
+        columns = self.indices[positions]
+        sorter = np.argsort(members)
+        slot = np.searchsorted(members, columns, sorter=sorter)
+        slot = np.clip(slot, 0, k - 1)
+        hit = members[sorter[slot]] == columns
+        block[owners[hit], sorter[slot[hit]]] = self.severity[positions[hit]]
+        return block
+
+    def resolve(self, drugs: Sequence[str]) -> Tuple[List[str], List[str]]:
+        """Map DrugBank IDs or names to indexed DrugBank IDs; returns (resolved, unresolved)"""
+        resolved, unresolved = [], []
+        for drug in drugs:
+            drug_id = drug.strip().upper()
+            if drug_id not in self.index and self.store is not None:
+                drug_id = self.store.resolve_drug(drug) or drug_id
+            if drug_id in self.index:
+                if drug_id not in resolved:
+                    resolved.append(drug_id)
+            else:
+                unresolved.append(drug)
+        return resolved, unresolved
+
+    def check_regimens(self, regimens: Sequence[Sequence[str]],
+                       min_severity: int = 1, with_descriptions: bool = True) -> List[Dict[str, Any]]:
+        """Pairwise interactions for every regimen, sharing one severity block for all of them"""
+        resolved = [self.resolve(regimen) for regimen in regimens]
+        union = sorted({drug_id for drug_ids, _ in resolved for drug_id in drug_ids})
+        members = np.array([self.index[drug_id] for drug_id in union], dtype=np.int64)
+        block = self._severity_block(members)
+        position = {drug_id: i for i, drug_id in enumerate(union)}
+
+        results = []
+        for drug_ids, unresolved in resolved:
+            slots = np.array([position[d] for d in drug_ids], dtype=np.int64)
+            sub = block[np.ix_(slots, slots)]
+            a, b = np.nonzero(np.triu(sub, 1) >= min_severity)
+            pairs = [(drug_ids[i], drug_ids[j], int(sub[i, j])) for i, j in zip(a, b)]
+            pairs.sort(key=lambda pair: -pair[2])
+            results.append(self._report(drug_ids, unresolved, pairs, with_descriptions))
+        return results
+
+    def check_regimen(self, drugs: Sequence[str], min_severity: int = 1) -> Dict[str, Any]:
+        return self.check_regimens([drugs], min_severity)[0]
+
+    def max_severity(self, drugs: Sequence[str]) -> int:
+        """Worst interaction severity within a set of DrugBank IDs (0 if none)"""
+        members = np.array(sorted(self.index[d] for d in drugs if d in self.index), dtype=np.int64)
+        block = self._severity_block(members)
+        return int(block.max()) if block.size else 0
+
+    def _report(self, drug_ids: List[str], unresolved: List[str],
+                pairs: List[Tuple[str, str, int]], with_descriptions: bool) -> Dict[str, Any]:
+        descriptions = self._descriptions(pairs) if with_descriptions else {}
+        counts = {label: 0 for code, label in SEVERITY_LABELS.items() if code}
+        for _, _, severity in pairs:
+            counts[SEVERITY_LABELS[severity]] += 1
+        return {
+            "regimen": drug_ids,
+            "unresolved": unresolved,
+            "max_severity": SEVERITY_LABELS[max((p[2] for p in pairs), default=0)],
+            "counts": counts,
+            "interactions": [{
+                "drug_a": a, "drug_b": b,
+                "severity": SEVERITY_LABELS[severity],
+                "description": descriptions.get((a, b))
+            } for a, b, severity in pairs]
+        }
+
+    def _descriptions(self, pairs: List[Tuple[str, str, int]]) -> Dict[Tuple[str, str], str]:
+        if self.store is None or not pairs:
+            return {}
+        descriptions = {}
+        for a, b, _ in pairs:
+            row = self.store.conn.execute(
+                """SELECT i.description FROM interactions i JOIN drugs d ON d.id = i.drug_id
+                   WHERE (d.drugbank_id = ? AND i.other_drugbank_id = ?)
+                      OR (d.drugbank_id = ? AND i.other_drugbank_id = ?) LIMIT 1""",
+                (a, b, b, a)
+            ).fetchone()
+            if row:
+                descriptions[(a, b)] = row[0]
+        return descriptions
+
+
+_index: Optional[InteractionIndex] = None
+_index_key: Optional[Tuple[str, float]] = None
+
+
+def get_interaction_index() -> Optional[InteractionIndex]:
+    """Index over the DRUGBANK_LOCAL_DB store (cached as <db>.ddi.npz), or None when unavailable"""
+    global _index, _index_key
+    store = get_local_store()
+    if store is None or not NUMPY_AVAILABLE:
+        return None
+
+    key = (store.db_path, os.path.getmtime(store.db_path))
+    if _index is not None and _index_key == key:
+        return _index
+
+    cache_path = f"{store.db_path}.ddi.npz"
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= key[1]:
+        _index = InteractionIndex.load(cache_path, store)
+    else:
+        logger.info("Building drug-drug interaction index from local DrugBank store")
+        _index = InteractionIndex.build(store)
+        try:
+            _index.save(cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache interaction index at {cache_path}: {e}")
+    _index_key = key
+    return _index
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Local DrugBank store built from the DrugBank XML release
+
+Streams the full database XML (full database.xml, plain, .gz or .zip) with
+iterparse, releasing each <drug> after it is written, into a SQLite file with:
+an FTS5 index over names, synonyms, brand names, indications and categories;
+indexed tables for targets/enzymes/carriers/transporters, categories and
+drug-drug interactions. The database is opened with a large mmap window so
+lookups are served from the page cache.
+
+Usage:
+    python -m mcp.drugbank.local_store ingest --db drugbank.db "full database.xml"
+    python -m mcp.drugbank.local_store search --db drugbank.db imatinib
+    python -m mcp.drugbank.local_store stats --db drugbank.db
+
+Set DRUGBANK_LOCAL_DB to the database path to let the DrugBank MCP tools answer from it.
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+logger = logging.getLogger(__name__)
+
+MMAP_SIZE = 1 << 30  # 1GB: 전체 DB를 mmap으로 접근
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drugs (
+    id INTEGER PRIMARY KEY,
+    drugbank_id TEXT UNIQUE NOT NULL,
+    name TEXT,
+    type TEXT,
+    description TEXT,
+    cas_number TEXT,
+    groups TEXT,
+    indication TEXT,
+    pharmacodynamics TEXT,
+    mechanism_of_action TEXT,
+    toxicity TEXT,
+    metabolism TEXT,
+    absorption TEXT,
+    half_life TEXT,
+    protein_binding TEXT,
+    route_of_elimination TEXT,
+    volume_of_distribution TEXT,
+    clearance TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_drugs_name ON drugs(name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS drug_aliases (
+    alias TEXT PRIMARY KEY,
+    drug_id INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS synonyms (
+    drug_id INTEGER NOT NULL,
+    synonym TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_synonyms_synonym ON synonyms(synonym COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_synonyms_drug ON synonyms(drug_id);
+
+CREATE TABLE IF NOT EXISTS targets (
+    drug_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    target_id TEXT,
+    name TEXT,
+    gene_name TEXT,
+    uniprot_id TEXT,
+    organism TEXT,
+    actions TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_targets_gene ON targets(gene_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_targets_name ON targets(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_targets_uniprot ON targets(uniprot_id);
+CREATE INDEX IF NOT EXISTS idx_targets_drug ON targets(drug_id);
+
+CREATE TABLE IF NOT EXISTS categories (
+    drug_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    mesh_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_categories_category ON categories(category COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_categories_drug ON categories(drug_id);
+
+CREATE TABLE IF NOT EXISTS interactions (
+    drug_id INTEGER NOT NULL,
+    other_drugbank_id TEXT NOT NULL,
+    other_name TEXT,
+    description TEXT,
+    PRIMARY KEY (drug_id, other_drugbank_id)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS drugs_fts USING fts5(
+    name, synonyms, brands, indication, categories
+);
+"""
+
+DRUG_COLUMNS = ("id", "drugbank_id", "name", "type", "description", "cas_number", "groups",
+                "indication", "pharmacodynamics", "mechanism_of_action", "toxicity", "metabolism",
+                "absorption", "half_life", "protein_binding", "route_of_elimination",
+                "volume_of_distribution", "clearance")
+
+# <drug> 자식 요소 -> drugs 컬럼
+TEXT_FIELDS = {
+    "name": "name", "description": "description", "cas-number": "cas_number",
+    "indication": "indication", "pharmacodynamics": "pharmacodynamics",
+    "mechanism-of-action": "mechanism_of_action", "toxicity": "toxicity",
+    "metabolism": "metabolism", "absorption": "absorption", "half-life": "half_life",
+    "protein-binding": "protein_binding", "route-of-elimination": "route_of_elimination",
+    "volume-of-distribution": "volume_of_distribution", "clearance": "clearance",
+}
+
+TARGET_KINDS = {"targets": "target", "enzymes": "enzyme", "carriers": "carrier", "transporters": "transporter"}
+
+CHILD_TABLES = ("synonyms", "targets", "categories", "interactions")
+
+_WORD = re.compile(r"[\w\-']+", re.UNICODE)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _children(element: ET.Element, name: str) -> List[ET.Element]:
+    return [child for child in element if _local(child.tag) == name]
+
+
+def _child(element: Optional[ET.Element], name: str) -> Optional[ET.Element]:
+    if element is None:
+        return None
+    for child in element:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _text(element: Optional[ET.Element]) -> Optional[str]:
+    if element is None or element.text is None:
+        return None
+    return element.text.strip() or None
+
+
+def _items(element: ET.Element, container: str, item: str) -> List[ET.Element]:
+    """<container><item/>...</container> entries (empty when the container is missing)"""
+    parent = _child(element, container)
+    return _children(parent, item) if parent is not None else []
+
+
+def _list_texts(element: ET.Element, container: str, item: str, sub: Optional[str] = None) -> List[str]:
+    values = []
+    for entry in _items(element, container, item):
+        value = _text(_child(entry, sub)) if sub else _text(entry)
+        if value:
+            values.append(value)
+    return values
+
+
+def parse_drug(element: ET.Element) -> Optional[Dict[str, Any]]:
+    """Store rows for one top-level <drug> element"""
+    ids = _children(element, "drugbank-id")
+    primary = next((_text(i) for i in ids if i.get("primary") == "true"), None) or (ids and _text(ids[0]))
+    if not primary or not primary[2:].isdigit():
+        return None
+    row_id = int(primary[2:])
+
+    drug = {column: None for column in DRUG_COLUMNS}
+    drug.update({"id": row_id, "drugbank_id": primary, "type": element.get("type")})
+    for tag, column in TEXT_FIELDS.items():
+        drug[column] = _text(_child(element, tag))
+    groups = _list_texts(element, "groups", "group")
+    drug["groups"] = ",".join(groups)
+
+    synonyms = _list_texts(element, "synonyms", "synonym")
+    brands = list(dict.fromkeys(_list_texts(element, "products", "product", "name") +
+                                _list_texts(element, "international-brands", "international-brand", "name")))
+
+    categories = []
+    for category in _items(element, "categories", "category"):
+        name = _text(_child(category, "category"))
+        if name:
+            categories.append((row_id, name, _text(_child(category, "mesh-id"))))
+
+    targets = []
+    for container, kind in TARGET_KINDS.items():
+        for target in _items(element, container, kind):
+            polypeptide = _child(target, "polypeptide")
+            targets.append((
+                row_id, kind, _text(_child(target, "id")), _text(_child(target, "name")),
+                _text(_child(polypeptide, "gene-name")),
+                polypeptide.get("id") if polypeptide is not None else None,
+                _text(_child(target, "organism")),
+                ",".join(_list_texts(target, "actions", "action"))
+            ))
+
+    interactions = {}
+    for interaction in _items(element, "drug-interactions", "drug-interaction"):
+        other = _text(_child(interaction, "drugbank-id"))
+        if other:
+            interactions[other] = (row_id, other, _text(_child(interaction, "name")),
+                                   _text(_child(interaction, "description")))
+
+    return {
+        "drug": drug,
+        "aliases": [(_text(i), row_id) for i in ids if _text(i)],
+        "synonyms": [(row_id, s) for s in synonyms],
+        "targets": targets,
+        "categories": categories,
+        "interactions": list(interactions.values()),
+        "fts": (row_id, drug["name"] or "", " ; ".join(synonyms), " ; ".join(brands),
+                drug["indication"] or "", " ; ".join(c[1] for c in categories))
+    }
+
+
+def _open_xml(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zip":
+        archive = zipfile.ZipFile(path)
+        name = next(n for n in archive.namelist() if n.endswith(".xml"))
+        return archive.open(name)
+    return open(path, "rb")
+
+
+def iter_drugs(path: Path) -> Iterator[ET.Element]:
+    """Top-level <drug> elements of a DrugBank XML file, released after use"""
+    depth = 0
+    root = None
+    with _open_xml(path) as f:
+        for event, element in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                depth += 1
+                continue
+            depth -= 1
+            # depth 1 = <drugbank> 바로 아래 <drug> (상호작용 등 내부 요소는 건너뜀)
+            if depth == 1 and _local(element.tag) == "drug":
+                yield element
+                root.clear()
+
+
+def _match_query(text: str, column: Optional[str] = None, prefix: bool = True) -> str:
+    """FTS5 query requiring every word of ``text`` (optionally prefix match on the last word)"""
+    words = [w.replace('"', '') for w in _WORD.findall(text) if w.replace('"', '')]
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words]
+    if prefix:
+        terms[-1] += "*"
+    query = " AND ".join(terms)
+    return f"{column}: ({query})" if column else query
+
+
+class DrugBankLocalStore:
+    """SQLite store of the DrugBank XML release"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------ ingest
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        ids = [(item["drug"]["id"],) for item in batch]
+        self.conn.executemany("DELETE FROM drugs WHERE id = ?", ids)
+        self.conn.executemany("DELETE FROM drugs_fts WHERE rowid = ?", ids)
+        for table in CHILD_TABLES:
+            self.conn.executemany(f"DELETE FROM {table} WHERE drug_id = ?", ids)
+
+        placeholders = ", ".join(f":{column}" for column in DRUG_COLUMNS)
+        self.conn.executemany(f"INSERT INTO drugs ({', '.join(DRUG_COLUMNS)}) VALUES ({placeholders})",
+                              [item["drug"] for item in batch])
+        self.conn.executemany("INSERT OR REPLACE INTO drug_aliases VALUES (?, ?)",
+                              [row for item in batch for row in item["aliases"]])
+        self.conn.executemany("INSERT INTO synonyms VALUES (?, ?)",
+                              [row for item in batch for row in item["synonyms"]])
+        self.conn.executemany("INSERT INTO targets VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                              [row for item in batch for row in item["targets"]])
+        self.conn.executemany("INSERT INTO categories VALUES (?, ?, ?)",
+                              [row for item in batch for row in item["categories"]])
+        self.conn.executemany("INSERT INTO interactions VALUES (?, ?, ?, ?)",
+                              [row for item in batch for row in item["interactions"]])
+        self.conn.executemany(
+            "INSERT INTO drugs_fts (rowid, name, synonyms, brands, indication, categories) VALUES (?, ?, ?, ?, ?, ?)",
+            [item["fts"] for item in batch]
+        )
+
+    def ingest(self, path: str, batch_size: int = 500) -> Dict[str, int]:
+        """Load (or refresh) every drug in a DrugBank XML file"""
+        loaded = skipped = 0
+        batch: List[Dict[str, Any]] = []
+        with self.conn:
+            for element in iter_drugs(Path(path)):
+                item = parse_drug(element)
+                if item is None:
+                    skipped += 1
+                    continue
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    self._write_batch(batch)
+                    loaded += len(batch)
+                    batch = []
+            if batch:
+                self._write_batch(batch)
+                loaded += len(batch)
+
+        self.conn.execute("INSERT INTO drugs_fts(drugs_fts) VALUES ('optimize')")
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+        logger.info(f"Ingested {loaded} drugs ({skipped} skipped)")
+        return {"drugs": loaded, "skipped": skipped}
+
+    # ------------------------------------------------------------------ query
+
+    def _resolve(self, drugbank_id: str) -> Optional[int]:
+        row = self.conn.execute("SELECT drug_id FROM drug_aliases WHERE alias = ?",
+                                (drugbank_id.strip().upper(),)).fetchone()
+        return row[0] if row else None
+
+    def resolve_drug(self, name_or_id: str) -> Optional[str]:
+        """DrugBank ID for a DrugBank/secondary ID, drug name or synonym (case-insensitive)"""
+        value = name_or_id.strip()
+        row = self.conn.execute(
+            """SELECT d.drugbank_id FROM drug_aliases a JOIN drugs d ON d.id = a.drug_id WHERE a.alias = ?
+               UNION ALL SELECT drugbank_id FROM drugs WHERE name = ?2 COLLATE NOCASE
+               UNION ALL SELECT d.drugbank_id FROM synonyms s JOIN drugs d ON d.id = s.drug_id
+                         WHERE s.synonym = ?2 COLLATE NOCASE
+               LIMIT 1""",
+            (value.upper(), value)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _drugs(self, ids: List[int]) -> List[Dict[str, Any]]:
+        if not ids:
+            return []
+        placeholders = ",".join("?" * len(ids))
+        rows = {row["id"]: dict(row) for row in self.conn.execute(
+            f"SELECT * FROM drugs WHERE id IN ({placeholders})", ids)}
+        return [rows[i] for i in ids if i in rows]
+
+    def search(self, query: str, limit: int = 10, column: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Drugs matching ``query`` in names/synonyms/brands (or one FTS column), best match first.
+
+        Whole-word matches rank ahead of prefix matches ("gleevec" before "gleevec xr").
+        """
+        ids: List[int] = []
+        for prefix in (False, True):
+            fts_query = _match_query(query, column, prefix)
+            if not fts_query:
+                return []
+            try:
+                # 이름 완전 일치를 먼저, 나머지는 BM25 (name, synonyms, brands 가중)
+                rows = self.conn.execute(
+                    """SELECT f.rowid FROM drugs_fts f JOIN drugs d ON d.id = f.rowid
+                       WHERE drugs_fts MATCH ?
+                       ORDER BY (d.name = ? COLLATE NOCASE) DESC, bm25(drugs_fts, 10.0, 5.0, 5.0, 1.0, 1.0)
+                       LIMIT ?""",
+                    (fts_query, query.strip(), limit)
+                ).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Local DrugBank query failed for '{query}' ({fts_query}): {e}")
+                return []
+            ids.extend(row[0] for row in rows if row[0] not in ids)
+            if len(ids) >= limit:
+                break
+        return self._drugs(ids[:limit])
+
+    def find_by_indication(self, indication: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Drugs whose indication text or categories mention ``indication``"""
+        fts_query = _match_query(indication, "{indication categories}")
+        if not fts_query:
+            return []
+        ids = [row[0] for row in self.conn.execute(
+            "SELECT rowid FROM drugs_fts WHERE drugs_fts MATCH ? ORDER BY bm25(drugs_fts, 0, 0, 0, 5.0, 1.0) LIMIT ?",
+            (fts_query, limit)
+        )]
+        return self._drugs(ids)
+
+    def get(self, drugbank_id: str) -> Optional[Dict[str, Any]]:
+        drug_id = self._resolve(drugbank_id)
+        if drug_id is None:
+            return None
+        drugs = self._drugs([drug_id])
+        if not drugs:
+            return None
+        drug = drugs[0]
+        drug["synonyms"] = [row[0] for row in self.conn.execute(
+            "SELECT synonym FROM synonyms WHERE drug_id = ?", (drug_id,))]
+        drug["categories"] = [row[0] for row in self.conn.execute(
+            "SELECT category FROM categories WHERE drug_id = ?", (drug_id,))]
+        drug["targets"] = self.targets_of(drug_id)
+        return drug
+
+    def get_many(self, drugbank_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Full records for many DrugBank/secondary IDs, keyed by the requested ID (unknown IDs omitted)"""
+        requested = {drugbank_id: drugbank_id.strip().upper() for drugbank_id in drugbank_ids}
+        aliases = list(set(requested.values()))
+        if not aliases:
+            return {}
+        placeholders = ",".join("?" * len(aliases))
+        resolved = {row[0]: row[1] for row in self.conn.execute(
+            f"SELECT alias, drug_id FROM drug_aliases WHERE alias IN ({placeholders})", aliases)}
+        drug_ids = list(set(resolved.values()))
+        drugs = {drug["id"]: drug for drug in self._drugs(drug_ids)}
+        if not drugs:
+            return {}
+
+        # 동의어/카테고리/타겟을 테이블당 한 번의 쿼리로 채움
+        placeholders = ",".join("?" * len(drug_ids))
+        for drug in drugs.values():
+            drug.update(synonyms=[], categories=[], targets=[])
+        for row in self.conn.execute(
+                f"SELECT drug_id, synonym FROM synonyms WHERE drug_id IN ({placeholders})", drug_ids):
+            drugs[row[0]]["synonyms"].append(row[1])
+        for row in self.conn.execute(
+                f"SELECT drug_id, category FROM categories WHERE drug_id IN ({placeholders})", drug_ids):
+            drugs[row[0]]["categories"].append(row[1])
+        for row in self.conn.execute(
+                f"""SELECT drug_id, kind, target_id, name, gene_name, uniprot_id, organism, actions
+                    FROM targets WHERE drug_id IN ({placeholders})""", drug_ids):
+            info = dict(row)
+            drugs[info.pop("drug_id")]["targets"].append(info)
+
+        return {drugbank_id: drugs[resolved[alias]] for drugbank_id, alias in requested.items()
+                if alias in resolved and resolved[alias] in drugs}
+
+    def targets_of(self, drug_id: int) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.conn.execute(
+            """SELECT kind, target_id, name, gene_name, uniprot_id, organism, actions
+               FROM targets WHERE drug_id = ?""", (drug_id,))]
+
+    def interactions(self, drugbank_id: str, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        drug_id = self._resolve(drugbank_id)
+        if drug_id is None:
+            return None
+        return [dict(row) for row in self.conn.execute(
+            "SELECT other_drugbank_id, other_name, description FROM interactions WHERE drug_id = ? LIMIT ?",
+            (drug_id, limit))]
+
+    def find_by_target(self, target: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Drugs acting on a target given as gene symbol, UniProt ID or protein name"""
+        rows = self.conn.execute(
+            """SELECT drug_id, kind, name, gene_name, uniprot_id, organism, actions FROM targets
+               WHERE gene_name = ?1 COLLATE NOCASE OR uniprot_id = ?1 OR name = ?1 COLLATE NOCASE
+               ORDER BY (kind = 'target') DESC, drug_id""",
+            (target.strip(),)
+        ).fetchall()
+        matched: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            if len(matched) >= limit and row["drug_id"] not in matched:
+                continue
+            info = dict(row)
+            matched.setdefault(info.pop("drug_id"), []).append(info)
+        drugs = self._drugs(list(matched))
+        for drug in drugs:
+            drug["targets"] = matched[drug["id"]]
+        return drugs
+
+    def stats(self) -> Dict[str, Any]:
+        count = lambda table: self.conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+        return {
+            "drugs": count("drugs"),
+            "targets": count("targets"),
+            "interactions": count("interactions"),
+            "db_size_mb": round(os.path.getsize(self.db_path) / (1024 * 1024), 1)
+        }
+
+
+_store: Optional[DrugBankLocalStore] = None
+
+
+def get_local_store() -> Optional[DrugBankLocalStore]:
+    """Store configured through DRUGBANK_LOCAL_DB, or None when no local copy is set up"""
+    global _store
+    db_path = os.getenv("DRUGBANK_LOCAL_DB")
+    if not db_path or not os.path.exists(db_path):
+        return None
+    if _store is None or _store.db_path != db_path:
+        _store = DrugBankLocalStore(db_path)
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local DrugBank store (SQLite)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Load a DrugBank XML release")
+    ingest_parser.add_argument("path")
+    ingest_parser.add_argument("--db", required=True)
+
+    search_parser = subparsers.add_parser("search", help="Search drugs by name or synonym")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--db", required=True)
+    search_parser.add_argument("--limit", type=int, default=10)
+
+    stats_parser = subparsers.add_parser("stats", help="Show store statistics")
+    stats_parser.add_argument("--db", required=True)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    store = DrugBankLocalStore(args.db)
+    try:
+        if args.command == "ingest":
+            result: Any = store.ingest(args.path)
+        elif args.command == "search":
+            start = time.perf_counter()
+            drugs = store.search(args.query, args.limit)
+            result = {
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+                "drugs": [{"drugbank_id": d["drugbank_id"], "name": d["name"]} for d in drugs]
+            }
+        else:
+            result = store.stats()
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""
+Cross-source entity ID crosswalk
+
+Every tool response that passes through MCPManager is scanned for entity records
+(DrugBank drugs and their targets, OpenTargets targets / diseases / drugs, ChEMBL
+molecules) and their identifiers are linked in a persistent store:
+
+- drug:    drugbank (DB00945), chembl (CHEMBL25 — also the OpenTargets drug ID)
+- target:  opentargets (ENSG00000141510), hgnc (approved symbol TP53), uniprot
+- disease: opentargets (EFO_0000305 / MONDO_...), mesh (D001943)
+
+Names, synonyms, trade names and gene aliases are indexed per kind, so a later
+question about "aspirin" or "p53" resolves to all known IDs without a search
+round-trip. Records from different sources are merged when they share an ID or
+the same canonical name (unless that would give one entity two IDs from the
+same source).
+
+Environment: ENTITY_CROSSWALK_DB (default ~/.cache/gaia/entity_crosswalk.db),
+ENTITY_CROSSWALK_DISABLED=1.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".cache", "gaia", "entity_crosswalk.db")
+
+KINDS = ("drug", "target", "disease")
+
+# ID 형식으로 출처/종류 추정 (이름 대신 ID가 들어온 경우)
+ID_PATTERNS: List[Tuple["re.Pattern", str, str]] = [
+    (re.compile(r"^DB\d{5}$", re.IGNORECASE), "drugbank", "drug"),
+    (re.compile(r"^CHEMBL\d+$", re.IGNORECASE), "chembl", "drug"),
+    (re.compile(r"^ENSG\d{11}$", re.IGNORECASE), "opentargets", "target"),
+    (re.compile(r"^([OPQ]\d[A-Z0-9]{3}\d|[A-NR-Z]\d([A-Z][A-Z0-9]{2}\d){1,2})$", re.IGNORECASE), "uniprot", "target"),
+    (re.compile(r"^(EFO|MONDO|HP|Orphanet|DOID|OTAR)_\d+$", re.IGNORECASE), "opentargets", "disease"),
+    (re.compile(r"^(MESH:)?[CD]\d{6,9}$", re.IGNORECASE), "mesh", "disease"),
+]
+
+# 종류 -> 크로스워크에 없을 때 해석에 쓸 검색 툴 (MCPManager.resolve_entity)
+SEARCH_TOOLS: Dict[str, Tuple[str, str]] = {
+    "drug": ("drugbank-mcp", "search_drugs"),
+    "target": ("opentargets-mcp", "search_targets"),
+    "disease": ("opentargets-mcp", "search_diseases"),
+}
+
+MAX_NAMES_PER_RECORD = 25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    entity_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entity_ids (
+    source TEXT NOT NULL,
+    external_id TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    PRIMARY KEY (source, external_id)
+);
+CREATE INDEX IF NOT EXISTS idx_entity_ids_entity ON entity_ids(entity_id);
+CREATE TABLE IF NOT EXISTS entity_names (
+    name_norm TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    is_primary INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (name_norm, kind, entity_id)
+);
+CREATE INDEX IF NOT EXISTS idx_entity_names_entity ON entity_names(entity_id);
+"""
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(str(name).casefold().split())
+
+
+def normalize_id(source: str, external_id: str) -> str:
+    external_id = str(external_id).strip()
+    if source == "mesh" and external_id.upper().startswith("MESH:"):
+        external_id = external_id[5:]
+    # 접두어형 ID만 대문자로 통일 (HGNC 심볼 C9orf72, EFO_0000305 등은 그대로)
+    return external_id.upper() if source in ("drugbank", "chembl", "mesh", "uniprot") else external_id
+
+
+def classify_id(value: str) -> Optional[Tuple[str, str]]:
+    """(source, kind) when ``value`` looks like a known identifier"""
+    value = value.strip()
+    for pattern, source, kind in ID_PATTERNS:
+        if pattern.match(value):
+            return source, kind
+    return None
+
+
+def _labels(values: Any) -> List[str]:
+    """Synonym lists come as strings or {"label": ...} objects depending on the endpoint"""
+    labels = []
+    for value in values or []:
+        if isinstance(value, dict):
+            value = value.get("label") or value.get("name")
+        if isinstance(value, str) and value.strip():
+            labels.append(value.strip())
+    return labels
+
+
+def _mesh_ids(record: Dict[str, Any]) -> List[str]:
+    ids = list(record.get("mesh_ids") or [])
+    for xref in record.get("db_xrefs") or []:
+        if isinstance(xref, str) and xref.upper().startswith("MESH:"):
+            ids.append(xref)
+    return ids
+
+
+def extract_entities(value: Any) -> Iterator[Tuple[str, Dict[str, List[str]], List[str]]]:
+    """Yield (kind, {source: [ids]}, names) for every entity record in a tool result.
+
+    The first name is the record's canonical name; the rest are synonyms.
+    """
+    if isinstance(value, list):
+        for item in value:
+            yield from extract_entities(item)
+        return
+    if not isinstance(value, dict) or "error" in value:
+        return
+
+    record = _record(value)
+    if record is not None:
+        yield record
+    for child in value.values():
+        if isinstance(child, (dict, list)):
+            yield from extract_entities(child)
+
+
+def _record(item: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, List[str]], List[str]]]:
+    ids: Dict[str, List[str]] = {}
+
+    # DrugBank 약물 (search_drugs / get_drug_details / 상호작용 상대 약물)
+    if item.get("drugbank_id"):
+        ids["drugbank"] = [item["drugbank_id"]]
+        names = [item.get("name")] + _labels(item.get("synonyms")) + _labels(item.get("brands"))
+        return "drug", ids, names
+
+    # OpenTargets 약물 (ID = ChEMBL ID) 및 ChEMBL 분자
+    chembl_id = item.get("molecule_chembl_id") or item.get("chembl_id")
+    drug_id = item.get("drug_id")
+    if drug_id and str(drug_id).upper().startswith("CHEMBL"):
+        chembl_id = drug_id
+    if chembl_id:
+        ids["chembl"] = [chembl_id]
+        names = ([item.get("pref_name") or item.get("name") or item.get("drug_name")]
+                 + _labels(item.get("synonyms")) + _labels(item.get("trade_names")))
+        return "drug", ids, names
+
+    # OpenTargets 타겟 (Ensembl ID + HGNC 승인 심볼)
+    target_id = item.get("target_id")
+    if target_id and str(target_id).upper().startswith("ENSG"):
+        ids["opentargets"] = [target_id]
+        symbol = item.get("symbol") or item.get("target_symbol")
+        if symbol:
+            ids["hgnc"] = [symbol]
+        names = ([symbol, item.get("name") or item.get("target_name")]
+                 + _labels(item.get("symbol_synonyms")) + _labels(item.get("synonyms")))
+        return "target", ids, names
+
+    # DrugBank 약물의 타겟 (유전자명 + UniProt)
+    if item.get("gene_name") and item.get("organism") in (None, "", "Humans", "Homo sapiens"):
+        ids["hgnc"] = [item["gene_name"]]
+        if item.get("uniprot_id"):
+            ids["uniprot"] = [item["uniprot_id"]]
+        return "target", ids, [item["gene_name"], item.get("name")]
+
+    # OpenTargets 질병 (EFO/MONDO ID, MeSH 교차참조)
+    if item.get("disease_id"):
+        ids["opentargets"] = [item["disease_id"]]
+        mesh = _mesh_ids(item)
+        if mesh:
+            ids["mesh"] = mesh
+        names = [item.get("name") or item.get("disease_name")] + _labels(item.get("synonyms"))
+        return "disease", ids, names
+
+    return None
+
+
+def _native(result: Any) -> Any:
+    """Native value of a tool result (MCP text content is parsed as JSON when possible)"""
+    if isinstance(result, str):
+        result = {"content": [{"type": "text", "text": result}]}
+    if isinstance(result, dict) and isinstance(result.get("content"), list):
+        if result.get("isError"):
+            return None
+        values = []
+        for item in result["content"]:
+            text = item.get("text", "") if isinstance(item, dict) else ""
+            if text.lstrip()[:1] in ("[", "{"):
+                try:
+                    values.append(json.loads(text))
+                except ValueError:
+                    continue
+        return values
+    return result
+
+
+class EntityCrosswalk:
+    """Persistent name/synonym -> canonical ID map across DrugBank, ChEMBL, OpenTargets, HGNC and MeSH"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.getenv("ENTITY_CROSSWALK_DB", DEFAULT_DB_PATH)
+        self.stats = {"learned": 0, "merged": 0, "hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    # ---- 학습 ----
+
+    def learn(self, server: str, tool: str, result: Any) -> int:
+        """Record every entity found in a tool result; returns the number of records seen"""
+        records = list(extract_entities(_native(result)))
+        if not records:
+            return 0
+        try:
+            with self._lock, self.conn:
+                for kind, ids, names in records:
+                    self._observe(kind, ids, names)
+        except sqlite3.Error as e:
+            logger.warning(f"Entity crosswalk update failed for {server}/{tool}: {e}")
+            return 0
+        self.stats["learned"] += len(records)
+        return len(records)
+
+    def _observe(self, kind: str, ids: Dict[str, List[str]], names: List[Optional[str]]):
+        pairs = [(source, normalize_id(source, external_id))
+                 for source, values in ids.items() for external_id in values if external_id]
+        names = [name.strip() for name in names if isinstance(name, str) and name.strip()][:MAX_NAMES_PER_RECORD]
+        if not pairs:
+            return
+
+        # 1) 공유 ID로 기존 엔티티 찾기
+        found: Set[int] = set()
+        for source, external_id in pairs:
+            row = self.conn.execute(
+                "SELECT entity_id FROM entity_ids WHERE source = ? AND external_id = ?", (source, external_id)
+            ).fetchone()
+            if row:
+                found.add(row[0])
+
+        # 2) 없으면 같은 종류의 대표 이름으로 찾기 (같은 출처의 다른 ID가 있으면 별개 엔티티)
+        if not found and names:
+            rows = self.conn.execute(
+                "SELECT entity_id FROM entity_names WHERE name_norm = ? AND kind = ? AND is_primary = 1",
+                (normalize_name(names[0]), kind)
+            ).fetchall()
+            for (entity_id,) in rows:
+                if not self._conflicts(entity_id, pairs):
+                    found.add(entity_id)
+                    break
+
+        now = time.time()
+        if found:
+            entity_id = min(found)
+            for other in found - {entity_id}:
+                self._merge(other, entity_id)
+            self.conn.execute("UPDATE entities SET updated_at = ? WHERE entity_id = ?", (now, entity_id))
+        else:
+            cursor = self.conn.execute(
+                "INSERT INTO entities (kind, name, updated_at) VALUES (?, ?, ?)",
+                (kind, names[0] if names else pairs[0][1], now)
+            )
+            entity_id = cursor.lastrowid
+
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO entity_ids VALUES (?, ?, ?)",
+            [(source, external_id, entity_id) for source, external_id in pairs]
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO entity_names VALUES (?, ?, ?, ?)",
+            [(normalize_name(name), kind, entity_id, int(i == 0)) for i, name in enumerate(names)]
+            + [(normalize_name(external_id), kind, entity_id, 0) for source, external_id in pairs if source == "hgnc"]
+        )
+        if names:
+            self.conn.execute(
+                "UPDATE entity_names SET is_primary = 1 WHERE name_norm = ? AND kind = ? AND entity_id = ?",
+                (normalize_name(names[0]), kind, entity_id)
+            )
+
+    def _conflicts(self, entity_id: int, pairs: List[Tuple[str, str]]) -> bool:
+        existing = dict(self.conn.execute(
+            "SELECT source, external_id FROM entity_ids WHERE entity_id = ?", (entity_id,)
+        ).fetchall())
+        return any(source in existing and existing[source] != external_id
+                   for source, external_id in pairs if source != "mesh")
+
+    def _merge(self, source_entity: int, target_entity: int):
+        self.conn.execute("UPDATE entity_ids SET entity_id = ? WHERE entity_id = ?", (target_entity, source_entity))
+        self.conn.execute(
+            "INSERT OR IGNORE INTO entity_names SELECT name_norm, kind, ?, is_primary FROM entity_names WHERE entity_id = ?",
+            (target_entity, source_entity)
+        )
+        self.conn.execute("DELETE FROM entity_names WHERE entity_id = ?", (source_entity,))
+        self.conn.execute("DELETE FROM entities WHERE entity_id = ?", (source_entity,))
+        self.stats["merged"] += 1
+
+    # ---- 조회 ----
+
+    def resolve(self, query: str, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Known IDs for a name, synonym, gene alias or identifier.
+
+        Returns ``{"entity_id", "kind", "name", "ids": {source: id or [ids]}, "names": [...]}``
+        or None when the entity has not been seen yet.
+        """
+        if not query or not query.strip():
+            return None
+        with self._lock:
+            entity_id = self._lookup(query.strip(), kind)
+            record = self._describe(entity_id) if entity_id is not None else None
+        self.stats["hits" if record else "misses"] += 1
+        return record
+
+    def _lookup(self, query: str, kind: Optional[str]) -> Optional[int]:
+        classified = classify_id(query)
+        if classified and (kind is None or classified[1] == kind):
+            source, _ = classified
+            row = self.conn.execute(
+                "SELECT entity_id FROM entity_ids WHERE source = ? AND external_id = ?",
+                (source, normalize_id(source, query))
+            ).fetchone()
+            if row:
+                return row[0]
+
+        # 대표 이름 우선, 그다음 ID가 많이 연결된 엔티티
+        sql = """SELECT n.entity_id FROM entity_names n
+                 WHERE n.name_norm = ?{kind_clause}
+                 ORDER BY n.is_primary DESC,
+                          (SELECT COUNT(*) FROM entity_ids i WHERE i.entity_id = n.entity_id) DESC,
+                          n.entity_id
+                 LIMIT 1"""
+        params: List[Any] = [normalize_name(query)]
+        if kind:
+            params.append(kind)
+        row = self.conn.execute(sql.format(kind_clause=" AND n.kind = ?" if kind else ""), params).fetchone()
+        return row[0] if row else None
+
+    def _describe(self, entity_id: int) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT kind, name FROM entities WHERE entity_id = ?", (entity_id,)).fetchone()
+        if row is None:
+            return None
+        ids: Dict[str, Any] = {}
+        for source, external_id in self.conn.execute(
+                "SELECT source, external_id FROM entity_ids WHERE entity_id = ? ORDER BY rowid", (entity_id,)):
+            if source in ids:
+                previous = ids[source]
+                ids[source] = (previous if isinstance(previous, list) else [previous]) + [external_id]
+            else:
+                ids[source] = external_id
+        names = [name for (name,) in self.conn.execute(
+            "SELECT name_norm FROM entity_names WHERE entity_id = ? ORDER BY is_primary DESC, rowid", (entity_id,))]
+        return {"entity_id": entity_id, "kind": row[0], "name": row[1], "ids": ids, "names": names}
+
+    def known_id(self, query: str, source: str, kind: Optional[str] = None) -> Optional[str]:
+        """First known ``source`` ID for a name or identifier, e.g. known_id("aspirin", "drugbank")"""
+        record = self.resolve(query, kind)
+        if record is None:
+            return None
+        value = record["ids"].get(source)
+        return value[0] if isinstance(value, list) else value
+
+    def count(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute("SELECT kind, COUNT(*) FROM entities GROUP BY kind").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_crosswalk: Optional[EntityCrosswalk] = None
+
+
+def get_entity_crosswalk() -> Optional[EntityCrosswalk]:
+    """Process-wide crosswalk, or None when disabled or the store cannot be opened"""
+    global _crosswalk
+    if os.getenv("ENTITY_CROSSWALK_DISABLED", "").lower() in ("1", "true", "yes"):
+        return None
+    if _crosswalk is None:
+        try:
+            _crosswalk = EntityCrosswalk()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Entity crosswalk unavailable: {e}")
+            return None
+    return _crosswalk
@@ -35,9 +35,11 @@ class GAIAMCPServer:
         # Initialize transport
         if self.transport_type == "stdio":
             self.transport = StdioTransport(self.server.handle_request)
+            self.server.set_notification_sender(self.transport.send_message)
             await self.transport.start()
         elif self.transport_type == "websocket":
             self.transport = WebSocketTransport(self.server.handle_request)
+            self.server.set_notification_sender(self.transport.send_message)
             await self.transport.start_server(host, port)
         else:
             raise ValueError(f"Unsupported transport type: {self.transport_type}")
@@ -0,0 +1,152 @@
+"""
+In-process tool host for the Python MCP servers bundled under mcp/
+"""
+
+import importlib
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from ..common.structured import tool_result
+
+
+# 번들된 Python MCP 서버 정의
+# - functions: 모듈 레벨 툴 함수 (FastMCP 스타일)
+# - registry:  서버 클래스 인스턴스의 server._tools 레지스트리
+# - methods:   서버 클래스 인스턴스의 메서드 (async context manager로 HTTP 클라이언트 관리)
+BUNDLED_SERVERS: Dict[str, Dict[str, Any]] = {
+    "pubmed-mcp": {
+        "module": "mcp.pubmed.pubmed_mcp",
+        "kind": "functions",
+        "tools": ["search_pubmed", "get_article_details", "get_articles_details", "find_related_articles",
+                  "search_by_author", "get_citations", "bulk_fetch_articles"]
+    },
+    "clinicaltrials-mcp": {
+        "module": "mcp.clinicaltrials.clinicaltrials_mcp",
+        "kind": "functions",
+        "tools": ["search_clinical_trials", "get_trial_details", "get_trials_details", "search_trials_by_sponsor",
+                  "search_trials_by_condition", "get_trial_results", "stream_clinical_trials",
+                  "aggregate_trials"]
+    },
+    "drugbank-mcp": {
+        "module": "mcp.drugbank.drugbank_mcp",
+        "kind": "registry",
+        "class": "DrugBankMCPServer"
+    },
+    "opentargets-mcp": {
+        "module": "mcp.opentargets.opentargets_mcp",
+        "kind": "registry",
+        "class": "OpenTargetsMCPServer"
+    },
+    "biorxiv-mcp": {
+        "module": "mcp.biorxiv.biorxiv_mcp",
+        "kind": "methods",
+        "class": "BioRxivMCPServer",
+        "tools": ["get_preprint_by_doi", "get_preprints_by_doi", "find_published_version",
+                  "get_recent_preprints", "search_preprints", "search_preprints_text"]
+    }
+}
+
+
+class InProcessToolHost:
+    """Imports bundled MCP server modules and runs their tools on the shared event loop"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.tools: Dict[str, Dict[str, Callable]] = {}
+        self._instances: Dict[str, Any] = {}
+
+    def supports(self, server_name: str) -> bool:
+        """Check whether a server can be hosted in-process"""
+        return server_name in BUNDLED_SERVERS
+
+    def is_loaded(self, server_name: str) -> bool:
+        return server_name in self.tools
+
+    async def load(self, server_name: str) -> List[str]:
+        """Import a bundled server and collect its tool functions"""
+        if server_name in self.tools:
+            return list(self.tools[server_name].keys())
+
+        spec = BUNDLED_SERVERS.get(server_name)
+        if spec is None:
+            raise ValueError(f"Server '{server_name}' cannot be hosted in-process")
+
+        module = importlib.import_module(spec["module"])
+        kind = spec["kind"]
+
+        if kind == "functions":
+            tools = {name: getattr(module, name) for name in spec["tools"]}
+        elif kind == "registry":
+            instance = getattr(module, spec["class"])()
+            registry = getattr(instance.server, "_tools", None)
+            if registry is None:
+                raise RuntimeError(f"{spec['class']} does not expose a tool registry")
+            tools = dict(registry)
+            self._instances[server_name] = instance
+        elif kind == "methods":
+            instance = getattr(module, spec["class"])()
+            await instance.__aenter__()
+            tools = {name: getattr(instance, name) for name in spec["tools"]}
+            self._instances[server_name] = instance
+        else:
+            raise ValueError(f"Unknown server kind: {kind}")
+
+        self.tools[server_name] = tools
+        self.logger.info(f"Loaded in-process MCP server '{server_name}' ({len(tools)} tools)")
+        return list(tools.keys())
+
+    async def call(self, server_name: str, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a hosted tool and return its native Python value"""
+        if server_name not in self.tools:
+            await self.load(server_name)
+
+        tool = self.tools[server_name].get(tool_name)
+        if tool is None:
+            raise ValueError(f"Tool '{tool_name}' not found in in-process server '{server_name}'")
+
+        return await tool(**(arguments or {}))
+
+    async def unload(self, server_name: str):
+        """Release a hosted server and its resources"""
+        self.tools.pop(server_name, None)
+        instance = self._instances.pop(server_name, None)
+        if instance is not None and hasattr(instance, "__aexit__"):
+            try:
+                await instance.__aexit__(None, None, None)
+            except Exception as e:
+                self.logger.warning(f"Error closing in-process server '{server_name}': {e}")
+
+    async def close(self):
+        """Unload every hosted server"""
+        for server_name in list(self.tools.keys()):
+            await self.unload(server_name)
+
+
+class InProcessClient:
+    """MCPManager client adapter for a server running inside the host"""
+
+    def __init__(self, host: InProcessToolHost, server_name: str):
+        self.host = host
+        self.name = f"GAIA-{server_name}"
+        self.server_type = server_name
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
+        native = await self.host.call(self.server_type, tool_name, arguments)
+        return tool_result(native)
+
+    async def call_tool_native(self, tool_name: str, arguments: Dict[str, Any] = None) -> Any:
+        return await self.host.call(self.server_type, tool_name, arguments)
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        tools = self.host.tools.get(self.server_type, {})
+        return [
+            {
+                "name": name,
+                "description": (func.__doc__ or "").strip(),
+                "inputSchema": {"type": "object"}
+            }
+            for name, func in tools.items()
+        ]
+
+    async def disconnect(self):
+        await self.host.unload(self.server_type)
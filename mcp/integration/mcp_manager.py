@@ -4,14 +4,23 @@ MCP Manager for GAIA System Integration
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, AsyncIterator, List, Optional, Union
 import json
 import os
-import subprocess
+import time
 
 from ..client.mcp_client import MCPClient
+from ..common.http_cache import get_http_cache
+from ..common.http_client import close_http_clients, get_pool_stats
+from ..common.structured import tool_result
 from ..server.mcp_server import MCPServer
+from ..server.progress import ProgressReporter, accepts_progress, iterate_events, queue_emitter
+from .entity_crosswalk import SEARCH_TOOLS, EntityCrosswalk, get_entity_crosswalk
 from .gaia_mcp_server import GAIAMCPServer
+from .inprocess_host import InProcessClient, InProcessToolHost
+from .regimen_optimizer import RegimenOptimizer
+from .result_cache import ToolResultCache
+from .replica_pool import ServerReplicaPool
 
 
 class MCPManager:
@@ -22,9 +31,31 @@ class MCPManager:
         self.server: Optional[GAIAMCPServer] = None
         self.server_task: Optional[asyncio.Task] = None
         self.local_server = None
+        self.regimen_optimizer: Optional[RegimenOptimizer] = None
         self.clients: Dict[str, MCPClient] = {}
-        self.external_servers: Dict[str, subprocess.Popen] = {}
+        self.external_servers: Dict[str, ServerReplicaPool] = {}
+        self.inprocess_host = InProcessToolHost()
         self.running = False
+        
+        # 지연 시작 / 유휴 종료 상태
+        self.server_configs: Dict[str, Dict[str, Any]] = {}
+        self.server_last_used: Dict[str, float] = {}
+        self.warm_pool: List[str] = ['drugbank-mcp', 'opentargets-mcp']
+        self.idle_timeout: float = 600.0
+        self._start_locks: Dict[str, asyncio.Lock] = {}
+        self._idle_task: Optional[asyncio.Task] = None
+        
+        # 툴 호출 기한(초): 호출 인자 > toolTimeouts > 서버 timeout > globalSettings.timeout
+        self.default_timeout: Optional[float] = None
+        self.tool_timeouts: Dict[str, float] = {}
+        
+        # 툴 결과 캐시 (메모리 LRU + SQLite), TOOL_CACHE_DISABLED=1이면 사용 안 함
+        self.result_cache: Optional[ToolResultCache] = None
+        if os.getenv("TOOL_CACHE_DISABLED", "").lower() not in ("1", "true", "yes"):
+            self.result_cache = ToolResultCache()
+        
+        # 엔티티 ID 크로스워크: 모든 툴 응답에서 이름/동의어 -> ID 매핑 학습
+        self.entity_crosswalk: Optional[EntityCrosswalk] = get_entity_crosswalk()
         self.mcp_config_path = "/home/gaia-bt/workspace/GAIA_LLMs/mcp.json"
     
     async def start_server(self, 
@@ -34,13 +65,16 @@ class MCPManager:
         """Start GAIA MCP server"""
         try:
             # 간단한 로컬 서버 생성 (전송 없이)
-            from ..server.mcp_server import MCPServer
             from ..server.handlers.gaia_tools import GAIAToolsHandler
             
             # MCP 서버 생성 및 툴 등록
             local_server = MCPServer("GAIA-MCP-Server", "0.1.0")
             tools_handler = GAIAToolsHandler(local_server)
             
+            # 복합처방 조합 탐색 툴 (DrugBank/ClinicalTrials/OpenTargets 툴 결과 사용)
+            self.regimen_optimizer = RegimenOptimizer(self)
+            self.regimen_optimizer.register(local_server)
+            
             # 서버를 인스턴스 변수에 저장
             self.local_server = local_server
             self.running = True
@@ -242,13 +276,98 @@ class MCPManager:
         if client_id in self.clients:
             await self.clients[client_id].disconnect()
             del self.clients[client_id]
+            self.external_servers.pop(client_id, None)
             self.logger.info(f"MCP client '{client_id}' removed")
     
     async def call_tool(self, 
                        client_id: str, 
                        tool_name: str, 
-                       arguments: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Call tool using specific client"""
+                       arguments: Dict[str, Any] = None,
+                       timeout: Optional[float] = None,
+                       use_cache: bool = True) -> Dict[str, Any]:
+        """Call tool using specific client
+        
+        The call is cancelled once its deadline passes (``timeout`` seconds, or the
+        configured per-tool / per-server / global timeout; ``timeout=0`` disables it).
+        Cancelling the call — by deadline or by cancelling the awaiting task — is
+        propagated to the server, which aborts the running handler.
+        
+        Results of pure tools are served from the tool-result cache (see
+        result_cache.py); ``use_cache=False`` forces a fresh call.
+        """
+        if use_cache and self.result_cache is not None:
+            return await self.result_cache.get_or_call(
+                client_id, tool_name, arguments,
+                lambda: self._call_tool_with_deadline(client_id, tool_name, arguments, timeout)
+            )
+        return await self._call_tool_with_deadline(client_id, tool_name, arguments, timeout)
+    
+    async def _call_tool_with_deadline(self,
+                                       client_id: str,
+                                       tool_name: str,
+                                       arguments: Dict[str, Any] = None,
+                                       timeout: Optional[float] = None) -> Dict[str, Any]:
+        deadline = self._resolve_timeout(client_id, tool_name, timeout)
+        if not deadline:
+            result = await self._call_tool(client_id, tool_name, arguments)
+        else:
+            try:
+                result = await asyncio.wait_for(self._call_tool(client_id, tool_name, arguments), deadline)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Tool '{tool_name}' on '{client_id}' exceeded its {deadline:g}s deadline")
+                raise asyncio.TimeoutError(f"Tool '{tool_name}' timed out after {deadline:g}s")
+        
+        await self._learn_entities(client_id, tool_name, result)
+        return result
+    
+    async def _learn_entities(self, client_id: str, tool_name: str, result: Any):
+        """Feed a fresh tool result into the entity crosswalk"""
+        if self.entity_crosswalk is None:
+            return
+        try:
+            await asyncio.to_thread(self.entity_crosswalk.learn, client_id, tool_name, result)
+        except Exception as e:
+            self.logger.debug(f"Entity crosswalk skipped {client_id}/{tool_name}: {e}")
+    
+    async def resolve_entity(self,
+                             name: str,
+                             kind: Optional[str] = None,
+                             allow_search: bool = True) -> Optional[Dict[str, Any]]:
+        """Known IDs for a drug, target or disease name (see entity_crosswalk.py)
+        
+        The crosswalk is consulted first; only when the entity is unknown and
+        ``allow_search`` is set is the matching search tool called (its result is
+        learned like any other response) and the lookup repeated.
+        """
+        if self.entity_crosswalk is None:
+            return None
+        record = await asyncio.to_thread(self.entity_crosswalk.resolve, name, kind)
+        if record is not None or not allow_search or kind not in SEARCH_TOOLS:
+            return record
+        
+        server, tool = SEARCH_TOOLS[kind]
+        try:
+            await self.call_tool_native(server, tool, {"query": name, "limit": 5})
+        except Exception as e:
+            self.logger.warning(f"Entity lookup via {server}/{tool} failed for '{name}': {e}")
+            return None
+        return await asyncio.to_thread(self.entity_crosswalk.resolve, name, kind)
+    
+    def _resolve_timeout(self, client_id: str, tool_name: str, timeout: Optional[float]) -> Optional[float]:
+        """Pick the deadline for a tool call"""
+        if timeout is not None:
+            return timeout or None
+        if tool_name in self.tool_timeouts:
+            return self.tool_timeouts[tool_name]
+        server_timeout = self.server_configs.get(client_id, {}).get('timeout')
+        if server_timeout:
+            return server_timeout / 1000
+        return self.default_timeout
+    
+    async def _call_tool(self,
+                         client_id: str,
+                         tool_name: str,
+                         arguments: Dict[str, Any] = None) -> Dict[str, Any]:
         # "default" 클라이언트인 경우 로컬 서버 사용
         if client_id == "default" and self.local_server:
             try:
@@ -257,15 +376,8 @@ class MCPManager:
                     handler = self.local_server.tool_handlers[tool_name]
                     result = await handler(**(arguments or {}))
                     
-                    # MCP 응답 형식으로 래핑
-                    return {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": str(result)
-                            }
-                        ]
-                    }
+                    # MCP 응답 형식으로 래핑 (dict/list는 structuredContent 포함)
+                    return tool_result(result)
                 else:
                     # 로컬 서버에 없으면 외부 서버에서 찾기
                     return await self._find_and_call_tool(tool_name, arguments)
@@ -276,20 +388,56 @@ class MCPManager:
                 except:
                     raise RuntimeError(f"Tool execution failed: {e}")
         
-        # 외부 클라이언트 사용
-        if client_id not in self.clients:
+        # 외부 클라이언트 사용 (등록만 된 서버는 첫 호출 시 시작)
+        client = await self._routed_client(client_id)
+        if client is None:
             raise ValueError(f"Client '{client_id}' not found")
         
-        client = self.clients[client_id]
         return await client.call_tool(tool_name, arguments)
     
+    async def call_tool_stream(self,
+                               client_id: str,
+                               tool_name: str,
+                               arguments: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Call tool and stream progress/partial events before the final result
+        
+        Yields ``progress``/``partial`` events as they are reported and finishes with
+        ``{"type": "result", "result": {...}}``. Clients without streaming support
+        yield only the final result.
+        """
+        # 로컬 서버 툴은 큐 기반 progress reporter로 직접 실행
+        if client_id == "default" and self.local_server and tool_name in self.local_server.tool_handlers:
+            handler = self.local_server.tool_handlers[tool_name]
+            kwargs = dict(arguments or {})
+            queue: asyncio.Queue = asyncio.Queue()
+            if accepts_progress(handler):
+                kwargs["progress"] = ProgressReporter(f"local_{tool_name}", queue_emitter(queue))
+            
+            async def _run() -> Dict[str, Any]:
+                result = await handler(**kwargs)
+                return tool_result(result)
+            
+            async for event in iterate_events(queue, asyncio.ensure_future(_run())):
+                yield event
+            return
+        
+        client = await self._routed_client(client_id)
+        if client is not None and hasattr(client, 'call_tool_stream'):
+            async for event in client.call_tool_stream(tool_name, arguments):
+                yield event
+            return
+        
+        result = await self.call_tool(client_id, tool_name, arguments)
+        yield {"type": "result", "result": result}
+    
     async def _find_and_call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
         """Find tool in available servers and call it"""
         # ChEMBL 툴들
         chembl_tools = ['search_molecule', 'search_target', 'canonicalize_smiles']
-        if tool_name in chembl_tools and 'chembl' in self.clients:
-            client = self.clients['chembl']
-            return await client.call_tool(tool_name, arguments)
+        if tool_name in chembl_tools:
+            client = await self._routed_client('chembl')
+            if client is not None:
+                return await client.call_tool(tool_name, arguments)
         
         # BioMCP 툴들 - default 클라이언트에서 처리 (Mock 응답)
         biomcp_tools = ['article_searcher', 'trial_searcher', 'search_variants']
@@ -323,10 +471,12 @@ class MCPManager:
                 return await self._generate_thinking_mock_response(tool_name, arguments)
         
         # BioRxiv 툴들 - Mock 응답으로 처리
-        biorxiv_tools = ['get_recent_preprints', 'search_preprints', 'get_preprint_by_doi', 'find_published_version']
+        biorxiv_tools = ['get_recent_preprints', 'search_preprints', 'get_preprint_by_doi', 'find_published_version',
+                         'search_preprints_text', 'get_preprints_by_doi']
         if tool_name in biorxiv_tools:
-            if 'biorxiv-mcp' in self.clients:
-                return await self.clients['biorxiv-mcp'].call_tool(tool_name, arguments)
+            client = await self._routed_client('biorxiv-mcp')
+            if client is not None:
+                return await client.call_tool(tool_name, arguments)
             else:
                 return await self._generate_biorxiv_mock_response(tool_name, arguments)
         
@@ -472,6 +622,13 @@ class MCPManager:
             "server_active": self.local_server is not None or self.server is not None,
             "clients_count": len(self.clients),
             "client_ids": list(self.clients.keys()),
+            "lazy_servers": [name for name in self.server_configs if name not in self.clients],
+            "replicas": self.get_replica_stats(),
+            "http_pools": get_pool_stats(),
+            "http_cache": get_http_cache().stats,
+            "result_cache": self.result_cache.stats if self.result_cache is not None else None,
+            "entity_crosswalk": ({**self.entity_crosswalk.stats, "entities": self.entity_crosswalk.count()}
+                                 if self.entity_crosswalk is not None else None),
             "server_info": server_info
         }
     
@@ -483,11 +640,21 @@ class MCPManager:
         
         # Stop server
         await self.stop_server()
+        await self.inprocess_host.close()
+        await close_http_clients()
+        if self.result_cache is not None:
+            await self.result_cache.close()
+            self.result_cache = None
         
         self.logger.info("MCP Manager cleanup completed")
     
-    async def start_external_servers(self, servers: List[str] = None):
-        """Start external MCP servers (biomcp, sequential-thinking, etc.)"""
+    async def start_external_servers(self, servers: List[str] = None, lazy: Optional[bool] = None):
+        """Register external MCP servers (biomcp, sequential-thinking, etc.)
+        
+        With lazy start (globalSettings.lazyStart, default on) only the warm-pool
+        servers are started here; the rest start on their first routed tool call
+        and are shut down again after idleTimeout seconds without use.
+        """
         try:
             # Load MCP configuration
             config_path = "/home/gaia-bt/workspace/GAIA_LLMs/config/mcp.json"  # 올바른 경로 사용
@@ -498,32 +665,156 @@ class MCPManager:
             with open(config_path, 'r') as f:
                 config = json.load(f)
             
+            settings = config.get('globalSettings', {})
+            if lazy is None:
+                lazy = settings.get('lazyStart', True)
+            self.idle_timeout = settings.get('idleTimeout', self.idle_timeout)
+            self.warm_pool = settings.get('warmPool', self.warm_pool)
+            if settings.get('timeout'):
+                self.default_timeout = settings['timeout'] / 1000
+            self.tool_timeouts.update(settings.get('toolTimeouts', {}))
+            if self.result_cache is not None:
+                self.result_cache.configure(settings.get('toolCache', {}))
+            
             # Default to all available drug development servers if not specified
             if servers is None:
-                servers = ['biomcp', 'chembl', 'sequential-thinking', 'drugbank-mcp', 'opentargets-mcp', 'biorxiv-mcp']
+                servers = ['biomcp', 'chembl', 'sequential-thinking', 'drugbank-mcp', 'opentargets-mcp', 'biorxiv-mcp',
+                           'pubmed-mcp', 'clinicaltrials-mcp']
             
             for server_name in servers:
                 if server_name in config.get('mcpServers', {}):
-                    server_config = config['mcpServers'][server_name]
+                    self.server_configs[server_name] = config['mcpServers'][server_name]
                     
-                    try:
-                        # Special handling for different server types
-                        if server_name in ['drugbank-mcp', 'opentargets-mcp', 'biorxiv-mcp']:
-                            # DrugBank, OpenTargets, and BioRxiv servers - create mock clients for now
-                            await self._create_mock_client(server_name, server_config)
-                        else:
-                            # Original server startup logic for other servers
-                            await self._start_server_process(server_name, server_config)
-                            
-                    except Exception as e:
-                        self.logger.error(f"Failed to start {server_name}: {e}")
+                    if not lazy or server_name in self.warm_pool:
+                        await self.ensure_server(server_name)
             
+            self._start_idle_reaper()
             return True
             
         except Exception as e:
             self.logger.error(f"Error starting external servers: {e}")
             return False
     
+    async def ensure_server(self, server_name: str):
+        """Start a registered server if it is not running yet and return its client"""
+        if server_name in self.clients:
+            self.server_last_used[server_name] = time.monotonic()
+            return self.clients[server_name]
+        
+        server_config = self.server_configs.get(server_name)
+        if server_config is None:
+            return None
+        
+        lock = self._start_locks.setdefault(server_name, asyncio.Lock())
+        async with lock:
+            # 다른 호출이 먼저 시작했을 수 있음
+            if server_name not in self.clients:
+                try:
+                    await self._activate_server(server_name, server_config)
+                except Exception as e:
+                    self.logger.error(f"Failed to start {server_name}: {e}")
+                    return None
+        
+        self.server_last_used[server_name] = time.monotonic()
+        return self.clients.get(server_name)
+    
+    async def _activate_server(self, server_name: str, server_config: Dict[str, Any]):
+        """Start a single server using the transport its configuration calls for"""
+        # 번들 Python 서버는 in-process로 실행 (isolation: "subprocess" 설정 시 프로세스 분리)
+        if (self.inprocess_host.supports(server_name) and
+                server_config.get('isolation', 'inprocess') != 'subprocess' and
+                await self._start_inprocess_server(server_name)):
+            return
+        
+        # Special handling for different server types
+        if server_name in ['drugbank-mcp', 'opentargets-mcp', 'biorxiv-mcp']:
+            # DrugBank, OpenTargets, and BioRxiv servers - create mock clients for now
+            await self._create_mock_client(server_name, server_config)
+        else:
+            # Original server startup logic for other servers
+            await self._start_server_process(server_name, server_config)
+    
+    async def _routed_client(self, server_name: str):
+        """Get the client for a routed tool call, starting the server on first use"""
+        if server_name in self.clients or server_name in self.server_configs:
+            return await self.ensure_server(server_name)
+        return None
+    
+    def _start_idle_reaper(self):
+        """Start the background task that shuts down idle servers"""
+        if self.idle_timeout and self.idle_timeout > 0 and (self._idle_task is None or self._idle_task.done()):
+            self._idle_task = asyncio.create_task(self._idle_reaper_loop())
+    
+    async def _idle_reaper_loop(self):
+        """Periodically stop servers idle longer than idle_timeout (warm pool excluded)"""
+        interval = max(1.0, min(self.idle_timeout / 2, 60.0))
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                now = time.monotonic()
+                for server_name in list(self.server_configs.keys()):
+                    if server_name in self.warm_pool or server_name not in self.clients:
+                        continue
+                    if now - self.server_last_used.get(server_name, now) > self.idle_timeout:
+                        await self.stop_idle_server(server_name)
+        except asyncio.CancelledError:
+            pass
+    
+    async def stop_idle_server(self, server_name: str):
+        """Shut down a lazily started server; it restarts on its next call"""
+        # 프로세스 기반 서버는 ServerReplicaPool.disconnect()가 레플리카를 모두 종료
+        client = self.clients.pop(server_name, None)
+        self.external_servers.pop(server_name, None)
+        if client is not None and hasattr(client, 'disconnect'):
+            try:
+                await client.disconnect()
+            except Exception as e:
+                self.logger.warning(f"Error disconnecting {server_name}: {e}")
+        
+        self.server_last_used.pop(server_name, None)
+        self.logger.info(f"Stopped idle MCP server: {server_name}")
+    
+    async def _start_inprocess_server(self, server_name: str) -> bool:
+        """Load a bundled Python MCP server into this process"""
+        try:
+            await self.inprocess_host.load(server_name)
+        except Exception as e:
+            # 의존성 누락 등으로 import 실패 시 기존 방식으로 폴백
+            self.logger.warning(f"In-process load failed for {server_name}, falling back: {e}")
+            return False
+        
+        self.clients[server_name] = InProcessClient(self.inprocess_host, server_name)
+        self.logger.info(f"Started in-process MCP server: {server_name}")
+        return True
+    
+    async def read_resource(self, client_id: str, uri: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Read a resource (result-set page or record) from the server that returned it
+        
+        Large tools/call results come back as a first page plus ``nextCursor`` and a
+        ``gaia://result-sets/...`` link; pass that URI and cursor here for more.
+        """
+        client = await self._routed_client(client_id)
+        if client is None:
+            raise ValueError(f"Client '{client_id}' not found")
+        if not hasattr(client, 'read_resource'):
+            raise RuntimeError(f"Server '{client_id}' does not serve resources")
+        self.server_last_used[client_id] = time.monotonic()
+        return await client.read_resource(uri, cursor)
+    
+    async def call_tool_native(self,
+                               client_id: str,
+                               tool_name: str,
+                               arguments: Dict[str, Any] = None) -> Any:
+        """Call tool on an in-process server and return its native Python value"""
+        client = await self._routed_client(client_id)
+        if isinstance(client, InProcessClient):
+            result = await client.call_tool_native(tool_name, arguments)
+            await self._learn_entities(client_id, tool_name, result)
+            return result
+        
+        # 프로세스 분리된 서버는 MCP 결과 그대로 반환
+        return await self.call_tool(client_id, tool_name, arguments)
+    
     async def _create_mock_client(self, server_name: str, server_config: Dict[str, Any]):
         """Create mock client for DrugBank and OpenTargets servers"""
         class MockMCPClient:
@@ -901,47 +1192,46 @@ CRISPR-Cas9, Prime Editing, Base Editing 등의 차세대 유전자 편집 도
         self.logger.info(f"Created mock MCP client for: {server_name}")
     
     async def _start_server_process(self, server_name: str, server_config: Dict[str, Any]):
-        """Start actual server process for biomcp, chembl, etc."""
-        # Build command
-        cmd = [server_config['command']] + server_config.get('args', [])
+        """Start a pool of STDIO server processes for biomcp, chembl, etc.
         
-        # Set environment
+        The number of replicas comes from the server's "replicas" entry in mcp.json
+        ({"min": 1, "max": 4, "scaleUpBacklog": 2, "scaleDownAfter": 60}); without it
+        a single process is started.
+        """
+        # Set environment (${VAR} 형식의 값은 현재 환경변수로 치환)
         env = os.environ.copy()
-        if 'env' in server_config:
-            env.update(server_config['env'])
-        
-        # Set working directory
-        cwd = server_config.get('cwd', None)
-        
-        # Start server process
-        process = subprocess.Popen(
-            cmd,
-            env=env,
-            cwd=cwd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            stdin=subprocess.PIPE
-        )
+        for key, value in server_config.get('env', {}).items():
+            env[key] = os.path.expandvars(value)
         
-        self.external_servers[server_name] = process
-        self.logger.info(f"Started external MCP server: {server_name}")
+        pool = ServerReplicaPool.from_config(server_name, server_config, env=env)
+        if not await pool.start():
+            raise RuntimeError(f"Could not start MCP server process: {server_name}")
         
-        # Give server time to initialize
-        await asyncio.sleep(2)
-        
-        # Create client for this server
-        await self.create_client(server_name, f"GAIA-{server_name}")
+        self.external_servers[server_name] = pool
+        self.clients[server_name] = pool
+        self.logger.info(f"Started external MCP server: {server_name} "
+                         f"({len(pool.replicas)}/{pool.max_replicas} replicas)")
+    
+    def get_replica_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Replica counts and queue depths of process-based servers"""
+        return {name: pool.get_stats() for name, pool in self.external_servers.items()}
     
     async def stop_external_servers(self):
         """Stop all external MCP servers"""
-        for server_name, process in self.external_servers.items():
+        if self._idle_task:
+            self._idle_task.cancel()
+            self._idle_task = None
+        self.server_configs.clear()
+        self.server_last_used.clear()
+        
+        for server_name, pool in self.external_servers.items():
             try:
-                process.terminate()
-                process.wait(timeout=5)
+                await pool.disconnect()
                 self.logger.info(f"Stopped external MCP server: {server_name}")
-            except:
-                process.kill()
-                self.logger.warning(f"Force killed external MCP server: {server_name}")
+            except Exception as e:
+                self.logger.warning(f"Error stopping external MCP server {server_name}: {e}")
+            if self.clients.get(server_name) is pool:
+                del self.clients[server_name]
         
         self.external_servers.clear()
     
@@ -0,0 +1,515 @@
+"""
+Combination regimen optimizer
+
+Ranks drug combinations built from candidate lists for the combination-prescription
+workflow. Per-drug signals (target-disease evidence, clinical trial phase, approval
+status) and the pairwise interaction severities are gathered once through the
+DrugBank / ClinicalTrials / OpenTargets tools and memoized; the combinations are
+then searched with branch-and-bound, so only regimens that can still reach the
+current top-k are expanded.
+
+Regimen score (weights default to the 0.4 / 0.3 / 0.2 / 0.1 split of the
+combination-prescription guide):
+
+    evidence * mean(evidence) + safety * (1 - interaction penalty)
+    + trials * mean(trial phase) + approval * mean(approval)
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..protocol.messages import MCPTool
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS = {"evidence": 0.4, "safety": 0.3, "trials": 0.2, "approval": 0.1}
+DRUG_SIGNALS = ("evidence", "trials", "approval")
+
+SEVERITY_CODES = {"none": 0, "minor": 1, "moderate": 2, "major": 3}
+SEVERITY_PENALTY = {0: 0.0, 1: 0.1, 2: 0.35, 3: 1.0}
+PHASE_LEVELS = {"EARLY_PHASE1": 0.5, "PHASE1": 1, "PHASE2": 2, "PHASE3": 3, "PHASE4": 4}
+APPROVAL_LEVELS = {"approved": 1.0, "investigational": 0.5, "experimental": 0.25}
+
+MAX_TRIALS_SCANNED = 200   # 약물당 조회하는 임상시험 수 상한
+TRIAL_COUNT_SATURATION = 50
+DISEASE_TARGETS_LIMIT = 500
+SIGNAL_CACHE_SIZE = 4096
+SIGNAL_CONCURRENCY = 8
+
+_DRUGBANK_ID = re.compile(r"^DB\d{5}$", re.IGNORECASE)
+
+
+def search_regimens(benefits: Sequence[float], penalties: Sequence[Sequence[float]],
+                    size: int, top_k: int, safety_weight: float,
+                    groups: Optional[Sequence[Sequence[int]]] = None,
+                    forbidden: Optional[Sequence[Sequence[bool]]] = None
+                    ) -> Tuple[List[Tuple[float, Tuple[int, ...]]], Dict[str, int]]:
+    """Branch-and-bound search for the ``top_k`` best regimens.
+
+    Args:
+        benefits: weighted per-drug signal sum (evidence + trials + approval parts)
+        penalties: symmetric pairwise interaction penalty matrix
+        size: drugs per regimen (ignored when ``groups`` is given)
+        safety_weight: weight of ``1 - min(1, sum of pair penalties)``
+        groups: candidate indices per slot; one drug is picked from every slot.
+            Without groups, every ``size``-combination of the candidates is considered.
+        forbidden: pairs that may never be combined (e.g. major interactions)
+
+    Score = sum(benefits) / size + safety_weight * (1 - min(1, penalty)).
+    Adding a drug can only raise the penalty, so the bound of a partial regimen is
+    its benefit plus the best benefits still available, at its current penalty.
+
+    Returns ([(score, candidate indices)] best first, search statistics).
+    """
+    if groups is not None:
+        size = len(groups)
+        slots = [sorted(set(group), key=lambda i: -benefits[i]) for group in groups]
+        # 뒤쪽 슬롯의 최대 benefit 누적합 (bound 계산용)
+        suffix = [0.0] * (size + 1)
+        for depth in range(size - 1, -1, -1):
+            suffix[depth] = suffix[depth + 1] + (benefits[slots[depth][0]] if slots[depth] else 0.0)
+    else:
+        order = sorted(range(len(benefits)), key=lambda i: -benefits[i])
+        prefix = [0.0]
+        for i in order:
+            prefix.append(prefix[-1] + benefits[i])
+
+    heap: List[Tuple[float, Tuple[int, ...]]] = []
+    seen = set()
+    stats = {"nodes": 0, "pruned": 0, "evaluated": 0}
+    chosen: List[int] = []
+
+    def threshold() -> float:
+        return heap[0][0] if len(heap) >= top_k else -math.inf
+
+    def expand(depth: int, start: int, benefit: float, penalty: float):
+        if depth == size:
+            key = tuple(sorted(chosen))
+            if key in seen:
+                return
+            seen.add(key)
+            stats["evaluated"] += 1
+            score = benefit / size + safety_weight * (1.0 - min(1.0, penalty))
+            if len(heap) < top_k:
+                heapq.heappush(heap, (score, key))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, key))
+            return
+
+        if groups is not None:
+            options = [(i, slots[depth][i]) for i in range(len(slots[depth]))]
+        else:
+            options = [(pos, order[pos]) for pos in range(start, len(order) - (size - depth) + 1)]
+        safety = safety_weight * (1.0 - min(1.0, penalty))
+
+        for n, (pos, candidate) in enumerate(options):
+            if candidate in chosen:
+                continue
+            stats["nodes"] += 1
+            # 후보는 benefit 내림차순: 이 후보의 bound가 기준 이하면 이후 후보도 모두 이하
+            if groups is not None:
+                rest = suffix[depth + 1]
+            else:
+                rest = prefix[pos + size - depth] - prefix[pos + 1]
+            if (benefit + benefits[candidate] + rest) / size + safety <= threshold():
+                stats["pruned"] += len(options) - n
+                break
+            if forbidden is not None and any(forbidden[candidate][j] for j in chosen):
+                stats["pruned"] += 1
+                continue
+
+            added = penalty + sum(penalties[candidate][j] for j in chosen)
+            if (benefit + benefits[candidate] + rest) / size + safety_weight * (1.0 - min(1.0, added)) <= threshold():
+                stats["pruned"] += 1
+                continue
+
+            chosen.append(candidate)
+            expand(depth + 1, pos + 1, benefit + benefits[candidate], added)
+            chosen.pop()
+
+    if size > 0 and (groups is not None or size <= len(benefits)):
+        expand(0, 0, 0.0, 0.0)
+    return sorted(heap, key=lambda item: (-item[0], item[1])), stats
+
+
+def _native(result: Any) -> Any:
+    """Native value of a tool call (unwraps MCP text content from process servers)"""
+    if isinstance(result, dict) and isinstance(result.get("content"), list):
+        texts = [c.get("text", "") for c in result["content"] if c.get("type") == "text"]
+        text = "\n".join(texts)
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+    return result
+
+
+def _first(value: Any) -> Any:
+    return value[0] if isinstance(value, list) else value
+
+
+def _phase_signal(phase_counts: Dict[str, int]) -> Dict[str, Any]:
+    """Trial signal in [0, 1] from trial counts per phase: 0.7 * max phase / 4 + 0.3 * trial volume"""
+    total = sum(phase_counts.values())
+    max_phase = max((PHASE_LEVELS.get(phase, 0) for phase, count in phase_counts.items() if count), default=0)
+    volume = min(1.0, math.log1p(total) / math.log1p(TRIAL_COUNT_SATURATION))
+    return {"score": 0.7 * max_phase / 4 + 0.3 * volume, "max_phase": max_phase, "trials": total}
+
+
+class RegimenOptimizer:
+    """Regimen search over signals collected through the MCPManager tools"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._cache: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._semaphore = asyncio.Semaphore(SIGNAL_CONCURRENCY)
+        self.stats = {"tool_calls": 0, "cache_hits": 0, "crosswalk_hits": 0}
+
+    def register(self, server):
+        """Register the optimize_regimens tool on a local MCPServer"""
+        tool = MCPTool(
+            name="optimize_regimens",
+            description=("Rank drug combinations from candidate lists by evidence, interaction "
+                         "severity, trial phase and approval status (branch-and-bound top-k search)"),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "candidates": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Candidate drugs (DrugBank IDs or names); combined regimen_size at a time"
+                    },
+                    "candidate_groups": {
+                        "type": "array",
+                        "items": {"type": "array", "items": {"type": "string"}},
+                        "description": "Candidate drugs per slot (e.g. per drug class); one drug is picked from each"
+                    },
+                    "regimen_size": {"type": "integer", "default": 2},
+                    "condition": {
+                        "type": "string",
+                        "description": "Disease or condition the regimen treats"
+                    },
+                    "disease_id": {
+                        "type": "string",
+                        "description": "OpenTargets disease ID (looked up from condition when omitted)"
+                    },
+                    "top_k": {"type": "integer", "default": 3},
+                    "weights": {
+                        "type": "object",
+                        "description": "Component weights: evidence, safety, trials, approval",
+                        "default": DEFAULT_WEIGHTS
+                    },
+                    "exclude_major": {
+                        "type": "boolean",
+                        "description": "Never combine drugs with a major interaction",
+                        "default": True
+                    },
+                    "signals": {
+                        "type": "object",
+                        "description": "Known per-drug signals {drug: {evidence, trials, approval}} in [0, 1]; skips their lookups"
+                    }
+                }
+            }
+        )
+        server.register_tool(tool, self.handle_optimize_regimens)
+
+    async def handle_optimize_regimens(self, **arguments) -> str:
+        try:
+            result = await self.optimize(**arguments)
+        except (TypeError, ValueError) as e:
+            result = {"error": str(e)}
+        return json.dumps(result, ensure_ascii=False, indent=2)
+
+    async def optimize(self,
+                       candidates: Optional[List[str]] = None,
+                       candidate_groups: Optional[List[List[str]]] = None,
+                       regimen_size: int = 2,
+                       condition: Optional[str] = None,
+                       disease_id: Optional[str] = None,
+                       top_k: int = 3,
+                       weights: Optional[Dict[str, float]] = None,
+                       exclude_major: bool = True,
+                       signals: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Any]:
+        """Top-k regimens with per-component scores"""
+        if not candidates and not candidate_groups:
+            raise ValueError("Provide candidates or candidate_groups")
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        unknown = set(weights) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown weights: {', '.join(sorted(unknown))} (evidence, safety, trials, approval)")
+
+        started = time.perf_counter()
+        names = list(dict.fromkeys(
+            drug.strip() for drug in (candidates or [d for group in candidate_groups for d in group]) if drug.strip()
+        ))
+
+        # 1) 약물 식별 + 약물별 신호 / 쌍별 상호작용을 동시에 수집 (모두 메모이즈)
+        drugs = await asyncio.gather(*(self.resolve_drug(name) for name in names))
+        warnings: List[str] = []
+        if disease_id is None and condition:
+            disease_id = await self.disease_id_for(condition)
+            if disease_id is None:
+                warnings.append(f"OpenTargets disease not found for '{condition}'; evidence set to 0")
+
+        known = {name.lower(): values for name, values in (signals or {}).items()}
+        per_drug, matrix = await asyncio.gather(
+            asyncio.gather(*(self.drug_signals(drug, condition, disease_id, known.get(drug["query"].lower()))
+                             for drug in drugs)),
+            self.interaction_matrix([drug["drugbank_id"] for drug in drugs]),
+            return_exceptions=True
+        )
+        if isinstance(per_drug, BaseException):
+            raise per_drug
+        gathered = time.perf_counter()
+        for drug, values in zip(drugs, per_drug):
+            warnings.extend(f"{drug['query']}: {note}" for note in values.pop("notes"))
+        if isinstance(matrix, RuntimeError):
+            # 상호작용 데이터 없이 순위를 매기면 모든 조합이 '안전'으로 보이므로 순위를 내지 않음
+            return {"error": f"{matrix}; regimens were not ranked because interaction data is missing",
+                    "condition": condition, "candidates": len(names), "warnings": warnings}
+        if isinstance(matrix, BaseException):
+            raise matrix
+        interactions, unchecked = matrix
+        # DrugBank ID가 없는 후보도 상호작용을 확인할 수 없음
+        unchecked_queries = {drug["query"] for drug in drugs
+                             if not drug["drugbank_id"] or drug["drugbank_id"].upper() in unchecked}
+        if unchecked_queries:
+            warnings.append(f"Interactions not checked for {', '.join(sorted(unchecked_queries))}; "
+                            f"their safety component assumes no interactions")
+
+        # 2) branch-and-bound 탐색
+        index = {name: i for i, name in enumerate(names)}
+        benefits = [sum(weights[s] * values[s] for s in DRUG_SIGNALS) for values in per_drug]
+        severity = [[interactions.get(frozenset((a["drugbank_id"], b["drugbank_id"])), 0) if i != j else 0
+                     for j, b in enumerate(drugs)] for i, a in enumerate(drugs)]
+        penalties = [[SEVERITY_PENALTY[code] for code in row] for row in severity]
+        forbidden = [[code >= 3 for code in row] for row in severity] if exclude_major else None
+        groups = ([[index[d.strip()] for d in group if d.strip()] for group in candidate_groups]
+                  if candidate_groups else None)
+
+        ranked, search_stats = search_regimens(benefits, penalties, regimen_size, max(1, top_k),
+                                               weights["safety"], groups, forbidden)
+        finished = time.perf_counter()
+
+        regimens = []
+        for score, members in ranked:
+            pairs = [(i, j) for n, i in enumerate(members) for j in members[n + 1:] if severity[i][j]]
+            penalty = min(1.0, sum(penalties[i][j] for i, j in pairs))
+            regimens.append({
+                "rank": len(regimens) + 1,
+                "drugs": [{"query": drugs[i]["query"], "drugbank_id": drugs[i]["drugbank_id"],
+                           "name": drugs[i]["name"]} for i in members],
+                "score": round(score, 4),
+                "components": {
+                    **{s: round(sum(per_drug[i][s] for i in members) / len(members), 4) for s in DRUG_SIGNALS},
+                    "safety": round(1.0 - penalty, 4)
+                },
+                "per_drug": {drugs[i]["query"]: {s: round(per_drug[i][s], 4) for s in DRUG_SIGNALS}
+                             for i in members},
+                "interactions": [{"drug_a": drugs[i]["query"], "drug_b": drugs[j]["query"],
+                                  "severity": next(k for k, v in SEVERITY_CODES.items() if v == severity[i][j])}
+                                 for i, j in pairs],
+                "unchecked_interactions": [drugs[i]["query"] for i in members
+                                           if drugs[i]["query"] in unchecked_queries]
+            })
+
+        return {
+            "condition": condition,
+            "disease_id": disease_id,
+            "weights": weights,
+            "candidates": len(names),
+            "regimens": regimens,
+            "search": {**search_stats,
+                       "signal_ms": round((gathered - started) * 1000, 1),
+                       "search_ms": round((finished - gathered) * 1000, 3)},
+            "warnings": warnings
+        }
+
+    # ------------------------------------------------------------------ signals
+
+    async def _call(self, server: str, tool: str, arguments: Dict[str, Any]) -> Any:
+        """Memoized tool call; concurrent identical calls share one request"""
+        key = json.dumps([server, tool, arguments], sort_keys=True)
+        future = self._cache.get(key)
+        if future is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 공유하던 원래 호출만 취소된 경우 새로 요청 (이 호출 자체가 취소된 경우는 전파)
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self._call(server, tool, arguments)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._cache[key] = future
+        while len(self._cache) > SIGNAL_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        try:
+            async with self._semaphore:
+                self.stats["tool_calls"] += 1
+                result = _native(await self.manager.call_tool_native(server, tool, arguments))
+        except asyncio.CancelledError:
+            # 취소(데드라인 / Deep Search 중단)된 호출도 캐시에서 제거해 이후 호출이 새로 요청하게 함
+            self._cache.pop(key, None)
+            future.cancel()
+            raise
+        except Exception as e:
+            # 실패는 캐시하지 않음
+            self._cache.pop(key, None)
+            future.set_exception(e)
+            future.exception()
+            raise
+        future.set_result(result)
+        return result
+
+    def _known(self, name: str, kind: str) -> Optional[Dict[str, Any]]:
+        """Entity already in the crosswalk, so the search round-trip can be skipped"""
+        crosswalk = getattr(self.manager, "entity_crosswalk", None)
+        if crosswalk is None:
+            return None
+        record = crosswalk.resolve(name, kind)
+        if record is not None:
+            self.stats["crosswalk_hits"] += 1
+        return record
+
+    async def resolve_drug(self, query: str) -> Dict[str, Any]:
+        """DrugBank ID and name for a candidate (ID or name)"""
+        if _DRUGBANK_ID.match(query):
+            return {"query": query, "drugbank_id": query.upper(), "name": query}
+        known = self._known(query, "drug")
+        if known and known["ids"].get("drugbank"):
+            return {"query": query, "drugbank_id": _first(known["ids"]["drugbank"]), "name": known["name"]}
+        try:
+            hits = await self._call("drugbank-mcp", "search_drugs", {"query": query, "limit": 1})
+        except Exception as e:
+            logger.warning(f"DrugBank lookup failed for {query}: {e}")
+            hits = []
+        hit = hits[0] if isinstance(hits, list) and hits and "error" not in hits[0] else {}
+        return {"query": query, "drugbank_id": hit.get("drugbank_id"), "name": hit.get("name") or query}
+
+    async def disease_id_for(self, condition: str) -> Optional[str]:
+        known = self._known(condition, "disease")
+        if known and known["ids"].get("opentargets"):
+            return _first(known["ids"]["opentargets"])
+        try:
+            hits = await self._call("opentargets-mcp", "search_diseases", {"query": condition, "limit": 1})
+        except Exception as e:
+            logger.warning(f"OpenTargets disease lookup failed for {condition}: {e}")
+            return None
+        if isinstance(hits, list) and hits and "error" not in hits[0]:
+            return hits[0].get("disease_id")
+        return None
+
+    async def disease_target_scores(self, disease_id: str) -> Dict[str, float]:
+        """{target symbol or id: association score} for a disease"""
+        rows = await self._call("opentargets-mcp", "get_disease_associated_targets",
+                                {"disease_id": disease_id, "limit": DISEASE_TARGETS_LIMIT})
+        scores: Dict[str, float] = {}
+        for row in rows if isinstance(rows, list) else []:
+            if "error" in row:
+                continue
+            for key in (row.get("symbol"), row.get("target_id")):
+                if key:
+                    scores[key.upper()] = max(scores.get(key.upper(), 0.0), row.get("association_score") or 0.0)
+        return scores
+
+    async def trial_phases(self, drug_name: str, condition: str) -> Dict[str, int]:
+        """Trial counts per phase for a drug in a condition (local index aggregate, else API sweep)"""
+        arguments = {"group_by": "phase", "condition": condition, "intervention": drug_name, "limit": 20,
+                     "output_format": "json"}
+        aggregate = await self._call("clinicaltrials-mcp", "aggregate_trials", arguments)
+        counts: Dict[str, int] = {}
+        if isinstance(aggregate, dict) and "groups" in aggregate:
+            for group in aggregate["groups"]:
+                phase = group["value"] or "NA"
+                counts[phase] = counts.get(phase, 0) + group["count"]
+            return counts
+
+        sweep = await self._call("clinicaltrials-mcp", "stream_clinical_trials", {
+            "condition": condition, "intervention": drug_name, "max_results": MAX_TRIALS_SCANNED,
+            "output_format": "json"
+        })
+        for record in sweep.get("trials", []) if isinstance(sweep, dict) else []:
+            for phase in record.get("phases") or ["NA"]:
+                counts[phase] = counts.get(phase, 0) + 1
+        return counts
+
+    async def drug_signals(self, drug: Dict[str, Any], condition: Optional[str],
+                           disease_id: Optional[str], known: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        """evidence / trials / approval in [0, 1] for one drug; missing sources score 0 with a note"""
+        values: Dict[str, Any] = {s: 0.0 for s in DRUG_SIGNALS}
+        values["notes"] = []
+        known = known or {}
+        values.update({s: float(known[s]) for s in DRUG_SIGNALS if s in known})
+        missing = [s for s in DRUG_SIGNALS if s not in known]
+        if not missing:
+            return values
+
+        details: Dict[str, Any] = {}
+        if drug["drugbank_id"] and ("evidence" in missing or "approval" in missing):
+            try:
+                details = await self._call("drugbank-mcp", "get_drug_details", {"drugbank_id": drug["drugbank_id"]})
+            except Exception as e:
+                values["notes"].append(f"DrugBank details unavailable ({e})")
+            if not isinstance(details, dict) or "error" in details:
+                details = {}
+        elif not drug["drugbank_id"]:
+            values["notes"].append("not found in DrugBank")
+
+        if "approval" in missing and details:
+            groups = details.get("groups") or []
+            values["approval"] = max((APPROVAL_LEVELS.get(g, 0.0) for g in groups), default=0.0)
+
+        if "evidence" in missing and disease_id:
+            genes = {(t.get("gene_name") or "").upper() for t in details.get("targets") or []} - {""}
+            if not genes:
+                values["notes"].append("no DrugBank targets for evidence")
+            else:
+                try:
+                    scores = await self.disease_target_scores(disease_id)
+                    values["evidence"] = max((scores.get(g, 0.0) for g in genes), default=0.0)
+                except Exception as e:
+                    values["notes"].append(f"OpenTargets associations unavailable ({e})")
+
+        if "trials" in missing and condition:
+            try:
+                signal = _phase_signal(await self.trial_phases(drug["name"], condition))
+                values["trials"] = signal["score"]
+            except Exception as e:
+                values["notes"].append(f"ClinicalTrials lookup failed ({e})")
+        return values
+
+    async def interaction_matrix(self, drug_ids: List[Optional[str]]) -> Tuple[Dict[frozenset, int], List[str]]:
+        """({frozenset(pair): severity code} among the candidates, IDs whose interactions could not be checked)
+
+        One check_regimen call. Raises RuntimeError when no interaction data could be
+        obtained at all, so the caller never ranks regimens as interaction-free by default.
+        """
+        ids = sorted({d for d in drug_ids if d})
+        if len(ids) < 2:
+            return {}, []
+        try:
+            report = await self._call("drugbank-mcp", "check_regimen", {"drug_ids": ids, "min_severity": "minor"})
+        except Exception as e:
+            logger.warning(f"Interaction check failed: {e}")
+            raise RuntimeError(f"DrugBank interaction check failed ({e})") from e
+        if not isinstance(report, dict) or "interactions" not in report:
+            error = report.get("error") if isinstance(report, dict) else None
+            raise RuntimeError(f"DrugBank interaction check failed ({error or 'no interaction data'})")
+
+        pairs = {}
+        for interaction in report["interactions"]:
+            label = str(interaction.get("severity") or "moderate").lower()
+            pairs[frozenset((interaction["drug_a"], interaction["drug_b"]))] = SEVERITY_CODES.get(label, 2)
+        unchecked = [str(d).upper() for d in report.get("unresolved") or []]
+        return pairs, unchecked
@@ -0,0 +1,280 @@
+"""
+Replica pool of STDIO MCP server processes
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ..client.mcp_client import MCPClient
+from ..server.result_sets import parse_uri
+from ..transport.process_transport import ProcessTransport
+
+
+RESULT_SET_ROUTES = 1024  # 레플리카를 기억하는 결과 셋 수
+
+
+class ServerReplica:
+    """One server process and the client talking to it"""
+
+    def __init__(self, index: int, client: MCPClient, transport: ProcessTransport):
+        self.index = index
+        self.client = client
+        self.transport = transport
+        self.last_active = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return self.transport.alive
+
+    @property
+    def pending(self) -> int:
+        return self.transport.pending
+
+
+class ServerReplicaPool:
+    """Runs N replicas of one server definition and spreads tool calls across them.
+
+    - 호출은 대기 중인 요청 수(queue depth)가 가장 적은 레플리카로 전달
+    - 종료된 레플리카는 모니터 루프가 교체
+    - 모든 레플리카의 대기열이 scale_up_backlog 이상이면 max까지 증설,
+      유휴 상태가 scale_down_after 초 이상이면 min까지 축소
+    """
+
+    def __init__(self,
+                 server_name: str,
+                 command: List[str],
+                 env: Optional[Dict[str, str]] = None,
+                 cwd: Optional[str] = None,
+                 min_replicas: int = 1,
+                 max_replicas: int = 1,
+                 scale_up_backlog: int = 2,
+                 scale_down_after: float = 60.0,
+                 check_interval: float = 5.0):
+        self.name = f"GAIA-{server_name}"
+        self.server_type = server_name
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.min_replicas = max(1, min_replicas)
+        self.max_replicas = max(self.min_replicas, max_replicas)
+        self.scale_up_backlog = max(1, scale_up_backlog)
+        self.scale_down_after = scale_down_after
+        self.check_interval = check_interval
+        self.logger = logging.getLogger(__name__)
+
+        self.replicas: List[ServerReplica] = []
+        self._next_index = 0
+        self._spawning = 0
+        self._scale_task: Optional[asyncio.Task] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._closed = False
+        # 결과 셋은 만든 프로세스에만 있으므로 result set id -> 레플리카를 기억
+        self._result_sets: "OrderedDict[str, ServerReplica]" = OrderedDict()
+
+    @classmethod
+    def from_config(cls, server_name: str, server_config: Dict[str, Any],
+                    env: Optional[Dict[str, str]] = None) -> "ServerReplicaPool":
+        """Build a pool from an mcp.json server entry ("replicas": {"min", "max", ...})"""
+        replicas = server_config.get('replicas', {})
+        if isinstance(replicas, int):
+            replicas = {"min": replicas, "max": replicas}
+
+        return cls(
+            server_name,
+            [server_config['command']] + server_config.get('args', []),
+            env=env,
+            cwd=server_config.get('cwd'),
+            min_replicas=replicas.get('min', 1),
+            max_replicas=replicas.get('max', replicas.get('min', 1)),
+            scale_up_backlog=replicas.get('scaleUpBacklog', 2),
+            scale_down_after=replicas.get('scaleDownAfter', 60.0)
+        )
+
+    @property
+    def backlog(self) -> int:
+        """Total number of in-flight requests across replicas"""
+        return sum(replica.pending for replica in self.replicas)
+
+    async def start(self) -> bool:
+        """Start the minimum number of replicas and the monitor loop"""
+        results = await asyncio.gather(
+            *(self._spawn() for _ in range(self.min_replicas)), return_exceptions=True
+        )
+        started = sum(1 for result in results if result is True)
+        if started == 0:
+            self.logger.error(f"No replicas of {self.server_type} could be started")
+            return False
+
+        self._monitor_task = asyncio.create_task(self._monitor_loop())
+        self.logger.info(f"Started {started} replica(s) of {self.server_type}")
+        return True
+
+    async def _spawn(self) -> bool:
+        """Start one replica process and complete the MCP handshake"""
+        self._spawning += 1
+        index = self._next_index
+        self._next_index += 1
+        try:
+            transport = ProcessTransport(self.command, env=self.env, cwd=self.cwd)
+            client = MCPClient(f"{self.name}-{index}", transport=transport)
+            if not await client.initialize():
+                await transport.stop()
+                return False
+
+            if self._closed:
+                await client.disconnect()
+                return False
+
+            self.replicas.append(ServerReplica(index, client, transport))
+            self.logger.info(f"Replica {index} of {self.server_type} is ready")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to start replica of {self.server_type}: {e}")
+            return False
+        finally:
+            self._spawning -= 1
+
+    def _pick_replica(self) -> Optional[ServerReplica]:
+        """Choose the live replica with the shortest queue"""
+        live = [replica for replica in self.replicas if replica.alive]
+        if not live:
+            return None
+        return min(live, key=lambda replica: (replica.pending, replica.last_active))
+
+    def _maybe_scale_up(self, replica: ServerReplica):
+        """Add a replica in the background when even the least loaded one is backed up"""
+        if (replica.pending >= self.scale_up_backlog and
+                len(self.replicas) + self._spawning < self.max_replicas and
+                (self._scale_task is None or self._scale_task.done())):
+            self.logger.info(f"Scaling up {self.server_type} (backlog {self.backlog})")
+            self._scale_task = asyncio.create_task(self._spawn())
+
+    async def _acquire(self) -> ServerReplica:
+        replica = self._pick_replica()
+        if replica is None:
+            # 모든 레플리카가 종료된 경우 즉시 하나를 다시 띄움
+            await self._replace_dead()
+            replica = self._pick_replica()
+            if replica is None:
+                raise RuntimeError(f"No live replicas of {self.server_type}")
+
+        self._maybe_scale_up(replica)
+        return replica
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Call a tool on the least loaded replica, retrying once if that replica dies"""
+        for attempt in range(2):
+            replica = await self._acquire()
+            try:
+                result = await replica.client.call_tool(tool_name, arguments)
+                self._remember_result_set(result, replica)
+                return result
+            except ConnectionError:
+                if attempt == 1:
+                    raise
+                self.logger.warning(f"Replica {replica.index} of {self.server_type} died during call, retrying")
+            finally:
+                replica.last_active = time.monotonic()
+
+    async def call_tool_stream(self, tool_name: str,
+                               arguments: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream progress/partial events from the least loaded replica"""
+        replica = await self._acquire()
+        try:
+            async for event in replica.client.call_tool_stream(tool_name, arguments):
+                yield event
+        finally:
+            replica.last_active = time.monotonic()
+
+    def _remember_result_set(self, result: Any, replica: ServerReplica):
+        if not isinstance(result, dict):
+            return
+        result_set = (result.get("_meta") or {}).get("resultSet")
+        if not result_set:
+            return
+        self._result_sets[result_set["id"]] = replica
+        while len(self._result_sets) > RESULT_SET_ROUTES:
+            self._result_sets.popitem(last=False)
+
+    async def read_resource(self, uri: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Read a result-set page from the replica that produced the result set"""
+        replica = None
+        try:
+            replica = self._result_sets.get(parse_uri(uri)[0])
+        except LookupError:
+            pass
+        if replica is None or not replica.alive:
+            replica = await self._acquire()
+        try:
+            return await replica.client.read_resource(uri, cursor)
+        finally:
+            replica.last_active = time.monotonic()
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        replica = await self._acquire()
+        return await replica.client.list_tools()
+
+    async def _replace_dead(self):
+        """Drop exited replicas and start replacements up to the minimum"""
+        dead = [replica for replica in self.replicas if not replica.alive]
+        for replica in dead:
+            self.replicas.remove(replica)
+            self.logger.warning(f"Replica {replica.index} of {self.server_type} exited, replacing")
+            await replica.transport.stop()
+
+        missing = self.min_replicas - len(self.replicas) - self._spawning
+        if missing > 0:
+            await asyncio.gather(*(self._spawn() for _ in range(missing)))
+
+    async def _scale_down(self):
+        """Stop surplus replicas that have been idle long enough"""
+        now = time.monotonic()
+        idle = sorted(
+            (replica for replica in self.replicas
+             if replica.pending == 0 and now - replica.last_active > self.scale_down_after),
+            key=lambda replica: replica.last_active
+        )
+        for replica in idle:
+            if len(self.replicas) <= self.min_replicas:
+                break
+            self.replicas.remove(replica)
+            self.logger.info(f"Scaling down {self.server_type}: stopping replica {replica.index}")
+            await replica.client.disconnect()
+
+    async def _monitor_loop(self):
+        try:
+            while not self._closed:
+                await asyncio.sleep(self.check_interval)
+                try:
+                    await self._replace_dead()
+                    await self._scale_down()
+                except Exception as e:
+                    self.logger.error(f"Replica monitor error for {self.server_type}: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Replica count and per-replica queue depth"""
+        return {
+            "server": self.server_type,
+            "replicas": len(self.replicas),
+            "min": self.min_replicas,
+            "max": self.max_replicas,
+            "backlog": self.backlog,
+            "queue_depths": {replica.index: replica.pending for replica in self.replicas}
+        }
+
+    async def disconnect(self):
+        """Stop the monitor loop and every replica"""
+        self._closed = True
+        if self._monitor_task and not self._monitor_task.done():
+            self._monitor_task.cancel()
+        # 증설 중인 레플리카는 _spawn이 _closed를 확인하고 스스로 종료
+
+        replicas, self.replicas = self.replicas, []
+        await asyncio.gather(*(replica.client.disconnect() for replica in replicas),
+                             return_exceptions=True)
+        self.logger.info(f"Stopped all replicas of {self.server_type}")
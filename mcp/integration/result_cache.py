@@ -0,0 +1,384 @@
+"""
+Tool-result cache for MCPManager.call_tool
+
+Formatted tool results are cached per (server, tool, normalized arguments):
+
+- an in-memory LRU tier in front of a persistent SQLite tier (TOOL_CACHE_DB,
+  default ~/.cache/gaia/tool_results.db), so follow-up questions in a session
+  and repeated sessions are answered without calling the server again;
+- per-tool policies: TTL, stale window and purity (impure tools such as
+  save_research or the LLM-backed research tools are never cached);
+- stale-while-revalidate: within the stale window the cached result is returned
+  at once and refreshed in the background;
+- negative caching: empty results ("No ... found", [], total_found 0) are kept
+  for a shorter TTL, errors (including record lists holding {"error": ...}
+  items) are never cached;
+- identical concurrent calls share one request; if the caller that started it
+  is cancelled, the others load the result themselves.
+
+Policies can be overridden with globalSettings.toolCache in config/mcp.json,
+e.g. ``{"search_pubmed": {"ttl": 600, "staleTtl": 3600}, "my_tool": {"pure": false}}``.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from ..common.structured import structured_content, structured_records
+
+
+logger = logging.getLogger(__name__)
+
+MINUTE = 60
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Caching rules for one tool"""
+    ttl: float = 15 * MINUTE        # 이 시간 동안은 캐시를 그대로 반환
+    stale_ttl: float = HOUR         # ttl 이후 이 시간 동안은 캐시 반환 + 백그라운드 갱신
+    negative_ttl: float = 10 * MINUTE
+    pure: bool = True               # 부작용/비결정적 툴은 False (캐시하지 않음)
+
+
+IMPURE = CachePolicy(pure=False)
+
+TOOL_POLICIES: Dict[str, CachePolicy] = {
+    # GAIA 로컬 툴: LLM 호출 / 파일 저장
+    "research_question": IMPURE,
+    "evaluate_answer": IMPURE,
+    "save_research": IMPURE,
+    # Sequential Thinking: 세션 상태를 바꿈
+    "start_thinking": IMPURE,
+    "think": IMPURE,
+    "complete_thinking": IMPURE,
+    # 약물/타겟 참조 데이터: 릴리스 단위로만 바뀜
+    "get_drug_details": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+    "get_drugs_details": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+    "get_drug_interactions": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+    "check_regimen": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+    "check_regimens": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+    "get_target_details": CachePolicy(ttl=DAY, stale_ttl=7 * DAY),
+    "get_targets_details": CachePolicy(ttl=DAY, stale_ttl=7 * DAY),
+    "get_target_associated_diseases": CachePolicy(ttl=DAY, stale_ttl=7 * DAY),
+    "get_disease_associated_targets": CachePolicy(ttl=DAY, stale_ttl=7 * DAY),
+    # 임상시험: 개별 trial은 수 시간, 검색은 1시간
+    "get_trial_details": CachePolicy(ttl=6 * HOUR, stale_ttl=DAY),
+    "get_trials_details": CachePolicy(ttl=6 * HOUR, stale_ttl=DAY),
+    "get_trial_results": CachePolicy(ttl=6 * HOUR, stale_ttl=DAY),
+    "search_clinical_trials": CachePolicy(ttl=HOUR, stale_ttl=6 * HOUR),
+    # 문헌: 출판된 논문 메타데이터는 길게, 검색 결과는 짧게
+    "get_article_details": CachePolicy(ttl=14 * DAY, stale_ttl=60 * DAY),
+    "get_articles_details": CachePolicy(ttl=14 * DAY, stale_ttl=60 * DAY),
+    "bulk_fetch_articles": CachePolicy(ttl=14 * DAY, stale_ttl=60 * DAY),
+    "get_preprint_by_doi": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+    "get_preprints_by_doi": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+    "search_pubmed": CachePolicy(ttl=HOUR, stale_ttl=DAY),
+    "get_recent_preprints": CachePolicy(ttl=HOUR, stale_ttl=6 * HOUR),
+}
+
+# 정책이 없는 툴은 읽기 전용으로 보이는 이름만 기본 정책으로 캐시
+READ_ONLY_PREFIXES = ("get_", "search_", "find_", "top_", "rank_", "aggregate_")
+DEFAULT_POLICY = CachePolicy()
+
+MEMORY_ENTRIES = 512
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".cache", "gaia", "tool_results.db")
+
+_EMPTY_TEXT = re.compile(r"^\s*(\[\]|\{\}|null|)\s*$|^\s*No\b.*\bfound\b", re.IGNORECASE)
+_ERROR_TEXT = re.compile(r"^\s*(Error\b|Failed\b)", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tool_results (
+    key TEXT PRIMARY KEY,
+    server TEXT,
+    tool TEXT,
+    result TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    negative INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tool_results_stored_at ON tool_results(stored_at);
+"""
+
+
+def normalize_arguments(value: Any) -> Any:
+    """Canonical form of tool arguments: None values dropped, keys sorted, strings stripped"""
+    if isinstance(value, dict):
+        return {k: normalize_arguments(v) for k, v in sorted(value.items()) if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [normalize_arguments(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def result_key(server: str, tool: str, arguments: Optional[Dict[str, Any]]) -> str:
+    payload = json.dumps([server, tool, normalize_arguments(arguments or {})],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _texts(result: Dict[str, Any]):
+    return [item.get("text", "") for item in result.get("content") or [] if item.get("type") == "text"]
+
+
+def _has_error_record(data: Any) -> bool:
+    """True for {"error": ...} or a record list holding {"error": ...} items (e.g. [{"error": "API 요청 실패"}])"""
+    if isinstance(data, list):
+        data = {"results": data}
+    if not isinstance(data, dict):
+        return False
+    return any(isinstance(record, dict) and "error" in record for record in structured_records(data))
+
+
+def is_error_result(result: Any) -> bool:
+    if not isinstance(result, dict) or result.get("isError"):
+        return True
+    structured = structured_content(result)
+    if structured is not None and _has_error_record(structured):
+        return True
+    for text in _texts(result):
+        if _ERROR_TEXT.match(text):
+            return True
+        if text.lstrip().startswith(("{", "[")):
+            try:
+                data = json.loads(text)
+            except ValueError:
+                continue
+            if _has_error_record(data):
+                return True
+    return False
+
+
+def is_empty_result(result: Dict[str, Any]) -> bool:
+    texts = _texts(result)
+    if not texts:
+        return not result.get("content")
+    for text in texts:
+        if _EMPTY_TEXT.match(text):
+            continue
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return False
+        if not (isinstance(data, dict) and data.get("total_found") == 0):
+            return False
+    return True
+
+
+class _Entry:
+    __slots__ = ("result", "stored_at", "negative")
+
+    def __init__(self, result: Dict[str, Any], stored_at: float, negative: bool):
+        self.result = result
+        self.stored_at = stored_at
+        self.negative = negative
+
+
+class ToolResultCache:
+    """Two-tier (memory LRU + SQLite) cache of MCP tool results"""
+
+    def __init__(self, db_path: Optional[str] = None, memory_entries: int = MEMORY_ENTRIES):
+        self.db_path = db_path or os.getenv("TOOL_CACHE_DB", DEFAULT_DB_PATH)
+        self.memory_entries = memory_entries
+        self.policies: Dict[str, CachePolicy] = dict(TOOL_POLICIES)
+        self._memory: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshing: Set[asyncio.Task] = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0,
+                      "refreshes": 0, "uncacheable": 0, "disk_hits": 0}
+        self.conn: Optional[sqlite3.Connection] = None
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        except (sqlite3.Error, OSError) as e:
+            # 디스크 계층 없이 메모리 LRU만 사용
+            logger.warning(f"Tool result cache running memory-only ({self.db_path}): {e}")
+            self.conn = None
+
+    def configure(self, overrides: Dict[str, Dict[str, Any]]):
+        """Apply globalSettings.toolCache overrides ({tool: {ttl, staleTtl, negativeTtl, pure}})"""
+        for tool, spec in (overrides or {}).items():
+            base = self.policies.get(tool, DEFAULT_POLICY)
+            self.policies[tool] = replace(
+                base,
+                ttl=spec.get("ttl", base.ttl),
+                stale_ttl=spec.get("staleTtl", base.stale_ttl),
+                negative_ttl=spec.get("negativeTtl", base.negative_ttl),
+                pure=spec.get("pure", base.pure)
+            )
+
+    def policy(self, tool: str) -> Optional[CachePolicy]:
+        """Policy of a tool, or None when its results must not be cached"""
+        policy = self.policies.get(tool)
+        if policy is None and tool.startswith(READ_ONLY_PREFIXES):
+            policy = DEFAULT_POLICY
+        if policy is None or not policy.pure or policy.ttl <= 0:
+            return None
+        return policy
+
+    async def get_or_call(self, server: str, tool: str, arguments: Optional[Dict[str, Any]],
+                          loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Cached result of ``loader()`` for this call (see module docstring for the rules)"""
+        policy = self.policy(tool)
+        if policy is None:
+            self.stats["uncacheable"] += 1
+            return await loader()
+
+        key = result_key(server, tool, arguments)
+        entry = self._lookup(key)
+        if entry is not None:
+            age = time.time() - entry.stored_at
+            if entry.negative:
+                if age < policy.negative_ttl:
+                    self.stats["negative_hits"] += 1
+                    return entry.result
+            elif age < policy.ttl:
+                self.stats["hits"] += 1
+                return entry.result
+            elif age < policy.ttl + policy.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._refresh_in_background(key, server, tool, loader)
+                return entry.result
+
+        self.stats["misses"] += 1
+        return await self._load(key, server, tool, loader)
+
+    async def _load(self, key: str, server: str, tool: str,
+                    loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run the loader once per key at a time and store its result"""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # 먼저 호출한 쪽만 취소된 경우(타임아웃 / 마감) 이 호출이 직접 다시 로드
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    return await self._load(key, server, tool, loader)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            self._store(key, server, tool, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def _refresh_in_background(self, key: str, server: str, tool: str,
+                               loader: Callable[[], Awaitable[Dict[str, Any]]]):
+        if key in self._inflight:
+            return
+        self.stats["refreshes"] += 1
+
+        async def refresh():
+            try:
+                await self._load(key, server, tool, loader)
+            except Exception as e:
+                logger.debug(f"Background refresh of {server}/{tool} failed: {e}")
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    # ------------------------------------------------------------------ tiers
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        if self.conn is None:
+            return None
+        try:
+            row = self.conn.execute(
+                "SELECT result, stored_at, negative FROM tool_results WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Tool result cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        self.stats["disk_hits"] += 1
+        entry = _Entry(json.loads(row[0]), row[1], bool(row[2]))
+        self._remember(key, entry)
+        return entry
+
+    def _store(self, key: str, server: str, tool: str, result: Dict[str, Any]):
+        if is_error_result(result):
+            return
+        if (result.get("_meta") or {}).get("resultSet"):
+            # 페이지로 나뉜 결과: 나머지 페이지는 서버의 TTL 저장소에만 있으므로 캐시하지 않음
+            return
+        entry = _Entry(result, time.time(), is_empty_result(result))
+        self._remember(key, entry)
+        if self.conn is None:
+            return
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO tool_results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, server, tool, json.dumps(result, ensure_ascii=False, default=str),
+                     entry.stored_at, int(entry.negative))
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Tool result cache write failed for {server}/{tool}: {e}")
+
+    def _remember(self, key: str, entry: _Entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def invalidate(self, server: Optional[str] = None, tool: Optional[str] = None):
+        """Drop cached results (all, per server, or per tool)"""
+        self._memory.clear()
+        if self.conn is None:
+            return
+        clauses, params = [], []
+        if server:
+            clauses.append("server = ?")
+            params.append(server)
+        if tool:
+            clauses.append("tool = ?")
+            params.append(tool)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        with self.conn:
+            self.conn.execute(f"DELETE FROM tool_results{where}", params)
+
+    def purge_expired(self, max_age: float = 90 * DAY) -> int:
+        """Delete persistent entries older than ``max_age`` seconds"""
+        if self.conn is None:
+            return 0
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM tool_results WHERE stored_at < ?", (time.time() - max_age,))
+        return cursor.rowcount
+
+    async def close(self):
+        for task in list(self._refreshing):
+            task.cancel()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
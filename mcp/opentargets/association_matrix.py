@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Offline OpenTargets target-disease association matrix
+
+Imports an OpenTargets Platform association dump (e.g. associationByOverallDirect,
+Parquet or JSON lines, plain or .gz) into a sparse float32 matrix stored as CSR
+arrays in .npy files, once by target and once by disease, plus the target and
+disease ID dictionaries. The arrays are memory-mapped on load, so opening the
+matrix is instant and top-k queries touch only the rows they rank.
+
+Usage:
+    python -m mcp.opentargets.association_matrix build --out /data/ot_matrix /data/associationByOverallDirect
+    python -m mcp.opentargets.association_matrix top-targets --matrix /data/ot_matrix EFO_0000305 -k 20
+    python -m mcp.opentargets.association_matrix rank --matrix /data/ot_matrix EFO_0000305 EFO_0000311 --method mean
+
+Set OPENTARGETS_MATRIX_DIR to the matrix directory to enable the offline OpenTargets tools.
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+AGGREGATIONS = ("sum", "mean", "max")
+
+
+def _dump_files(paths: List[str]) -> List[Path]:
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir()
+                                if p.name.endswith((".parquet", ".json", ".jsonl", ".json.gz", ".jsonl.gz"))))
+        else:
+            files.append(path)
+    return files
+
+
+def iter_associations(paths: List[str]) -> Iterator[Tuple[str, str, float]]:
+    """(targetId, diseaseId, score) rows from association dump files"""
+    for path in _dump_files(paths):
+        if path.suffix == ".parquet":
+            if not PARQUET_AVAILABLE:
+                raise RuntimeError(f"pyarrow is required to read {path.name}")
+            parquet = pq.ParquetFile(path)
+            for batch in parquet.iter_batches(columns=["targetId", "diseaseId", "score"], batch_size=65536):
+                columns = batch.to_pydict()
+                yield from zip(columns["targetId"], columns["diseaseId"], columns["score"])
+        else:
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    yield row["targetId"], row["diseaseId"], row["score"]
+
+
+def _csr(rows, cols, values, n_rows: int):
+    """CSR arrays for (rows, cols, values); entries within a row are ordered by column"""
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32), values[order]
+
+
+def build_matrix(paths: List[str], out_dir: str) -> Dict[str, int]:
+    """Build the on-disk matrix from association dump files"""
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required to build the association matrix")
+
+    target_ids: Dict[str, int] = {}
+    disease_ids: Dict[str, int] = {}
+    rows, cols, values = array("i"), array("i"), array("f")
+    for target_id, disease_id, score in iter_associations(paths):
+        if score is None:
+            continue
+        rows.append(target_ids.setdefault(target_id, len(target_ids)))
+        cols.append(disease_ids.setdefault(disease_id, len(disease_ids)))
+        values.append(score)
+
+    rows_np = np.frombuffer(rows, dtype=np.int32)
+    cols_np = np.frombuffer(cols, dtype=np.int32)
+    values_np = np.frombuffer(values, dtype=np.float32)
+
+    # 같은 (target, disease) 쌍이 여러 번 나오면 최고 점수만 유지
+    pair = rows_np.astype(np.int64) * max(len(disease_ids), 1) + cols_np
+    order = np.lexsort((-values_np, pair))
+    keep = order[np.concatenate(([True], pair[order][1:] != pair[order][:-1]))] if len(order) else order
+    rows_np, cols_np, values_np = rows_np[keep], cols_np[keep], values_np[keep]
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    for prefix, r, c, n in (("by_target", rows_np, cols_np, len(target_ids)),
+                            ("by_disease", cols_np, rows_np, len(disease_ids))):
+        indptr, indices, data = _csr(r, c, values_np, n)
+        np.save(out / f"{prefix}_indptr.npy", indptr)
+        np.save(out / f"{prefix}_indices.npy", indices)
+        np.save(out / f"{prefix}_data.npy", data)
+
+    with open(out / "ids.json", "w", encoding="utf-8") as f:
+        json.dump({"targets": list(target_ids), "diseases": list(disease_ids)}, f)
+
+    stats = {"targets": len(target_ids), "diseases": len(disease_ids), "associations": int(len(values_np))}
+    logger.info(f"Built association matrix in {out_dir}: {stats}")
+    return stats
+
+
+class _CSR:
+    """Memory-mapped CSR arrays"""
+
+    def __init__(self, directory: Path, prefix: str):
+        self.indptr = np.load(directory / f"{prefix}_indptr.npy", mmap_mode="r")
+        self.indices = np.load(directory / f"{prefix}_indices.npy", mmap_mode="r")
+        self.data = np.load(directory / f"{prefix}_data.npy", mmap_mode="r")
+
+    def row(self, i: int):
+        start, end = int(self.indptr[i]), int(self.indptr[i + 1])
+        return self.indices[start:end], self.data[start:end]
+
+
+def _top_k(scores, k: int):
+    """Indices of the k largest scores in descending order (argpartition + sort of k)"""
+    if k <= 0 or len(scores) == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        top = np.argpartition(scores, -k)[-k:]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class AssociationMatrix:
+    """Target x disease association scores with top-k queries"""
+
+    def __init__(self, directory: str):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for the association matrix")
+        self.directory = directory
+        path = Path(directory)
+        self.by_target = _CSR(path, "by_target")
+        self.by_disease = _CSR(path, "by_disease")
+        with open(path / "ids.json", encoding="utf-8") as f:
+            ids = json.load(f)
+        self.target_ids: List[str] = ids["targets"]
+        self.disease_ids: List[str] = ids["diseases"]
+        self.target_index = {target_id: i for i, target_id in enumerate(self.target_ids)}
+        self.disease_index = {disease_id: i for i, disease_id in enumerate(self.disease_ids)}
+
+    def top_diseases(self, target_id: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Highest-scoring diseases for a target (None if the target is unknown)"""
+        row = self.target_index.get(target_id)
+        if row is None:
+            return None
+        indices, data = self.by_target.row(row)
+        return [{"disease_id": self.disease_ids[indices[i]], "score": float(data[i])}
+                for i in _top_k(data, k)]
+
+    def top_targets(self, disease_id: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Highest-scoring targets for a disease (None if the disease is unknown)"""
+        row = self.disease_index.get(disease_id)
+        if row is None:
+            return None
+        indices, data = self.by_disease.row(row)
+        return [{"target_id": self.target_ids[indices[i]], "score": float(data[i])}
+                for i in _top_k(data, k)]
+
+    def rank_targets(self, disease_ids: List[str], k: int = 10, method: str = "mean",
+                     weights: Optional[List[float]] = None) -> Dict[str, Any]:
+        """Rank targets across several diseases.
+
+        Args:
+            method: sum / mean (missing associations count as 0) or max of the per-disease scores
+            weights: optional per-disease weights (same order as disease_ids)
+        """
+        if method not in AGGREGATIONS:
+            raise ValueError(f"Unknown method '{method}'. Use one of: {', '.join(AGGREGATIONS)}")
+        weights = weights or [1.0] * len(disease_ids)
+        if len(weights) != len(disease_ids):
+            raise ValueError("weights must have one value per disease")
+
+        totals = np.zeros(len(self.target_ids), dtype=np.float32)
+        hits = np.zeros(len(self.target_ids), dtype=np.int32)
+        found, missing = [], []
+        for disease_id, weight in zip(disease_ids, weights):
+            row = self.disease_index.get(disease_id)
+            if row is None:
+                missing.append(disease_id)
+                continue
+            found.append(disease_id)
+            indices, data = self.by_disease.row(row)
+            if method == "max":
+                np.maximum.at(totals, indices, data * weight)
+            else:
+                totals[indices] += data * weight  # 질병 행 내 target 인덱스는 중복 없음
+            hits[indices] += 1
+
+        if method == "mean" and found:
+            totals /= float(sum(w for d, w in zip(disease_ids, weights) if d in self.disease_index))
+
+        candidates = np.flatnonzero(hits)
+        top = candidates[_top_k(totals[candidates], k)]
+        return {
+            "diseases": found,
+            "missing": missing,
+            "method": method,
+            "ranking": [{"target_id": self.target_ids[i], "score": float(totals[i]),
+                         "supporting_diseases": int(hits[i])} for i in top]
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "targets": len(self.target_ids),
+            "diseases": len(self.disease_ids),
+            "associations": int(len(self.by_target.data))
+        }
+
+
+_matrix: Optional[AssociationMatrix] = None
+
+
+def get_association_matrix() -> Optional[AssociationMatrix]:
+    """Matrix configured through OPENTARGETS_MATRIX_DIR, or None when not set up"""
+    global _matrix
+    directory = os.getenv("OPENTARGETS_MATRIX_DIR")
+    if not NUMPY_AVAILABLE or not directory or not os.path.exists(os.path.join(directory, "ids.json")):
+        return None
+    if _matrix is None or _matrix.directory != directory:
+        _matrix = AssociationMatrix(directory)
+    return _matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline OpenTargets association matrix")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Import association dump files or directories")
+    build_parser.add_argument("paths", nargs="+")
+    build_parser.add_argument("--out", required=True)
+
+    targets_parser = subparsers.add_parser("top-targets", help="Top targets for a disease")
+    targets_parser.add_argument("disease_id")
+    diseases_parser = subparsers.add_parser("top-diseases", help="Top diseases for a target")
+    diseases_parser.add_argument("target_id")
+    rank_parser = subparsers.add_parser("rank", help="Rank targets across several diseases")
+    rank_parser.add_argument("disease_ids", nargs="+")
+    rank_parser.add_argument("--method", choices=AGGREGATIONS, default="mean")
+    for sub in (targets_parser, diseases_parser, rank_parser):
+        sub.add_argument("--matrix", required=True)
+        sub.add_argument("-k", type=int, default=10)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "build":
+        result: Any = build_matrix(args.paths, args.out)
+    else:
+        matrix = AssociationMatrix(args.matrix)
+        start = time.perf_counter()
+        if args.command == "top-targets":
+            result = {"ranking": matrix.top_targets(args.disease_id, args.k)}
+        elif args.command == "top-diseases":
+            result = {"ranking": matrix.top_diseases(args.target_id, args.k)}
+        else:
+            result = matrix.rank_targets(args.disease_ids, args.k, args.method)
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
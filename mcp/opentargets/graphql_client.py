@@ -0,0 +1,222 @@
+"""
+GraphQL client for the OpenTargets Platform API
+
+Queries are sent as POST bodies with variables instead of being interpolated into
+a GET URL. Query documents are normalized once and cached together with their
+sha256 id, which is offered as an automatic persisted query (hash only) and
+falls back to the full document when the server does not know or support it.
+Lookups for many entities are merged into one request using field aliases, and
+association lists are read with ``page: {index, size}`` pagination.
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp.common.http_client import get_http_client
+
+
+logger = logging.getLogger(__name__)
+
+OPENTARGETS_API_URL = "https://api.platform.opentargets.org/api/v4/graphql"
+MAX_PAGE_SIZE = 500  # association 페이지당 행 수
+MAX_ALIASES = 25     # 한 요청에 묶는 엔티티 수
+
+
+class GraphQLError(Exception):
+    """Errors returned by the GraphQL endpoint"""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        super().__init__("; ".join(error.get("message", str(error)) for error in errors))
+
+
+@dataclass(frozen=True)
+class QueryDocument:
+    """A normalized query document and its persisted-query id"""
+    text: str
+    sha256: str
+    operation_name: Optional[str]
+
+
+_COMMENT = re.compile(r"#[^\n]*")
+_SPACE = re.compile(r"\s+")
+_PUNCT_SPACE = re.compile(r"\s*([{}()\[\]:,!$=@])\s*")
+_OPERATION = re.compile(r"^(?:query|mutation)\s+(\w+)")
+
+
+@lru_cache(maxsize=256)
+def parse_query(query: str) -> QueryDocument:
+    """Minify a query document (comments/whitespace) and compute its sha256 id.
+
+    Cached per source text, so the per-call cost is a dictionary lookup.
+    """
+    text = _COMMENT.sub("", query)
+    text = _SPACE.sub(" ", text).strip()
+    text = _PUNCT_SPACE.sub(r"\1", text)
+    match = _OPERATION.match(text)
+    return QueryDocument(
+        text=text,
+        sha256=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        operation_name=match.group(1) if match else None
+    )
+
+
+@lru_cache(maxsize=128)
+def aliased_query(operation: str, field: str, arg_name: str, arg_type: str,
+                  selection: str, count: int, shared_vars: Tuple[Tuple[str, str], ...] = ()) -> str:
+    """Build one query that runs ``field(arg_name: $idN)`` for ``count`` entities.
+
+    Each lookup is aliased ``e0``..``eN``; ``shared_vars`` are variables used by
+    ``selection`` (e.g. the association page) and declared once.
+    """
+    var_defs = [f"$id{i}: {arg_type}" for i in range(count)]
+    var_defs += [f"${name}: {var_type}" for name, var_type in shared_vars]
+    fields = " ".join(f"e{i}: {field}({arg_name}: $id{i}) {selection}" for i in range(count))
+    return f"query {operation}({', '.join(var_defs)}) {{ {fields} }}"
+
+
+class OpenTargetsGraphQLClient:
+    """POST-based GraphQL client with persisted queries and aliased batching"""
+
+    def __init__(self, url: str = OPENTARGETS_API_URL, persisted_queries: bool = True):
+        self.url = url
+        self.persisted_queries = persisted_queries
+        self.known_hashes: set = set()
+        self.stats = {"requests": 0, "persisted_hits": 0, "batched_entities": 0}
+
+    async def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a query and return its ``data``; raises GraphQLError when no data comes back"""
+        document = parse_query(query)
+        body: Dict[str, Any] = {"variables": variables or {}}
+        if document.operation_name:
+            body["operationName"] = document.operation_name
+
+        if self.persisted_queries:
+            body["extensions"] = {"persistedQuery": {"version": 1, "sha256Hash": document.sha256}}
+            if document.sha256 in self.known_hashes:
+                # 서버에 등록된 쿼리는 해시만 전송
+                result = await self._post(body)
+                if result.get("data") is not None:
+                    self.stats["persisted_hits"] += 1
+                    return self._data(result)
+                self.known_hashes.discard(document.sha256)
+                if not any("PersistedQueryNotFound" in m for m in self._messages(result)):
+                    # 해시만 보낸 요청을 이해하지 못하는 서버: APQ 비활성화
+                    self._disable_persisted_queries()
+
+        if not self.persisted_queries:
+            body.pop("extensions", None)
+        body["query"] = document.text
+        result = await self._post(body)
+        if self.persisted_queries:
+            if result.get("data") is not None:
+                self.known_hashes.add(document.sha256)
+            elif self._persisted_unsupported(result):
+                self._disable_persisted_queries()
+                body.pop("extensions", None)
+                result = await self._post(body)
+        return self._data(result)
+
+    async def execute_batch(self, operation: str, field: str, arg_name: str, arg_type: str,
+                            selection: str, ids: List[str],
+                            shared_variables: Optional[Dict[str, Tuple[str, Any]]] = None
+                            ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Look up many entities through aliased fields; returns {id: result or None}.
+
+        Args:
+            field / arg_name / arg_type: root field to repeat, e.g. target / ensemblId / String!
+            selection: selection set applied to every entity
+            shared_variables: {name: (GraphQL type, value)} used inside ``selection``
+        """
+        shared_variables = shared_variables or {}
+        shared_types = tuple(sorted((name, spec[0]) for name, spec in shared_variables.items()))
+        unique_ids = list(dict.fromkeys(ids))
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        for start in range(0, len(unique_ids), MAX_ALIASES):
+            chunk = unique_ids[start:start + MAX_ALIASES]
+            query = aliased_query(operation, field, arg_name, arg_type, selection, len(chunk), shared_types)
+            variables = {f"id{i}": entity_id for i, entity_id in enumerate(chunk)}
+            variables.update({name: spec[1] for name, spec in shared_variables.items()})
+            data = await self.execute(query, variables)
+            self.stats["batched_entities"] += len(chunk)
+            for i, entity_id in enumerate(chunk):
+                results[entity_id] = data.get(f"e{i}")
+        return results
+
+    async def paginate(self, query: str, variables: Dict[str, Any], path: List[str],
+                       limit: int, page_size: int = MAX_PAGE_SIZE) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+        """Collect up to ``limit`` rows of a paged list (``page: {index: $index, size: $size}``).
+
+        ``path`` leads from ``data`` to the object holding ``count`` and ``rows``.
+        Returns (total count, rows); total is None when the parent entity is missing.
+        """
+        size = max(1, min(limit, page_size))
+        rows: List[Dict[str, Any]] = []
+        total: Optional[int] = None
+        index = 0
+        while len(rows) < limit:
+            data = await self.execute(query, {**variables, "index": index, "size": size})
+            node: Any = data
+            for key in path:
+                node = (node or {}).get(key)
+            if node is None:
+                return total, rows
+            total = node.get("count", total)
+            page_rows = node.get("rows", [])
+            rows.extend(page_rows)
+            index += 1
+            if len(page_rows) < size or (total is not None and index * size >= total):
+                break
+        return total, rows[:limit]
+
+    async def _post(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.stats["requests"] += 1
+        client = get_http_client(self.url)
+        response = await client.post(self.url, json=body)
+        if response.status_code >= 400:
+            # GraphQL 서버는 쿼리 오류를 4xx + errors 본문으로 돌려주기도 함
+            try:
+                result = response.json()
+            except ValueError:
+                response.raise_for_status()
+            if "errors" not in result:
+                response.raise_for_status()
+            return result
+        return response.json()
+
+    @staticmethod
+    def _messages(result: Dict[str, Any]) -> List[str]:
+        return [str(error.get("message", "")) for error in result.get("errors") or []]
+
+    def _persisted_unsupported(self, result: Dict[str, Any]) -> bool:
+        return any("PersistedQuery" in m or "extensions" in m.lower() for m in self._messages(result))
+
+    def _disable_persisted_queries(self):
+        logger.info("OpenTargets endpoint does not support persisted queries; sending full documents")
+        self.persisted_queries = False
+        self.known_hashes.clear()
+
+    @staticmethod
+    def _data(result: Dict[str, Any]) -> Dict[str, Any]:
+        data = result.get("data")
+        if data is None:
+            raise GraphQLError(result.get("errors") or [{"message": "No data in GraphQL response"}])
+        if result.get("errors"):
+            logger.warning(f"OpenTargets partial GraphQL errors: {result['errors']}")
+        return data
+
+
+_client: Optional[OpenTargetsGraphQLClient] = None
+
+
+def get_graphql_client() -> OpenTargetsGraphQLClient:
+    """Process-wide OpenTargets GraphQL client"""
+    global _client
+    if _client is None:
+        _client = OpenTargetsGraphQLClient()
+    return _client
@@ -5,13 +5,14 @@ Based on gosset-ai/mcps implementation with enhancements for drug development re
 """
 
 import asyncio
-import json
 import logging
 import os
 from typing import Any, Dict, List, Optional
 
 import httpx
 
+from mcp.opentargets.graphql_client import GraphQLError, MAX_PAGE_SIZE, get_graphql_client
+
 # MCP 임포트 (설치된 경우에만)
 try:
     from mcp.server import Server
@@ -39,9 +40,246 @@ except ImportError:
             return decorator
 
 # 로깅 설정
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# GraphQL 쿼리 문서 (값은 모두 변수로 전달)
+SEARCH_TARGETS_QUERY = """
+query SearchTargets($queryString: String!, $size: Int!) {
+    search(queryString: $queryString, entityNames: ["target"], page: {index: 0, size: $size}) {
+        hits {
+            id
+            name
+            description
+            object {
+                ... on Target {
+                    id
+                    approvedSymbol
+                    approvedName
+                    biotype
+                    functionDescriptions
+                    go {
+                        id
+                        name
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
+# target selection (단건 쿼리와 alias 배치 쿼리가 공유)
+TARGET_DETAILS_SELECTION = """{
+    id
+    approvedSymbol
+    approvedName
+    biotype
+    chromosome
+    start
+    end
+    strand
+    description
+    functionDescriptions
+    synonyms
+    nameSynonyms
+    symbolSynonyms
+    subcellularLocations
+    pathways {
+        pathway
+        pathwayId
+    }
+    tractability {
+        label
+        value
+    }
+}"""
+
+TARGET_DETAILS_QUERY = f"""
+query GetTargetDetails($ensemblId: String!) {{
+    target(ensemblId: $ensemblId) {TARGET_DETAILS_SELECTION}
+}}
+"""
+
+SEARCH_DISEASES_QUERY = """
+query SearchDiseases($queryString: String!, $size: Int!) {
+    search(queryString: $queryString, entityNames: ["disease"], page: {index: 0, size: $size}) {
+        hits {
+            id
+            name
+            description
+            object {
+                ... on Disease {
+                    id
+                    name
+                    description
+                    therapeuticAreas {
+                        id
+                        name
+                    }
+                    synonyms
+                    dbXRefs
+                }
+            }
+        }
+    }
+}
+"""
+
+SEARCH_DRUGS_QUERY = """
+query SearchDrugs($queryString: String!, $size: Int!) {
+    search(queryString: $queryString, entityNames: ["drug"], page: {index: 0, size: $size}) {
+        hits {
+            id
+            name
+            description
+            object {
+                ... on Drug {
+                    id
+                    name
+                    type
+                    maximumClinicalTrialPhase
+                    hasBeenWithdrawn
+                    withdrawnNotice
+                    synonyms
+                    tradeNames
+                }
+            }
+        }
+    }
+}
+"""
+
+# association selection (단건 쿼리와 alias 배치 쿼리가 공유)
+TARGET_DISEASES_SELECTION = """{
+    associatedDiseases(page: {index: $index, size: $size}) {
+        count
+        rows {
+            disease {
+                id
+                name
+                description
+            }
+            score
+            datatypeScores {
+                componentId
+                score
+            }
+        }
+    }
+}"""
+
+DISEASE_TARGETS_SELECTION = """{
+    associatedTargets(page: {index: $index, size: $size}) {
+        count
+        rows {
+            target {
+                id
+                approvedSymbol
+                approvedName
+                biotype
+            }
+            score
+            datatypeScores {
+                componentId
+                score
+            }
+        }
+    }
+}"""
+
+TARGET_DISEASES_QUERY = f"""
+query GetTargetDiseases($ensemblId: String!, $index: Int!, $size: Int!) {{
+    target(ensemblId: $ensemblId) {TARGET_DISEASES_SELECTION}
+}}
+"""
+
+DISEASE_TARGETS_QUERY = f"""
+query GetDiseaseTargets($efoId: String!, $index: Int!, $size: Int!) {{
+    disease(efoId: $efoId) {DISEASE_TARGETS_SELECTION}
+}}
+"""
+
+
+def format_disease_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    disease = row.get("disease", {})
+    return {
+        "disease_id": disease.get("id"),
+        "disease_name": disease.get("name"),
+        "description": disease.get("description"),
+        "association_score": row.get("score"),
+        "evidence_scores": {
+            score.get("componentId"): score.get("score")
+            for score in row.get("datatypeScores", [])
+        }
+    }
+
+
+def format_target_details(target: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "target_id": target.get("id"),
+        "symbol": target.get("approvedSymbol"),
+        "name": target.get("approvedName"),
+        "biotype": target.get("biotype"),
+        "chromosome": target.get("chromosome"),
+        "genomic_location": {
+            "start": target.get("start"),
+            "end": target.get("end"),
+            "strand": target.get("strand")
+        },
+        "description": target.get("description"),
+        "function_descriptions": target.get("functionDescriptions", []),
+        "synonyms": target.get("synonyms", []),
+        "symbol_synonyms": target.get("symbolSynonyms", []),
+        "subcellular_locations": target.get("subcellularLocations", []),
+        "pathways": [{"name": p.get("pathway"), "id": p.get("pathwayId")}
+                   for p in target.get("pathways") or []],
+        "tractability": [{"category": t.get("label"), "score": t.get("value")}
+                       for t in target.get("tractability") or []]
+    }
+
+
+def format_target_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    target = row.get("target", {})
+    return {
+        "target_id": target.get("id"),
+        "symbol": target.get("approvedSymbol"),
+        "name": target.get("approvedName"),
+        "biotype": target.get("biotype"),
+        "association_score": row.get("score"),
+        "evidence_scores": {
+            score.get("componentId"): score.get("score")
+            for score in row.get("datatypeScores", [])
+        }
+    }
+
+
+def get_association_matrix():
+    """Offline association matrix (OPENTARGETS_MATRIX_DIR), or None when not set up"""
+    # 지연 import: association_matrix를 CLI(python -m)로 실행할 때 중복 로드를 피함
+    from mcp.opentargets.association_matrix import get_association_matrix as load_matrix
+    return load_matrix()
+
+
+async def batch_associations(operation: str, field: str, arg_name: str, selection: str,
+                             list_field: str, ids: List[str], limit: int, formatter) -> Dict[str, Any]:
+    """First ``limit`` association rows for many entities in aliased round-trips"""
+    size = max(1, min(limit, MAX_PAGE_SIZE))
+    entities = await get_graphql_client().execute_batch(
+        operation, field, arg_name, "String!", selection, ids,
+        shared_variables={"index": ("Int!", 0), "size": ("Int!", size)}
+    )
+    results = {}
+    for entity_id, entity in entities.items():
+        if not entity:
+            results[entity_id] = {"error": f"{entity_id}를 찾을 수 없습니다."}
+            continue
+        associations = entity.get(list_field) or {}
+        results[entity_id] = {
+            "total": associations.get("count"),
+            "associations": [formatter(row) for row in associations.get("rows", [])]
+        }
+    return results
+
 class OpenTargetsMCPServer:
     """OpenTargets Platform API MCP Server for drug development research"""
     
@@ -68,59 +306,29 @@ class OpenTargetsMCPServer:
                 검색된 타겟 정보 리스트
             """
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.base_url}/graphql",
-                        params={
-                            "query": f"""
-                            query SearchTargets {{
-                                search(queryString: "{query}", entityNames: ["target"]) {{
-                                    hits {{
-                                        id
-                                        name
-                                        description
-                                        object {{
-                                            ... on Target {{
-                                                id
-                                                approvedSymbol
-                                                approvedName
-                                                biotype
-                                                functionDescriptions
-                                                go {{
-                                                    id
-                                                    name
-                                                }}
-                                            }}
-                                        }}
-                                    }}
-                                }}
-                            }}
-                            """
-                        }
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    
-                    # 결과 포맷팅
-                    results = []
-                    hits = data.get("data", {}).get("search", {}).get("hits", [])
-                    
-                    for hit in hits[:limit]:
-                        target_obj = hit.get("object", {})
-                        results.append({
-                            "target_id": target_obj.get("id"),
-                            "symbol": target_obj.get("approvedSymbol"),
-                            "name": target_obj.get("approvedName"),
-                            "biotype": target_obj.get("biotype"),
-                            "description": hit.get("description"),
-                            "function_descriptions": target_obj.get("functionDescriptions", []),
-                            "go_terms": [go.get("name") for go in target_obj.get("go", [])][:5]
-                        })
-                    
-                    return results
-                    
-            except httpx.HTTPError as e:
+                data = await get_graphql_client().execute(
+                    SEARCH_TARGETS_QUERY, {"queryString": query, "size": limit}
+                )
+                
+                # 결과 포맷팅
+                results = []
+                hits = (data.get("search") or {}).get("hits", [])
+                
+                for hit in hits:
+                    target_obj = hit.get("object") or {}
+                    results.append({
+                        "target_id": target_obj.get("id"),
+                        "symbol": target_obj.get("approvedSymbol"),
+                        "name": target_obj.get("approvedName"),
+                        "biotype": target_obj.get("biotype"),
+                        "description": hit.get("description"),
+                        "function_descriptions": target_obj.get("functionDescriptions", []),
+                        "go_terms": [go.get("name") for go in target_obj.get("go") or []][:5]
+                    })
+                
+                return results
+            
+            except (httpx.HTTPError, GraphQLError) as e:
                 logger.error(f"OpenTargets API 오류: {e}")
                 return [{"error": f"API 요청 실패: {str(e)}"}]
             except Exception as e:
@@ -139,71 +347,42 @@ class OpenTargetsMCPServer:
                 타겟의 상세 정보
             """
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.base_url}/graphql",
-                        params={
-                            "query": f"""
-                            query GetTargetDetails {{
-                                target(ensemblId: "{target_id}") {{
-                                    id
-                                    approvedSymbol
-                                    approvedName
-                                    biotype
-                                    chromosome
-                                    start
-                                    end
-                                    strand
-                                    description
-                                    functionDescriptions
-                                    synonyms
-                                    nameSynonyms
-                                    symbolSynonyms
-                                    subcellularLocations
-                                    pathways {{
-                                        pathway
-                                        pathwayId
-                                    }}
-                                    tractability {{
-                                        label
-                                        value
-                                    }}
-                                }}
-                            }}
-                            """
-                        }
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    target = data.get("data", {}).get("target", {})
-                    
-                    if not target:
-                        return {"error": f"타겟 {target_id}를 찾을 수 없습니다."}
-                    
-                    # 상세 정보 포맷팅
-                    return {
-                        "target_id": target.get("id"),
-                        "symbol": target.get("approvedSymbol"),
-                        "name": target.get("approvedName"),
-                        "biotype": target.get("biotype"),
-                        "chromosome": target.get("chromosome"),
-                        "genomic_location": {
-                            "start": target.get("start"),
-                            "end": target.get("end"),
-                            "strand": target.get("strand")
-                        },
-                        "description": target.get("description"),
-                        "function_descriptions": target.get("functionDescriptions", []),
-                        "synonyms": target.get("synonyms", []),
-                        "subcellular_locations": target.get("subcellularLocations", []),
-                        "pathways": [{"name": p.get("pathway"), "id": p.get("pathwayId")} 
-                                   for p in target.get("pathways", [])],
-                        "tractability": [{"category": t.get("label"), "score": t.get("value")} 
-                                       for t in target.get("tractability", [])]
-                    }
-                    
-            except httpx.HTTPError as e:
+                data = await get_graphql_client().execute(TARGET_DETAILS_QUERY, {"ensemblId": target_id})
+                target = data.get("target")
+                
+                if not target:
+                    return {"error": f"타겟 {target_id}를 찾을 수 없습니다."}
+                
+                # 상세 정보 포맷팅
+                return format_target_details(target)
+            
+            except (httpx.HTTPError, GraphQLError) as e:
+                logger.error(f"OpenTargets API 오류: {e}")
+                return {"error": f"API 요청 실패: {str(e)}"}
+            except Exception as e:
+                logger.error(f"예상치 못한 오류: {e}")
+                return {"error": f"예상치 못한 오류: {str(e)}"}
+        
+        @self.server.call_tool()
+        async def get_targets_details(target_ids: List[str]) -> Dict[str, Any]:
+            """
+            여러 타겟의 상세 정보를 한 번에 조회 (alias 배치 요청)
+            
+            Args:
+                target_ids: OpenTargets 타겟 ID 리스트 (예: ["ENSG00000141510", ...])
+            
+            Returns:
+                {타겟 ID: 타겟 상세 정보} (없는 ID는 {"error": ...})
+            """
+            try:
+                targets = await get_graphql_client().execute_batch(
+                    "GetTargetsDetails", "target", "ensemblId", "String!", TARGET_DETAILS_SELECTION, target_ids
+                )
+                return {
+                    target_id: format_target_details(target) if target else {"error": f"타겟 {target_id}를 찾을 수 없습니다."}
+                    for target_id, target in targets.items()
+                }
+            except (httpx.HTTPError, GraphQLError) as e:
                 logger.error(f"OpenTargets API 오류: {e}")
                 return {"error": f"API 요청 실패: {str(e)}"}
             except Exception as e:
@@ -223,56 +402,29 @@ class OpenTargetsMCPServer:
                 검색된 질병 정보 리스트
             """
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.base_url}/graphql",
-                        params={
-                            "query": f"""
-                            query SearchDiseases {{
-                                search(queryString: "{query}", entityNames: ["disease"]) {{
-                                    hits {{
-                                        id
-                                        name
-                                        description
-                                        object {{
-                                            ... on Disease {{
-                                                id
-                                                name
-                                                description
-                                                therapeuticAreas {{
-                                                    id
-                                                    name
-                                                }}
-                                                synonyms
-                                            }}
-                                        }}
-                                    }}
-                                }}
-                            }}
-                            """
-                        }
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    
-                    # 결과 포맷팅
-                    results = []
-                    hits = data.get("data", {}).get("search", {}).get("hits", [])
-                    
-                    for hit in hits[:limit]:
-                        disease_obj = hit.get("object", {})
-                        results.append({
-                            "disease_id": disease_obj.get("id"),
-                            "name": disease_obj.get("name"),
-                            "description": disease_obj.get("description"),
-                            "therapeutic_areas": [ta.get("name") for ta in disease_obj.get("therapeuticAreas", [])],
-                            "synonyms": disease_obj.get("synonyms", [])[:5]
-                        })
-                    
-                    return results
-                    
-            except httpx.HTTPError as e:
+                data = await get_graphql_client().execute(
+                    SEARCH_DISEASES_QUERY, {"queryString": query, "size": limit}
+                )
+                
+                # 결과 포맷팅
+                results = []
+                hits = (data.get("search") or {}).get("hits", [])
+                
+                for hit in hits:
+                    disease_obj = hit.get("object") or {}
+                    results.append({
+                        "disease_id": disease_obj.get("id"),
+                        "name": disease_obj.get("name"),
+                        "description": disease_obj.get("description"),
+                        "therapeutic_areas": [ta.get("name") for ta in disease_obj.get("therapeuticAreas") or []],
+                        "synonyms": (disease_obj.get("synonyms") or [])[:5],
+                        "mesh_ids": [xref.split(":", 1)[1] for xref in disease_obj.get("dbXRefs") or []
+                                     if xref.upper().startswith("MESH:")]
+                    })
+                
+                return results
+            
+            except (httpx.HTTPError, GraphQLError) as e:
                 logger.error(f"OpenTargets API 오류: {e}")
                 return [{"error": f"API 요청 실패: {str(e)}"}]
             except Exception as e:
@@ -292,60 +444,18 @@ class OpenTargetsMCPServer:
                 타겟과 연관된 질병 리스트
             """
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.base_url}/graphql",
-                        params={
-                            "query": f"""
-                            query GetTargetDiseases {{
-                                target(ensemblId: "{target_id}") {{
-                                    associatedDiseases(size: {limit}) {{
-                                        rows {{
-                                            disease {{
-                                                id
-                                                name
-                                                description
-                                            }}
-                                            score
-                                            datatypeScores {{
-                                                componentId
-                                                score
-                                            }}
-                                        }}
-                                    }}
-                                }}
-                            }}
-                            """
-                        }
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    target_data = data.get("data", {}).get("target", {})
-                    
-                    if not target_data:
-                        return [{"error": f"타겟 {target_id}를 찾을 수 없습니다."}]
-                    
-                    # 연관 질병 정보 포맷팅
-                    results = []
-                    rows = target_data.get("associatedDiseases", {}).get("rows", [])
-                    
-                    for row in rows:
-                        disease = row.get("disease", {})
-                        results.append({
-                            "disease_id": disease.get("id"),
-                            "disease_name": disease.get("name"),
-                            "description": disease.get("description"),
-                            "association_score": row.get("score"),
-                            "evidence_scores": {
-                                score.get("componentId"): score.get("score") 
-                                for score in row.get("datatypeScores", [])
-                            }
-                        })
-                    
-                    return results
-                    
-            except httpx.HTTPError as e:
+                total, rows = await get_graphql_client().paginate(
+                    TARGET_DISEASES_QUERY, {"ensemblId": target_id},
+                    ["target", "associatedDiseases"], limit
+                )
+                
+                if total is None:
+                    return [{"error": f"타겟 {target_id}를 찾을 수 없습니다."}]
+                
+                # 연관 질병 정보 포맷팅
+                return [format_disease_row(row) for row in rows]
+            
+            except (httpx.HTTPError, GraphQLError) as e:
                 logger.error(f"OpenTargets API 오류: {e}")
                 return [{"error": f"API 요청 실패: {str(e)}"}]
             except Exception as e:
@@ -365,68 +475,135 @@ class OpenTargetsMCPServer:
                 질병과 연관된 타겟 리스트
             """
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.base_url}/graphql",
-                        params={
-                            "query": f"""
-                            query GetDiseaseTargets {{
-                                disease(efoId: "{disease_id}") {{
-                                    associatedTargets(size: {limit}) {{
-                                        rows {{
-                                            target {{
-                                                id
-                                                approvedSymbol
-                                                approvedName
-                                                biotype
-                                            }}
-                                            score
-                                            datatypeScores {{
-                                                componentId
-                                                score
-                                            }}
-                                        }}
-                                    }}
-                                }}
-                            }}
-                            """
-                        }
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    disease_data = data.get("data", {}).get("disease", {})
-                    
-                    if not disease_data:
-                        return [{"error": f"질병 {disease_id}를 찾을 수 없습니다."}]
-                    
-                    # 연관 타겟 정보 포맷팅
-                    results = []
-                    rows = disease_data.get("associatedTargets", {}).get("rows", [])
-                    
-                    for row in rows:
-                        target = row.get("target", {})
-                        results.append({
-                            "target_id": target.get("id"),
-                            "symbol": target.get("approvedSymbol"),
-                            "name": target.get("approvedName"),
-                            "biotype": target.get("biotype"),
-                            "association_score": row.get("score"),
-                            "evidence_scores": {
-                                score.get("componentId"): score.get("score") 
-                                for score in row.get("datatypeScores", [])
-                            }
-                        })
-                    
-                    return results
-                    
-            except httpx.HTTPError as e:
+                total, rows = await get_graphql_client().paginate(
+                    DISEASE_TARGETS_QUERY, {"efoId": disease_id},
+                    ["disease", "associatedTargets"], limit
+                )
+                
+                if total is None:
+                    return [{"error": f"질병 {disease_id}를 찾을 수 없습니다."}]
+                
+                # 연관 타겟 정보 포맷팅
+                return [format_target_row(row) for row in rows]
+            
+            except (httpx.HTTPError, GraphQLError) as e:
                 logger.error(f"OpenTargets API 오류: {e}")
                 return [{"error": f"API 요청 실패: {str(e)}"}]
             except Exception as e:
                 logger.error(f"예상치 못한 오류: {e}")
                 return [{"error": f"예상치 못한 오류: {str(e)}"}]
         
+        @self.server.call_tool()
+        async def get_targets_associated_diseases(target_ids: List[str], limit: int = 10) -> Dict[str, Any]:
+            """
+            여러 타겟의 연관 질병을 한 번에 조회 (alias 배치 요청)
+            
+            Args:
+                target_ids: OpenTargets 타겟 ID 리스트
+                limit: 타겟별 최대 결과 수 (최대 500)
+            
+            Returns:
+                {타겟 ID: {"total": 전체 연관 수, "associations": 연관 질병 리스트}}
+            """
+            try:
+                return await batch_associations(
+                    "GetTargetsDiseases", "target", "ensemblId", TARGET_DISEASES_SELECTION,
+                    "associatedDiseases", target_ids, limit, format_disease_row
+                )
+            except (httpx.HTTPError, GraphQLError) as e:
+                logger.error(f"OpenTargets API 오류: {e}")
+                return {"error": f"API 요청 실패: {str(e)}"}
+            except Exception as e:
+                logger.error(f"예상치 못한 오류: {e}")
+                return {"error": f"예상치 못한 오류: {str(e)}"}
+        
+        @self.server.call_tool()
+        async def get_diseases_associated_targets(disease_ids: List[str], limit: int = 10) -> Dict[str, Any]:
+            """
+            여러 질병의 연관 타겟을 한 번에 조회 (alias 배치 요청)
+            
+            Args:
+                disease_ids: OpenTargets 질병 ID 리스트
+                limit: 질병별 최대 결과 수 (최대 500)
+            
+            Returns:
+                {질병 ID: {"total": 전체 연관 수, "associations": 연관 타겟 리스트}}
+            """
+            try:
+                return await batch_associations(
+                    "GetDiseasesTargets", "disease", "efoId", DISEASE_TARGETS_SELECTION,
+                    "associatedTargets", disease_ids, limit, format_target_row
+                )
+            except (httpx.HTTPError, GraphQLError) as e:
+                logger.error(f"OpenTargets API 오류: {e}")
+                return {"error": f"API 요청 실패: {str(e)}"}
+            except Exception as e:
+                logger.error(f"예상치 못한 오류: {e}")
+                return {"error": f"예상치 못한 오류: {str(e)}"}
+        
+        @self.server.call_tool()
+        async def top_targets_for_disease(disease_id: str, k: int = 20) -> List[Dict[str, Any]]:
+            """
+            오프라인 association 행렬에서 질병별 상위 k개 타겟 조회 (네트워크 없음)
+            
+            Args:
+                disease_id: OpenTargets 질병 ID (예: EFO_0000305)
+                k: 반환할 타겟 수
+            
+            Returns:
+                점수 순 타겟 리스트
+            """
+            matrix = get_association_matrix()
+            if matrix is None:
+                return [{"error": "오프라인 association 행렬이 없습니다 (OPENTARGETS_MATRIX_DIR 설정 필요)."}]
+            ranking = matrix.top_targets(disease_id, k)
+            if ranking is None:
+                return [{"error": f"질병 {disease_id}를 찾을 수 없습니다."}]
+            return ranking
+        
+        @self.server.call_tool()
+        async def top_diseases_for_target(target_id: str, k: int = 20) -> List[Dict[str, Any]]:
+            """
+            오프라인 association 행렬에서 타겟별 상위 k개 질병 조회 (네트워크 없음)
+            
+            Args:
+                target_id: OpenTargets 타겟 ID (예: ENSG00000146648)
+                k: 반환할 질병 수
+            
+            Returns:
+                점수 순 질병 리스트
+            """
+            matrix = get_association_matrix()
+            if matrix is None:
+                return [{"error": "오프라인 association 행렬이 없습니다 (OPENTARGETS_MATRIX_DIR 설정 필요)."}]
+            ranking = matrix.top_diseases(target_id, k)
+            if ranking is None:
+                return [{"error": f"타겟 {target_id}를 찾을 수 없습니다."}]
+            return ranking
+        
+        @self.server.call_tool()
+        async def rank_targets_for_diseases(disease_ids: List[str], k: int = 20, method: str = "mean",
+                                            weights: Optional[List[float]] = None) -> Dict[str, Any]:
+            """
+            여러 질병에 걸친 타겟 통합 순위 (오프라인 association 행렬)
+            
+            Args:
+                disease_ids: OpenTargets 질병 ID 리스트
+                k: 반환할 타겟 수
+                method: 점수 통합 방식 (sum, mean, max)
+                weights: 질병별 가중치 (선택, disease_ids와 같은 순서)
+            
+            Returns:
+                통합 점수 순 타겟 리스트와 찾지 못한 질병 ID
+            """
+            matrix = get_association_matrix()
+            if matrix is None:
+                return {"error": "오프라인 association 행렬이 없습니다 (OPENTARGETS_MATRIX_DIR 설정 필요)."}
+            try:
+                return matrix.rank_targets(disease_ids, k, method, weights)
+            except ValueError as e:
+                return {"error": str(e)}
+        
         @self.server.call_tool()
         async def search_drugs(query: str, limit: int = 10) -> List[Dict[str, Any]]:
             """
@@ -440,60 +617,31 @@ class OpenTargetsMCPServer:
                 검색된 약물 정보 리스트
             """
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.base_url}/graphql",
-                        params={
-                            "query": f"""
-                            query SearchDrugs {{
-                                search(queryString: "{query}", entityNames: ["drug"]) {{
-                                    hits {{
-                                        id
-                                        name
-                                        description
-                                        object {{
-                                            ... on Drug {{
-                                                id
-                                                name
-                                                type
-                                                maximumClinicalTrialPhase
-                                                hasBeenWithdrawn
-                                                withdrawnNotice
-                                                synonyms
-                                                tradeNames
-                                            }}
-                                        }}
-                                    }}
-                                }}
-                            }}
-                            """
-                        }
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    
-                    # 결과 포맷팅
-                    results = []
-                    hits = data.get("data", {}).get("search", {}).get("hits", [])
-                    
-                    for hit in hits[:limit]:
-                        drug_obj = hit.get("object", {})
-                        results.append({
-                            "drug_id": drug_obj.get("id"),
-                            "name": drug_obj.get("name"),
-                            "description": hit.get("description"),
-                            "type": drug_obj.get("type"),
-                            "clinical_trial_phase": drug_obj.get("maximumClinicalTrialPhase"),
-                            "withdrawn": drug_obj.get("hasBeenWithdrawn"),
-                            "withdrawn_notice": drug_obj.get("withdrawnNotice"),
-                            "synonyms": drug_obj.get("synonyms", [])[:5],
-                            "trade_names": drug_obj.get("tradeNames", [])[:5]
-                        })
-                    
-                    return results
-                    
-            except httpx.HTTPError as e:
+                data = await get_graphql_client().execute(
+                    SEARCH_DRUGS_QUERY, {"queryString": query, "size": limit}
+                )
+                
+                # 결과 포맷팅
+                results = []
+                hits = (data.get("search") or {}).get("hits", [])
+                
+                for hit in hits:
+                    drug_obj = hit.get("object") or {}
+                    results.append({
+                        "drug_id": drug_obj.get("id"),
+                        "name": drug_obj.get("name"),
+                        "description": hit.get("description"),
+                        "type": drug_obj.get("type"),
+                        "clinical_trial_phase": drug_obj.get("maximumClinicalTrialPhase"),
+                        "withdrawn": drug_obj.get("hasBeenWithdrawn"),
+                        "withdrawn_notice": drug_obj.get("withdrawnNotice"),
+                        "synonyms": (drug_obj.get("synonyms") or [])[:5],
+                        "trade_names": (drug_obj.get("tradeNames") or [])[:5]
+                    })
+                
+                return results
+            
+            except (httpx.HTTPError, GraphQLError) as e:
                 logger.error(f"OpenTargets API 오류: {e}")
                 return [{"error": f"API 요청 실패: {str(e)}"}]
             except Exception as e:
@@ -502,6 +650,7 @@ class OpenTargetsMCPServer:
 
 async def main():
     """OpenTargets MCP 서버 실행"""
+    logging.basicConfig(level=logging.INFO)
     logger.info("OpenTargets MCP Server 시작...")
     
     # 서버 인스턴스 생성
@@ -2,6 +2,6 @@
 MCP Protocol Messages and Types
 """
 
-from .messages import MCPMessage, MCPRequest, MCPResponse, MCPError
+from .messages import MCPMessage, MCPRequest, MCPResponse, MCPNotification, MCPError
 
-__all__ = ["MCPMessage", "MCPRequest", "MCPResponse", "MCPError"]
\ No newline at end of file
+__all__ = ["MCPMessage", "MCPRequest", "MCPResponse", "MCPNotification", "MCPError"]
\ No newline at end of file
@@ -18,7 +18,12 @@ class MCPMethod(Enum):
     INITIALIZE = "initialize"
     TOOLS_LIST = "tools/list"
     TOOLS_CALL = "tools/call"
+    RESOURCES_READ = "resources/read"
     PING = "ping"
+    NOTIFICATION_INITIALIZED = "notifications/initialized"
+    NOTIFICATION_CANCELLED = "notifications/cancelled"
+    NOTIFICATION_PROGRESS = "notifications/progress"
+    NOTIFICATION_PARTIAL_RESULT = "notifications/partialResult"
 
 
 class MCPMessage:
@@ -83,6 +88,7 @@ class MCPErrorCode(Enum):
     METHOD_NOT_FOUND = -32601
     INVALID_PARAMS = -32602
     INTERNAL_ERROR = -32603
+    RESOURCE_NOT_FOUND = -32002
     SERVER_ERROR_START = -32099
     SERVER_ERROR_END = -32000
 
@@ -3,15 +3,19 @@
 from .pubmed_mcp import (
     search_pubmed,
     get_article_details,
+    get_articles_details,
     find_related_articles,
     search_by_author,
-    get_citations
+    get_citations,
+    bulk_fetch_articles
 )
 
 __all__ = [
     'search_pubmed',
     'get_article_details', 
+    'get_articles_details',
     'find_related_articles',
     'search_by_author',
-    'get_citations'
+    'get_citations',
+    'bulk_fetch_articles'
 ]
\ No newline at end of file
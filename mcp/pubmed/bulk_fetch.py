@@ -0,0 +1,186 @@
+"""
+Bulk PubMed retrieval through the E-utilities history server
+
+ESearch stores the full result set on the history server (WebEnv/query_key);
+EFetch then pages through it in chunks. Each page is parsed incrementally with
+XMLPullParser while it downloads, and every PubmedArticle is released as soon as
+its compact record has been yielded, so memory stays flat for large result sets.
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from mcp.pubmed.entrez_scheduler import EntrezScheduler, get_entrez_scheduler
+
+
+DATABASE = "pubmed"
+TOOL_NAME = "GAIA-MCP-PubMed"
+EMAIL = "research@gaia-bt.com"
+
+MONTHS = {"jan": "01", "feb": "02", "mar": "03", "apr": "04", "may": "05", "jun": "06",
+          "jul": "07", "aug": "08", "sep": "09", "oct": "10", "nov": "11", "dec": "12"}
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    """All text inside an element (titles/abstracts can contain <i>, <sup> ...)"""
+    if element is None:
+        return ""
+    return "".join(element.itertext()).strip()
+
+
+def _pub_date(article: ET.Element) -> str:
+    pub_date = article.find("Journal/JournalIssue/PubDate")
+    if pub_date is None:
+        return ""
+    year = pub_date.findtext("Year")
+    if not year:
+        return pub_date.findtext("MedlineDate", "")
+    month = pub_date.findtext("Month", "")
+    month = MONTHS.get(month[:3].lower(), month.zfill(2) if month.isdigit() else "")
+    day = pub_date.findtext("Day", "")
+    return "-".join(part for part in (year, month, day.zfill(2) if day else "") if part)
+
+
+def parse_pubmed_article(element: ET.Element) -> Optional[Dict[str, Any]]:
+    """Compact record from a <PubmedArticle> element"""
+    citation = element.find("MedlineCitation")
+    if citation is None:
+        return None
+    article = citation.find("Article")
+    if article is None:
+        return None
+
+    abstract_parts = []
+    for part in article.findall("Abstract/AbstractText"):
+        text = _text(part)
+        label = part.get("Label")
+        abstract_parts.append(f"{label}: {text}" if label else text)
+
+    doi = ""
+    for article_id in element.findall("PubmedData/ArticleIdList/ArticleId"):
+        if article_id.get("IdType") == "doi":
+            doi = (article_id.text or "").strip()
+            break
+    if not doi:
+        for location in article.findall("ELocationID"):
+            if location.get("EIdType") == "doi":
+                doi = (location.text or "").strip()
+                break
+
+    authors = []
+    for author in article.findall("AuthorList/Author"):
+        last_name = author.findtext("LastName")
+        if last_name:
+            authors.append(f"{last_name} {author.findtext('Initials', '')}".strip())
+        elif author.findtext("CollectiveName"):
+            authors.append(author.findtext("CollectiveName"))
+
+    return {
+        "pmid": citation.findtext("PMID", ""),
+        "title": _text(article.find("ArticleTitle")),
+        "authors": authors,
+        "abstract": "\n".join(abstract_parts),
+        "mesh": [_text(heading.find("DescriptorName"))
+                 for heading in citation.findall("MeshHeadingList/MeshHeading")],
+        "doi": doi,
+        "date": _pub_date(article),
+        "journal": article.findtext("Journal/Title", "")
+    }
+
+
+class PubmedXMLStream:
+    """Incremental PubmedArticleSet parser: feed() bytes, get finished article elements back"""
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: Optional[ET.Element] = None
+
+    def feed(self, data: bytes) -> Iterator[ET.Element]:
+        """Feed a chunk and yield each completed top-level article element"""
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> Iterator[ET.Element]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> Iterator[ET.Element]:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+                continue
+            if element.tag in ("PubmedArticle", "PubmedBookArticle", "DeleteCitation"):
+                yield element
+                # 처리한 article은 트리에서 제거해 메모리 사용량을 일정하게 유지
+                if self._root is not None and len(self._root) and self._root[0] is element:
+                    self._root.remove(element)
+                else:
+                    element.clear()
+
+
+async def search_history(query: str, scheduler: Optional[EntrezScheduler] = None) -> Dict[str, Any]:
+    """Run ESearch with usehistory=y and return count, WebEnv and query_key"""
+    scheduler = scheduler or get_entrez_scheduler()
+    result = await scheduler.request("esearch", {
+        "db": DATABASE, "tool": TOOL_NAME, "email": EMAIL,
+        "term": query, "usehistory": "y", "retmax": 0, "retmode": "json"
+    })
+    search = result.get("esearchresult", {})
+    if "ERROR" in search:
+        raise RuntimeError(search["ERROR"])
+    return {
+        "count": int(search.get("count", 0)),
+        "webenv": search.get("webenv"),
+        "query_key": search.get("querykey")
+    }
+
+
+async def iter_pubmed_records(query: str,
+                              max_records: Optional[int] = None,
+                              chunk_size: int = 500,
+                              scheduler: Optional[EntrezScheduler] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream compact article records for every hit of ``query``.
+
+    Args:
+        query: PubMed search query
+        max_records: Stop after this many records (default: all hits)
+        chunk_size: Records per EFetch page (NCBI allows up to 10000)
+    """
+    scheduler = scheduler or get_entrez_scheduler()
+    history = await search_history(query, scheduler)
+    if not history["webenv"]:
+        return
+
+    total = history["count"] if max_records is None else min(history["count"], max_records)
+    emitted = 0
+    for retstart in range(0, total, chunk_size):
+        params = {
+            "db": DATABASE, "tool": TOOL_NAME, "email": EMAIL,
+            "WebEnv": history["webenv"], "query_key": history["query_key"],
+            "retstart": retstart, "retmax": min(chunk_size, total - retstart),
+            "retmode": "xml"
+        }
+        stream = PubmedXMLStream()
+        chunks = scheduler.stream("efetch", params)
+        try:
+            async for chunk in chunks:
+                for element in stream.feed(chunk):
+                    record = parse_pubmed_article(element)
+                    if record is None:
+                        continue
+                    yield record
+                    emitted += 1
+                    if emitted >= total:
+                        return
+        finally:
+            # 조기 종료 시에도 HTTP 응답을 즉시 닫음
+            await chunks.aclose()
+        for element in stream.close():
+            record = parse_pubmed_article(element)
+            if record is not None:
+                yield record
+                emitted += 1
+                if emitted >= total:
+                    return
+
@@ -0,0 +1,257 @@
+"""
+Rate-limited request scheduler for NCBI E-utilities
+
+NCBI allows 3 requests/second per client (10 with an API key). All Entrez calls
+from the PubMed tools go through one token bucket so concurrent searches use the
+full budget without tripping 429s, and concurrent esummary/efetch calls for
+different PMIDs are merged into one comma-joined request.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from mcp.common.http_cache import fresh_response
+from mcp.common.http_client import get_http_client
+
+
+ENTREZ_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+# 요청별 타임아웃 (공유 클라이언트 기본값 대신 기존 E-utilities 요청 한도 유지)
+REQUEST_TIMEOUT = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket; capacity 1 spaces requests evenly at ``rate`` per second"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait for a token (callers are served in FIFO order)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for ``seconds`` (after a 429 / Retry-After)"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class _Batch:
+    def __init__(self, params: Dict[str, Any], is_json: bool):
+        self.params = params
+        self.is_json = is_json
+        self.ids: Dict[str, None] = {}  # 순서 유지 + 중복 제거
+        self.waiters: List[Tuple[List[str], asyncio.Future]] = []
+
+
+class EntrezScheduler:
+    """Token-bucket scheduler with ID micro-batching for E-utilities requests"""
+
+    # esummary(JSON)와 efetch(XML)만 PMID 단위로 결과를 나눌 수 있음
+    BATCHABLE = {"esummary": "json", "efetch": "xml"}
+
+    def __init__(self,
+                 base_url: str = ENTREZ_BASE_URL,
+                 api_key: Optional[str] = None,
+                 rate: Optional[float] = None,
+                 batch_window: float = 0.05,
+                 max_batch_size: int = 200,
+                 max_retries: int = 4):
+        self.base_url = base_url
+        self.api_key = api_key if api_key is not None else os.getenv("NCBI_API_KEY")
+        self.rate = rate or (10.0 if self.api_key else 3.0)
+        self.bucket = TokenBucket(self.rate)
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self._batches: Dict[Tuple, _Batch] = {}
+        self.stats = {"requests": 0, "http_calls": 0, "batched_requests": 0, "throttled": 0, "cache_hits": 0}
+
+    async def request(self, endpoint: str, params: Dict[str, Any], is_json: bool = True) -> Any:
+        """Run an E-utilities request; returns parsed JSON or response text"""
+        self.stats["requests"] += 1
+        if self._batchable(endpoint, params):
+            return await self._enqueue(endpoint, params, is_json)
+        return await self._call(endpoint, params, is_json)
+
+    def _batchable(self, endpoint: str, params: Dict[str, Any]) -> bool:
+        retmode = self.BATCHABLE.get(endpoint)
+        return (retmode is not None and params.get("retmode") == retmode and
+                bool(str(params.get("id", "")).strip()) and "WebEnv" not in params)
+
+    async def _enqueue(self, endpoint: str, params: Dict[str, Any], is_json: bool) -> Any:
+        """Join (or open) the pending batch for requests that differ only by id"""
+        ids = [pmid.strip() for pmid in str(params["id"]).split(",") if pmid.strip()]
+        base_params = {k: v for k, v in params.items() if k not in ("id", "retmax")}
+        key = (endpoint, is_json, tuple(sorted((k, str(v)) for k, v in base_params.items())))
+
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(key)
+        if batch is None or len(batch.ids) + len(ids) > self.max_batch_size:
+            batch = _Batch(base_params, is_json)
+            self._batches[key] = batch
+            loop.call_later(self.batch_window, self._flush, endpoint, key, batch)
+
+        future = loop.create_future()
+        batch.waiters.append((ids, future))
+        batch.ids.update(dict.fromkeys(ids))
+        return await future
+
+    def _flush(self, endpoint: str, key: Tuple, batch: _Batch):
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+        asyncio.ensure_future(self._run_batch(endpoint, batch))
+
+    async def _run_batch(self, endpoint: str, batch: _Batch):
+        waiters = [(ids, future) for ids, future in batch.waiters if not future.done()]
+        if not waiters:
+            return
+
+        params = dict(batch.params)
+        params["id"] = ",".join(batch.ids)
+        if endpoint == "esummary":
+            params["retmax"] = len(batch.ids)
+        if len(waiters) > 1:
+            self.stats["batched_requests"] += len(waiters)
+
+        try:
+            data = await self._call(endpoint, params, batch.is_json)
+        except Exception as e:
+            for _, future in waiters:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for ids, future in waiters:
+            if future.done():
+                continue
+            try:
+                future.set_result(data if len(waiters) == 1 else self._split(endpoint, data, ids))
+            except Exception as e:
+                future.set_exception(e)
+
+    @staticmethod
+    def _split(endpoint: str, data: Any, ids: List[str]) -> Any:
+        """Cut a merged response down to one caller's PMIDs"""
+        if endpoint == "esummary":
+            if not isinstance(data, dict) or "result" not in data:
+                return data
+            result = data["result"]
+            found = [pmid for pmid in ids if pmid in result]
+            subset: Dict[str, Any] = {"uids": found}
+            subset.update({pmid: result[pmid] for pmid in found})
+            return {"header": data.get("header", {}), "result": subset}
+
+        # efetch XML: PubmedArticle 단위로 분리
+        root = ET.fromstring(data)
+        wanted = set(ids)
+        article_set = ET.Element(root.tag)
+        for article in root:
+            pmid = article.findtext(".//PMID")
+            if pmid in wanted:
+                article_set.append(article)
+        return ET.tostring(article_set, encoding="unicode")
+
+    async def _call(self, endpoint: str, params: Dict[str, Any], is_json: bool) -> Any:
+        """Single rate-limited HTTP call with 429/503 backoff"""
+        url, params = self._prepare(endpoint, params)
+        # 디스크 캐시에 신선한 응답이 있으면 요청 예산을 쓰지 않음
+        cached = await fresh_response("GET", url, params)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached.json() if is_json else cached.text
+        
+        client = get_http_client(self.base_url)
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self.stats["http_calls"] += 1
+            response = await client.get(url, params=params, timeout=REQUEST_TIMEOUT)
+
+            if response.status_code in (429, 503) and attempt < self.max_retries:
+                self._back_off(endpoint, response, attempt)
+                continue
+
+            response.raise_for_status()
+            return response.json() if is_json else response.text
+
+    async def stream(self, endpoint: str, params: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """Rate-limited request whose body is yielded in chunks (for large efetch pages)"""
+        self.stats["requests"] += 1
+        url, params = self._prepare(endpoint, params)
+        client = get_http_client(self.base_url)
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self.stats["http_calls"] += 1
+            # 대용량 스트리밍 응답은 캐시를 거치지 않음
+            async with client.stream("GET", url, params=params, timeout=REQUEST_TIMEOUT,
+                                     extensions={"http_cache": False}) as response:
+                if response.status_code in (429, 503) and attempt < self.max_retries:
+                    self._back_off(endpoint, response, attempt)
+                    continue
+
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+                return
+
+    def _prepare(self, endpoint: str, params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        params = dict(params)
+        if self.api_key:
+            params.setdefault("api_key", self.api_key)
+        return f"{self.base_url}/{endpoint}.fcgi", params
+
+    def _back_off(self, endpoint: str, response, attempt: int):
+        """Pause the bucket after a throttled response"""
+        delay = self._retry_after(response)
+        if delay is None:
+            delay = min(2 ** attempt, 30) * (0.5 + random.random() / 2)
+        self.stats["throttled"] += 1
+        logger.warning(f"E-utilities {endpoint} throttled ({response.status_code}), retrying in {delay:.1f}s")
+        self.bucket.pause(delay)
+
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+
+
+_scheduler: Optional[EntrezScheduler] = None
+_scheduler_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_entrez_scheduler() -> EntrezScheduler:
+    """Process-wide scheduler shared by every PubMed tool (one per event loop)"""
+    global _scheduler, _scheduler_loop
+    loop = asyncio.get_event_loop()
+    if _scheduler is None or _scheduler_loop is not loop:
+        _scheduler = EntrezScheduler()
+        _scheduler_loop = loop
+    return _scheduler
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Offline PubMed mirror backed by SQLite FTS5
+
+Loads PubMed baseline/update XML files (plain or .gz) into a compact SQLite
+database with a full-text index over title, abstract, MeSH terms and authors.
+Update files are applied incrementally: newer versions of a citation replace the
+old row and <DeleteCitation> entries remove it. Files already ingested are skipped.
+
+Usage:
+    python -m mcp.pubmed.local_index ingest --db pubmed.db /data/pubmed/baseline /data/pubmed/updatefiles
+    python -m mcp.pubmed.local_index search --db pubmed.db "asthma AND children"
+    python -m mcp.pubmed.local_index stats --db pubmed.db
+
+Set PUBMED_LOCAL_DB to the database path to let the PubMed MCP tools answer from it.
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from mcp.pubmed.bulk_fetch import PubmedXMLStream, parse_pubmed_article
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    pmid INTEGER PRIMARY KEY,
+    title TEXT,
+    abstract TEXT,
+    authors TEXT,
+    mesh TEXT,
+    doi TEXT,
+    date TEXT,
+    journal TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, abstract, mesh, authors,
+    content='articles', content_rowid='pmid'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, abstract, mesh, authors)
+    VALUES (new.pmid, new.title, new.abstract, new.mesh, new.authors);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, abstract, mesh, authors)
+    VALUES ('delete', old.pmid, old.title, old.abstract, old.mesh, old.authors);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, abstract, mesh, authors)
+    VALUES ('delete', old.pmid, old.title, old.abstract, old.mesh, old.authors);
+    INSERT INTO articles_fts(rowid, title, abstract, mesh, authors)
+    VALUES (new.pmid, new.title, new.abstract, new.mesh, new.authors);
+END;
+CREATE TABLE IF NOT EXISTS ingested_files (
+    name TEXT PRIMARY KEY,
+    ingested_at REAL,
+    records INTEGER,
+    deletions INTEGER
+);
+"""
+
+UPSERT = """
+INSERT INTO articles (pmid, title, abstract, authors, mesh, doi, date, journal)
+VALUES (:pmid, :title, :abstract, :authors, :mesh, :doi, :date, :journal)
+ON CONFLICT(pmid) DO UPDATE SET
+    title = excluded.title, abstract = excluded.abstract, authors = excluded.authors,
+    mesh = excluded.mesh, doi = excluded.doi, date = excluded.date, journal = excluded.journal
+"""
+
+# PubMed 필드 태그 -> FTS5 컬럼
+FIELD_COLUMNS = {
+    "ti": "title", "title": "title",
+    "ab": "abstract", "abstract": "abstract",
+    "tiab": "{title abstract}", "title/abstract": "{title abstract}",
+    "mh": "mesh", "mesh": "mesh", "mesh terms": "mesh", "majr": "mesh",
+    "au": "authors", "author": "authors",
+}
+
+_QUERY_TOKEN = re.compile(r'"[^"]*"(?:\[[^\]]+\])?|\(|\)|[^\s()"]+(?:\[[^\]]+\])?')
+
+
+def to_fts_query(query: str) -> str:
+    """Translate a simple PubMed-style query into FTS5 MATCH syntax.
+
+    Boolean operators and parentheses are kept, field tags such as [ti], [mh]
+    or [au] become column filters, and every other term is quoted.
+    """
+    parts = []
+    for token in _QUERY_TOKEN.findall(query):
+        if token in ("(", ")") or token.upper() in ("AND", "OR", "NOT"):
+            parts.append(token.upper() if token not in ("(", ")") else token)
+            continue
+
+        field = None
+        match = re.match(r'^(.*)\[([^\]]+)\]$', token)
+        if match:
+            token, field = match.group(1), match.group(2).lower()
+
+        term = token.strip('"').replace('"', '')
+        if not term:
+            continue
+        if term.endswith("*"):
+            phrase = f'"{term[:-1]}"*'
+        else:
+            phrase = f'"{term}"'
+        column = FIELD_COLUMNS.get(field or "")
+        parts.append(f"{column}: {phrase}" if column else phrase)
+
+    return " ".join(parts)
+
+
+def _open_xml(path: Path):
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def _xml_files(paths: List[str]) -> List[Path]:
+    """Expand directories to their PubMed XML files in name order (baseline before updates)"""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.name.endswith((".xml", ".xml.gz"))))
+        else:
+            files.append(path)
+    return files
+
+
+class PubmedLocalIndex:
+    """SQLite FTS5 mirror of PubMed citations"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------ ingest
+
+    def _iter_file(self, path: Path) -> Iterator[Tuple[str, Any]]:
+        """Yield ("article", record) and ("delete", [pmids]) items from one XML file"""
+        stream = PubmedXMLStream()
+        with _open_xml(path) as f:
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                for element in stream.feed(chunk):
+                    yield self._classify(element)
+        for element in stream.close():
+            yield self._classify(element)
+
+    @staticmethod
+    def _classify(element) -> Tuple[str, Any]:
+        if element.tag == "DeleteCitation":
+            return "delete", [pmid.text.strip() for pmid in element.findall("PMID") if pmid.text]
+        return "article", parse_pubmed_article(element)
+
+    def ingest_file(self, path: Path, force: bool = False, batch_size: int = 5000) -> Dict[str, int]:
+        """Load one baseline/update file; returns counts of upserted and deleted citations"""
+        name = path.name
+        if not force and self.conn.execute(
+                "SELECT 1 FROM ingested_files WHERE name = ?", (name,)).fetchone():
+            logger.info(f"Skipping already ingested file: {name}")
+            return {"records": 0, "deletions": 0, "skipped": 1}
+
+        records = deletions = 0
+        pending: List[Dict[str, Any]] = []
+        with self.conn:
+            for kind, value in self._iter_file(path):
+                if kind == "article":
+                    if not value or not value["pmid"]:
+                        continue
+                    pending.append({
+                        **value,
+                        "pmid": int(value["pmid"]),
+                        "authors": "; ".join(value["authors"]),
+                        "mesh": "; ".join(value["mesh"])
+                    })
+                    if len(pending) >= batch_size:
+                        self.conn.executemany(UPSERT, pending)
+                        records += len(pending)
+                        pending = []
+                else:
+                    # 삭제 전에 대기 중인 레코드를 먼저 반영 (파일 내 순서 유지)
+                    if pending:
+                        self.conn.executemany(UPSERT, pending)
+                        records += len(pending)
+                        pending = []
+                    self.conn.executemany("DELETE FROM articles WHERE pmid = ?",
+                                          [(int(pmid),) for pmid in value])
+                    deletions += len(value)
+
+            if pending:
+                self.conn.executemany(UPSERT, pending)
+                records += len(pending)
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ingested_files (name, ingested_at, records, deletions) VALUES (?, ?, ?, ?)",
+                (name, time.time(), records, deletions)
+            )
+
+        logger.info(f"Ingested {name}: {records} records, {deletions} deletions")
+        return {"records": records, "deletions": deletions, "skipped": 0}
+
+    def ingest(self, paths: List[str], force: bool = False) -> Dict[str, int]:
+        """Ingest files and/or directories of PubMed XML"""
+        totals = {"files": 0, "records": 0, "deletions": 0, "skipped": 0}
+        for path in _xml_files(paths):
+            result = self.ingest_file(path, force=force)
+            totals["files"] += 1
+            for key in ("records", "deletions", "skipped"):
+                totals[key] += result[key]
+        self.conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')")
+        self.conn.commit()
+        return totals
+
+    # ------------------------------------------------------------------ query
+
+    def search(self, query: str, limit: int = 10) -> Tuple[int, List[Dict[str, Any]]]:
+        """Full-text search ranked by BM25; returns (total matches, top records)"""
+        fts_query = to_fts_query(query)
+        if not fts_query:
+            return 0, []
+        try:
+            total = self.conn.execute(
+                "SELECT count(*) FROM articles_fts WHERE articles_fts MATCH ?", (fts_query,)
+            ).fetchone()[0]
+            rows = self.conn.execute(
+                """SELECT a.* FROM articles_fts f JOIN articles a ON a.pmid = f.rowid
+                   WHERE articles_fts MATCH ? ORDER BY bm25(articles_fts, 10.0, 1.0, 5.0, 2.0) LIMIT ?""",
+                (fts_query, limit)
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Local FTS query failed for '{query}' ({fts_query}): {e}")
+            return 0, []
+        return total, [self._row_to_record(row) for row in rows]
+
+    def get(self, pmid: str) -> Optional[Dict[str, Any]]:
+        if not str(pmid).strip().isdigit():
+            return None
+        row = self.conn.execute("SELECT * FROM articles WHERE pmid = ?", (int(pmid),)).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def get_many(self, pmids: List[str]) -> Dict[str, Dict[str, Any]]:
+        ids = [int(pmid) for pmid in pmids if str(pmid).strip().isdigit()]
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        rows = self.conn.execute(f"SELECT * FROM articles WHERE pmid IN ({placeholders})", ids).fetchall()
+        return {str(row["pmid"]): self._row_to_record(row) for row in rows}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "articles": self.conn.execute("SELECT count(*) FROM articles").fetchone()[0],
+            "files": self.conn.execute("SELECT count(*) FROM ingested_files").fetchone()[0],
+            "db_size_mb": round(os.path.getsize(self.db_path) / (1024 * 1024), 1)
+        }
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record["pmid"] = str(record["pmid"])
+        record["authors"] = [a for a in (record.get("authors") or "").split("; ") if a]
+        record["mesh"] = [m for m in (record.get("mesh") or "").split("; ") if m]
+        return record
+
+
+_index: Optional[PubmedLocalIndex] = None
+
+
+def get_local_index() -> Optional[PubmedLocalIndex]:
+    """Index configured through PUBMED_LOCAL_DB, or None when no mirror is set up"""
+    global _index
+    db_path = os.getenv("PUBMED_LOCAL_DB")
+    if not db_path or not os.path.exists(db_path):
+        return None
+    if _index is None or _index.db_path != db_path:
+        _index = PubmedLocalIndex(db_path)
+    return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline PubMed mirror (SQLite FTS5)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Load PubMed XML files or directories")
+    ingest_parser.add_argument("paths", nargs="+")
+    ingest_parser.add_argument("--db", required=True)
+    ingest_parser.add_argument("--force", action="store_true", help="Re-ingest files already loaded")
+
+    search_parser = subparsers.add_parser("search", help="Query the local index")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--db", required=True)
+    search_parser.add_argument("--limit", type=int, default=10)
+
+    stats_parser = subparsers.add_parser("stats", help="Show index statistics")
+    stats_parser.add_argument("--db", required=True)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    index = PubmedLocalIndex(args.db)
+    try:
+        if args.command == "ingest":
+            result = index.ingest(args.paths, force=args.force)
+        elif args.command == "search":
+            start = time.perf_counter()
+            total, records = index.search(args.query, args.limit)
+            result = {
+                "total": total,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+                "records": [{"pmid": r["pmid"], "title": r["title"]} for r in records]
+            }
+        else:
+            result = index.stats()
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
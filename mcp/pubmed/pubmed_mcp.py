@@ -7,15 +7,22 @@ Provides access to PubMed research database for scientific literature search.
 Supports paper search, abstract retrieval, author searches, and related articles.
 """
 
-import os
+import json
 import sys
-from typing import Any, List, Optional
-import httpx
+import xml.etree.ElementTree as ET
+from functools import partial
+from typing import Any, Dict, List, Optional, Union
 from pathlib import Path
 
 # Add the parent directory to sys.path to import from mcp package
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from mcp.pubmed.entrez_scheduler import get_entrez_scheduler
+from mcp.pubmed.bulk_fetch import iter_pubmed_records, parse_pubmed_article
+from mcp.common.exports import resolve_export_path
+from mcp.common.structured import wants_structured
+from mcp.common.local_mode import get_local_mode as resolve_local_mode
+
 try:
     from mcp.server.fastmcp import FastMCP
 except ImportError:
@@ -51,12 +58,24 @@ except ImportError:
                 
             async def run(self):
                 # Run the server
-                from mcp.server.stdio import stdio_server
                 async with stdio_server() as (read_stream, write_stream):
                     await self.server.run(read_stream, write_stream)
     except ImportError:
-        print("Error: Could not import MCP server components")
-        sys.exit(1)
+        # MCP 서버 구성요소가 없으면 툴 등록만 하는 기본 클래스 제공 (in-process 호스트용)
+        class FastMCP:
+            def __init__(self, name: str, working_dir: str = None):
+                self.name = name
+                self.working_dir = working_dir
+                self.tools = []
+                
+            def tool(self):
+                def decorator(func):
+                    self.tools.append((None, func))
+                    return func
+                return decorator
+                
+            async def run(self):
+                raise RuntimeError("Could not import MCP server components")
 
 # Initialize FastMCP server
 mcp = FastMCP("pubmed-mcp", working_dir=str(Path(__file__).parent))
@@ -68,9 +87,11 @@ TOOL_NAME = "GAIA-MCP-PubMed"
 EMAIL = "research@gaia-bt.com"  # Required by NCBI
 
 async def make_entrez_request(endpoint: str, params: dict, is_json: bool = True) -> Any:
-    """Make a request to the Entrez API with proper error handling."""
-    url = f"{ENTREZ_BASE_URL}/{endpoint}.fcgi"
+    """Make a request to the Entrez API with proper error handling.
     
+    Requests are paced by the shared Entrez scheduler (3 req/s, 10 with NCBI_API_KEY),
+    and concurrent esummary calls for different PMIDs are merged into one request.
+    """
     # Add required parameters
     params.update({
         "db": DATABASE,
@@ -81,45 +102,120 @@ async def make_entrez_request(endpoint: str, params: dict, is_json: bool = True)
     if is_json:
         params["retmode"] = "json"
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, params=params, timeout=30.0)
-            response.raise_for_status()
-            
-            if is_json:
-                return response.json()
-            return response.text
-        except Exception as e:
-            return {"error": str(e)} if is_json else f"Error: {str(e)}"
+    try:
+        return await get_entrez_scheduler().request(endpoint, params, is_json)
+    except Exception as e:
+        return {"error": str(e)} if is_json else f"Error: {str(e)}"
+
+# 로컬 미러 선택 (PUBMED_MODE: remote | local | hybrid)
+get_local_mode = partial(resolve_local_mode, "PUBMED_MODE", "mcp.pubmed.local_index:get_local_index")
+
+def summary_record(pmid: str, article: dict) -> Dict[str, Any]:
+    """Typed record from an ESummary document (output_format="json")."""
+    doi = article.get("elocationid", "")
+    return {
+        "pmid": pmid,
+        "title": article.get("title"),
+        "authors": [a.get("name", "") for a in article.get("authors", [])],
+        "journal": article.get("source"),
+        "date": article.get("pubdate"),
+        "doi": doi.split("doi:", 1)[1].strip() if "doi:" in doi else None
+    }
+
+def summary_records(ids: List[str], summary_result: Any) -> List[Dict[str, Any]]:
+    summaries = summary_result.get("result", {}) if isinstance(summary_result, dict) else {}
+    return [summary_record(pmid, summaries[pmid]) for pmid in ids if pmid in summaries]
+
+def format_local_search(query: str, total: int, records: list) -> str:
+    """Format local index hits like the E-utilities search output."""
+    if not records:
+        return f"No articles found for query: {query}"
+    
+    output = [f"Found {total} articles (showing top {len(records)}) [local index]:"]
+    for article in records:
+        output.append(f"\n{'-'*60}")
+        output.append(f"PMID: {article['pmid']}")
+        output.append(f"Title: {article['title'] or 'N/A'}")
+        authors = article["authors"]
+        if authors:
+            author_names = authors[:3] + (["et al."] if len(authors) > 3 else [])
+            output.append(f"Authors: {', '.join(author_names)}")
+        output.append(f"Journal: {article['journal'] or 'N/A'}")
+        output.append(f"Date: {article['date'] or 'N/A'}")
+        if article["doi"]:
+            output.append(f"DOI: {article['doi']}")
+    return "\n".join(output)
+
+def format_local_details(article: dict) -> str:
+    """Format a local index record like get_article_details output."""
+    output = [f"Article Details for PMID: {article['pmid']} [local index]", "="*60]
+    output.append(f"\nTitle: {article['title'] or 'N/A'}")
+    if article["authors"]:
+        output.append(f"\nAuthors: {', '.join(article['authors'])}")
+    output.append(f"\nJournal: {article['journal'] or 'N/A'}")
+    output.append(f"Publication Date: {article['date'] or 'N/A'}")
+    output.append(f"\nPMID: {article['pmid']}")
+    if article["doi"]:
+        output.append(f"DOI: {article['doi']}")
+    if article["mesh"]:
+        output.append(f"MeSH: {'; '.join(article['mesh'])}")
+    output.append(f"\n{'='*60}\nAbstract:\n{'='*60}\n")
+    output.append(article["abstract"] or "No abstract available.")
+    return "\n".join(output)
 
 @mcp.tool()
-async def search_pubmed(query: str, max_results: int = 10) -> str:
+async def search_pubmed(query: str, max_results: int = 10,
+                        output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Search PubMed for articles matching the query.
     
     Args:
         query: Search query in PubMed syntax
         max_results: Maximum number of results to return (default: 10)
+        output_format: "text" (formatted listing) or "json" (article records)
     """
+    structured = wants_structured(output_format)
+    
+    # 로컬 미러가 있으면 먼저 조회
+    # hybrid 모드는 미러가 요청 수만큼 채울 때만 사용 (오래된 미러가 최신 결과를 가리지 않도록 E-utilities로 넘어감)
+    index, mode = get_local_mode()
+    local = None
+    if index is not None:
+        local = index.search(query, max_results)
+        if mode == "local" or len(local[1]) >= max_results:
+            total, records = local
+            if structured:
+                return {"query": query, "total": total, "source": "local", "articles": records}
+            return format_local_search(query, total, records)
+    
     # First use ESearch to get IDs
     search_params = {
         "term": query,
         "retmax": max_results,
-        "sort": "relevance",
-        "usehistory": "y"
+        "sort": "relevance"
     }
     
     search_result = await make_entrez_request("esearch", search_params)
     
     if isinstance(search_result, dict) and "error" in search_result:
+        if local and local[1]:
+            # E-utilities 오류 시 일부라도 있는 로컬 결과를 반환 (source로 표시)
+            total, records = local
+            if structured:
+                return {"query": query, "total": total, "source": "local", "articles": records}
+            return format_local_search(query, total, records)
+        if structured:
+            return {"error": f"Error searching PubMed: {search_result['error']}"}
         return f"Error searching PubMed: {search_result['error']}"
     
     if "esearchresult" not in search_result:
-        return "No search results found"
+        return {"query": query, "total": 0, "articles": []} if structured else "No search results found"
     
     result = search_result["esearchresult"]
     id_list = result.get("idlist", [])
     
     if not id_list:
+        if structured:
+            return {"query": query, "total": 0, "articles": []}
         return f"No articles found for query: {query}"
     
     # Now fetch summaries for these IDs
@@ -131,8 +227,14 @@ async def search_pubmed(query: str, max_results: int = 10) -> str:
     summary_result = await make_entrez_request("esummary", summary_params)
     
     if isinstance(summary_result, dict) and "error" in summary_result:
+        if structured:
+            return {"error": f"Error fetching summaries: {summary_result['error']}"}
         return f"Error fetching summaries: {summary_result['error']}"
     
+    if structured:
+        return {"query": query, "total": int(result.get("count", 0)), "source": "entrez",
+                "articles": summary_records(id_list, summary_result)}
+    
     # Format the results
     output = [f"Found {result.get('count', 0)} articles (showing top {len(id_list)}):"]
     
@@ -163,12 +265,25 @@ async def search_pubmed(query: str, max_results: int = 10) -> str:
     return "\n".join(output)
 
 @mcp.tool()
-async def get_article_details(pmid: str) -> str:
+async def get_article_details(pmid: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Get detailed information about a specific PubMed article.
     
     Args:
         pmid: PubMed ID of the article
+        output_format: "text" (formatted details) or "json" (article record with abstract)
     """
+    structured = wants_structured(output_format)
+    
+    index, mode = get_local_mode()
+    if index is not None:
+        record = index.get(pmid)
+        if record:
+            return {**record, "source": "local"} if structured else format_local_details(record)
+        if mode == "local":
+            if structured:
+                return {"error": f"Article {pmid} not found in local PubMed index"}
+            return f"Article {pmid} not found in local PubMed index"
+    
     # Fetch article details
     params = {
         "id": pmid,
@@ -179,12 +294,26 @@ async def get_article_details(pmid: str) -> str:
     abstract_text = await make_entrez_request("efetch", params, is_json=False)
     
     if "Error:" in abstract_text:
-        return abstract_text
+        return {"error": abstract_text} if structured else abstract_text
     
     # Also get structured data
     summary_params = {"id": pmid}
     summary_result = await make_entrez_request("esummary", summary_params)
     
+    if structured:
+        summaries = summary_result.get("result", {}) if isinstance(summary_result, dict) else {}
+        article = summaries.get(pmid, {})
+        record = summary_record(pmid, article)
+        record.update({
+            "volume": article.get("volume"),
+            "issue": article.get("issue"),
+            "pages": article.get("pages"),
+            "pmcid": article.get("pmcid") or None,
+            "abstract": abstract_text,
+            "source": "entrez"
+        })
+        return record
+    
     output = [f"Article Details for PMID: {pmid}", "="*60]
     
     # Add structured data if available
@@ -220,13 +349,63 @@ async def get_article_details(pmid: str) -> str:
     return "\n".join(output)
 
 @mcp.tool()
-async def find_related_articles(pmid: str, max_results: int = 10) -> str:
+async def get_articles_details(pmids: List[str]) -> Dict[str, Any]:
+    """Get details for many PubMed articles at once (batch variant of get_article_details).
+    
+    Articles in the local index are answered from it; the rest are fetched with
+    one EFetch request of comma-joined PMIDs.
+    
+    Args:
+        pmids: List of PubMed IDs
+    
+    Returns:
+        Article records (title, authors, journal, date, doi, mesh, abstract) keyed by PMID;
+        PMIDs that could not be fetched map to {"error": ...}
+    """
+    ids = list(dict.fromkeys(str(pmid).strip() for pmid in pmids if str(pmid).strip()))
+    results: Dict[str, Any] = {}
+    
+    index, mode = get_local_mode()
+    if index is not None:
+        for pmid, record in index.get_many(ids).items():
+            results[pmid] = {**record, "source": "local"}
+        if mode == "local":
+            for pmid in ids:
+                results.setdefault(pmid, {"error": f"Article {pmid} not found in local PubMed index"})
+            return results
+    
+    missing = [pmid for pmid in ids if pmid not in results]
+    if missing:
+        xml_text = await make_entrez_request("efetch", {"id": ",".join(missing), "retmode": "xml"}, is_json=False)
+        try:
+            if xml_text.startswith("Error:"):
+                raise ValueError(xml_text)
+            root = ET.fromstring(xml_text)
+        except (ValueError, ET.ParseError) as e:
+            # 요청 자체가 실패하면 로컬에서 찾은 레코드는 유지하고 나머지만 오류로 표시
+            error = str(e) if str(e).startswith("Error:") else f"Error: could not parse EFetch response: {e}"
+            results.update({pmid: {"error": error} for pmid in missing})
+            root = None
+        if root is not None:
+            for element in root.iter("PubmedArticle"):
+                record = parse_pubmed_article(element)
+                if record and record["pmid"] in missing:
+                    results[record["pmid"]] = {**record, "source": "entrez"}
+    
+    return {pmid: results.get(pmid, {"error": f"Article {pmid} not found in PubMed"}) for pmid in ids}
+
+@mcp.tool()
+async def find_related_articles(pmid: str, max_results: int = 10,
+                                output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Find articles related to a specific PubMed article.
     
     Args:
         pmid: PubMed ID of the reference article
         max_results: Maximum number of related articles to return
+        output_format: "text" (formatted listing) or "json" (article records)
     """
+    structured = wants_structured(output_format)
+
     # Use ELink to find related articles
     params = {
         "dbfrom": DATABASE,
@@ -237,6 +416,8 @@ async def find_related_articles(pmid: str, max_results: int = 10) -> str:
     link_result = await make_entrez_request("elink", params)
     
     if isinstance(link_result, dict) and "error" in link_result:
+        if structured:
+            return {"error": f"Error finding related articles: {link_result['error']}"}
         return f"Error finding related articles: {link_result['error']}"
     
     # Extract related PMIDs
@@ -250,7 +431,7 @@ async def find_related_articles(pmid: str, max_results: int = 10) -> str:
                         break
     
     if not related_ids:
-        return f"No related articles found for PMID: {pmid}"
+        return {"pmid": pmid, "articles": []} if structured else f"No related articles found for PMID: {pmid}"
     
     # Fetch summaries for related articles
     summary_params = {
@@ -259,6 +440,9 @@ async def find_related_articles(pmid: str, max_results: int = 10) -> str:
     
     summary_result = await make_entrez_request("esummary", summary_params)
     
+    if structured:
+        return {"pmid": pmid, "articles": summary_records(related_ids[:max_results], summary_result)}
+    
     output = [f"Related articles for PMID {pmid} (top {len(related_ids)}):"]
     
     if "result" in summary_result:
@@ -283,24 +467,29 @@ async def find_related_articles(pmid: str, max_results: int = 10) -> str:
     return "\n".join(output)
 
 @mcp.tool()
-async def search_by_author(author_name: str, max_results: int = 10) -> str:
+async def search_by_author(author_name: str, max_results: int = 10,
+                           output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Search PubMed for articles by a specific author.
     
     Args:
         author_name: Name of the author to search for
         max_results: Maximum number of results to return
+        output_format: "text" (formatted listing) or "json" (article records)
     """
     # Format author name for PubMed search
     query = f"{author_name}[Author]"
-    return await search_pubmed(query, max_results)
+    return await search_pubmed(query, max_results, output_format)
 
 @mcp.tool()
-async def get_citations(pmid: str) -> str:
+async def get_citations(pmid: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """Get articles that cite a specific PubMed article.
     
     Args:
         pmid: PubMed ID of the article
+        output_format: "text" (formatted listing) or "json" (citing article records)
     """
+    structured = wants_structured(output_format)
+
     # Use ELink to find citing articles
     params = {
         "dbfrom": DATABASE,
@@ -311,6 +500,8 @@ async def get_citations(pmid: str) -> str:
     link_result = await make_entrez_request("elink", params)
     
     if isinstance(link_result, dict) and "error" in link_result:
+        if structured:
+            return {"error": f"Error finding citations: {link_result['error']}"}
         return f"Error finding citations: {link_result['error']}"
     
     # Extract citing PMIDs
@@ -324,7 +515,10 @@ async def get_citations(pmid: str) -> str:
                         break
     
     if not citing_ids:
+        if structured:
+            return {"pmid": pmid, "total": 0, "articles": []}
         return f"No citations found for PMID: {pmid} (or citation data not available)"
+    total_citations = len(citing_ids)
     
     # Limit results
     citing_ids = citing_ids[:20]  # Top 20 citations
@@ -336,6 +530,9 @@ async def get_citations(pmid: str) -> str:
     
     summary_result = await make_entrez_request("esummary", summary_params)
     
+    if structured:
+        return {"pmid": pmid, "total": total_citations, "articles": summary_records(citing_ids, summary_result)}
+    
     output = [f"Articles citing PMID {pmid} (found {len(citing_ids)} citations):"]
     
     if "result" in summary_result:
@@ -349,6 +546,58 @@ async def get_citations(pmid: str) -> str:
     
     return "\n".join(output)
 
+@mcp.tool()
+async def bulk_fetch_articles(query: str, max_records: int = 1000, chunk_size: int = 500,
+                              output_path: Optional[str] = None,
+                              output_format: str = "text") -> Union[str, Dict[str, Any]]:
+    """Retrieve a large PubMed result set through the history server.
+    
+    Pages through the full result set in chunks and returns compact records
+    (PMID, title, abstract, MeSH, DOI, date) as JSON Lines.
+    
+    Args:
+        query: Search query in PubMed syntax
+        max_records: Maximum number of records to retrieve (default: 1000)
+        chunk_size: Records per EFetch page (default: 500)
+        output_path: Optional .jsonl file inside MCP_EXPORT_DIR to write records to instead of returning them
+        output_format: "text" (JSON Lines) or "json" ({"articles": [...]}); ignored with output_path
+    """
+    if output_path:
+        try:
+            output_path = resolve_export_path(output_path)
+        except ValueError as e:
+            if wants_structured(output_format):
+                return {"error": str(e)}
+            return str(e)
+    
+    count = 0
+    lines = []
+    records = []
+    try:
+        if output_path:
+            with open(output_path, "w", encoding="utf-8") as f:
+                async for record in iter_pubmed_records(query, max_records, chunk_size):
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    count += 1
+            return f"Wrote {count} articles for query '{query}' to {output_path}"
+        
+        async for record in iter_pubmed_records(query, max_records, chunk_size):
+            if wants_structured(output_format):
+                records.append(record)
+            else:
+                lines.append(json.dumps(record, ensure_ascii=False))
+            count += 1
+    except Exception as e:
+        if wants_structured(output_format):
+            return {"error": f"Error during bulk retrieval after {count} articles: {str(e)}"}
+        return f"Error during bulk retrieval after {count} articles: {str(e)}"
+    
+    if wants_structured(output_format):
+        return {"query": query, "total": count, "articles": records}
+    if not lines:
+        return f"No articles found for query: {query}"
+    return "\n".join(lines)
+
 if __name__ == "__main__":
     import asyncio
     
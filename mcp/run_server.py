@@ -6,6 +6,7 @@ GAIA MCP 서버 실행 스크립트
 import asyncio
 import logging
 import argparse
+from rich.console import Console
 from rich.logging import RichHandler
 
 from .integration.gaia_mcp_server import GAIAMCPServer
@@ -28,12 +29,12 @@ async def main():
     
     args = parser.parse_args()
     
-    # 로깅 설정
+    # 로깅 설정 (stdio 전송은 stdout을 프로토콜에 사용하므로 로그는 stderr로 출력)
     logging.basicConfig(
         level=getattr(logging, args.log_level),
         format="%(message)s",
         datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True)]
+        handlers=[RichHandler(console=Console(stderr=True), rich_tracebacks=True)]
     )
     
     logger = logging.getLogger("mcp-server")
@@ -5,12 +5,13 @@ GAIA System Tools for MCP Server
 import asyncio
 import sys
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from ..mcp_server import MCPServer
+from ..progress import ProgressReporter
 from ...protocol.messages import MCPTool
 
 
@@ -167,15 +168,22 @@ class GAIAToolsHandler:
         )
         self.server.register_tool(search_articles_tool, self.handle_search_articles)
     
-    async def handle_research_question(self, question: str, depth: str = "detailed") -> str:
+    async def handle_research_question(self, question: str, depth: str = "detailed",
+                                       progress: Optional[ProgressReporter] = None) -> str:
         """Handle research question requests"""
+        progress = progress or ProgressReporter()
         try:
+            await progress.report(0, 3, "Preparing research manager")
+            
             # Import here to avoid circular imports
             from src.research.research_manager import ResearchManager
             
             research_manager = ResearchManager()
+            await progress.report(1, 3, f"Researching ({depth}): {question}")
             result = await research_manager.research_question(question)
             
+            await progress.partial(str(result))
+            await progress.report(3, 3, "Research completed")
             return f"Research completed for: {question}\n\nResult: {result}"
             
         except Exception as e:
@@ -260,8 +268,10 @@ class GAIAToolsHandler:
         except Exception as e:
             return f"Sequential thinking 시작 중 오류: {str(e)}"
     
-    async def handle_search_articles(self, query: str, limit: int = 10) -> str:
+    async def handle_search_articles(self, query: str, limit: int = 10,
+                                     progress: Optional[ProgressReporter] = None) -> str:
         """Handle biomedical article search"""
+        progress = progress or ProgressReporter()
         try:
             # 모의 PubMed 데이터 반환
             results = []
@@ -279,12 +289,17 @@ class GAIAToolsHandler:
                 })
             
             response = f"생의학 논문 검색 결과 ('{query}'):\n\n"
-            for result in results:
-                response += f"• PMID: {result['pmid']}\n"
-                response += f"  제목: {result['title']}\n"
-                response += f"  저자: {result['authors']}\n"
-                response += f"  저널: {result['journal']} ({result['year']})\n"
-                response += f"  초록: {result['abstract']}\n\n"
+            for i, result in enumerate(results, 1):
+                entry = f"• PMID: {result['pmid']}\n"
+                entry += f"  제목: {result['title']}\n"
+                entry += f"  저자: {result['authors']}\n"
+                entry += f"  저널: {result['journal']} ({result['year']})\n"
+                entry += f"  초록: {result['abstract']}\n\n"
+                response += entry
+                
+                # 레코드 단위로 부분 결과 전송
+                await progress.partial(entry)
+                await progress.report(i, len(results))
             
             return response
             
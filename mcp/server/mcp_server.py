@@ -12,6 +12,9 @@ from ..protocol.messages import (
     MCPRequest, MCPResponse, MCPNotification, MCPError, MCPErrorCode,
     MCPTool, MCPMethod
 )
+from ..common.structured import tool_result
+from .progress import ProgressReporter, accepts_progress
+from .result_sets import ResultSetError, ResultSetStore
 
 
 class MCPServer:
@@ -22,17 +25,45 @@ class MCPServer:
         self.tool_handlers: Dict[str, Callable] = {}
         self.logger = logging.getLogger(__name__)
         self.initialized = False
+        self.notification_sender: Optional[Callable[[str], Any]] = None
+        # request id -> running tools/call handler task (notifications/cancelled 대상)
+        self.active_calls: Dict[Union[str, int], asyncio.Task] = {}
+        self._cancelled_requests: set = set()
+        # 큰 tools/call 결과는 첫 페이지만 보내고 나머지는 resources/read로 제공
+        self.result_sets = ResultSetStore()
         
+    def set_notification_sender(self, sender: Callable[[str], Any]):
+        """Set the coroutine used to push notifications to the client (e.g. transport.send_message)"""
+        self.notification_sender = sender
+    
+    async def send_notification(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Send a JSON-RPC notification to the connected client"""
+        if not self.notification_sender:
+            return
+        notification = MCPNotification(method=method, params=params)
+        try:
+            await self.notification_sender(notification.to_json())
+        except Exception as e:
+            self.logger.warning(f"Failed to send notification {method}: {e}")
+    
     def register_tool(self, tool: MCPTool, handler: Callable):
         """Register a tool with its handler function"""
         self.tools[tool.name] = tool
         self.tool_handlers[tool.name] = handler
         self.logger.info(f"Registered tool: {tool.name}")
     
-    async def handle_request(self, request_data: str) -> str:
-        """Handle incoming MCP requests"""
+    async def handle_request(self, request_data: str) -> Optional[str]:
+        """Handle incoming MCP requests
+        
+        Returns None for notifications and for requests cancelled by the client,
+        which get no response.
+        """
         try:
             request_dict = json.loads(request_data)
+            if "id" not in request_dict:
+                # 알림(notification)에는 응답하지 않음
+                await self._handle_notification(request_dict)
+                return None
             request = MCPRequest(**request_dict)
             
             if request.method == MCPMethod.INITIALIZE.value:
@@ -41,6 +72,8 @@ class MCPServer:
                 response = await self._handle_tools_list(request)
             elif request.method == MCPMethod.TOOLS_CALL.value:
                 response = await self._handle_tools_call(request)
+            elif request.method == MCPMethod.RESOURCES_READ.value:
+                response = await self._handle_resources_read(request)
             elif request.method == MCPMethod.PING.value:
                 response = await self._handle_ping(request)
             else:
@@ -51,7 +84,9 @@ class MCPServer:
                         message=f"Method not found: {request.method}"
                     ).to_dict()
                 )
-                
+            
+            if response is None:
+                return None
             return response.to_json()
             
         except json.JSONDecodeError:
@@ -75,6 +110,19 @@ class MCPServer:
             )
             return error_response.to_json()
     
+    async def _handle_notification(self, notification: Dict[str, Any]):
+        """Handle client notifications (notifications/cancelled)"""
+        if notification.get("method") != MCPMethod.NOTIFICATION_CANCELLED.value:
+            return
+        
+        params = notification.get("params") or {}
+        request_id = params.get("requestId")
+        task = self.active_calls.get(request_id)
+        if task is not None and not task.done():
+            self.logger.info(f"Cancelling request {request_id}: {params.get('reason', 'no reason given')}")
+            self._cancelled_requests.add(request_id)
+            task.cancel()
+    
     async def _handle_initialize(self, request: MCPRequest) -> MCPResponse:
         """Handle initialize request"""
         self.initialized = True
@@ -85,7 +133,8 @@ class MCPServer:
                 "capabilities": {
                     "tools": {
                         "listChanged": True
-                    }
+                    },
+                    "resources": {}
                 },
                 "serverInfo": {
                     "name": self.name,
@@ -111,7 +160,7 @@ class MCPServer:
             result={"tools": tools_list}
         )
     
-    async def _handle_tools_call(self, request: MCPRequest) -> MCPResponse:
+    async def _handle_tools_call(self, request: MCPRequest) -> Optional[MCPResponse]:
         """Handle tools/call request"""
         if not self.initialized:
             return MCPResponse(
@@ -143,19 +192,29 @@ class MCPServer:
         
         try:
             handler = self.tool_handlers[tool_name]
-            arguments = request.params.get("arguments", {})
-            result = await handler(**arguments)
+            arguments = dict(request.params.get("arguments") or {})
+            if accepts_progress(handler):
+                progress_token = (request.params.get("_meta") or {}).get("progressToken")
+                arguments["progress"] = ProgressReporter(progress_token, self.send_notification)
+            
+            # 핸들러를 별도 태스크로 실행해 취소 알림으로 중단할 수 있게 함
+            # (태스크 취소는 핸들러 안의 진행 중인 HTTP 요청까지 전파됨)
+            task = asyncio.ensure_future(handler(**arguments))
+            self.active_calls[request.id] = task
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                if request.id in self._cancelled_requests:
+                    return None
+                raise
+            finally:
+                self.active_calls.pop(request.id, None)
+                self._cancelled_requests.discard(request.id)
             
+            # dict/list 반환값은 structuredContent로도 전달, 큰 결과는 첫 페이지 + nextCursor
             return MCPResponse(
                 id=request.id,
-                result={
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": str(result)
-                        }
-                    ]
-                }
+                result=self.result_sets.paginate(tool_result(result), tool_name)
             )
             
         except Exception as e:
@@ -168,6 +227,33 @@ class MCPServer:
                 ).to_dict()
             )
     
+    async def _handle_resources_read(self, request: MCPRequest) -> MCPResponse:
+        """Handle resources/read for result sets (params: uri, optional cursor)"""
+        params = request.params or {}
+        if "uri" not in params:
+            return MCPResponse(
+                id=request.id,
+                error=MCPError(
+                    code=MCPErrorCode.INVALID_PARAMS.value,
+                    message="Missing resource uri"
+                ).to_dict()
+            )
+        
+        try:
+            return MCPResponse(
+                id=request.id,
+                result=self.result_sets.read(params["uri"], params.get("cursor"))
+            )
+        except ResultSetError as e:
+            return MCPResponse(
+                id=request.id,
+                error=MCPError(
+                    code=MCPErrorCode.RESOURCE_NOT_FOUND.value,
+                    message=str(e),
+                    data={"uri": params["uri"]}
+                ).to_dict()
+            )
+    
     async def _handle_ping(self, request: MCPRequest) -> MCPResponse:
         """Handle ping request"""
         return MCPResponse(
@@ -0,0 +1,113 @@
+"""
+Progress notifications and partial-result streaming for MCP tools
+"""
+
+import asyncio
+import inspect
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+from ..protocol.messages import MCPMethod
+
+
+# Emitter signature: (method, params) -> awaitable
+ProgressEmitter = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class ProgressReporter:
+    """Progress-token handle passed to tool handlers that accept a ``progress`` argument.
+
+    Without a progress token (or without an emitter) every call is a no-op, so
+    handlers can report unconditionally.
+    """
+
+    def __init__(self, token: Optional[Union[str, int]] = None, emit: Optional[ProgressEmitter] = None):
+        self.token = token
+        self._emit = emit
+        self._progress = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.token is not None and self._emit is not None
+
+    async def report(self, progress: float, total: Optional[float] = None, message: Optional[str] = None):
+        """Send a notifications/progress update"""
+        self._progress = progress
+        if not self.enabled:
+            return
+
+        params: Dict[str, Any] = {"progressToken": self.token, "progress": progress}
+        if total is not None:
+            params["total"] = total
+        if message:
+            params["message"] = message
+        await self._emit(MCPMethod.NOTIFICATION_PROGRESS.value, params)
+
+    async def partial(self, content: Union[str, Dict[str, Any], List[Dict[str, Any]]]):
+        """Send a batch of early results before the tool call completes"""
+        if not self.enabled:
+            return
+
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        elif isinstance(content, dict):
+            content = [content]
+        await self._emit(
+            MCPMethod.NOTIFICATION_PARTIAL_RESULT.value,
+            {"progressToken": self.token, "content": content}
+        )
+
+
+def accepts_progress(handler: Callable) -> bool:
+    """Check whether a tool handler takes a ``progress`` keyword argument"""
+    try:
+        return "progress" in inspect.signature(handler).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def notification_to_event(method: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert a progress/partial notification into a stream event"""
+    if method == MCPMethod.NOTIFICATION_PROGRESS.value:
+        return {
+            "type": "progress",
+            "progress": params.get("progress"),
+            "total": params.get("total"),
+            "message": params.get("message")
+        }
+    if method == MCPMethod.NOTIFICATION_PARTIAL_RESULT.value:
+        return {"type": "partial", "content": params.get("content", [])}
+    return None
+
+
+def queue_emitter(queue: asyncio.Queue) -> ProgressEmitter:
+    """Emitter that delivers notifications to a local queue as stream events"""
+    async def emit(method: str, params: Dict[str, Any]):
+        event = notification_to_event(method, params)
+        if event is not None:
+            queue.put_nowait(event)
+    return emit
+
+
+async def iterate_events(queue: asyncio.Queue, task: asyncio.Task) -> AsyncIterator[Dict[str, Any]]:
+    """Yield queued progress/partial events until ``task`` finishes, then its result.
+
+    The final event is ``{"type": "result", "result": ...}``. Exceptions raised by
+    the task propagate to the consumer; closing the iterator early cancels it.
+    """
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+
+            getter.cancel()
+            # Drain anything emitted right before completion
+            while not queue.empty():
+                yield queue.get_nowait()
+            yield {"type": "result", "result": task.result()}
+            return
+    finally:
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,215 @@
+"""
+Cursor-paged result sets for large tool outputs
+
+Instead of sending a large tools/call result inline, the server keeps it in a
+bounded TTL cache and returns only the first page. The page also carries:
+
+- a ``resource_link`` content block naming the result set
+  (``gaia://result-sets/<id>``);
+- ``nextCursor``;
+- ``_meta.resultSet`` (id, uri, total, page size).
+
+Clients fetch further pages with ``resources/read`` on the result-set URI plus
+the cursor. A single record is fetched with ``gaia://result-sets/<id>/records/<n>``.
+
+- Structured results are paged by record: the record list found under one of
+  the RECORD_KEYS of ``structuredContent``.
+- Text-only results are paged in line-aligned chunks.
+
+Environment: RESULT_SET_PAGE_SIZE (records per page, default 25),
+RESULT_SET_PAGE_CHARS (text page size, default 20000), RESULT_SET_TTL
+(seconds, default 900), RESULT_SET_MAX (cached sets, default 128).
+"""
+
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..common.structured import RECORD_KEYS
+
+
+URI_PREFIX = "gaia://result-sets/"
+
+
+class ResultSetError(LookupError):
+    """Unknown or expired result set, bad cursor or record index"""
+
+
+def _record_key(structured: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not isinstance(structured, dict):
+        return None
+    for key in RECORD_KEYS:
+        if isinstance(structured.get(key), list):
+            return key
+    return None
+
+
+def _text_pages(text: str, page_chars: int) -> List[str]:
+    """Split text into pages of at most ``page_chars``, cutting at line breaks when possible"""
+    pages = []
+    start = 0
+    while start < len(text):
+        end = min(start + page_chars, len(text))
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline > start:
+                end = newline + 1
+        pages.append(text[start:end])
+        start = end
+    return pages
+
+
+def parse_uri(uri: str) -> Tuple[str, Optional[int]]:
+    """(set id, record index or None) of a result-set URI"""
+    if not uri.startswith(URI_PREFIX):
+        raise ResultSetError(f"Not a result-set URI: {uri}")
+    parts = uri[len(URI_PREFIX):].split("/")
+    if len(parts) == 1 and parts[0]:
+        return parts[0], None
+    if len(parts) == 3 and parts[1] == "records" and parts[2].isdigit():
+        return parts[0], int(parts[2])
+    raise ResultSetError(f"Malformed result-set URI: {uri}")
+
+
+class ResultSetStore:
+    """Bounded LRU of paged tool results; entries expire ``ttl`` seconds after their last read"""
+
+    def __init__(self, page_size: Optional[int] = None, page_chars: Optional[int] = None,
+                 ttl: Optional[float] = None, max_sets: Optional[int] = None):
+        self.page_size = page_size or int(os.getenv("RESULT_SET_PAGE_SIZE", "25"))
+        self.page_chars = page_chars or int(os.getenv("RESULT_SET_PAGE_CHARS", "20000"))
+        self.ttl = ttl or float(os.getenv("RESULT_SET_TTL", "900"))
+        self.max_sets = max_sets or int(os.getenv("RESULT_SET_MAX", "128"))
+        self._sets: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = {"created": 0, "pages_served": 0, "expired": 0, "evicted": 0}
+
+    # ------------------------------------------------------------------ store
+
+    def _put(self, entry: Dict[str, Any]) -> str:
+        self._purge()
+        set_id = uuid.uuid4().hex[:16]
+        entry["touched"] = time.monotonic()
+        self._sets[set_id] = entry
+        while len(self._sets) > self.max_sets:
+            self._sets.popitem(last=False)
+            self.stats["evicted"] += 1
+        self.stats["created"] += 1
+        return set_id
+
+    def _get(self, set_id: str) -> Dict[str, Any]:
+        self._purge()
+        entry = self._sets.get(set_id)
+        if entry is None:
+            raise ResultSetError(f"Result set {set_id} is unknown or has expired")
+        entry["touched"] = time.monotonic()
+        self._sets.move_to_end(set_id)
+        return entry
+
+    def _purge(self):
+        cutoff = time.monotonic() - self.ttl
+        for set_id in [k for k, entry in self._sets.items() if entry["touched"] < cutoff]:
+            del self._sets[set_id]
+            self.stats["expired"] += 1
+
+    # ------------------------------------------------------------------ pages
+
+    def paginate(self, result: Dict[str, Any], tool_name: str = "") -> Dict[str, Any]:
+        """First page of a tools/call result, or the result unchanged when it fits in one page"""
+        if result.get("isError"):
+            return result
+
+        structured = result.get("structuredContent")
+        key = _record_key(structured)
+        if key is not None:
+            if len(structured[key]) <= self.page_size:
+                return result
+            entry = {"kind": "records", "tool": tool_name, "structured": structured, "key": key,
+                     "total": len(structured[key]), "page_size": self.page_size}
+        else:
+            texts = [block.get("text", "") for block in result.get("content", []) if block.get("type") == "text"]
+            if len(texts) != 1 or len(texts[0]) <= self.page_chars:
+                return result
+            pages = _text_pages(texts[0], self.page_chars)
+            entry = {"kind": "text", "tool": tool_name, "pages": pages, "total": len(pages), "page_size": 1}
+
+        set_id = self._put(entry)
+        page = self.page(set_id)
+        uri = URI_PREFIX + set_id
+        paged = {
+            "content": page["content"] + [{
+                "type": "resource_link",
+                "uri": uri,
+                "name": f"{tool_name or 'tool'} result set",
+                "mimeType": page["mimeType"],
+                "description": f"{entry['total']} {'records' if entry['kind'] == 'records' else 'text pages'}; "
+                               f"read with resources/read and nextCursor"
+            }],
+            "_meta": {"resultSet": {"id": set_id, "uri": uri, "kind": entry["kind"],
+                                    "total": entry["total"], "pageSize": entry["page_size"]}}
+        }
+        if "structuredContent" in page:
+            paged["structuredContent"] = page["structuredContent"]
+        if page.get("nextCursor"):
+            paged["nextCursor"] = page["nextCursor"]
+        return paged
+
+    def page(self, set_id: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """One page of a result set: content blocks, structuredContent (record sets) and nextCursor"""
+        entry = self._get(set_id)
+        offset = self._offset(set_id, cursor, entry["total"])
+        end = offset + entry["page_size"]
+
+        if entry["kind"] == "records":
+            structured = dict(entry["structured"])
+            structured[entry["key"]] = entry["structured"][entry["key"]][offset:end]
+            structured["page"] = {"offset": offset, "count": len(structured[entry["key"]]),
+                                  "total": entry["total"]}
+            page = {"content": [{"type": "text", "text": json.dumps(structured, ensure_ascii=False, indent=2,
+                                                                    default=str)}],
+                    "structuredContent": structured, "mimeType": "application/json"}
+        else:
+            page = {"content": [{"type": "text", "text": entry["pages"][offset]}], "mimeType": "text/plain"}
+
+        if end < entry["total"]:
+            page["nextCursor"] = f"{set_id}:{end}"
+        self.stats["pages_served"] += 1
+        return page
+
+    @staticmethod
+    def _offset(set_id: str, cursor: Optional[str], total: int) -> int:
+        if not cursor:
+            return 0
+        cursor_set, _, offset = cursor.partition(":")
+        if cursor_set != set_id or not offset.isdigit() or int(offset) >= total:
+            raise ResultSetError(f"Invalid cursor for result set {set_id}: {cursor}")
+        return int(offset)
+
+    def record(self, set_id: str, index: int) -> Any:
+        """Single record of a record result set"""
+        entry = self._get(set_id)
+        if entry["kind"] != "records":
+            raise ResultSetError(f"Result set {set_id} holds text pages, not records")
+        records = entry["structured"][entry["key"]]
+        if not 0 <= index < len(records):
+            raise ResultSetError(f"Record {index} out of range (result set has {len(records)})")
+        return records[index]
+
+    def read(self, uri: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """resources/read result for a result-set URI"""
+        set_id, index = parse_uri(uri)
+        if index is not None:
+            record = self.record(set_id, index)
+            return {"contents": [{"uri": uri, "mimeType": "application/json",
+                                  "text": json.dumps(record, ensure_ascii=False, indent=2, default=str)}]}
+
+        page = self.page(set_id, cursor)
+        contents = [{"uri": uri, "mimeType": page["mimeType"], "text": block["text"]} for block in page["content"]]
+        result: Dict[str, Any] = {"contents": contents}
+        if "structuredContent" in page:
+            result["structuredContent"] = page["structuredContent"]
+        if page.get("nextCursor"):
+            result["nextCursor"] = page["nextCursor"]
+        return result
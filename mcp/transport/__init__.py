@@ -2,7 +2,8 @@
 MCP Transport Layer
 """
 
+from .process_transport import ProcessTransport
 from .stdio_transport import StdioTransport
 from .websocket_transport import WebSocketTransport
 
-__all__ = ["StdioTransport", "WebSocketTransport"]
\ No newline at end of file
+__all__ = ["ProcessTransport", "StdioTransport", "WebSocketTransport"]
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Subprocess STDIO Transport for MCP clients
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..protocol.messages import MCPNotification, MCPRequest, MCPResponse
+
+
+class ProcessTransport:
+    """Client-side transport that talks JSON-RPC to an MCP server subprocess over STDIO.
+
+    Requests are pipelined: each request registers a future keyed by its id and
+    the reader task resolves futures as responses arrive, in any order.
+    """
+
+    def __init__(self,
+                 command: List[str],
+                 env: Optional[Dict[str, str]] = None,
+                 cwd: Optional[str] = None,
+                 notification_handler: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+                 on_exit: Optional[Callable[["ProcessTransport"], None]] = None):
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.notification_handler = notification_handler
+        self.on_exit = on_exit
+        self.logger = logging.getLogger(__name__)
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None and not self._closed
+
+    @property
+    def pending(self) -> int:
+        """Number of requests waiting for a response (queue depth)"""
+        return len(self._pending)
+
+    async def start(self):
+        """Spawn the server process and start reading its output"""
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self.env,
+            cwd=self.cwd,
+            limit=16 * 1024 * 1024
+        )
+        self._reader_task = asyncio.create_task(self._read_loop())
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        self.logger.info(f"Started MCP server process (pid {self.process.pid}): {' '.join(self.command)}")
+
+    async def stop(self, timeout: float = 5.0):
+        """Terminate the server process"""
+        self._closed = True
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+        for task in (self._reader_task, self._stderr_task):
+            if task and not task.done():
+                task.cancel()
+        self._fail_pending(ConnectionError("Transport stopped"))
+
+    async def request(self, request: MCPRequest) -> MCPResponse:
+        """Send a request and wait for its response"""
+        if not self.alive:
+            raise ConnectionError("MCP server process is not running")
+
+        future = asyncio.get_event_loop().create_future()
+        self._pending[request.id] = future
+        try:
+            await self.send_message(request.to_json())
+            data = await future
+        finally:
+            self._pending.pop(request.id, None)
+
+        return MCPResponse(id=data.get("id"), result=data.get("result"), error=data.get("error"))
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Send a JSON-RPC notification"""
+        await self.send_message(MCPNotification(method=method, params=params).to_json())
+
+    async def send_message(self, message: str):
+        """Write a newline-delimited message to the server's stdin"""
+        if not self.alive:
+            raise ConnectionError("MCP server process is not running")
+
+        async with self._write_lock:
+            self.process.stdin.write(f"{message}\n".encode())
+            await self.process.stdin.drain()
+        self.logger.debug(f"Sent message: {message}")
+
+    async def _read_loop(self):
+        """Dispatch responses to waiting requests and notifications to the handler"""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line.decode())
+                except json.JSONDecodeError:
+                    # 서버가 stdout에 출력한 로그 등은 무시
+                    self.logger.debug(f"Ignoring non-JSON output: {line[:200]!r}")
+                    continue
+
+                if "method" in message and "id" in message:
+                    await self._handle_server_request(message)
+                elif "method" in message:
+                    if self.notification_handler:
+                        try:
+                            await self.notification_handler(message)
+                        except Exception as e:
+                            self.logger.error(f"Error handling notification: {e}")
+                else:
+                    future = self._pending.get(message.get("id"))
+                    if future is not None and not future.done():
+                        future.set_result(message)
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Error in process transport read loop: {e}")
+        finally:
+            self._fail_pending(ConnectionError("MCP server process exited"))
+            if not self._closed and self.on_exit:
+                self.on_exit(self)
+
+    async def _handle_server_request(self, message: Dict[str, Any]):
+        """Answer server-initiated requests (only ping is supported)"""
+        if message.get("method") == "ping":
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+        else:
+            reply = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": f"Method not found: {message.get('method')}"}
+            }
+        try:
+            await self.send_message(json.dumps(reply))
+        except ConnectionError:
+            pass
+
+    async def _drain_stderr(self):
+        """Forward server stderr to the debug log so the pipe never fills up"""
+        try:
+            while True:
+                line = await self.process.stderr.readline()
+                if not line:
+                    break
+                self.logger.debug(f"[server stderr] {line.decode(errors='replace').rstrip()}")
+        except asyncio.CancelledError:
+            pass
+
+    def _fail_pending(self, error: Exception):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
@@ -33,8 +33,9 @@ class StdioTransport:
         await loop.connect_read_pipe(lambda: reader_protocol, sys.stdin)
         
         # Create stdout writer using connect_write_pipe
+        # StreamWriter.drain()에는 흐름 제어를 지원하는 프로토콜이 필요
         transport, protocol = await loop.connect_write_pipe(
-            lambda: asyncio.Protocol(), sys.stdout
+            asyncio.streams.FlowControlMixin, sys.stdout
         )
         self.writer = asyncio.StreamWriter(transport, protocol, None, loop)
         
@@ -57,7 +58,12 @@ class StdioTransport:
         self.logger.debug(f"Sent message: {message}")
     
     async def _message_loop(self):
-        """Main message processing loop"""
+        """Main message processing loop
+        
+        Each message is handled in its own task so that a cancel notification can be
+        read while a long tool call is still running.
+        """
+        tasks = set()
         while self.running:
             try:
                 # Read message from stdin
@@ -73,25 +79,37 @@ class StdioTransport:
                 
                 # Process message if handler is available
                 if self.message_handler:
-                    try:
-                        response = await self.message_handler(message)
-                        if response:
-                            await self.send_message(response)
-                    except Exception as e:
-                        self.logger.error(f"Error processing message: {e}")
-                        # Send error response
-                        error_response = {
-                            "jsonrpc": "2.0",
-                            "id": None,
-                            "error": {
-                                "code": -32603,
-                                "message": f"Internal error: {str(e)}"
-                            }
-                        }
-                        await self.send_message(json.dumps(error_response))
+                    task = asyncio.create_task(self._process_message(message))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
                         
             except Exception as e:
                 self.logger.error(f"Error in message loop: {e}")
                 break
         
-        self.logger.info("Message loop ended")
\ No newline at end of file
+        # 클라이언트가 종료되면 진행 중인 요청도 중단
+        for task in tasks:
+            task.cancel()
+        
+        self.logger.info("Message loop ended")
+    
+    async def _process_message(self, message: str):
+        """Run the message handler and send back its response"""
+        try:
+            response = await self.message_handler(message)
+            if response:
+                await self.send_message(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error processing message: {e}")
+            # Send error response
+            error_response = {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": -32603,
+                    "message": f"Internal error: {str(e)}"
+                }
+            }
+            await self.send_message(json.dumps(error_response))
@@ -74,9 +74,14 @@ class WebSocketTransport:
         self.logger.debug(f"Sent message: {message}")
     
     async def _handle_client(self, websocket: WebSocketServerProtocol, path: str):
-        """Handle incoming WebSocket client connection"""
+        """Handle incoming WebSocket client connection
+        
+        Each message is handled in its own task so that a cancel notification can be
+        read while a long tool call is still running.
+        """
         self.websocket = websocket
         self.logger.info(f"Client connected: {websocket.remote_address}")
+        tasks = set()
         
         try:
             async for message in websocket:
@@ -87,30 +92,43 @@ class WebSocketTransport:
                 
                 # Process message if handler is available
                 if self.message_handler:
-                    try:
-                        response = await self.message_handler(message)
-                        if response:
-                            await websocket.send(response)
-                    except Exception as e:
-                        self.logger.error(f"Error processing message: {e}")
-                        # Send error response
-                        error_response = {
-                            "jsonrpc": "2.0",
-                            "id": None,
-                            "error": {
-                                "code": -32603,
-                                "message": f"Internal error: {str(e)}"
-                            }
-                        }
-                        await websocket.send(json.dumps(error_response))
+                    task = asyncio.create_task(self._process_message(websocket, message))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
                         
         except websockets.exceptions.ConnectionClosed:
             self.logger.info("Client disconnected")
         except Exception as e:
             self.logger.error(f"Error handling client: {e}")
         finally:
+            # 연결이 끊기면 진행 중인 요청도 중단
+            for task in tasks:
+                task.cancel()
             self.websocket = None
     
+    async def _process_message(self, websocket: WebSocketServerProtocol, message: str):
+        """Run the message handler and send back its response"""
+        try:
+            response = await self.message_handler(message)
+            if response:
+                await websocket.send(response)
+        except asyncio.CancelledError:
+            raise
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            self.logger.error(f"Error processing message: {e}")
+            # Send error response
+            error_response = {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": -32603,
+                    "message": f"Internal error: {str(e)}"
+                }
+            }
+            await websocket.send(json.dumps(error_response))
+    
     async def _client_message_loop(self):
         """Message processing loop for client mode"""
         try:
@@ -0,0 +1,105 @@
+"""
+DrugBank 상호작용 인덱스 테스트 (심각도 분류, 대칭 CSR 조회)
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mcp.drugbank.interaction_index import InteractionIndex, SEVERITY_LABELS, classify_severity
+from mcp.drugbank.local_store import DrugBankLocalStore
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("The risk or severity of bleeding can be increased when DB00001 is combined with DB00002.", 3),
+    ("DB00003 may increase the QTc-prolonging activities of DB00004.", 3),
+    ("DB00005 can cause a decrease in the absorption of DB00006.", 1),
+    ("The excretion of DB00007 can be decreased when combined with DB00008.", 1),
+    ("The metabolism of DB00009 can be decreased when combined with DB00010.", 2),
+    ("", 2),
+    (None, 2),
+])
+def test_classify_severity(description, expected):
+    assert classify_severity(description) == expected
+
+
+def test_major_rule_wins_over_minor_rule():
+    # 규칙은 순서대로 적용: 흡수 감소 문구가 있어도 major 키워드가 우선
+    description = "A decrease in the absorption of DB00001 may lead to seizure."
+    assert classify_severity(description) == 3
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DrugBankLocalStore(str(tmp_path / "drugbank.db"))
+    store.conn.executemany("INSERT INTO drugs (id, drugbank_id, name) VALUES (?, ?, ?)", [
+        (1, "DB00001", "Lepirudin"),
+        (2, "DB00002", "Cetuximab"),
+        (3, "DB00003", "Dornase alfa"),
+        (4, "DB00004", "Denileukin diftitox"),
+    ])
+    store.conn.executemany("INSERT INTO interactions (drug_id, other_drugbank_id, other_name, description) "
+                           "VALUES (?, ?, ?, ?)", [
+        # 한 방향만 기록된 쌍
+        (1, "DB00002", "Cetuximab", "The risk or severity of bleeding can be increased."),
+        (3, "DB00004", "Denileukin diftitox", "The metabolism of DB00004 can be decreased."),
+        # 양방향으로 기록됐지만 심각도가 다른 쌍: 높은 쪽 유지
+        (2, "DB00003", "Dornase alfa", "DB00002 can cause a decrease in the absorption of DB00003."),
+        (3, "DB00002", "Cetuximab", "DB00003 may increase the hypotensive activities of DB00002."),
+        # 저장소에 없는 약물과의 상호작용은 무시
+        (4, "DB09999", "Unknown", "The risk of bleeding can be increased."),
+    ])
+    store.conn.commit()
+    yield store
+    store.close()
+
+
+def test_csr_is_symmetric(store):
+    index = InteractionIndex.build(store)
+    members = np.arange(len(index.drug_ids), dtype=np.int64)
+    block = index._severity_block(members)
+    assert (block == block.T).all()
+    assert int(block.diagonal().max()) == 0
+
+    a, b = index.index["DB00001"], index.index["DB00002"]
+    assert block[a, b] == block[b, a] == 3
+    c, d = index.index["DB00003"], index.index["DB00004"]
+    assert block[c, d] == block[d, c] == 2
+    e = index.index["DB00003"]
+    assert block[b, e] == block[e, b] == 3
+    # 행마다 정렬된 열 인덱스
+    for row in range(len(index.drug_ids)):
+        columns = index.indices[index.indptr[row]:index.indptr[row + 1]]
+        assert list(columns) == sorted(columns)
+
+
+def test_check_regimen_finds_pair_from_either_side(store):
+    index = InteractionIndex.build(store)
+    forward = index.check_regimen(["DB00001", "DB00002"])
+    backward = index.check_regimen(["DB00002", "DB00001"])
+    for report in (forward, backward):
+        assert report["max_severity"] == "major"
+        assert [(i["drug_a"], i["drug_b"]) for i in report["interactions"]] in (
+            [("DB00001", "DB00002")], [("DB00002", "DB00001")])
+        assert report["interactions"][0]["description"] == "The risk or severity of bleeding can be increased."
+
+
+def test_check_regimen_resolves_names_and_filters_severity(store):
+    index = InteractionIndex.build(store)
+    report = index.check_regimen(["lepirudin", "DB00003", "DB00004", "not-a-drug"], min_severity=1)
+    assert report["regimen"] == ["DB00001", "DB00003", "DB00004"]
+    assert report["unresolved"] == ["not-a-drug"]
+    assert report["counts"] == {"minor": 0, "moderate": 1, "major": 0}
+
+    report = index.check_regimen(["DB00003", "DB00004"], min_severity=3)
+    assert report["interactions"] == []
+    assert report["max_severity"] == SEVERITY_LABELS[0]
+
+
+def test_saved_index_round_trips(store, tmp_path):
+    index = InteractionIndex.build(store)
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = InteractionIndex.load(path, store)
+    assert loaded.drug_ids == index.drug_ids
+    assert loaded.max_severity(["DB00002", "DB00003"]) == index.max_severity(["DB00002", "DB00003"]) == 3
@@ -0,0 +1,76 @@
+"""
+처방 조합 탐색(search_regimens) 테스트: branch-and-bound 결과를 전수 탐색과 비교
+"""
+
+import itertools
+import random
+
+import pytest
+
+from mcp.integration.regimen_optimizer import search_regimens
+
+
+def _score(combo, benefits, penalties, size, safety_weight):
+    penalty = sum(penalties[i][j] for i, j in itertools.combinations(combo, 2))
+    return sum(benefits[i] for i in combo) / size + safety_weight * (1.0 - min(1.0, penalty))
+
+
+def _brute_force(candidates, benefits, penalties, size, top_k, safety_weight, forbidden=None):
+    scored = {}
+    for combo in candidates:
+        combo = tuple(sorted(combo))
+        if len(set(combo)) != len(combo) or combo in scored:
+            continue
+        if forbidden is not None and any(forbidden[i][j] for i, j in itertools.combinations(combo, 2)):
+            continue
+        scored[combo] = _score(combo, benefits, penalties, size, safety_weight)
+    return sorted(((score, combo) for combo, score in scored.items()), key=lambda item: (-item[0], item[1]))[:top_k]
+
+
+def _problem(seed, n):
+    rng = random.Random(seed)
+    benefits = [rng.random() for _ in range(n)]
+    penalties = [[0.0] * n for _ in range(n)]
+    for i, j in itertools.combinations(range(n), 2):
+        penalties[i][j] = penalties[j][i] = rng.choice([0.0, 0.0, 0.1, 0.35, 1.0])
+    return benefits, penalties
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("size, top_k", [(2, 3), (3, 5), (4, 1)])
+def test_top_k_matches_brute_force(seed, size, top_k):
+    benefits, penalties = _problem(seed, 8)
+    expected = _brute_force(itertools.combinations(range(8), size), benefits, penalties, size, top_k, 0.5)
+    results, stats = search_regimens(benefits, penalties, size, top_k, 0.5)
+
+    assert [combo for _, combo in results] == [combo for _, combo in expected]
+    assert [score for score, _ in results] == pytest.approx([score for score, _ in expected])
+    assert stats["evaluated"] <= len(list(itertools.combinations(range(8), size)))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_forbidden_pairs_are_never_combined(seed):
+    benefits, penalties = _problem(seed, 7)
+    forbidden = [[penalties[i][j] >= 1.0 for j in range(7)] for i in range(7)]
+    expected = _brute_force(itertools.combinations(range(7), 3), benefits, penalties, 3, 4, 0.3, forbidden)
+    results, _ = search_regimens(benefits, penalties, 3, 4, 0.3, forbidden=forbidden)
+
+    assert [combo for _, combo in results] == [combo for _, combo in expected]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_groups_pick_one_drug_per_slot(seed):
+    benefits, penalties = _problem(seed, 9)
+    # 슬롯 간 후보가 겹치는 경우 포함 (같은 약물은 한 번만 선택)
+    groups = [[0, 1, 2, 3], [3, 4, 5], [5, 6, 7, 8]]
+    expected = _brute_force(itertools.product(*groups), benefits, penalties, 3, 5, 0.4)
+    results, _ = search_regimens(benefits, penalties, 0, 5, 0.4, groups=groups)
+
+    assert [combo for _, combo in results] == [combo for _, combo in expected]
+    assert [score for score, _ in results] == pytest.approx([score for score, _ in expected])
+
+
+def test_size_larger_than_candidates_returns_nothing():
+    results, stats = search_regimens([0.5, 0.4], [[0.0, 0.0], [0.0, 0.0]], 3, 2, 0.5)
+    assert results == []
+    assert stats["evaluated"] == 0
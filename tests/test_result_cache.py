@@ -0,0 +1,210 @@
+"""
+툴 결과 캐시(ToolResultCache) 테스트: TTL / stale-while-revalidate, 부정 캐시,
+오류 결과 제외, 메모리 LRU -> SQLite 계층, 동일 호출 공유(singleflight)
+"""
+
+import asyncio
+
+import pytest
+
+from mcp.common.structured import tool_result
+from mcp.integration.result_cache import (CachePolicy, ToolResultCache, is_empty_result, is_error_result,
+                                          result_key)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ToolResultCache(db_path=str(tmp_path / "tool_results.db"))
+    cache.policies["get_drug_details"] = CachePolicy(ttl=100, stale_ttl=1000, negative_ttl=10)
+    yield cache
+    asyncio.run(cache.close())
+
+
+class Loader:
+    """호출 횟수를 세는 loader (결과는 순서대로 반환)"""
+
+    def __init__(self, *results, delay: float = 0.0):
+        self.results = list(results)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.results[min(self.calls, len(self.results)) - 1]
+
+
+def _age(cache, arguments, seconds):
+    """메모리 계층 항목을 ``seconds`` 만큼 오래된 것으로 만듦"""
+    cache._memory[result_key("drugbank", "get_drug_details", arguments)].stored_at -= seconds
+
+
+def _call(cache, loader, arguments=None):
+    arguments = arguments or {"drugbank_id": "DB00001"}
+    return cache.get_or_call("drugbank", "get_drug_details", arguments, loader)
+
+
+def test_list_error_results_are_errors():
+    # DrugBank / OpenTargets 툴은 전송 오류를 [{"error": ...}]로 반환
+    result = tool_result([{"error": "API 요청 실패: ReadTimeout"}])
+    assert "isError" not in result
+    assert is_error_result(result)
+    assert not is_error_result(tool_result([{"drugbank_id": "DB00001", "name": "Lepirudin"}]))
+    # structuredContent 없이 텍스트만 있는 경우
+    assert is_error_result({"content": [{"type": "text", "text": '[{"error": "timeout"}]'}]})
+    assert is_error_result(tool_result({"error": "boom", "regimen": []}))
+
+
+def test_empty_results_are_negative():
+    assert is_empty_result(tool_result([]))
+    assert is_empty_result(tool_result("No articles found for query: x"))
+    assert not is_empty_result(tool_result([{"drugbank_id": "DB00001"}]))
+
+
+def test_list_error_is_not_cached(cache):
+    async def run():
+        loader = Loader(tool_result([{"error": "API 요청 실패: ReadTimeout"}]),
+                        tool_result({"drugbank_id": "DB00001", "name": "Lepirudin"}))
+        first = await _call(cache, loader)
+        second = await _call(cache, loader)
+        return loader.calls, first, second
+
+    calls, first, second = asyncio.run(run())
+    assert calls == 2
+    assert is_error_result(first)
+    assert second["structuredContent"]["name"] == "Lepirudin"
+
+
+def test_ttl_and_stale_while_revalidate(cache):
+    async def run():
+        loader = Loader(tool_result({"version": 1}), tool_result({"version": 2}))
+        fresh = await _call(cache, loader)
+        cached = await _call(cache, loader)
+        assert loader.calls == 1 and cached == fresh
+
+        # ttl 이후 stale 창: 이전 결과를 바로 반환하고 백그라운드에서 갱신
+        _age(cache, {"drugbank_id": "DB00001"}, 150)
+        stale = await _call(cache, loader)
+        await asyncio.gather(*cache._refreshing)
+        refreshed = await _call(cache, loader)
+
+        # stale 창까지 지나면 다시 직접 호출
+        _age(cache, {"drugbank_id": "DB00001"}, 5000)
+        expired = await _call(cache, loader)
+        return loader.calls, stale, refreshed, expired
+
+    calls, stale, refreshed, expired = asyncio.run(run())
+    assert stale["structuredContent"] == {"version": 1}
+    assert refreshed["structuredContent"] == {"version": 2}
+    assert expired["structuredContent"] == {"version": 2}
+    assert calls == 3
+    assert cache.stats["stale_hits"] == 1 and cache.stats["refreshes"] == 1
+
+
+def test_negative_results_use_negative_ttl(cache):
+    async def run():
+        loader = Loader(tool_result([]), tool_result([{"drugbank_id": "DB00001"}]))
+        await _call(cache, loader)
+        await _call(cache, loader)
+        assert loader.calls == 1
+        # negative_ttl(10초)은 ttl(100초)보다 짧음
+        _age(cache, {"drugbank_id": "DB00001"}, 20)
+        result = await _call(cache, loader)
+        return loader.calls, result
+
+    calls, result = asyncio.run(run())
+    assert calls == 2
+    assert cache.stats["negative_hits"] == 1
+    assert result["structuredContent"]["results"] == [{"drugbank_id": "DB00001"}]
+
+
+def test_evicted_entries_are_served_from_disk(tmp_path):
+    cache = ToolResultCache(db_path=str(tmp_path / "tool_results.db"), memory_entries=1)
+
+    async def run():
+        loader = Loader(tool_result({"id": "a"}), tool_result({"id": "b"}))
+        await _call(cache, loader, {"drugbank_id": "DB00001"})
+        await _call(cache, loader, {"drugbank_id": "DB00002"})  # DB00001 항목은 메모리에서 밀려남
+        assert len(cache._memory) == 1
+        result = await _call(cache, loader, {"drugbank_id": "DB00001"})
+        return loader.calls, result
+
+    calls, result = asyncio.run(run())
+    assert calls == 2
+    assert cache.stats["disk_hits"] == 1
+    assert result["structuredContent"] == {"id": "a"}
+
+    # 새 인스턴스(다음 세션)도 디스크 계층에서 읽음
+    reopened = ToolResultCache(db_path=str(tmp_path / "tool_results.db"))
+    loader = Loader(tool_result({"id": "new"}))
+    assert asyncio.run(_call(reopened, loader, {"drugbank_id": "DB00002"}))["structuredContent"] == {"id": "b"}
+    assert loader.calls == 0
+    asyncio.run(cache.close())
+    asyncio.run(reopened.close())
+
+
+def test_arguments_are_normalized(cache):
+    async def run():
+        loader = Loader(tool_result({"id": "a"}))
+        await _call(cache, loader, {"drugbank_id": " DB00001 ", "unused": None})
+        await _call(cache, loader, {"drugbank_id": "DB00001"})
+        return loader.calls
+
+    assert asyncio.run(run()) == 1
+
+
+def test_concurrent_calls_share_one_load(cache):
+    async def run():
+        loader = Loader(tool_result({"id": "a"}), delay=0.05)
+        results = await asyncio.gather(*(_call(cache, loader) for _ in range(5)))
+        return loader.calls, results
+
+    calls, results = asyncio.run(run())
+    assert calls == 1
+    assert all(result["structuredContent"] == {"id": "a"} for result in results)
+
+
+def test_follower_survives_cancelled_leader(cache):
+    async def run():
+        loader = Loader(tool_result({"id": "a"}), delay=0.05)
+        leader = asyncio.ensure_future(_call(cache, loader))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(_call(cache, loader))
+        await asyncio.sleep(0.01)
+        # 먼저 시작한 호출만 취소 (예: 소스별 타임아웃)
+        leader.cancel()
+        result = await follower
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return loader.calls, result
+
+    calls, result = asyncio.run(run())
+    assert result["structuredContent"] == {"id": "a"}
+    assert calls == 2
+
+
+def test_cancelled_follower_still_raises(cache):
+    async def run():
+        loader = Loader(tool_result({"id": "a"}), delay=0.05)
+        leader = asyncio.ensure_future(_call(cache, loader))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(_call(cache, loader))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(run())["structuredContent"] == {"id": "a"}
+
+
+def test_impure_tools_are_not_cached(cache):
+    async def run():
+        loader = Loader(tool_result({"saved": True}))
+        for _ in range(2):
+            await cache.get_or_call("gaia", "save_research", {"topic": "x"}, loader)
+        return loader.calls
+
+    assert asyncio.run(run()) == 2
+    assert cache.stats["uncacheable"] == 2